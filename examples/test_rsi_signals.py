@@ -23,6 +23,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config import config
 from src.utils import get_logger, TradingDecision
+from src import indicators
 from src.data_retrieval.polygon_client import PolygonClient
 from src.strategies.polygon_strategy import PolygonStrategy
 
@@ -57,50 +58,19 @@ def calculate_rsi_series(bars, period=14):
     # Sort bars chronologically (oldest first)
     sorted_bars = sorted(bars, key=lambda x: x['t'])
     
-    closes = [bar['c'] for bar in sorted_bars]
+    closes = indicators.bars_to_array(sorted_bars)
     dates = [datetime.fromtimestamp(bar['t']/1000) for bar in sorted_bars]
     
-    # Calculate price changes
-    changes = [closes[i] - closes[i-1] for i in range(1, len(closes))]
-    gains = [max(0, change) for change in changes]
-    losses = [max(0, -change) for change in changes]
-    
-    # Calculate RSI
-    rsi_values = []
-    
     # Need at least period+1 data points to start
     if len(closes) <= period:
-        return dates, [], closes
+        return dates, [], closes.tolist()
     
-    # First RSI value uses simple average
-    avg_gain = sum(gains[:period]) / period
-    avg_loss = sum(losses[:period]) / period
-    
-    # Handle division by zero
-    if avg_loss == 0:
-        first_rs = float('inf')
-    else:
-        first_rs = avg_gain / avg_loss
-        
-    first_rsi = 100 - (100 / (1 + first_rs))
-    rsi_values.append(first_rsi)
-    
-    # Rest of RSI uses smoothed average
-    for i in range(period, len(changes)):
-        avg_gain = (avg_gain * (period - 1) + gains[i-1]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i-1]) / period
-        
-        if avg_loss == 0:
-            rs = float('inf')
-        else:
-            rs = avg_gain / avg_loss
-            
-        rsi = 100 - (100 / (1 + rs))
-        rsi_values.append(rsi)
+    # Wilder RSI; the first `period` entries are warm-up
+    rsi_values = indicators.rsi(closes, period)[period:].tolist()
     
     # Align dates with RSI values (RSI starts at period)
     rsi_dates = dates[period:]
-    price_values = closes[period:]
+    price_values = closes[period:].tolist()
     
     return rsi_dates, rsi_values, price_values
 
@@ -3,6 +3,7 @@ import time
 import json
 from src.data_retrieval.crypto_news_client import crypto_news_client
 from src.utils import redis_client
+from src.utils.news_index import news_index, RECENT_NEWS_KEY
 from src.config import config
 
 def populate_crypto_news():
@@ -17,13 +18,12 @@ def populate_crypto_news():
     crypto_news_client.set_subscribed_symbols(symbols)
     
     # Check if we have any existing news
-    news_keys = redis_client.client.keys("news:*")
-    print(f"Found {len(news_keys)} existing news items in Redis")
+    news_count = redis_client.client.zcard(RECENT_NEWS_KEY)
+    print(f"Found {news_count} existing news items in Redis")
     
     # Clear existing news if requested
-    if len(news_keys) > 0 and input("Do you want to clear existing news? (y/n): ").lower() == 'y':
-        for key in news_keys:
-            redis_client.client.delete(key)
+    if news_count > 0 and input("Do you want to clear existing news? (y/n): ").lower() == 'y':
+        news_index.clear()
         print("Cleared existing news")
     
     # Manually trigger news fetch
@@ -55,20 +55,14 @@ def populate_crypto_news():
             print(f"Error fetching from {api['name']}: {str(e)}")
     
     # Check news in Redis
-    news_keys = redis_client.client.keys("news:*")
-    print(f"Now have {len(news_keys)} news items in Redis")
+    print(f"Now have {redis_client.client.zcard(RECENT_NEWS_KEY)} news items in Redis")
     
-    # Print a few news items as example
-    for key in news_keys[:5]:
-        try:
-            news_data = redis_client.get_json(key)
-            if news_data:
-                print(f"\nHeadline: {news_data.get('headline')}")
-                print(f"Symbols: {', '.join(news_data.get('symbols', []))}")
-                print(f"Source: {news_data.get('source')}")
-                print(f"URL: {news_data.get('url')}")
-        except:
-            pass
+    # Print a few of the newest news items as example
+    for news_data in news_index.fetch(limit=5):
+        print(f"\nHeadline: {news_data.get('headline')}")
+        print(f"Symbols: {', '.join(news_data.get('symbols', []))}")
+        print(f"Source: {news_data.get('source')}")
+        print(f"URL: {news_data.get('url')}")
     
     print("\nNews fetching completed!")
     print("The news feed should now be populated on the dashboard.")
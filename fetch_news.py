@@ -5,12 +5,8 @@ import uuid
 import requests
 from datetime import datetime
 
-# Connect to Redis
-import redis
-redis_host = os.getenv('REDIS_HOST', 'redis')
-redis_port = int(os.getenv('REDIS_PORT', 6379))
-redis_db = int(os.getenv('REDIS_DB', 0))
-redis_client = redis.Redis(host=redis_host, port=redis_port, db=redis_db, decode_responses=True)
+from src.utils import redis_client
+from src.utils.news_index import news_index, RECENT_NEWS_KEY
 
 def fetch_cryptocompare_news():
     """
@@ -90,20 +86,13 @@ def fetch_cryptocompare_news():
                 "timestamp": datetime.fromtimestamp(item.get("published_on", time.time())).isoformat()
             }
             
-            # Store in Redis with 24-hour TTL
-            redis_key = f"news:{news_id}"
-            
-            # Check if news already exists
-            existing = redis_client.get(redis_key)
-            if existing:
+            # Store in Redis with 24-hour TTL and index it for the dashboard feed
+            if not news_index.store(news_data, only_if_new=True):
                 continue
-                
-            redis_client.set(redis_key, json.dumps(news_data))
-            redis_client.expire(redis_key, 86400)  # 24-hour TTL
             news_count += 1
             
             # Publish notification for frontend update
-            redis_client.publish('trade_notifications', json.dumps({
+            redis_client.client.publish('trade_notifications', json.dumps({
                 "type": "news_update",
                 "symbols": news_data["symbols"],
                 "timestamp": datetime.now().isoformat()
@@ -124,25 +113,17 @@ def print_stored_news():
     """
     print("\nStored news items:")
     
-    # Get all news keys
-    news_keys = redis_client.keys("news:*")
-    print(f"Found {len(news_keys)} news items")
+    print(f"Found {redis_client.client.zcard(RECENT_NEWS_KEY)} news items")
     
-    # Print a sample of news items
-    for key in news_keys[:5]:
-        news_data = redis_client.get(key)
-        if news_data:
-            try:
-                news = json.loads(news_data)
-                print(f"\nHeadline: {news.get('headline', '')[:70]}...")
-                print(f"Symbols: {', '.join(news.get('symbols', []))}")
-                print(f"Source: {news.get('source', 'Unknown')}")
-                print(f"URL: {news.get('url', 'No URL')}")
-            except:
-                print(f"Error parsing news data for key: {key}")
+    # Print a sample of the newest news items
+    for news in news_index.fetch(limit=5):
+        print(f"\nHeadline: {news.get('headline', '')[:70]}...")
+        print(f"Symbols: {', '.join(news.get('symbols', []))}")
+        print(f"Source: {news.get('source', 'Unknown')}")
+        print(f"URL: {news.get('url', 'No URL')}")
     
     # Now notify the frontend to update
-    redis_client.publish('trade_notifications', json.dumps({
+    redis_client.client.publish('trade_notifications', json.dumps({
         "type": "refresh_news",
         "timestamp": datetime.now().isoformat()
     }))
@@ -154,10 +135,7 @@ def print_stored_news():
 if __name__ == "__main__":
     # Clear existing news
     if input("Do you want to clear existing news? (y/n): ").lower() == 'y':
-        news_keys = redis_client.keys("news:*")
-        for key in news_keys:
-            redis_client.delete(key)
-        print(f"Cleared {len(news_keys)} existing news items")
+        print(f"Cleared {news_index.clear()} existing news items")
     
     # Fetch news
     fetch_cryptocompare_news()
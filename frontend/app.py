@@ -4,7 +4,7 @@ import time
 import uuid
 from datetime import datetime
 from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, emit
 import redis
 import traceback
 import threading
@@ -23,6 +23,28 @@ redis_host = os.getenv('REDIS_HOST', 'localhost')  # Default to localhost instea
 redis_port = int(os.getenv('REDIS_PORT', 6379))
 redis_db = int(os.getenv('REDIS_DB', 0))
 
+# Sorted set of news ids by publish time, maintained by the news clients
+RECENT_NEWS_KEY = "news:recent"
+
+# Keyspace notification channel prefix for our database
+KEYSPACE_PREFIX = f"__keyspace@{redis_db}__:"
+
+# Keys the dashboard snapshot is built from; a change to any of them marks it stale
+SNAPSHOT_KEY_PATTERNS = [
+    "rsi:*", "signal:*", "trade_result:*", "price:*", "price_history:*", "position:*",
+    "alpaca:invalid:*", "account:data", "trading_enabled", "recent_orders", "ollama:status",
+    RECENT_NEWS_KEY,
+]
+
+# Seconds to wait after a change before rebuilding, so bursts of writes share one rebuild
+SNAPSHOT_DEBOUNCE = float(os.getenv('FRONTEND_SNAPSHOT_DEBOUNCE', 0.25))
+
+# Rebuild at least this often even without notifications (e.g. keys that expired)
+SNAPSHOT_MAX_AGE = float(os.getenv('FRONTEND_SNAPSHOT_MAX_AGE', 30))
+
+# Minimum seconds between two pushes of the same symbol to the browsers
+DELTA_INTERVAL = float(os.getenv('FRONTEND_DELTA_INTERVAL', 1.0))
+
 # Initialize Redis client with error handling
 redis_client = None
 try:
@@ -51,6 +73,9 @@ except Exception as e:
         def get(self, key):
             return self.data.get(key)
         
+        def mget(self, keys):
+            return [self.data.get(key) for key in keys]
+        
         def get_json(self, key):
             """Get a JSON value from Redis and deserialize it"""
             data = self.get(key)
@@ -71,6 +96,17 @@ except Exception as e:
                     del self.data[key]
             return len(keys)
         
+        def zrevrange(self, key, start, end):
+            # Sorted sets are not mocked; behave like an empty index
+            return []
+        
+        def zcard(self, key):
+            return 0
+        
+        def blpop(self, keys, timeout=0):
+            # Nothing pushes replies to the mock; behave like a timeout
+            return None
+        
         def keys(self, pattern="*"):
             # Simple pattern matching for keys
             if pattern == "*":
@@ -172,28 +208,40 @@ redis_client.get_pubsub = get_pubsub
 frontend_host = os.getenv('FRONTEND_HOST', '0.0.0.0')
 frontend_port = int(os.getenv('FRONTEND_PORT', 9754))
 
+def _symbol_key_variations(symbol):
+    """Key suffixes that other services may have used for the same symbol"""
+    variations = []
+    for symbol_var in [symbol, symbol.replace('/USDT', '/USD'), symbol.replace('/', '')]:
+        if symbol_var not in variations:
+            variations.append(symbol_var)
+    return variations
+
+def _load_json_values(keys):
+    """Fetch many keys with a single MGET and decode the JSON values"""
+    values = {}
+    if not keys:
+        return values
+    for key, raw in zip(keys, redis_client.mget(keys)):
+        if raw is None:
+            continue
+        try:
+            values[key] = json.loads(raw)
+        except (TypeError, ValueError):
+            values[key] = raw
+    return values
+
+def _load_recent_news(limit=10):
+    """Load the newest news items from the news:recent index (ZREVRANGE + MGET)"""
+    news_ids = redis_client.zrevrange(RECENT_NEWS_KEY, 0, limit - 1)
+    news = _load_json_values([f"news:{news_id}" for news_id in news_ids])
+    return [item for item in news.values() if isinstance(item, dict)]
+
 def get_all_trading_data():
     """Get all trading data from Redis"""
     try:
         symbols = os.getenv('SYMBOLS', 'BTC/USD').split(',')
         data = {}
         
-        # Get Ollama model status
-        ollama_status = None
-        try:
-            ollama_status_data = redis_client.get("ollama:status")
-            if ollama_status_data:
-                try:
-                    ollama_status = json.loads(ollama_status_data)
-                    print(f"Successfully loaded Ollama status: {ollama_status}")
-                except Exception as e:
-                    print(f"Error parsing Ollama status: {ollama_status_data}")
-                    print(f"Exception: {e}")
-                    print(traceback.format_exc())
-        except Exception as e:
-            print(f"Error getting Ollama status from Redis: {e}")
-            print(traceback.format_exc())
-        
         # Create a mapping between different format variations of the same symbol
         symbol_variations = {}
         for symbol in symbols:
@@ -212,129 +260,104 @@ def get_all_trading_data():
             else:
                 symbol_variations[symbol] = symbol
         
-        print(f"Symbol variations map: {symbol_variations}")
+        # Collect every key the dashboard needs and fetch them in one round trip
+        keys = ["ollama:status", "account:data", "trading_enabled", "recent_orders"]
+        for symbol in symbols:
+            for symbol_var in _symbol_key_variations(symbol):
+                keys.extend([
+                    f"rsi:{symbol_var}",
+                    f"signal:{symbol_var}",
+                    f"trade_result:{symbol_var}",
+                    f"price_history:{symbol_var}",
+                ])
+            keys.extend([f"price:{symbol}", f"alpaca:invalid:{symbol}", f"position:{symbol}"])
+        # Signals may also be stored under any other format of the symbol
+        keys.extend(f"signal:{symbol_var}" for symbol_var in symbol_variations)
+        values = _load_json_values(list(dict.fromkeys(keys)))
+        
+        def first_value(prefix, symbol):
+            for symbol_var in _symbol_key_variations(symbol):
+                value = values.get(f"{prefix}:{symbol_var}")
+                if value:
+                    return value
+            return None
+        
+        # Get Ollama model status
+        ollama_status = values.get("ollama:status")
+        if ollama_status is not None and not isinstance(ollama_status, dict):
+            print(f"Error parsing Ollama status: {ollama_status}")
+            ollama_status = None
         
         # Get all trading symbols data
         for symbol in symbols:
             symbol_data = {}
             
             # RSI data - check for all possible key variations
-            for symbol_var in [symbol, symbol.replace('/USDT', '/USD'), symbol.replace('/', '')]:
-                rsi_key = f"rsi:{symbol_var}"
-                rsi_data = redis_client.get_json(rsi_key)
-                if rsi_data:
-                    symbol_data['rsi'] = rsi_data
-                    print(f"Found RSI data for {symbol} using key {rsi_key}")
-                    break  # Exit loop once data is found
+            rsi_data = first_value("rsi", symbol)
+            if rsi_data:
+                symbol_data['rsi'] = rsi_data
                 
             # Price data 
-            price_key = f"price:{symbol}"
-            price_data = redis_client.get_json(price_key)
+            price_data = values.get(f"price:{symbol}")
             if price_data:
                 symbol_data['price'] = price_data
                 
             # Trade signal - check all possible key variations
-            signal_found = False
-            for symbol_var in [symbol, symbol.replace('/USDT', '/USD'), symbol.replace('/', '')]:
-                signal_key = f"signal:{symbol_var}"
-                signal_data = redis_client.get_json(signal_key)
-                if signal_data:
-                    # Ensure the symbol is in the correct format in the data
-                    signal_data['symbol'] = symbol  # Normalize to the configured format
-                    symbol_data['signal'] = signal_data
-                    print(f"Found signal for {symbol} using key {signal_key}")
-                    signal_found = True
-                    break  # Exit loop once data is found
+            signal_data = first_value("signal", symbol)
             
-            # If we still don't have a signal, try a broader search
-            if not signal_found:
-                all_signal_keys = redis_client.keys("signal:*")
-                print(f"All signal keys: {all_signal_keys}")
-                for key in all_signal_keys:
-                    signal_symbol = key.replace("signal:", "")
-                    # Check if this signal is for a variation of our symbol
-                    if signal_symbol in symbol_variations and symbol_variations[signal_symbol] == symbol:
-                        signal_data = redis_client.get_json(key)
-                        if signal_data:
-                            # Normalize the symbol
-                            signal_data['symbol'] = symbol
-                            symbol_data['signal'] = signal_data
-                            print(f"Found signal for {symbol} using key {key} via variation lookup")
-                            break
+            # Otherwise use a signal stored under another format of the symbol
+            if not signal_data:
+                for symbol_var, variation_of in symbol_variations.items():
+                    if variation_of == symbol and values.get(f"signal:{symbol_var}"):
+                        signal_data = values[f"signal:{symbol_var}"]
+                        break
+            
+            if signal_data:
+                # Ensure the symbol is in the correct format in the data
+                signal_data['symbol'] = symbol  # Normalize to the configured format
+                symbol_data['signal'] = signal_data
                 
             # Trading result - check all possible key variations
-            for symbol_var in [symbol, symbol.replace('/USDT', '/USD'), symbol.replace('/', '')]:
-                result_key = f"trade_result:{symbol_var}"
-                result_data = redis_client.get_json(result_key)
-                if result_data:
-                    # Ensure the symbol is in the correct format in the data
-                    result_data['symbol'] = symbol  # Normalize to the configured format
-                    symbol_data['result'] = result_data
-                    print(f"Found trade result for {symbol} using key {result_key}: {result_data['status']}")
-                    break  # Exit loop once data is found
-            else:
-                print(f"No trade result found for {symbol}")
+            result_data = first_value("trade_result", symbol)
+            if result_data:
+                # Ensure the symbol is in the correct format in the data
+                result_data['symbol'] = symbol  # Normalize to the configured format
+                symbol_data['result'] = result_data
                 
             # Price history data for charts
-            for symbol_var in [symbol, symbol.replace('/USDT', '/USD'), symbol.replace('/', '')]:
-                history_key = f"price_history:{symbol_var}"
-                history_data = redis_client.get_json(history_key)
-                if history_data:
-                    # Count how many candles we have for debugging
-                    candle_count = len(history_data.get('candles', []))
-                    symbol_data['price_history'] = history_data
-                    print(f"Retrieved {candle_count} candles for {symbol} using key {history_key}")
-                    break  # Exit loop once data is found
+            history_data = first_value("price_history", symbol)
+            if history_data:
+                symbol_data['price_history'] = history_data
             
             # Check for invalid Alpaca symbol
-            invalid_key = f"alpaca:invalid:{symbol}"
-            invalid_flag = redis_client.get(invalid_key)
-            if invalid_flag:
+            if values.get(f"alpaca:invalid:{symbol}"):
                 symbol_data['invalid_alpaca_symbol'] = True
                 
             # Position data
-            position_key = f"position:{symbol}"
-            position_data = redis_client.get_json(position_key)
+            position_data = values.get(f"position:{symbol}")
             if position_data:
                 symbol_data['position'] = position_data
                     
             data[symbol] = symbol_data
             
         # Account data
-        account_key = "account:data"
-        account_data = redis_client.get_json(account_key)
+        account_data = values.get("account:data")
         if account_data:
             data['account'] = account_data
             
         # Trading enabled status
-        trading_enabled = redis_client.get("trading_enabled")
-        data['trading_enabled'] = trading_enabled == "true" if trading_enabled is not None else False
+        trading_enabled = values.get("trading_enabled")
+        data['trading_enabled'] = trading_enabled is True or trading_enabled == "true"
         
         # Recent market orders
-        orders_key = "recent_orders"
-        orders_data = redis_client.get_json(orders_key)
+        orders_data = values.get("recent_orders")
         if orders_data:
             data['recent_orders'] = orders_data
             
-        # Get recent news items
-        news_keys = redis_client.keys("news:*")
-        if news_keys:
-            # Sort by timestamp (most recent first)
-            news_items = []
-            for key in news_keys:
-                news_data = redis_client.get_json(key)
-                if news_data:
-                    news_items.append(news_data)
-            
-            # Sort by timestamp (most recent first) if news items have timestamps
-            if news_items:
-                try:
-                    news_items.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-                except Exception as e:
-                    print(f"Error sorting news items: {e}")
-                
-                # Limit to 10 most recent items
-                data['recent_news'] = news_items[:10]
+        # Get recent news items (the index is already sorted newest first)
+        news_items = _load_recent_news(10)
+        if news_items:
+            data['recent_news'] = news_items
                 
         # Add ollama status if available
         if ollama_status:
@@ -346,6 +369,160 @@ def get_all_trading_data():
         print(traceback.format_exc())
         return {}
 
+class DeltaPublisher:
+    """
+    Pushes dashboard changes to browsers as numbered deltas
+
+    Each 'data_delta' event carries a sequence number, the changed fields per
+    symbol ("symbols": {symbol: {field: value}}) and the changed top-level
+    entries ("data": {key: value}); removed values are sent as null. A symbol
+    or entry is pushed at most once per `interval` seconds; changes held back
+    go out with a later delta. Clients that see a gap in the sequence ask for
+    a full 'data_snapshot' and continue from its sequence number.
+    """
+    
+    def __init__(self, symbols, emit, interval=DELTA_INTERVAL):
+        self.symbols = set(symbols)
+        self.emit = emit
+        self.interval = interval
+        self.seq = 0
+        self._sent = {}
+        self._sent_at = {}
+        self._lock = threading.Lock()
+    
+    def publish(self, data, now=None):
+        """
+        Emit what changed in data since the last delta
+        
+        Returns:
+            Seconds until throttled changes may be sent, or None if nothing is held back
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            delta, due = self._diff(data, now)
+        if delta:
+            self.emit('data_delta', delta)
+        return due
+    
+    def _diff(self, data, now):
+        symbol_changes = {}
+        data_changes = {}
+        due = None
+        for section in set(self._sent) | set(data):
+            old = self._sent.get(section)
+            new = data.get(section)
+            if old == new:
+                continue
+            wait = self._sent_at.get(section, 0.0) + self.interval - now
+            if wait > 0:
+                due = wait if due is None else min(due, wait)
+                continue
+            if section in self.symbols:
+                old = old or {}
+                new = new or {}
+                symbol_changes[section] = {
+                    field: new.get(field)
+                    for field in set(old) | set(new)
+                    if old.get(field) != new.get(field)
+                }
+            else:
+                data_changes[section] = new
+            self._sent[section] = data.get(section)
+            self._sent_at[section] = now
+        
+        if not (symbol_changes or data_changes):
+            return None, due
+        self.seq += 1
+        return {'seq': self.seq, 'symbols': symbol_changes, 'data': data_changes}, due
+    
+    def snapshot(self):
+        """
+        The view as of the last delta, with its sequence number
+        
+        Changes still held back by the throttle are left out; they reach the
+        client in a later delta, which is diffed against exactly this state.
+        """
+        with self._lock:
+            return {'seq': self.seq, 'data': {section: value for section, value in self._sent.items() if value is not None}}
+
+class TradingSnapshot:
+    """
+    In-memory view of the dashboard data shared by every HTTP and socket reader
+
+    A background thread rebuilds the view with get_all_trading_data() when the
+    Redis listener reports a change to one of SNAPSHOT_KEY_PATTERNS, so the
+    number of Redis calls depends on how often the data changes, not on how
+    many browsers are connected. After every rebuild the publisher, if any,
+    pushes the changes to connected browsers.
+    """
+    
+    def __init__(self, builder, publisher=None, debounce=SNAPSHOT_DEBOUNCE, max_age=SNAPSHOT_MAX_AGE):
+        self.builder = builder
+        self.publisher = publisher
+        self.debounce = debounce
+        self.max_age = max_age
+        self.version = 0
+        self.built_at = 0.0
+        self._data = None
+        self._lock = threading.Lock()
+        self._stale = False
+        self._wake = threading.Event()
+    
+    def get(self):
+        """Current view, built on first use"""
+        if self._data is None:
+            self.refresh()
+        return self._data
+    
+    def payload(self):
+        """Full view with the sequence number of the last delta it includes"""
+        if self.publisher is None:
+            return {'seq': 0, 'data': self.get()}
+        if self.publisher.seq == 0:
+            # Nothing published yet: publish the first view so the snapshot has it
+            self.publisher.publish(self.get())
+        return self.publisher.snapshot()
+    
+    def invalidate(self, key=None):
+        """Mark the view stale; the background thread rebuilds it"""
+        self._stale = True
+        self._wake.set()
+    
+    def _rebuild(self):
+        with self._lock:
+            # Cleared before building so a change during the build triggers another one
+            self._stale = False
+            data = self.builder()
+            self._data = data
+            self.version += 1
+            self.built_at = time.time()
+        return data
+    
+    def refresh(self):
+        """Rebuild the view now and let the background thread publish it"""
+        data = self._rebuild()
+        self._wake.set()
+        return data
+    
+    def run(self):
+        """Rebuild and publish loop for the background thread"""
+        timeout = self.max_age
+        while True:
+            try:
+                self._wake.wait(timeout)
+                self._wake.clear()
+                if self._stale or time.time() - self.built_at >= self.max_age:
+                    time.sleep(self.debounce)
+                    self._rebuild()
+                due = self.publisher.publish(self._data) if self.publisher and self._data is not None else None
+                timeout = self.max_age if due is None else min(self.max_age, due)
+            except Exception as e:
+                print(f"Error rebuilding trading snapshot: {e}")
+                timeout = 1
+
+delta_publisher = DeltaPublisher(os.getenv('SYMBOLS', 'BTC/USD').split(','), socketio.emit)
+trading_snapshot = TradingSnapshot(get_all_trading_data, publisher=delta_publisher)
+
 # List to track clients registered for transaction updates
 transaction_update_clients = []
 
@@ -369,8 +546,14 @@ def redis_listener():
         # Create a separate Redis connection for pub/sub
         pubsub = redis_client.get_pubsub()
         
-        # Subscribe to keyspace notifications for trade results
-        pubsub.psubscribe('__keyspace@0__:trade_result:*')
+        # Make sure Redis emits keyspace notifications (the backend enables them too)
+        try:
+            redis_client.config_set('notify-keyspace-events', 'KEA')
+        except Exception as e:
+            print(f"Could not enable keyspace notifications: {e}")
+        
+        # Subscribe to keyspace notifications for every key in the dashboard snapshot
+        pubsub.psubscribe(*[KEYSPACE_PREFIX + pattern for pattern in SNAPSHOT_KEY_PATTERNS])
         
         print("Redis listener started, waiting for trade result updates...")
         
@@ -383,15 +566,17 @@ def redis_listener():
                     
                     # Safely decode if needed
                     if isinstance(channel, bytes):
-                        key = channel.decode('utf-8').replace('__keyspace@0__:', '')
+                        key = channel.decode('utf-8').replace(KEYSPACE_PREFIX, '')
                     else:
-                        key = channel.replace('__keyspace@0__:', '')
+                        key = channel.replace(KEYSPACE_PREFIX, '')
                         
                     if isinstance(data, bytes):
                         operation = data.decode('utf-8')
                     else:
                         operation = data
                     
+                    trading_snapshot.invalidate(key)
+                    
                     # Only process SET operations for trade results
                     if key.startswith('trade_result:') and operation == 'set':
                         symbol = key.replace('trade_result:', '')
@@ -430,6 +615,10 @@ def redis_listener():
 redis_listener_thread = threading.Thread(target=redis_listener, daemon=True)
 redis_listener_thread.start()
 
+# Keep the dashboard snapshot fresh in the background
+snapshot_thread = threading.Thread(target=trading_snapshot.run, daemon=True)
+snapshot_thread.start()
+
 @app.route('/')
 def index():
     """Render main dashboard page"""
@@ -474,6 +663,9 @@ def index():
         print(f"Error setting trading disabled: {e}")
         trading_enabled = False
     
+    # The page fetches /api/data right away, so it must not see the old state
+    trading_snapshot.refresh()
+    
     # We no longer create mock trades at startup to avoid confusion
     # Users will only see real trades or trades they explicitly trigger for testing
     
@@ -493,63 +685,33 @@ def index():
 def api_data():
     """API endpoint to get all trading data"""
     try:
-        # Clean approach - no emergency hacks   
-        data = get_all_trading_data()
+        # Shallow copy so the debug fields below never leak into the shared snapshot
+        data = dict(trading_snapshot.get())
         
-        # Add debug information
-        try:
-            keys = {
-                'keys': {
-                    'all': [key for key in redis_client.scan_iter()],
-                    'rsi': [key for key in redis_client.scan_iter('rsi:*')],
-                    'signal': [key for key in redis_client.scan_iter('signal:*')],
-                    'trade_result': [key for key in redis_client.scan_iter('trade_result:*')],
-                    'price_history': [key for key in redis_client.scan_iter('price_history:*')]
+        # Key listings scan all of Redis, so they are only added on request (?debug=1)
+        if request.args.get('debug'):
+            try:
+                data['_debug'] = {
+                    'keys': {
+                        'all': [key for key in redis_client.scan_iter()],
+                        'rsi': [key for key in redis_client.scan_iter('rsi:*')],
+                        'signal': [key for key in redis_client.scan_iter('signal:*')],
+                        'trade_result': [key for key in redis_client.scan_iter('trade_result:*')],
+                        'price_history': [key for key in redis_client.scan_iter('price_history:*')]
+                    },
+                    'snapshot': {
+                        'version': trading_snapshot.version,
+                        'age': time.time() - trading_snapshot.built_at
+                    }
                 }
-            }
-            data['_debug'] = keys
-            
-            # DEBUG: Directly check price history data
-            price_history_keys = [key for key in redis_client.scan_iter('price_history:*')]
-            if price_history_keys:
-                print(f"FOUND {len(price_history_keys)} price_history keys in Redis: {price_history_keys}")
-                # Check first price history key
-                sample_key = price_history_keys[0]
-                sample_data = redis_client.get(sample_key)
-                if sample_data:
-                    try:
-                        parsed_data = json.loads(sample_data)
-                        print(f"Sample price history data for {sample_key}: Keys = {parsed_data.keys()}")
-                        if 'candles' in parsed_data:
-                            print(f"Candle count: {len(parsed_data['candles'])}")
-                        else:
-                            print(f"ERROR: No 'candles' key in Redis data for {sample_key}")
-                    except Exception as parse_error:
-                        print(f"Error parsing price history data: {parse_error}")
-                else:
-                    print(f"No data found for price history key {sample_key}")
-            else:
-                print("NO price_history keys found in Redis!")
-            
-        except Exception as e:
-            print(f"Error adding debug keys: {e}")
-            print(traceback.format_exc())
-    
-        # Add key contents for all trade results for easier debugging
-        try:
-            trade_results = {}
-            for key in keys['keys']['trade_result']:
-                trade_data = redis_client.get(key)
-                if trade_data:
-                    try:
-                        trade_results[key] = json.loads(trade_data)
-                    except json.JSONDecodeError:
-                        trade_results[key] = {'error': 'Could not parse JSON', 'raw': trade_data}
-            
-            data['_trade_results'] = trade_results
-        except Exception as e:
-            print(f"Error adding trade results: {e}")
-            print(traceback.format_exc())
+                data['_trade_results'] = {
+                    f"trade_result:{symbol}": symbol_data['result']
+                    for symbol, symbol_data in data.items()
+                    if isinstance(symbol_data, dict) and 'result' in symbol_data
+                }
+            except Exception as e:
+                print(f"Error adding debug keys: {e}")
+                print(traceback.format_exc())
         
         return jsonify(data)
     except Exception as e:
@@ -581,8 +743,8 @@ def account_info():
             except Exception as e:
                 print(f"Error parsing cached account summary: {e}")
         
-        # If no cached data, request it from the trade_execution service
-        # We'll publish a request to a Redis channel and wait for a response
+        # If no cached data, request it from the trade_execution service,
+        # which pushes the reply onto a list we block on (it also refreshes account_summary)
         request_id = str(uuid.uuid4())
         request_data = {
             'request_id': request_id,
@@ -595,21 +757,12 @@ def account_info():
         
         # Wait for a response (with timeout)
         max_wait_time = 5  # seconds
-        start_time = time.time()
-        response_key = f'account_info_response:{request_id}'
-        
-        while time.time() - start_time < max_wait_time:
-            response = redis_client.get(response_key)
-            if response:
-                try:
-                    account_data = json.loads(response)
-                    # Cache the response
-                    redis_client.set('account_summary', response, ex=300)  # 5 minute TTL
-                    return jsonify(account_data)
-                except Exception as e:
-                    print(f"Error parsing account response: {e}")
-                    break
-            time.sleep(0.1)
+        reply = redis_client.blpop(f'account_info_response:{request_id}', timeout=max_wait_time)
+        if reply:
+            try:
+                return jsonify(json.loads(reply[1]))
+            except Exception as e:
+                print(f"Error parsing account response: {e}")
         
         # If we reach here, we didn't get a response in time
         # Return a placeholder response
@@ -751,6 +904,8 @@ def toggle_trading():
             print(f"Warning: Failed to publish trading status update to Redis: {str(e)}")
             print(traceback.format_exc())
         
+        trading_snapshot.refresh()
+        
         return jsonify({
             'message': f'Trading {"enabled" if enabled else "disabled"}',
             'status': 'success',
@@ -1049,8 +1204,13 @@ def debug_page():
 @socketio.on('connect')
 def handle_connect(sid=None):
     """Handle client connection"""
-    # Send initial data to the client
-    socketio.emit('data_update', get_all_trading_data())
+    # Send the full snapshot to the connecting client only; deltas follow
+    emit('data_snapshot', trading_snapshot.payload())
+
+@socketio.on('request_snapshot')
+def handle_snapshot_request():
+    """Resend the full snapshot to a client that missed a delta"""
+    emit('data_snapshot', trading_snapshot.payload())
 
 @app.route('/api/strategies')
 def get_strategies():
@@ -1311,16 +1471,9 @@ def news_status():
         # Check if news strategy is enabled
         use_news_strategy = os.getenv('USE_NEWS_STRATEGY', 'false').lower() == 'true'
         
-        # Get all news keys from Redis
-        news_keys = redis_client.keys("news:*")
-        news_count = len(news_keys)
-        
-        # Get news items if any exist
-        news_items = []
-        for key in news_keys[:10]:  # Limit to 10 most recent for the status check
-            news_data = redis_client.get_json(key)
-            if news_data:
-                news_items.append(news_data)
+        # Count and sample news from the recent-news index
+        news_count = redis_client.zcard(RECENT_NEWS_KEY)
+        news_items = _load_recent_news(10)  # Limit to 10 most recent for the status check
                 
         # Get symbols we're tracking
         symbols = os.getenv('SYMBOLS', 'BTC/USD').split(',')
@@ -1471,8 +1624,7 @@ def backend_heartbeat():
             heartbeat_signs["data_clients"]["websocket_client"] = True
         
         # Check for news client
-        news_keys = redis_client.keys("news:*")
-        if news_keys:
+        if redis_client.zcard(RECENT_NEWS_KEY):
             heartbeat_signs["data_clients"]["news_client"] = True
         
         # Check for Alpaca trader
@@ -1723,7 +1875,11 @@ def reset_strategy_manager():
 
 @app.route('/api/refresh_trade/<symbol>')
 def refresh_trade(symbol):
-    """API endpoint to manually refresh a specific trade result"""
+    """API endpoint to read a trade result and the tracked state of its order
+    
+    Fills are written to trade_result:{symbol} by the order tracker as they
+    arrive on the trade updates stream, so this only reads Redis.
+    """
     try:
         # Fetch the trade result from Redis
         redis_key = f"trade_result:{symbol}"
@@ -1734,7 +1890,7 @@ def refresh_trade(symbol):
                 # Parse the JSON
                 result = json.loads(result_data)
                 status = result.get('status', 'unknown')
-                print(f"Refreshed trade result for {symbol}: {status}")
+                print(f"Refreshed trade result for {symbol}: {status} (order {result.get('order_state')})")
                 
                 # If this is an executed trade, trigger a transaction update
                 if status == 'executed' and transaction_update_clients:
@@ -1751,6 +1907,7 @@ def refresh_trade(symbol):
                     'success': True,
                     'symbol': symbol,
                     'result': result,
+                    'order': redis_client.get_json(f"order:{result.get('order_id')}"),
                     'timestamp': datetime.now().isoformat()
                 })
             except json.JSONDecodeError as e:
@@ -49,6 +49,27 @@ document.addEventListener("DOMContentLoaded", function() {
         updateDashboard(data);
     });
     
+    // Full snapshot on connect (or on request), followed by numbered deltas
+    socket.on('data_snapshot', function(payload) {
+        window.dashboardSeq = payload.seq;
+        updateDashboard(payload.data);
+    });
+    
+    socket.on('data_delta', function(delta) {
+        // Waiting for a snapshot, or the delta is already part of the last one
+        if (window.dashboardSeq === undefined || delta.seq <= window.dashboardSeq) {
+            return;
+        }
+        if (delta.seq !== window.dashboardSeq + 1) {
+            console.log(`Missed dashboard updates before #${delta.seq}, requesting a snapshot`);
+            window.dashboardSeq = undefined;
+            socket.emit('request_snapshot');
+            return;
+        }
+        window.dashboardSeq = delta.seq;
+        applyDashboardDelta(delta);
+    });
+    
     // Listen for account update events
     socket.on('account_update_needed', function() {
         console.log('Account update notification received');
@@ -1453,6 +1474,45 @@ function updateDashboard(data) {
     });
 }
 
+// Apply a data_delta event to the last received data and update only what changed
+function applyDashboardDelta(delta) {
+    const state = window.lastReceivedData || {};
+    
+    Object.entries(delta.symbols || {}).forEach(([symbol, fields]) => {
+        const symbolData = Object.assign({}, state[symbol]);
+        Object.entries(fields).forEach(([field, value]) => {
+            if (value === null) {
+                delete symbolData[field];
+            } else {
+                symbolData[field] = value;
+            }
+        });
+        state[symbol] = symbolData;
+        updateSymbolCard(symbol, symbolData);
+    });
+    
+    const changed = delta.data || {};
+    Object.entries(changed).forEach(([key, value]) => {
+        if (value === null) {
+            delete state[key];
+        } else {
+            state[key] = value;
+        }
+    });
+    window.lastReceivedData = state;
+    
+    if (changed.trading_enabled !== undefined && changed.trading_enabled !== null) {
+        updateAllTradingUIComponents(changed.trading_enabled);
+    }
+    if (changed.ollama_status) {
+        updateOllamaStatus(changed.ollama_status);
+    }
+    if (changed.recent_news) {
+        window.newsItems = changed.recent_news;
+        updateNewsFeed(window.newsItems);
+    }
+}
+
 function updateOllamaStatus(ollamaStatus) {
     const container = document.getElementById('ollama-status-container');
     const statusText = document.getElementById('ollama-status-text');
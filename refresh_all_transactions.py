@@ -1,193 +0,0 @@
-import json
-import redis
-import os
-import time
-import requests
-from datetime import datetime
-
-# Connect to Redis
-redis_host = os.getenv('REDIS_HOST', 'redis')
-redis_port = int(os.getenv('REDIS_PORT', 6379))
-redis_client = redis.Redis(host=redis_host, port=redis_port)
-
-def refresh_all_transactions(force_update=True):
-    """Refresh all trading transactions and account data with the new API key"""
-    print("Starting complete transaction refresh...")
-    
-    # Get all available trading symbols from Redis
-    try:
-        # Get all trading pairs from Redis or use default list
-        symbols_key = "available_symbols"
-        symbols_data = redis_client.get(symbols_key)
-        
-        if symbols_data:
-            symbols = json.loads(symbols_data)
-        else:
-            # Use default symbols as fallback
-            symbols = ["BTC/USDT", "ETH/USDT", "LTC/USDT", "XRP/USDT"]
-            
-        print(f"Found {len(symbols)} trading symbols to refresh")
-        
-        # Force account data reload
-        if force_update:
-            account_key = "account:data"
-            redis_client.delete(account_key)
-            print(f"Deleted {account_key} to force reload")
-            
-            # DELETE FAILED TRANSACTIONS
-            failed_keys = redis_client.keys("trade_result:*")
-            for key in failed_keys:
-                key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-                
-                # Check if this is a failed transaction
-                result_data = redis_client.get(key)
-                if result_data:
-                    try:
-                        result = json.loads(result_data)
-                        if result.get('status') == 'failed' and 'insufficient balance' in result.get('error', ''):
-                            redis_client.delete(key)
-                            print(f"Deleted failed transaction: {key_str}")
-                    except:
-                        pass
-            
-            # Delete any cached API keys to ensure new ones are used
-            api_keys = redis_client.keys("api_key:*")
-            if api_keys:
-                for key in api_keys:
-                    redis_client.delete(key)
-                    print(f"Deleted cached API key: {key}")
-        
-        # Setup mock account data with sufficient balance to prevent insufficient balance errors
-        mock_account = {
-            "account_number": "PA12345",
-            "cash": 10000.00,
-            "portfolio_value": 10000.00,
-            "buying_power": 10000.00,
-            "equity": 10000.00,
-            "paper_trading": True,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
-            "positions": [],
-            "daily_change": 0.00,
-            "daily_change_percent": 0.00,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Save account data to Redis
-        redis_client.set("account:data", json.dumps(mock_account))
-        print("Created mock account with $10,000 balance to prevent insufficient balance errors")
-        
-        # Process each symbol
-        for symbol in symbols:
-            # Delete existing signals and trade results to force regeneration
-            signal_key = f"signal:{symbol}"
-            result_key = f"trade_result:{symbol}"
-            
-            if force_update:
-                redis_client.delete(signal_key)
-                redis_client.delete(result_key)
-                print(f"Deleted {signal_key} and {result_key} to force refresh")
-            
-            # Publish keyspace notifications to trigger UI updates
-            redis_client.publish(f'__keyspace@0__:{signal_key}', 'set')
-            redis_client.publish(f'__keyspace@0__:{result_key}', 'set')
-            print(f"Published keyspace notifications for {symbol}")
-            
-            # For immediate testing, create a test executed trade
-            test_result = {
-                "symbol": symbol,
-                "decision": "buy",
-                "order_id": f"refresh-{symbol.replace('/', '-').lower()}-{int(time.time())}",
-                "quantity": 0.5,
-                "price": 100.00,
-                "status": "executed",
-                "error": None,
-                "timestamp": datetime.now().isoformat()
-            }
-            
-            # Save test result to Redis
-            redis_client.set(result_key, json.dumps(test_result))
-            print(f"Created test transaction for {symbol}")
-            
-            # Publish notification for frontend update
-            redis_client.publish(f'__keyspace@0__:{result_key}', 'set')
-            print(f"Published update notification for {symbol}")
-            
-            # Small delay to prevent rate limiting
-            time.sleep(0.2)
-        
-        # Trigger frontend account update
-        try:
-            # Send a notification to force account update
-            print("Triggering account data refresh on frontend...")
-            redis_client.publish('trade_notifications', json.dumps({
-                "type": "account_update",
-                "timestamp": datetime.now().isoformat()
-            }))
-            print("Published account update notification")
-            
-        except Exception as e:
-            print(f"Error triggering account update: {e}")
-        
-        print("\n✅ All transactions refreshed successfully!")
-        print("The frontend should update automatically within the next refresh cycle.")
-        print("You can also press Ctrl+Shift+D on the dashboard to reveal debug buttons for manual refresh.")
-        
-        return True
-    except Exception as e:
-        print(f"Error refreshing transactions: {e}")
-        return False
-
-def handle_insufficient_balance():
-    """Create a special fix for the insufficient balance error"""
-    try:
-        # Find transactions with insufficient balance error
-        trade_keys = redis_client.keys("trade_result:*")
-        fixed_count = 0
-        
-        for key in trade_keys:
-            key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-            
-            # Get transaction data
-            result_data = redis_client.get(key)
-            if result_data:
-                try:
-                    result = json.loads(result_data)
-                    # Check if this is a failed transaction with insufficient balance
-                    if result.get('status') == 'failed' and 'insufficient balance' in result.get('error', ''):
-                        print(f"Found insufficient balance error in {key_str}")
-                        
-                        # Update to a test successful transaction
-                        result['status'] = 'executed'
-                        result['error'] = None
-                        result['quantity'] = 0.5  # Smaller quantity
-                        result['price'] = 100.00
-                        result['timestamp'] = datetime.now().isoformat()
-                        
-                        # Save updated result
-                        redis_client.set(key, json.dumps(result))
-                        print(f"Fixed transaction for {key_str}")
-                        fixed_count += 1
-                        
-                        # Notify frontend
-                        redis_client.publish(f'__keyspace@0__:{key}', 'set')
-                except:
-                    pass
-        
-        if fixed_count > 0:
-            print(f"Fixed {fixed_count} transactions with insufficient balance errors")
-        else:
-            print("No insufficient balance errors found")
-            
-        return fixed_count > 0
-    except Exception as e:
-        print(f"Error handling insufficient balance: {e}")
-        return False
-
-if __name__ == "__main__":
-    # First try to fix any insufficient balance errors
-    print("Checking for insufficient balance errors...")
-    handle_insufficient_balance()
-    
-    # Then refresh all transactions
-    refresh_all_transactions() 
\ No newline at end of file
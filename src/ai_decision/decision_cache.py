@@ -0,0 +1,211 @@
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from src.config import config
+from src.utils import get_logger
+from src.utils.redis_client import redis_client
+
+logger = get_logger("decision_cache")
+
+# Longest a process waits for another process generating the same prompt
+LOCK_TIMEOUT = 60.0
+LOCK_POLL_INTERVAL = 0.1
+
+
+def bucket_rsi(value: float, resolution: float) -> float:
+    """Round an RSI value to the nearest multiple of resolution (0 keeps it as is)"""
+    if resolution <= 0:
+        return value
+    return round(round(value / resolution) * resolution, 6)
+
+
+class DecisionCache:
+    """
+    Caches LLM trading decisions in Redis, keyed by a hash of the model,
+    system prompt and user prompt, so every process shares the answers
+
+    Entries expire after ttl seconds; the max_entries least recently used
+    entries are kept, tracked in a sorted set by last access time. Identical
+    prompts requested at the same time share one generation: within a process
+    through a shared future, across processes through a Redis lock whose
+    waiters pick up the answer from the cache.
+
+    Counters in {prefix}:stats: hits, misses, coalesced (requests served by
+    another in-flight generation) and saved_seconds (generation time avoided).
+    """
+
+    def __init__(self, ttl: int = 300, max_entries: int = 1000, prefix: str = "ai_decision:cache"):
+        """
+        Args:
+            ttl: Seconds an entry stays valid (0 disables the cache)
+            max_entries: Entries kept before the least recently used are evicted
+            prefix: Redis key prefix
+        """
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.prefix = prefix
+        self.lru_key = f"{prefix}:lru"
+        self.stats_key = f"{prefix}:stats"
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def key(self, model: str, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Cache key for a normalized prompt"""
+        digest = hashlib.sha1(json.dumps([model, system_prompt or "", prompt]).encode()).hexdigest()
+        return f"{self.prefix}:{digest}"
+
+    def _record(self, field: str, amount: float = 1):
+        try:
+            if isinstance(amount, float):
+                redis_client.client.hincrbyfloat(self.stats_key, field, amount)
+            else:
+                redis_client.client.hincrby(self.stats_key, field, amount)
+        except Exception as e:
+            logger.debug(f"Could not update decision cache stats: {e}")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an entry and mark it as recently used"""
+        try:
+            entry = redis_client.get_json(key)
+            if entry is not None:
+                redis_client.client.zadd(self.lru_key, {key: time.time()})
+            return entry
+        except Exception as e:
+            logger.error(f"Error reading decision cache: {e}")
+            return None
+
+    def put(self, key: str, decision: str, latency: float):
+        """Store an entry and evict the least recently used beyond max_entries"""
+        if not self.enabled:
+            # A zero TTL would store the entry without expiry and drop it from the LRU set at once
+            return
+        now = time.time()
+        try:
+            with redis_client.pipeline() as pipe:
+                pipe.set_json(key, {"decision": decision, "latency": latency, "created": now}, ttl=self.ttl)
+                pipe.zadd(self.lru_key, {key: now})
+                # Entries not used within the TTL have expired already
+                pipe.zremrangebyscore(self.lru_key, "-inf", now - self.ttl)
+                pipe.zcard(self.lru_key)
+            excess = pipe.results[-1] - self.max_entries
+            if excess > 0:
+                evicted = [member for member, _ in redis_client.client.zpopmin(self.lru_key, excess)]
+                if evicted:
+                    redis_client.client.delete(*evicted)
+        except Exception as e:
+            logger.error(f"Error writing decision cache: {e}")
+
+    def _hit(self, entry: Dict[str, Any]) -> str:
+        self._record("hits", 1)
+        self._record("saved_seconds", float(entry.get("latency", 0.0)))
+        return entry["decision"]
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Cached decision for key, counted as a hit; None on a miss"""
+        if not self.enabled:
+            return None
+        entry = self.get(key)
+        return self._hit(entry) if entry is not None else None
+
+    async def _wait_for_other_process(self, key: str, lock_key: str) -> Optional[Dict[str, Any]]:
+        """Wait while another process holds the lock; return its entry if it stored one"""
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            entry = self.get(key)
+            if entry is not None or not redis_client.client.exists(lock_key):
+                return entry
+        return None
+
+    async def _generate(self, key: str, generate: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            locked = redis_client.client.set(lock_key, token, nx=True, px=int(LOCK_TIMEOUT * 1000))
+        except Exception as e:
+            logger.debug(f"Could not lock decision cache entry: {e}")
+            locked = True
+
+        if not locked:
+            entry = await self._wait_for_other_process(key, lock_key)
+            if entry is not None:
+                self._record("coalesced", 1)
+                self._record("saved_seconds", float(entry.get("latency", 0.0)))
+                return entry["decision"]
+
+        self._record("misses", 1)
+        started = time.perf_counter()
+        try:
+            decision = await generate()
+            # Only real decisions are cached, not errors or "model not ready" replies
+            if decision is not None:
+                self.put(key, decision, time.perf_counter() - started)
+            return decision
+        finally:
+            try:
+                if redis_client.client.get(lock_key) == token:
+                    redis_client.client.delete(lock_key)
+            except Exception:
+                pass
+
+    async def get_or_generate(self, key: str, generate: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """
+        Return the cached decision for key, or generate it once
+
+        Args:
+            key: Cache key from key()
+            generate: Coroutine function returning a decision, or None if none could be made
+
+        Returns:
+            The decision string or None
+        """
+        if not self.enabled:
+            return await generate()
+
+        decision = self.lookup(key)
+        if decision is not None:
+            return decision
+
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            self._record("coalesced", 1)
+            return await asyncio.shield(pending)
+
+        task = loop.create_task(self._generate(key, generate))
+        self._inflight[key] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters with the hit rate and generation time saved"""
+        raw = redis_client.client.hgetall(self.stats_key) or {}
+        hits = int(raw.get("hits", 0))
+        coalesced = int(raw.get("coalesced", 0))
+        misses = int(raw.get("misses", 0))
+        requests = hits + coalesced + misses
+        return {
+            "hits": hits,
+            "coalesced": coalesced,
+            "misses": misses,
+            "hit_rate": (hits + coalesced) / requests if requests else 0.0,
+            "saved_seconds": float(raw.get("saved_seconds", 0.0)),
+            "entries": redis_client.client.zcard(self.lru_key),
+        }
+
+
+# Singleton instance
+decision_cache = DecisionCache(
+    ttl=config.ollama.decision_cache_ttl,
+    max_entries=config.ollama.decision_cache_size
+)
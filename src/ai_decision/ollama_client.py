@@ -1,28 +1,125 @@
 import json
 import httpx
 import time
+import asyncio
 import threading
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Pattern
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from src.config import config
 from src.utils import get_logger
 from src.utils.redis_client import redis_client
+from src.utils.metrics import RollingMetrics
 
 logger = get_logger("ollama_client")
 
+# Connection pool for generate requests; connections stay open between calls
+POOL_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=300.0)
+
 class OllamaClient:
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.BaseTransport] = None,
+                 async_transport: Optional[httpx.AsyncBaseTransport] = None, monitor: bool = True):
+        """
+        Args:
+            transport: Optional transport for the status/pull client (used in tests)
+            async_transport: Optional transport for generate requests (used in tests)
+            monitor: Start the background model status monitor
+        """
         self.host = config.ollama.host
         self.model = config.ollama.model
+        self.keep_alive = config.ollama.keep_alive
         self.api_url = f"{self.host}/api/generate"
         self.model_ready = False
         
-        # Set initial status in Redis
-        self._update_model_status("initializing", "Connecting to Ollama server...")
+        # Long-lived clients so requests reuse pooled keep-alive connections
+        self.http = httpx.Client(base_url=self.host, timeout=5.0, transport=transport)
+        self._async_transport = async_transport
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
         
-        # Start a background thread to check connection and model status
-        threading.Thread(target=self._monitor_model_status, daemon=True).start()
+        # Per-call latency, tokens generated and queue wait over a rolling window
+        self.latency_budget = config.ollama.latency_budget
+        self.slo_min_samples = config.ollama.slo_min_samples
+        self.metrics = RollingMetrics("ollama:metrics", window=config.ollama.slo_window, histogram_field="latency")
+        
+        if monitor:
+            # Set initial status in Redis
+            self._update_model_status("initializing", "Connecting to Ollama server...")
+            
+            # Start a background thread to check connection and model status
+            threading.Thread(target=self._monitor_model_status, daemon=True).start()
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Pooled AsyncClient for the running event loop
+        
+        Connections belong to the loop that opened them, so a client is kept
+        per loop; AIDecisionService drives every call through one persistent
+        loop, so in practice a single client is reused.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=POOL_LIMITS,
+                transport=self._async_transport
+            )
+            self._semaphore = asyncio.Semaphore(max(1, config.ollama.max_concurrency))
+            self._async_client_loop = loop
+        return self._async_client
+    
+    def latency_p95(self) -> Optional[float]:
+        """p95 generate latency over the SLO window, or None with too few samples"""
+        samples = self.metrics.samples()
+        if len(samples) < self.slo_min_samples:
+            return None
+        return self.metrics.percentile("latency", 0.95, samples)
+    
+    def available(self) -> bool:
+        """
+        Whether decisions should go to the model: it is loaded and its p95
+        latency is within the budget. Samples age out of the window, so the
+        model is tried again once a slow period has passed.
+        """
+        if not self.model_ready:
+            return False
+        if self.latency_budget <= 0:
+            return True
+        try:
+            p95 = self.latency_p95()
+        except Exception as e:
+            logger.debug(f"Could not read Ollama latency metrics: {e}")
+            return True
+        if p95 is not None and p95 > self.latency_budget:
+            logger.warning(f"Ollama p95 latency {p95:.1f}s exceeds the {self.latency_budget:.1f}s budget")
+            return False
+        return True
+    
+    def warm_up(self) -> bool:
+        """
+        Load the model into memory with a one-token generation so the first
+        real decision does not pay the load time
+        
+        Returns:
+            True if the model answered
+        """
+        self._update_model_status("warming", f"Loading model {self.model} into memory...")
+        started = time.perf_counter()
+        try:
+            response = self.http.post("/api/generate", json={
+                "model": self.model,
+                "prompt": "Reply with one word: hold",
+                "stream": False,
+                "keep_alive": self.keep_alive,
+                "options": {"num_predict": 1}
+            }, timeout=600.0)
+            response.raise_for_status()
+            logger.info(f"Warmed up {self.model} in {time.perf_counter() - started:.1f}s")
+            return True
+        except httpx.HTTPError as e:
+            logger.warning(f"Warm-up of {self.model} failed, first decision will load the model: {e}")
+            return False
     
     def _update_model_status(self, status: str, message: str):
         """Update the Ollama model status in Redis"""
@@ -43,7 +140,7 @@ class OllamaClient:
         while retry_count < max_retries:
             try:
                 # First check if server is available
-                response = httpx.get(f"{self.host}/api/tags", timeout=5.0)
+                response = self.http.get("/api/tags")
                 response.raise_for_status()
                 
                 # Check if our model is available
@@ -59,7 +156,8 @@ class OllamaClient:
                     except:
                         pass  # Ignore errors, might already be pulling
                 else:
-                    # Model is ready
+                    # Model is available; load it before reporting ready
+                    self.warm_up()
                     self._update_model_status("ready", f"Model {self.model} is ready")
                     self.model_ready = True
                     return
@@ -80,7 +178,7 @@ class OllamaClient:
         """Test connection to Ollama server and pull model if needed"""
         try:
             # First check connection
-            response = httpx.get(f"{self.host}/api/tags")
+            response = self.http.get("/api/tags")
             response.raise_for_status()
             available_models = [model["name"] for model in response.json().get("models", [])]
             
@@ -94,6 +192,7 @@ class OllamaClient:
                 self._pull_model()
             else:
                 logger.info(f"Model {self.model} is already available")
+                self.warm_up()
                 self._update_model_status("ready", f"Model {self.model} is ready")
                 self.model_ready = True
                 
@@ -110,12 +209,11 @@ class OllamaClient:
             logger.info(f"Pulling model {self.model}...")
             
             # Use the Ollama API to pull the model
-            pull_url = f"{self.host}/api/pull"
             payload = {"name": self.model}
             
             # Send the request (this will take time for large models)
             timeout = None if background else 600.0  # No timeout for background pull
-            response = httpx.post(pull_url, json=payload, timeout=timeout)
+            response = self.http.post("/api/pull", json=payload, timeout=timeout)
             response.raise_for_status()
             
             logger.info(f"Successfully pulled model {self.model}")
@@ -134,13 +232,21 @@ class OllamaClient:
         retry=retry_if_exception_type((httpx.HTTPError, ConnectionError)),
         reraise=True
     )
-    async def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None, json_format: bool = False,
+                       num_predict: int = 500, stop_pattern: Optional[Pattern] = None) -> str:
         """
         Generate text using Ollama
         
+        The response is streamed; with stop_pattern the stream is closed as
+        soon as the text generated so far matches it, which also stops
+        generation on the server.
+        
         Args:
             prompt: The user prompt
             system_prompt: Optional system instructions
+            json_format: Constrain the output to valid JSON (Ollama format: json)
+            num_predict: Maximum tokens to generate
+            stop_pattern: Regex that ends generation early once it matches the text
             
         Returns:
             Generated text response
@@ -155,32 +261,52 @@ class OllamaClient:
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": True,
+            # Keep the model loaded between polls instead of reloading it each time
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": 0.1,  # Low temperature for more deterministic responses
-                "num_predict": 500   # Limit response length
+                "num_predict": num_predict   # Limit response length
             }
         }
         
         if system_prompt:
             payload["system"] = system_prompt
+        if json_format:
+            payload["format"] = "json"
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.api_url,
-                    json=payload,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                # Extract response text
-                if "response" in result:
-                    return result["response"]
-                else:
-                    logger.error(f"Unexpected response format from Ollama: {result}")
-                    return ""
+            client = self._get_async_client()
+            queued = time.perf_counter()
+            async with self._semaphore:
+                started = time.perf_counter()
+                parts = []
+                tokens = None
+                async with client.stream("POST", self.api_url, json=payload) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.strip():
+                            continue
+                        chunk = json.loads(line)
+                        if "error" in chunk:
+                            logger.error(f"Ollama error: {chunk['error']}")
+                            break
+                        parts.append(chunk.get("response", ""))
+                        if chunk.get("done"):
+                            tokens = chunk.get("eval_count")
+                            break
+                        if stop_pattern is not None and stop_pattern.search("".join(parts)):
+                            logger.debug(f"Stopping generation early after {len(parts)} chunks")
+                            break
+                finished = time.perf_counter()
+            
+            # Each streamed chunk carries one token when the final count is not available
+            self.metrics.observe(
+                latency=finished - started,
+                tokens=tokens if tokens is not None else len(parts),
+                queue_wait=started - queued
+            )
+            return "".join(parts)
                 
         except httpx.HTTPError as e:
             logger.error(f"Error calling Ollama API: {e}")
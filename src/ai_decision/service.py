@@ -1,13 +1,16 @@
 import asyncio
+import json
 import re
 import time
 import threading
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 from datetime import datetime
 
-from src.utils import get_logger, RSIData, TradeSignal, TradingDecision
+from src.utils import get_logger, RSIData, TradeSignal, TradingDecision, signal_stream
 from src.utils.redis_client import redis_client
 from src.ai_decision.ollama_client import ollama_client
+from src.ai_decision.decision_cache import decision_cache, bucket_rsi
+from src.strategies.rsi_strategy import RSIStrategy
 from src.config.settings import config
 
 logger = get_logger("ai_decision_service")
@@ -27,10 +30,122 @@ Guidelines for RSI trading:
 - Consider recent trends when making decisions
 """
 
+# System prompt for batched decisions over several symbols
+BATCH_SYSTEM_PROMPT = """
+You are a world expert at stock and cryptocurrency trading.
+Your task is to analyze RSI (Relative Strength Index) data for several symbols and make a trading decision for each.
+Respond ONLY with a JSON object of the form {"decisions": {"<symbol>": "<decision>"}}
+containing every symbol you were given, where each decision is "buy", "sell", or "hold".
+DO NOT include any explanations, analysis, or additional text.
+
+Guidelines for RSI trading:
+- RSI below 30 typically indicates oversold conditions (potential buy)
+- RSI above 70 typically indicates overbought conditions (potential sell)
+- RSI between 30-70 is generally neutral (potential hold)
+"""
+
+# Map the decision string to TradingDecision enum
+DECISION_MAP = {
+    "buy": TradingDecision.BUY,
+    "sell": TradingDecision.SELL,
+    "hold": TradingDecision.HOLD
+}
+
+# A decision word followed by more text: enough to stop streaming the reply
+DECISION_PATTERN = re.compile(r'\b(buy|sell|hold)\b(?=\W)', re.IGNORECASE)
+
+# Tokens allowed per symbol in a batched JSON reply, on top of a fixed allowance
+BATCH_TOKENS_PER_SYMBOL = 16
+
+def parse_batch_decisions(response: str, symbols: List[str]) -> Dict[str, str]:
+    """
+    Parse a batched JSON reply into decisions for the requested symbols
+    
+    Accepts {"decisions": {...}}, a flat {"SYMBOL": "buy"} object, or a list of
+    {"symbol": ..., "decision": ...} objects. Unknown symbols and decisions
+    other than buy/sell/hold are dropped.
+    
+    Args:
+        response: Raw LLM response
+        symbols: Symbols that were asked about
+        
+    Returns:
+        symbol -> "buy" | "sell" | "hold" for the symbols with a valid decision
+    """
+    try:
+        data = json.loads(response)
+    except (TypeError, ValueError):
+        logger.warning(f"Batched LLM response is not valid JSON: {response[:200] if response else response}")
+        return {}
+    
+    if isinstance(data, dict) and "decisions" in data:
+        data = data["decisions"]
+    if isinstance(data, list):
+        data = {str(item.get("symbol")): item.get("decision") for item in data if isinstance(item, dict)}
+    if not isinstance(data, dict):
+        return {}
+    
+    by_upper = {symbol.upper(): symbol for symbol in symbols}
+    decisions = {}
+    for symbol, decision in data.items():
+        requested = by_upper.get(str(symbol).strip().upper())
+        decision = str(decision).strip().lower()
+        if requested and decision in DECISION_MAP:
+            decisions[requested] = decision
+    return decisions
+
 class AIDecisionService:
     def __init__(self):
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
+        # Deterministic thresholds used while the model is not loaded or too slow
+        self.fallback_strategy = RSIStrategy()
+    
+    def _trading_enabled(self) -> bool:
+        # Check Redis first for latest trading_enabled status, default to False for safety
+        trading_enabled_data = redis_client.get("trading_enabled")
+        return trading_enabled_data == "true" if trading_enabled_data is not None else False
+    
+    def _prompt(self, rsi_data: RSIData) -> str:
+        # RSI is bucketed so consecutive polls with nearly identical values share a cached decision
+        rsi_value = bucket_rsi(rsi_data.value, config.ollama.rsi_resolution)
+        return f"The current Relative Strength Index (RSI) for {rsi_data.symbol} is {rsi_value:.2f}. Based on this information alone, should I buy, sell, or hold?"
+    
+    def _cache_key(self, rsi_data: RSIData) -> str:
+        return decision_cache.key(ollama_client.model, self._prompt(rsi_data), SYSTEM_PROMPT)
+    
+    def _make_signal(self, rsi_data: RSIData, decision_str: str) -> TradeSignal:
+        return TradeSignal(
+            symbol=rsi_data.symbol,
+            decision=DECISION_MAP.get(decision_str, TradingDecision.HOLD),
+            rsi_value=rsi_data.value
+        )
+    
+    def _fallback_signal(self, rsi_data: RSIData) -> TradeSignal:
+        """Signal from the RSIStrategy thresholds, marked with its source"""
+        signal = self.fallback_strategy.process_data({"symbol": rsi_data.symbol, "rsi": rsi_data})
+        if signal is None:
+            signal = TradeSignal(symbol=rsi_data.symbol, decision=TradingDecision.HOLD, rsi_value=rsi_data.value)
+        signal.metadata = {"source": "rsi_fallback"}
+        return signal
+    
+    async def _decide(self, rsi_data: RSIData) -> Optional[str]:
+        """Decision for one symbol, from the cache or a single-symbol LLM request"""
+        prompt = self._prompt(rsi_data)
+        
+        async def ask_llm() -> Optional[str]:
+            # Stop generating as soon as the decision word has been produced
+            response = await ollama_client.generate(prompt, SYSTEM_PROMPT, stop_pattern=DECISION_PATTERN)
+            logger.info(f"LLM response for {rsi_data.symbol}: {response}")
+            
+            # Extract the decision using regex to find 'buy', 'sell', or 'hold'
+            match = re.search(r'\b(buy|sell|hold)\b', response.lower())
+            if not match:
+                logger.error(f"Could not extract a clear decision from LLM response: {response}")
+                return None
+            return match.group(1)
+        
+        return await decision_cache.get_or_generate(self._cache_key(rsi_data), ask_llm)
         
     async def analyze_rsi(self, rsi_data: RSIData) -> Optional[TradeSignal]:
         """
@@ -42,55 +157,126 @@ class AIDecisionService:
         Returns:
             TradeSignal object with the decision
         """
-        # Check Redis first for latest trading_enabled status, default to False for safety
-        trading_enabled_data = redis_client.get("trading_enabled")
-        trading_enabled = trading_enabled_data == "true" if trading_enabled_data is not None else False
-        
-        if not trading_enabled:
+        if not self._trading_enabled():
             logger.info(f"Trading is disabled. Skipping signal generation for {rsi_data.symbol}")
             return None
-            
-        prompt = f"The current Relative Strength Index (RSI) for {rsi_data.symbol} is {rsi_data.value:.2f}. Based on this information alone, should I buy, sell, or hold?"
         
         try:
-            response = await ollama_client.generate(prompt, SYSTEM_PROMPT)
-            logger.info(f"LLM response for {rsi_data.symbol}: {response}")
+            if not ollama_client.available():
+                # Never block decisions on a model that is loading or over its latency budget
+                signal = self._fallback_signal(rsi_data)
+                logger.info(f"Model unavailable, using RSI thresholds for {rsi_data.symbol}")
+            else:
+                decision_str = await self._decide(rsi_data)
+                signal = self._make_signal(rsi_data, decision_str) if decision_str else None
             
-            # Extract the decision using regex to find 'buy', 'sell', or 'hold'
-            match = re.search(r'\b(buy|sell|hold)\b', response.lower())
-            if match:
-                decision_str = match.group(1)
-                
-                # Map the decision string to TradingDecision enum
-                decision_map = {
-                    "buy": TradingDecision.BUY,
-                    "sell": TradingDecision.SELL,
-                    "hold": TradingDecision.HOLD
-                }
-                
-                decision = decision_map.get(decision_str, TradingDecision.HOLD)
+            if signal:
+                # Store the signal and add it to the signal stream for execution
+                signal_stream.publish(signal, ttl=None)
                 
-                # Create the trade signal
-                signal = TradeSignal(
-                    symbol=rsi_data.symbol,
-                    decision=decision,
-                    rsi_value=rsi_data.value
-                )
-                
-                # Store the signal in Redis
-                redis_key = f"signal:{rsi_data.symbol}"
-                redis_client.set_json(redis_key, signal.dict())
-                
-                logger.info(f"Generated trade signal for {rsi_data.symbol}: {decision.value}")
+                logger.info(f"Generated trade signal for {rsi_data.symbol}: {signal.decision.value}")
                 return signal
-            else:
-                logger.error(f"Could not extract a clear decision from LLM response: {response}")
-                return None
+            return None
                 
         except Exception as e:
             logger.error(f"Error analyzing RSI data: {e}")
             return None
     
+    async def _ask_batch(self, batch: List[RSIData]) -> Dict[str, str]:
+        """One JSON-mode LLM request for several symbols; returns the valid decisions"""
+        lines = "\n".join(
+            f"- {rsi_data.symbol}: {bucket_rsi(rsi_data.value, config.ollama.rsi_resolution):.2f}" for rsi_data in batch
+        )
+        prompt = (
+            f"Current Relative Strength Index (RSI) values:\n{lines}\n"
+            "Based on this information alone, should I buy, sell, or hold each symbol?"
+        )
+        symbols = [rsi_data.symbol for rsi_data in batch]
+        
+        started = time.perf_counter()
+        response = await ollama_client.generate(
+            prompt, BATCH_SYSTEM_PROMPT, json_format=True,
+            num_predict=64 + BATCH_TOKENS_PER_SYMBOL * len(batch)
+        )
+        decisions = parse_batch_decisions(response, symbols)
+        elapsed = time.perf_counter() - started
+        logger.info(f"Batched LLM decisions for {len(decisions)}/{len(batch)} symbols in {elapsed:.2f}s")
+        
+        # Cache under each symbol's single prompt so later single-symbol calls reuse them
+        for rsi_data in batch:
+            if rsi_data.symbol in decisions:
+                decision_cache.put(self._cache_key(rsi_data), decisions[rsi_data.symbol], elapsed / len(batch))
+        return decisions
+    
+    async def analyze_batch(self, rsi_list: List[RSIData]) -> Dict[str, TradeSignal]:
+        """
+        Analyze several symbols' RSI data with as few LLM requests as possible
+        
+        Cached decisions are used first; the remaining symbols are sent in
+        batches of config.ollama.batch_size in one JSON-mode request each.
+        Symbols missing or invalid in a batched reply fall back to a
+        single-symbol request.
+        
+        Args:
+            rsi_list: RSI data for each symbol
+            
+        Returns:
+            Dictionary of symbol -> TradeSignal for the symbols that got a decision
+        """
+        if not self._trading_enabled():
+            logger.info(f"Trading is disabled. Skipping signal generation for {len(rsi_list)} symbols")
+            return {}
+        
+        if not ollama_client.available():
+            # Never block decisions on a model that is loading or over its latency budget
+            logger.info(f"Model unavailable, using RSI thresholds for {len(rsi_list)} symbols")
+            return self._publish({rsi_data.symbol: self._fallback_signal(rsi_data) for rsi_data in rsi_list})
+        
+        decisions: Dict[str, str] = {}
+        pending: List[RSIData] = []
+        for rsi_data in rsi_list:
+            decision_str = decision_cache.lookup(self._cache_key(rsi_data))
+            if decision_str is not None:
+                decisions[rsi_data.symbol] = decision_str
+            else:
+                pending.append(rsi_data)
+        
+        batch_size = max(1, config.ollama.batch_size)
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            if len(batch) < 2:
+                # A single symbol is cheaper with the plain prompt below
+                continue
+            try:
+                decisions.update(await self._ask_batch(batch))
+            except Exception as e:
+                logger.error(f"Error requesting batched decisions: {e}")
+        
+        # Per-symbol fallback for anything the batch did not answer
+        for rsi_data in pending:
+            if rsi_data.symbol not in decisions:
+                try:
+                    decision_str = await self._decide(rsi_data)
+                    if decision_str:
+                        decisions[rsi_data.symbol] = decision_str
+                except Exception as e:
+                    logger.error(f"Error analyzing RSI data for {rsi_data.symbol}: {e}")
+        
+        return self._publish({rsi_data.symbol: self._make_signal(rsi_data, decisions[rsi_data.symbol])
+                              for rsi_data in rsi_list if rsi_data.symbol in decisions})
+    
+    def _publish(self, signals: Dict[str, TradeSignal]) -> Dict[str, TradeSignal]:
+        """Store the signals and add them to the signal stream in one round trip"""
+        if signals:
+            try:
+                with redis_client.pipeline() as pipe:
+                    for signal in signals.values():
+                        signal_stream.queue(pipe, signal, ttl=None)
+                logger.info(f"Generated trade signals: {', '.join(f'{s}={sig.decision.value}' for s, sig in signals.items())}")
+            except Exception as e:
+                logger.error(f"Error publishing trade signals: {e}")
+        return signals
+    
     def get_decision(self, rsi_data: RSIData) -> Optional[TradeSignal]:
         """
         Get a trading decision based on RSI data
@@ -107,6 +293,25 @@ class AIDecisionService:
             logger.error(f"Error in get_decision: {e}")
             return None
     
+    def get_decisions(self, rsi_list: List[RSIData]) -> Dict[str, TradeSignal]:
+        """
+        Get trading decisions for several symbols, batched when enabled
+        
+        Args:
+            rsi_list: RSI data for each symbol
+            
+        Returns:
+            Dictionary of symbol -> TradeSignal
+        """
+        if not config.ollama.batch_decisions:
+            signals = {rsi_data.symbol: self.get_decision(rsi_data) for rsi_data in rsi_list}
+            return {symbol: signal for symbol, signal in signals.items() if signal}
+        try:
+            return self.loop.run_until_complete(self.analyze_batch(rsi_list))
+        except Exception as e:
+            logger.error(f"Error in get_decisions: {e}")
+            return {}
+    
 
     def get_latest_signal(self, symbol: str) -> Optional[TradeSignal]:
         """
@@ -7,16 +7,27 @@ import json
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date as Date
 from typing import Dict, List, Any, Optional, Tuple, Union, Callable
 
 from src.config import config
 from src.utils import get_logger
+from src import indicators
 from src.data_retrieval.polygon_client import PolygonClient
-from src.strategies.base_strategy import BaseStrategy
+from src.strategies.base_strategy import BaseStrategy, SIGNAL_BUY, SIGNAL_SELL
 
 logger = get_logger("backtest_engine")
 
+# Polygon.io aggregate field names -> column names used by the engine
+POLYGON_COLUMNS = {
+    't': 'timestamp',
+    'o': 'open',
+    'h': 'high',
+    'l': 'low',
+    'c': 'close',
+    'v': 'volume',
+}
+
 class BacktestEngine:
     """
     Backtesting engine for testing trading strategies on historical data
@@ -48,8 +59,12 @@ class BacktestEngine:
         self.trade_id = 0                              # Unique trade ID counter
         
         self.equity_curve: List[Dict[str, Any]] = []   # Track equity over time
+        self.equity_frame: Optional[pd.DataFrame] = None  # Equity curve of a vectorized run
         self.results: Dict[str, Any] = {}              # Backtest results
         
+        # symbol -> {date: (start_row, stop_row)}, built once per symbol at load time
+        self.date_index: Dict[str, Dict[Date, Tuple[int, int]]] = {}
+        
         # Initialize Polygon client
         self.polygon = PolygonClient()
         
@@ -59,7 +74,9 @@ class BacktestEngine:
                     start_date: Union[str, datetime],
                     end_date: Union[str, datetime],
                     timeframe: str = "1d",
-                    verbose: bool = False) -> Dict[str, Any]:
+                    verbose: bool = False,
+                    data: Optional[Dict[str, Union[pd.DataFrame, List[Dict[str, Any]]]]] = None,
+                    vectorized: bool = False) -> Dict[str, Any]:
         """
         Run a backtest for a given strategy and time period
         
@@ -70,6 +87,11 @@ class BacktestEngine:
             end_date: End date for backtest (YYYY-MM-DD)
             timeframe: Data timeframe (1d, 1h, etc.)
             verbose: Whether to print detailed logs
+            data: Optional pre-loaded bars per symbol (DataFrame or list of bar
+                dicts); symbols found here are not fetched from Polygon.io
+            vectorized: Run the whole backtest with array operations on the
+                strategy's generate_signals output instead of calling
+                process_data per symbol and day (see _run_vectorized)
             
         Returns:
             Dictionary with backtest results
@@ -88,28 +110,34 @@ class BacktestEngine:
         # Get historical data for all symbols
         all_data = {}
         for symbol in symbols:
-            logger.info(f"Fetching historical data for {symbol}")
-            symbol_data = self.polygon.get_historical_data_for_backtest(
-                symbol, 
-                start_date.strftime("%Y-%m-%d"), 
-                end_date.strftime("%Y-%m-%d"),
-                timeframe
-            )
+            if data is not None and symbol in data:
+                symbol_data = data[symbol]
+            else:
+                logger.info(f"Fetching historical data for {symbol}")
+                symbol_data = self.polygon.get_historical_data_for_backtest(
+                    symbol, 
+                    start_date.strftime("%Y-%m-%d"), 
+                    end_date.strftime("%Y-%m-%d"),
+                    timeframe
+                )
             
             if symbol_data is None or len(symbol_data) == 0:
                 logger.warning(f"No historical data found for {symbol}, skipping")
                 continue
                 
-            # Convert to DataFrame and sort by date
-            df = pd.DataFrame(symbol_data)
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df = df.sort_values('timestamp')
-            all_data[symbol] = df
+            all_data[symbol] = self._prepare_symbol_data(symbol_data)
+            self.date_index[symbol] = self._build_date_index(all_data[symbol])
         
         if not all_data:
             logger.error("No historical data found for any symbols")
             return {"error": "No historical data found"}
         
+        if vectorized:
+            self.results = self._run_vectorized(strategy, all_data)
+            if verbose and "error" not in self.results:
+                self._print_results()
+            return self.results
+        
         # Find the common date range across all symbols
         common_dates = self._find_common_dates(all_data)
         if not common_dates:
@@ -129,9 +157,9 @@ class BacktestEngine:
             # Process each symbol for the current date
             for symbol in all_data.keys():
                 # Get the day's data
-                day_data = all_data[symbol][all_data[symbol]['timestamp'].dt.date == date.date()]
+                day_data = self._get_day_data(symbol, all_data, date)
                 
-                if day_data.empty:
+                if day_data is None:
                     continue
                     
                 # Prepare data in the format the strategy expects
@@ -165,7 +193,7 @@ class BacktestEngine:
         Args:
             output_dir: Directory to save plots
         """
-        if not self.equity_curve:
+        if not self.equity_curve and self.equity_frame is None:
             logger.error("No backtest data to plot")
             return
             
@@ -173,9 +201,12 @@ class BacktestEngine:
         os.makedirs(output_dir, exist_ok=True)
         
         # Convert equity curve to DataFrame
-        equity_df = pd.DataFrame(self.equity_curve)
-        equity_df['date'] = pd.to_datetime(equity_df['date'])
-        equity_df = equity_df.set_index('date')
+        if self.equity_frame is not None:
+            equity_df = self.equity_frame
+        else:
+            equity_df = pd.DataFrame(self.equity_curve)
+            equity_df['date'] = pd.to_datetime(equity_df['date'])
+            equity_df = equity_df.set_index('date')
         
         # Basic equity curve
         plt.figure(figsize=(10, 6))
@@ -248,14 +279,51 @@ class BacktestEngine:
         self.trades = []
         self.trade_id = 0
         self.equity_curve = []
+        self.equity_frame = None
         self.results = {}
+        self.date_index = {}
+    
+    def _prepare_symbol_data(self, symbol_data: Union[pd.DataFrame, List[Dict[str, Any]]]) -> pd.DataFrame:
+        """
+        Normalize one symbol's bars into a timestamp-sorted DataFrame
+        
+        Accepts Polygon.io aggregate fields (t, o, h, l, c, v) or the long
+        column names; the result always uses timestamp/open/high/low/close/volume
+        with a fresh RangeIndex so row positions match the date index.
+        """
+        df = symbol_data.copy() if isinstance(symbol_data, pd.DataFrame) else pd.DataFrame(symbol_data)
+        df = df.rename(columns={k: v for k, v in POLYGON_COLUMNS.items() if k in df.columns and v not in df.columns})
+        if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+    
+    def _build_date_index(self, df: pd.DataFrame) -> Dict[Date, Tuple[int, int]]:
+        """
+        Map each calendar date to its [start, stop) row range in a sorted frame
+        
+        Rows are sorted by timestamp, so each date's bars are contiguous and
+        one np.unique pass over the day-truncated timestamps finds them all.
+        """
+        days = df['timestamp'].values.astype('datetime64[D]')
+        unique_days, starts = np.unique(days, return_index=True)
+        stops = np.append(starts[1:], len(days))
+        return {
+            day: (int(start), int(stop))
+            for day, start, stop in zip(unique_days.astype(object), starts, stops)
+        }
+    
+    def _get_day_data(self, symbol: str, all_data: Dict[str, pd.DataFrame], date: datetime) -> Optional[pd.DataFrame]:
+        """Return the rows for symbol on date as a positional slice, or None"""
+        bounds = self.date_index.get(symbol, {}).get(date.date())
+        if bounds is None:
+            return None
+        return all_data[symbol].iloc[bounds[0]:bounds[1]]
     
     def _find_common_dates(self, data_dict: Dict[str, pd.DataFrame]) -> List[datetime]:
         """Find dates that exist across all symbols"""
         date_sets = []
-        for symbol, df in data_dict.items():
-            dates = set(df['timestamp'].dt.date.unique())
-            date_sets.append(dates)
+        for symbol in data_dict:
+            date_sets.append(set(self.date_index[symbol]))
         
         # Find the intersection of all date sets
         if date_sets:
@@ -290,21 +358,19 @@ class BacktestEngine:
             
         # Calculate some basic indicators
         if len(day_data) >= 14:
-            # RSI
-            delta = day_data['close'].diff()
-            gain = delta.where(delta > 0, 0).rolling(window=14).mean()
-            loss = -delta.where(delta < 0, 0).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            data["rsi"] = {"value": float(rsi.iloc[-1]), "data": rsi.tolist()}
+            closes = indicators.as_float_array(day_data['close'].values)
+            
+            # RSI (Wilder)
+            rsi = indicators.rsi(closes, 14)
+            data["rsi"] = {"value": float(rsi[-1]), "data": rsi.tolist()}
             
             # Moving averages
-            data["polygon_data"]["sma_20"] = float(day_data['close'].rolling(20).mean().iloc[-1])
-            data["polygon_data"]["sma_50"] = float(day_data['close'].rolling(50).mean().iloc[-1])
-            data["polygon_data"]["sma_200"] = float(day_data['close'].rolling(200).mean().iloc[-1])
+            data["polygon_data"]["sma_20"] = float(indicators.sma(closes, 20)[-1])
+            data["polygon_data"]["sma_50"] = float(indicators.sma(closes, 50)[-1])
+            data["polygon_data"]["sma_200"] = float(indicators.sma(closes, 200)[-1])
             
             # Volatility (20-day)
-            data["polygon_data"]["volatility"] = float(day_data['close'].pct_change().rolling(20).std().iloc[-1])
+            data["polygon_data"]["volatility"] = float(indicators.rolling_volatility(closes, 20)[-1])
         
         return data
     
@@ -412,14 +478,115 @@ class BacktestEngine:
             
             logger.info(f"SELL {position_size:.2f} {symbol} @ ${price:.2f}, P/L: ${pl:.2f} ({trade['pl_pct']:.2%})")
     
+    def _run_vectorized(self, strategy: BaseStrategy, all_data: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+        """
+        Backtest a signal-array strategy with NumPy operations only
+        
+        Every symbol gets an equal share of the initial capital and is either
+        fully invested or flat: a BUY signal opens the position at that bar's
+        close and a SELL signal closes it, with the same slippage and
+        commission as _execute_trade. Bars are aligned on the timestamps
+        common to all symbols.
+        
+        Args:
+            strategy: Strategy implementing generate_signals
+            all_data: Prepared bars per symbol
+            
+        Returns:
+            Dictionary with backtest results (same keys as the event-driven run)
+        """
+        symbols = list(all_data)
+        
+        # Timestamps shared by every symbol
+        timestamps = all_data[symbols[0]]['timestamp'].values
+        for symbol in symbols[1:]:
+            timestamps = np.intersect1d(timestamps, all_data[symbol]['timestamp'].values)
+        if len(timestamps) == 0:
+            logger.error("No common dates found across symbols")
+            return {"error": "No common dates found across symbols"}
+        
+        # Signals are computed on each symbol's full history, then aligned
+        closes = np.empty((len(timestamps), len(symbols)))
+        signals = np.empty((len(timestamps), len(symbols)), dtype=np.int8)
+        for col, symbol in enumerate(symbols):
+            df = all_data[symbol]
+            symbol_signals = strategy.generate_signals(df)
+            if symbol_signals is None:
+                logger.error(f"Strategy {strategy.name} does not support vectorized backtests")
+                return {"error": "Strategy does not support vectorized backtests"}
+            rows = np.searchsorted(df['timestamp'].values, timestamps)
+            closes[:, col] = indicators.as_float_array(df['close'].values)[rows]
+            signals[:, col] = np.asarray(symbol_signals)[rows]
+        
+        # Long/flat position held after each bar's close: BUY sets 1, SELL sets 0,
+        # anything else carries the previous state forward
+        markers = np.where(signals == SIGNAL_BUY, 1.0, np.where(signals == SIGNAL_SELL, 0.0, np.nan))
+        position = pd.DataFrame(markers).ffill().fillna(0.0).values
+        prev_position = np.vstack([np.zeros((1, len(symbols))), position[:-1]])
+        change = position - prev_position
+        entries = change > 0
+        exits = change < 0
+        if not entries.any():
+            return {"error": "No trades executed"}
+        
+        # Per-symbol sleeve value: close-to-close growth while invested, scaled
+        # by the cost of entering (slippage, then commission) or exiting
+        returns = np.zeros_like(closes)
+        returns[1:] = closes[1:] / closes[:-1] - 1
+        growth = 1 + prev_position * returns
+        growth[entries] /= (1 + self.slippage) * (1 + self.commission)
+        growth[exits] *= (1 - self.slippage) * (1 - self.commission)
+        sleeves = (self.initial_capital / len(symbols)) * np.cumprod(growth, axis=0)
+        
+        equity = sleeves.sum(axis=1)
+        daily_returns = np.zeros(len(equity))
+        daily_returns[1:] = equity[1:] / equity[:-1] - 1
+        peak_equity = np.maximum.accumulate(equity)
+        drawdowns = (peak_equity - equity) / peak_equity
+        
+        # Pair each exit with the entry before it; a still-open last entry has no exit
+        entry_col, entry_row = np.nonzero(entries.T)
+        exit_col, exit_row = np.nonzero(exits.T)
+        exits_per_col = np.bincount(exit_col, minlength=len(symbols))
+        rank_in_col = np.arange(len(entry_col)) - np.searchsorted(entry_col, entry_col)
+        closed = rank_in_col < exits_per_col[entry_col]
+        entry_col, entry_row = entry_col[closed], entry_row[closed]
+        
+        # Shares bought with the whole sleeve; P/L excludes commission like _execute_trade
+        entry_price = closes[entry_row, entry_col]
+        exit_price = closes[exit_row, exit_col]
+        size = sleeves[entry_row, entry_col] / entry_price
+        closed_pl = size * (exit_price * (1 - self.slippage) - entry_price * (1 + self.slippage))
+        holding_days = (timestamps[exit_row] - timestamps[entry_row]) / np.timedelta64(1, 'D')
+        
+        dates = pd.to_datetime(timestamps)
+        self.equity_frame = pd.DataFrame({
+            'equity': equity,
+            'peak_equity': peak_equity,
+            'drawdown': drawdowns,
+            'returns': daily_returns,
+        }, index=pd.DatetimeIndex(dates, name='date'))
+        
+        return self._summarize_performance(
+            start_date=dates[0].to_pydatetime(),
+            end_date=dates[-1].to_pydatetime(),
+            end_equity=float(equity[-1]),
+            daily_returns=daily_returns,
+            drawdowns=drawdowns,
+            closed_pl=closed_pl,
+            holding_days=np.floor(holding_days),
+            total_trades=int(entries.sum() + exits.sum()),
+            n_points=len(equity)
+        )
+    
     def _process_open_positions(self, date: datetime, all_data: Dict[str, pd.DataFrame]):
         """Process open positions at the start of each day"""
         for symbol, position in list(self.positions.items()):
             if symbol in all_data:
-                day_data = all_data[symbol][all_data[symbol]['timestamp'].dt.date == date.date()]
-                if not day_data.empty:
-                    # Update current price
-                    position['current_price'] = float(day_data.iloc[-1]['close'])
+                bounds = self.date_index[symbol].get(date.date())
+                if bounds is not None:
+                    # Update current price from the day's last bar
+                    position['current_price'] = float(all_data[symbol]['close'].iat[bounds[1] - 1])
     
     def _update_equity_curve(self, date: datetime, point: str):
         """Update equity curve with current portfolio value"""
@@ -467,42 +634,80 @@ class BacktestEngine:
         if not self.trades or not self.equity_curve:
             return {"error": "No trades executed"}
         
+        sells = [t for t in self.trades if t.get('action') == 'sell']
+        
+        return self._summarize_performance(
+            start_date=self.equity_curve[0]['date'],
+            end_date=self.equity_curve[-1]['date'],
+            end_equity=self.equity_curve[-1]['equity'],
+            daily_returns=np.array([e['returns'] for e in self.equity_curve if e['point'] == 'end_of_day']),
+            drawdowns=np.array([e['drawdown'] for e in self.equity_curve]),
+            closed_pl=np.array([t.get('pl', 0) for t in sells]),
+            holding_days=np.array([
+                (t['date'] - self.trades[t['entry_trade_id']-1]['date']).days for t in sells
+            ]),
+            total_trades=len(self.trades),
+            n_points=len(self.equity_curve)
+        )
+    
+    def _summarize_performance(self,
+                               start_date: datetime,
+                               end_date: datetime,
+                               end_equity: float,
+                               daily_returns: np.ndarray,
+                               drawdowns: np.ndarray,
+                               closed_pl: np.ndarray,
+                               holding_days: np.ndarray,
+                               total_trades: int,
+                               n_points: int) -> Dict[str, Any]:
+        """
+        Performance metrics from equity and trade arrays, shared by the
+        event-driven and vectorized backtests
+        
+        Args:
+            start_date: Date of the first equity point
+            end_date: Date of the last equity point
+            end_equity: Final portfolio value
+            daily_returns: Returns used for the Sharpe ratio
+            drawdowns: Drawdown (fraction of peak) at every equity point
+            closed_pl: P/L of each closed trade
+            holding_days: Holding period in days of each closed trade
+            total_trades: Number of buy and sell fills
+            n_points: Number of equity points
+            
+        Returns:
+            Dictionary with backtest results
+        """
         # Basic metrics
         start_equity = self.initial_capital
-        end_equity = self.equity_curve[-1]['equity']
         total_return = (end_equity / start_equity) - 1
         
-        # Extract trades info
-        winning_trades = [t for t in self.trades if t.get('action') == 'sell' and t.get('pl', 0) > 0]
-        losing_trades = [t for t in self.trades if t.get('action') == 'sell' and t.get('pl', 0) <= 0]
+        # Split closed trades into winners and losers
+        wins = closed_pl[closed_pl > 0]
+        losses = closed_pl[closed_pl <= 0]
         
         # Calculate win rate and average trade metrics
-        total_closed_trades = len(winning_trades) + len(losing_trades)
-        win_rate = len(winning_trades) / total_closed_trades if total_closed_trades > 0 else 0
+        total_closed_trades = len(closed_pl)
+        win_rate = len(wins) / total_closed_trades if total_closed_trades > 0 else 0
         
-        avg_win = np.mean([t['pl'] for t in winning_trades]) if winning_trades else 0
-        avg_loss = np.mean([t['pl'] for t in losing_trades]) if losing_trades else 0
+        avg_win = np.mean(wins) if len(wins) else 0
+        avg_loss = np.mean(losses) if len(losses) else 0
         
         # Profit factor
-        gross_profit = sum(t['pl'] for t in winning_trades)
-        gross_loss = abs(sum(t['pl'] for t in losing_trades))
+        gross_profit = wins.sum()
+        gross_loss = abs(losses.sum())
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
         
         # Maximum drawdown
-        max_drawdown = max([e['drawdown'] for e in self.equity_curve]) if self.equity_curve else 0
+        max_drawdown = drawdowns.max() if len(drawdowns) else 0
         
         # Annualized return and Sharpe ratio
-        if len(self.equity_curve) > 1:
-            start_date = self.equity_curve[0]['date']
-            end_date = self.equity_curve[-1]['date']
+        if n_points > 1:
             days = (end_date - start_date).days
             
             if days > 0:
                 annualized_return = ((1 + total_return) ** (365 / days)) - 1
                 
-                # Daily returns
-                daily_returns = np.array([e['returns'] for e in self.equity_curve if e['point'] == 'end_of_day'])
-                
                 # Sharpe ratio (annualized, assuming risk-free rate of 0)
                 sharpe_ratio = (np.mean(daily_returns) * 252) / (np.std(daily_returns) * np.sqrt(252)) if np.std(daily_returns) > 0 else 0
             else:
@@ -513,13 +718,12 @@ class BacktestEngine:
             sharpe_ratio = 0
         
         # Calculate drawdown statistics
-        drawdowns = [e['drawdown'] for e in self.equity_curve]
-        avg_drawdown = np.mean(drawdowns) if drawdowns else 0
+        avg_drawdown = np.mean(drawdowns) if len(drawdowns) else 0
         
         # Compile results
         results = {
-            'start_date': self.equity_curve[0]['date'] if self.equity_curve else None,
-            'end_date': self.equity_curve[-1]['date'] if self.equity_curve else None,
+            'start_date': start_date,
+            'end_date': end_date,
             'initial_capital': start_equity,
             'final_capital': end_equity,
             'total_return': total_return,
@@ -531,19 +735,16 @@ class BacktestEngine:
             'avg_drawdown': avg_drawdown,
             'avg_drawdown_pct': avg_drawdown * 100,
             'sharpe_ratio': sharpe_ratio,
-            'total_trades': len(self.trades),
+            'total_trades': total_trades,
             'total_closed_trades': total_closed_trades,
-            'winning_trades': len(winning_trades),
-            'losing_trades': len(losing_trades),
+            'winning_trades': len(wins),
+            'losing_trades': len(losses),
             'win_rate': win_rate,
             'win_rate_pct': win_rate * 100,
             'avg_win': avg_win,
             'avg_loss': avg_loss,
             'profit_factor': profit_factor,
-            'avg_holding_period_days': np.mean([
-                (t['date'] - self.trades[t['entry_trade_id']-1]['date']).days 
-                for t in self.trades if t.get('action') == 'sell'
-            ]) if any(t.get('action') == 'sell' for t in self.trades) else 0,
+            'avg_holding_period_days': np.mean(holding_days) if len(holding_days) else 0,
         }
         
         return results
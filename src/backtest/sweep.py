@@ -0,0 +1,263 @@
+"""
+Parallel parameter sweeps for the backtesting engine
+
+Historical bars are loaded once in the parent process and copied into a
+single shared memory block. Worker processes attach to that block by name
+and rebuild their DataFrames from it, so each task only pickles a small
+parameter dictionary and its metrics.
+"""
+
+import os
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.utils import get_logger
+from src.backtest.backtest_engine import BacktestEngine
+from src.strategies.base_strategy import BaseStrategy
+from src.strategies.polygon_strategy import PolygonStrategy
+from src.strategies.rsi_strategy import RSIStrategy
+
+logger = get_logger("backtest_sweep")
+
+# Strategies that can be swept; parameters are set as attributes on a fresh instance
+SWEEP_STRATEGIES = {
+    "rsi": RSIStrategy,
+    "polygon": PolygonStrategy,
+}
+
+# Metrics kept for each run, in table order
+SWEEP_METRICS = ["sharpe_ratio", "max_drawdown_pct", "win_rate_pct", "total_return_pct", "total_trades"]
+
+class SharedBars:
+    """
+    Prepared OHLCV frames for several symbols stored in one shared memory block
+
+    Rows are float64 [timestamp (ms), open, high, low, close, volume]; the
+    layout maps each symbol to its (first_row, row_count) in the block.
+    """
+
+    COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+
+    def __init__(self, shm: shared_memory.SharedMemory, layout: Dict[str, Tuple[int, int]], owner: bool):
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        total_rows = sum(rows for _, rows in layout.values())
+        self.array = np.ndarray((total_rows, len(self.COLUMNS)), dtype=np.float64, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, frames: Dict[str, pd.DataFrame]) -> "SharedBars":
+        """Copy prepared frames (see BacktestEngine._prepare_symbol_data) into a new block"""
+        layout = {}
+        offset = 0
+        for symbol, df in frames.items():
+            layout[symbol] = (offset, len(df))
+            offset += len(df)
+
+        size = max(1, offset * len(cls.COLUMNS) * 8)
+        shared = cls(shared_memory.SharedMemory(create=True, size=size), layout, owner=True)
+        for symbol, df in frames.items():
+            start, rows = layout[symbol]
+            block = shared.array[start:start + rows]
+            block[:, 0] = df["timestamp"].values.astype("datetime64[ms]").astype(np.int64)
+            for col, name in enumerate(cls.COLUMNS[1:], start=1):
+                block[:, col] = df[name].values if name in df else 0.0
+        return shared
+
+    @classmethod
+    def attach(cls, name: str, layout: Dict[str, Tuple[int, int]]) -> "SharedBars":
+        """Open an existing block from another process"""
+        # Pool workers share the parent's resource tracker, so the block is
+        # still removed exactly once, by the owner's close()
+        return cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+
+    @property
+    def handle(self) -> Tuple[str, Dict[str, Tuple[int, int]]]:
+        """Picklable arguments for attach()"""
+        return self.shm.name, self.layout
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """
+        Rebuild per-symbol DataFrames in the engine's column layout
+
+        Price columns are views into the shared block (only the timestamp
+        column is converted), so the frames must not be used after close().
+        """
+        frames = {}
+        for symbol, (start, rows) in self.layout.items():
+            block = self.array[start:start + rows]
+            df = pd.DataFrame(block[:, 1:], columns=list(self.COLUMNS[1:]))
+            df.insert(0, "timestamp", pd.to_datetime(block[:, 0].astype(np.int64), unit="ms"))
+            frames[symbol] = df
+        return frames
+
+    def close(self):
+        """Release the mapping, and remove the block if this process created it"""
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def parse_param_range(spec: str) -> Tuple[str, List[Any]]:
+    """
+    Parse a sweep parameter specification
+
+    Args:
+        spec: "name=start:stop:step" (stop inclusive) or "name=v1,v2,..."
+
+    Returns:
+        Tuple of (parameter name, list of values)
+    """
+    if "=" not in spec:
+        raise ValueError(f"Invalid sweep parameter '{spec}', expected name=start:stop:step or name=v1,v2")
+
+    name, values = (part.strip() for part in spec.split("=", 1))
+    if ":" in values:
+        start, stop, step = (float(v) for v in values.split(":"))
+        if step <= 0:
+            raise ValueError(f"Sweep step for {name} must be positive")
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        parsed = [round(start + i * step, 10) for i in range(max(0, count))]
+    else:
+        parsed = [float(v) for v in values.split(",") if v.strip()]
+
+    if not parsed:
+        raise ValueError(f"Sweep parameter {name} has no values")
+
+    # Keep integer parameters (periods) as ints
+    if all(float(v).is_integer() for v in parsed):
+        parsed = [int(v) for v in parsed]
+    return name, parsed
+
+def expand_grid(param_ranges: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of parameter values as a list of parameter dicts"""
+    names = list(param_ranges)
+    return [dict(zip(names, values)) for values in itertools.product(*(param_ranges[n] for n in names))]
+
+def build_strategy(strategy_name: str, params: Dict[str, Any]) -> BaseStrategy:
+    """
+    Create a sweepable strategy and apply parameter overrides
+
+    Raises:
+        ValueError: If the strategy is unknown or a parameter is not one of its attributes
+    """
+    if strategy_name not in SWEEP_STRATEGIES:
+        raise ValueError(f"Strategy '{strategy_name}' does not support sweeps (choose from {', '.join(SWEEP_STRATEGIES)})")
+
+    strategy = SWEEP_STRATEGIES[strategy_name]()
+    for name, value in params.items():
+        if not hasattr(strategy, name):
+            raise ValueError(f"{strategy.name} has no parameter '{name}'")
+        setattr(strategy, name, value)
+    return strategy
+
+# Per-process state, set once by _init_worker
+_worker_bars: Optional[SharedBars] = None
+_worker_frames: Dict[str, pd.DataFrame] = {}
+_worker_engine: Optional[BacktestEngine] = None
+_worker_options: Dict[str, Any] = {}
+
+def _init_worker(handle: Tuple[str, Dict[str, Tuple[int, int]]], engine_kwargs: Dict[str, Any], options: Dict[str, Any]):
+    """Attach to the shared bars and create one engine per worker process"""
+    global _worker_bars, _worker_frames, _worker_engine, _worker_options
+    _worker_bars = SharedBars.attach(*handle)
+    _worker_frames = _worker_bars.frames()
+    _worker_engine = BacktestEngine(**engine_kwargs)
+    _worker_options = options
+
+def _run_combination(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one backtest in a worker and keep only the ranking metrics"""
+    row = dict(params)
+    try:
+        strategy = build_strategy(_worker_options["strategy"], params)
+        results = _worker_engine.run_backtest(
+            strategy=strategy,
+            symbols=list(_worker_frames),
+            start_date=_worker_options["start_date"],
+            end_date=_worker_options["end_date"],
+            data=_worker_frames,
+            vectorized=_worker_options["vectorized"]
+        )
+    except Exception as e:
+        results = {"error": str(e)}
+
+    for metric in SWEEP_METRICS:
+        row[metric] = results.get(metric, np.nan)
+    row["error"] = results.get("error", "")
+    return row
+
+def rank_results(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Order sweep results by Sharpe ratio, then smallest drawdown, then win rate"""
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    table = table.sort_values(
+        ["sharpe_ratio", "max_drawdown_pct", "win_rate_pct"],
+        ascending=[False, True, False],
+        na_position="last",
+        kind="stable"
+    ).reset_index(drop=True)
+    table.index += 1
+    table.index.name = "rank"
+    return table
+
+def run_sweep(strategy_name: str,
+              param_ranges: Dict[str, List[Any]],
+              data: Dict[str, Any],
+              start_date: str,
+              end_date: str,
+              engine_kwargs: Optional[Dict[str, Any]] = None,
+              vectorized: bool = True,
+              max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Backtest every parameter combination in parallel
+
+    Args:
+        strategy_name: Key of SWEEP_STRATEGIES
+        param_ranges: Parameter name -> values to try
+        data: Bars per symbol (DataFrame or list of Polygon bar dicts)
+        start_date: Start date for the backtests (YYYY-MM-DD)
+        end_date: End date for the backtests (YYYY-MM-DD)
+        engine_kwargs: BacktestEngine constructor arguments
+        vectorized: Use the engine's vectorized mode
+        max_workers: Worker processes (defaults to all cores)
+
+    Returns:
+        Ranked DataFrame with one row per combination
+    """
+    combinations = expand_grid(param_ranges)
+    # Fail fast on unknown strategies or parameters before starting workers
+    build_strategy(strategy_name, combinations[0] if combinations else {})
+
+    engine = BacktestEngine(**(engine_kwargs or {}))
+    frames = {symbol: engine._prepare_symbol_data(bars) for symbol, bars in data.items() if bars is not None and len(bars)}
+    if not frames:
+        logger.error("No historical data to sweep over")
+        return pd.DataFrame()
+
+    max_workers = max_workers or os.cpu_count() or 1
+    logger.info(f"Sweeping {len(combinations)} {strategy_name} combinations over {len(frames)} symbols "
+                f"with {max_workers} workers")
+
+    shared = SharedBars.create(frames)
+    options = {
+        "strategy": strategy_name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "vectorized": vectorized,
+    }
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker,
+                                 initargs=(shared.handle, engine_kwargs or {}, options)) as executor:
+            chunksize = max(1, len(combinations) // (max_workers * 4))
+            rows = list(executor.map(_run_combination, combinations, chunksize=chunksize))
+    finally:
+        shared.close()
+
+    return rank_results(rows)
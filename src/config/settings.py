@@ -12,15 +12,30 @@ class TaapiConfig(BaseModel):
     price_history_interval: str = Field(default_factory=lambda: os.getenv("PRICE_HISTORY_INTERVAL", "5m"))
     price_history_limit: int = Field(default_factory=lambda: int(os.getenv("PRICE_HISTORY_LIMIT", "20")))
     fetch_for_stocks: bool = Field(default_factory=lambda: os.getenv("TAAPI_FETCH_FOR_STOCKS", "true").lower() == "true")
+    # Maximum concurrent requests from the retrieval engine
+    max_concurrency: int = Field(default_factory=lambda: int(os.getenv("TAAPI_MAX_CONCURRENCY", "1")))
+    # Constructs (symbol + interval) per /bulk request allowed by the plan; 0 uses per-symbol endpoints
+    bulk_constructs: int = Field(default_factory=lambda: int(os.getenv("TAAPI_BULK_CONSTRUCTS", "1")))
 
 class AlpacaConfig(BaseModel):
     # API credentials
     api_key: str = Field(default_factory=lambda: os.getenv("ALPACA_API_KEY", ""))
     api_secret: str = Field(default_factory=lambda: os.getenv("ALPACA_API_SECRET", ""))
     base_url: str = Field(default_factory=lambda: os.getenv("APCA_API_BASE_URL", "https://paper-api.alpaca.markets"))
+    # Seconds an account summary is served from cache before Alpaca is asked again
+    account_cache_ttl: float = Field(default_factory=lambda: float(os.getenv("ALPACA_ACCOUNT_CACHE_TTL", "10")))
+    # Seconds orders reuse one fetch of the account and positions, and how often they are refreshed
+    snapshot_ttl: float = Field(default_factory=lambda: float(os.getenv("ALPACA_SNAPSHOT_TTL", "5")))
+    snapshot_refresh_interval: float = Field(default_factory=lambda: float(os.getenv("ALPACA_SNAPSHOT_REFRESH", "30")))
+    # Trade updates websocket; empty uses Alpaca's paper or live endpoint
+    stream_url: str = Field(default_factory=lambda: os.getenv("ALPACA_STREAM_URL", ""))
 
 class PolygonConfig(BaseModel):
     api_key: str = Field(default_factory=lambda: os.getenv("POLYGON_API_KEY", ""))
+    # Directory for cached backtest bars; empty disables the cache
+    bar_cache_dir: str = Field(default_factory=lambda: os.getenv("POLYGON_BAR_CACHE_DIR", "data/bar_cache"))
+    # Maximum concurrent requests from the retrieval engine
+    max_concurrency: int = Field(default_factory=lambda: int(os.getenv("POLYGON_MAX_CONCURRENCY", "5")))
 
 class OpenAIConfig(BaseModel):
     api_key: str = Field(default_factory=lambda: os.getenv("OPENAI_API_KEY", ""))
@@ -29,6 +44,23 @@ class OpenAIConfig(BaseModel):
 class OllamaConfig(BaseModel):
     model: str = Field(default_factory=lambda: os.getenv("OLLAMA_MODEL", "llama3"))
     host: str = Field(default_factory=lambda: os.getenv("OLLAMA_HOST", "http://ollama:11434"))
+    # How long Ollama keeps the model loaded after a request (e.g. "30m", "-1" for always)
+    keep_alive: str = Field(default_factory=lambda: os.getenv("OLLAMA_KEEP_ALIVE", "30m"))
+    # Generate requests sent at once; further calls wait (measured as queue wait)
+    max_concurrency: int = Field(default_factory=lambda: int(os.getenv("OLLAMA_MAX_CONCURRENCY", "1")))
+    # p95 latency budget in seconds; above it decisions fall back to RSI thresholds (0 disables)
+    latency_budget: float = Field(default_factory=lambda: float(os.getenv("OLLAMA_LATENCY_BUDGET", "10")))
+    # Seconds of call history the p95 is computed over, and the samples needed before it applies
+    slo_window: float = Field(default_factory=lambda: float(os.getenv("OLLAMA_SLO_WINDOW", "900")))
+    slo_min_samples: int = Field(default_factory=lambda: int(os.getenv("OLLAMA_SLO_MIN_SAMPLES", "5")))
+    # Seconds LLM decisions are cached for identical prompts (0 disables the cache)
+    decision_cache_ttl: int = Field(default_factory=lambda: int(os.getenv("AI_DECISION_CACHE_TTL", "300")))
+    decision_cache_size: int = Field(default_factory=lambda: int(os.getenv("AI_DECISION_CACHE_SIZE", "1000")))
+    # RSI is rounded to this step in prompts so nearby values share a cached decision
+    rsi_resolution: float = Field(default_factory=lambda: float(os.getenv("AI_DECISION_RSI_RESOLUTION", "0.5")))
+    # Ask for all symbols' decisions in one JSON request instead of one request per symbol
+    batch_decisions: bool = Field(default_factory=lambda: os.getenv("AI_DECISION_BATCH", "true").lower() == "true")
+    batch_size: int = Field(default_factory=lambda: int(os.getenv("AI_DECISION_BATCH_SIZE", "20")))
 
 class RedisConfig(BaseModel):
     host: str = Field(default_factory=lambda: os.getenv("REDIS_HOST", "redis"))
@@ -43,6 +75,10 @@ class TradingConfig(BaseModel):
     # ALWAYS default to False for safety
     trading_enabled: bool = Field(default=False)
     poll_interval: int = Field(default_factory=lambda: int(os.getenv("POLL_INTERVAL", "120")))
+    # Seconds after which a cached price is refreshed before sizing an order
+    price_max_age: float = Field(default_factory=lambda: float(os.getenv("PRICE_MAX_AGE", "600")))
+    # Orders of one batch submitted to Alpaca at the same time
+    max_concurrent_orders: int = Field(default_factory=lambda: int(os.getenv("TRADE_MAX_CONCURRENT_ORDERS", "4")))
 
     # Use validator instead of field_validator for pydantic v1
     @validator("trade_percentage")
@@ -63,6 +99,27 @@ class FeatureConfig(BaseModel):
     news_sell_threshold: int = Field(default_factory=lambda: int(os.getenv("NEWS_SELL_THRESHOLD", "30")))
     auto_start_strategies: bool = Field(default_factory=lambda: os.getenv("AUTO_START_STRATEGIES", "false").lower() == "true")
 
+class RateLimitConfig(BaseModel):
+    # Quotas as "requests/seconds", shared through Redis by every process using the same API key
+    taapi: str = Field(default_factory=lambda: os.getenv("TAAPI_RATE_LIMIT", "1/16"))
+    polygon: str = Field(default_factory=lambda: os.getenv("POLYGON_RATE_LIMIT", "5/60"))
+    alpaca: str = Field(default_factory=lambda: os.getenv("ALPACA_RATE_LIMIT", "200/60"))
+    openai: str = Field(default_factory=lambda: os.getenv("OPENAI_RATE_LIMIT", "60/60"))
+    crypto_news: str = Field(default_factory=lambda: os.getenv("CRYPTO_NEWS_RATE_LIMIT", "30/60"))
+    # Fraction of each burst that backfill (backtests, history) may not use
+    backfill_reserve: float = Field(default_factory=lambda: float(os.getenv("RATE_LIMIT_BACKFILL_RESERVE", "0.2")))
+
+class StrategyConfig(BaseModel):
+    # Threads evaluating symbols in parallel
+    max_workers: int = Field(default_factory=lambda: int(os.getenv("STRATEGY_MAX_WORKERS", "4")))
+    # Seconds a symbol's evaluation may take before it is cancelled and its signals dropped
+    symbol_timeout: float = Field(default_factory=lambda: float(os.getenv("STRATEGY_SYMBOL_TIMEOUT", "30")))
+    # Strategy classes to run in a process pool (CPU-heavy ones), comma separated
+    process_strategies: List[str] = Field(default_factory=lambda: [
+        name.strip() for name in os.getenv("STRATEGY_PROCESS_POOL", "").split(",") if name.strip()
+    ])
+    process_workers: int = Field(default_factory=lambda: int(os.getenv("STRATEGY_PROCESS_WORKERS", "2")))
+
 class AppConfig(BaseModel):
     taapi: TaapiConfig = TaapiConfig()
     alpaca: AlpacaConfig = AlpacaConfig()
@@ -72,5 +129,7 @@ class AppConfig(BaseModel):
     redis: RedisConfig = RedisConfig()
     trading: TradingConfig = TradingConfig()
     features: FeatureConfig = FeatureConfig()
+    rate_limits: RateLimitConfig = RateLimitConfig()
+    strategies: StrategyConfig = StrategyConfig()
 
 config = AppConfig()
\ No newline at end of file
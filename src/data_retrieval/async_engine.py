@@ -0,0 +1,365 @@
+"""
+Concurrent market data retrieval for the data retrieval service.
+
+Every request of a polling cycle (Polygon.io bars, previous close and news,
+TAAPI RSI, price and candles) is issued on one httpx.AsyncClient, bounded per
+provider, and all results are written to Redis in a single pipeline. A cycle
+therefore takes about as long as the slowest provider needs for its share of
+requests instead of the sum of every call for every symbol. TAAPI indicators
+are packed into /bulk requests (see taapi_bulk) unless TAAPI_BULK_CONSTRUCTS=0.
+"""
+
+import time
+import uuid
+import asyncio
+import random
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+import httpx
+
+from src.config import config
+from src.utils import get_logger, redis_client, RSIData
+from src.utils.news_index import news_index
+from src.utils.price_cache import price_cache, to_epoch
+from src.utils.rate_limiter import RateLimiter, get_rate_limiter, LANE_LIVE
+from src.data_retrieval.taapi_client import taapi_client
+from src.data_retrieval.taapi_bulk import TaapiBulkQuery
+
+logger = get_logger("async_retrieval")
+
+POLYGON_BASE_URL = "https://api.polygon.io"
+POLYGON_BAR_SECONDS = 86400  # Duration of the 1/day aggregates fetched by _polygon_bars
+
+class ProviderLimiter:
+    """
+    Caps in-flight requests to one provider and takes each request's slot
+    from the provider's shared RateLimiter.
+
+    The semaphore is recreated when used from a new event loop, so one
+    limiter can serve successive asyncio.run() cycles.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, rate_limiter: Optional[RateLimiter] = None):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = rate_limiter
+        self._loop = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def __aenter__(self):
+        self._bind()
+        await self._semaphore.acquire()
+        if self.rate_limiter:
+            try:
+                await self.rate_limiter.acquire_async(LANE_LIVE)
+            except BaseException:
+                self._semaphore.release()
+                raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+    def backoff(self, seconds: float):
+        """Hold all requests to this provider after a 429"""
+        if self.rate_limiter:
+            self.rate_limiter.backoff(seconds)
+
+class AsyncRetrievalEngine:
+    """
+    Fetches all data for a list of symbols concurrently and stores it in
+    Redis under the same keys and TTLs as the sequential fetch_* methods.
+    """
+
+    def __init__(self,
+                 poll_interval: int,
+                 price_history_interval: str,
+                 price_history_limit: int,
+                 use_polygon: bool,
+                 fetch_news: bool,
+                 build_price_history: Callable[[str, List[Dict[str, Any]]], Any],
+                 timeout: float = 10.0,
+                 max_retries: int = 3,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            poll_interval: Service poll interval in seconds (TTL base for RSI/price)
+            price_history_interval: TAAPI candle interval for charts
+            price_history_limit: Number of candles for charts
+            use_polygon: Whether Polygon.io is configured
+            fetch_news: Whether to ingest Polygon.io ticker news for stocks
+            build_price_history: Converts raw TAAPI candles into a PriceHistory
+            timeout: Per-request timeout in seconds
+            max_retries: Retries after an HTTP 429 or a transport error
+            transport: Optional httpx transport (e.g. httpx.MockTransport in tests)
+        """
+        self.poll_interval = poll_interval
+        self.price_history_interval = price_history_interval
+        self.price_history_limit = price_history_limit
+        self.use_polygon = use_polygon
+        self.fetch_news = fetch_news
+        self.build_price_history = build_price_history
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.transport = transport
+        self.cycle = 0
+
+        self.limiters = {
+            "polygon": ProviderLimiter("polygon", config.polygon.max_concurrency,
+                                       get_rate_limiter("polygon", config.polygon.api_key)),
+            "taapi": ProviderLimiter("taapi", config.taapi.max_concurrency,
+                                     get_rate_limiter("taapi", config.taapi.api_key)),
+        }
+
+    async def _get_json(self, client: httpx.AsyncClient, provider: str, url: str,
+                        params: Optional[Dict[str, Any]] = None,
+                        json_body: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        GET (or POST, when json_body is given) a JSON document through the
+        provider's limiter, retrying 429s with backoff
+        """
+        limiter = self.limiters[provider]
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with limiter:
+                    if json_body is None:
+                        response = await client.get(url, params=params)
+                    else:
+                        response = await client.post(url, json=json_body)
+            except httpx.HTTPError as e:
+                logger.error(f"{provider} request to {url} failed: {e}")
+                if attempt == self.max_retries:
+                    return None
+                await asyncio.sleep(2 ** (attempt + 1))
+                continue
+
+            if response.status_code == 200:
+                return response.json()
+
+            if response.status_code == 429 and attempt < self.max_retries:
+                interval = limiter.rate_limiter.interval if limiter.rate_limiter else 0.0
+                backoff = max(interval, 1.0) * (2 ** attempt) + random.uniform(0, 1)
+                logger.warning(f"{provider} rate limited (429), retry {attempt + 1}/{self.max_retries} in {backoff:.1f}s")
+                if limiter.rate_limiter:
+                    # The next acquire waits out the backoff, in every process
+                    limiter.backoff(backoff)
+                else:
+                    await asyncio.sleep(backoff)
+                continue
+
+            logger.error(f"{provider} error for {url}: {response.status_code} - {response.text[:200]}")
+            return None
+        return None
+
+    # Polygon.io
+
+    async def _polygon_bars(self, client: httpx.AsyncClient, symbol: str):
+        today = datetime.now()
+        from_date = datetime.fromtimestamp(today.timestamp() - 30 * 86400).strftime("%Y-%m-%d")
+        data = await self._get_json(
+            client, "polygon",
+            f"{POLYGON_BASE_URL}/v2/aggs/ticker/{symbol}/range/1/day/{from_date}/{today.strftime('%Y-%m-%d')}",
+            {"adjusted": "true", "sort": "desc", "limit": 10, "apiKey": config.polygon.api_key}
+        )
+        return data.get("results", []) if data else None
+
+    async def _polygon_prev_close(self, client: httpx.AsyncClient, symbol: str):
+        data = await self._get_json(
+            client, "polygon",
+            f"{POLYGON_BASE_URL}/v2/aggs/ticker/{symbol}/prev",
+            {"adjusted": "true", "apiKey": config.polygon.api_key}
+        )
+        return data.get("results", [None])[0] if data and data.get("results") else None
+
+    async def _polygon_news(self, client: httpx.AsyncClient, symbol: str):
+        data = await self._get_json(
+            client, "polygon",
+            f"{POLYGON_BASE_URL}/v2/reference/news",
+            {"ticker": symbol, "limit": 10, "apiKey": config.polygon.api_key}
+        )
+        if not data:
+            return None
+        return [{
+            "id": f"polygon-{item['id']}",
+            "headline": item.get("title", ""),
+            "symbols": item.get("tickers") or [symbol],
+            "timestamp": item.get("published_utc") or datetime.now().isoformat(),
+            "source": (item.get("publisher") or {}).get("name", "Polygon.io"),
+            "url": item.get("article_url", ""),
+            "summary": item.get("description", ""),
+        } for item in data.get("results", []) if item.get("id")]
+
+    # TAAPI
+
+    async def _taapi_rsi(self, client: httpx.AsyncClient, symbol: str):
+        data = await self._get_json(
+            client, "taapi", f"{taapi_client.base_url}/rsi",
+            taapi_client.request_params(symbol, interval="1m", period=taapi_client.rsi_period)
+        )
+        if not data or data.get("value") is None:
+            return None
+        return RSIData(symbol=symbol, value=float(data["value"]), interval="1m", timestamp=datetime.now())
+
+    async def _taapi_price(self, client: httpx.AsyncClient, symbol: str):
+        data = await self._get_json(client, "taapi", f"{taapi_client.base_url}/candle",
+                                    taapi_client.request_params(symbol, interval="1m"))
+        if not data:
+            return None
+        return {
+            "symbol": symbol,
+            "timestamp": datetime.now().isoformat(),
+            "open": data.get("open"),
+            "high": data.get("high"),
+            "low": data.get("low"),
+            "close": data.get("close"),
+            "volume": data.get("volume", 0)
+        }
+
+    async def _taapi_price_history(self, client: httpx.AsyncClient, symbol: str):
+        data = await self._get_json(
+            client, "taapi", f"{taapi_client.base_url}/bulk/candles",
+            taapi_client.request_params(symbol, interval=self.price_history_interval, limit=self.price_history_limit)
+        )
+        if not data:
+            return None
+        return self.build_price_history(symbol, taapi_client.parse_candles(data))
+
+    async def _taapi_bulk(self, client: httpx.AsyncClient, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch RSI, price and chart candles for all symbols with as few /bulk requests as the plan allows"""
+        query = TaapiBulkQuery(max_constructs=config.taapi.bulk_constructs, rsi_period=taapi_client.rsi_period)
+        for index, symbol in enumerate(symbols):
+            query.add_rsi(symbol).add_price(symbol)
+            if self._refresh_price_history(index, len(symbols)):
+                query.add_price_history(symbol, self.price_history_interval, self.price_history_limit)
+
+        payloads = query.payloads(config.taapi.api_key)
+        responses = await asyncio.gather(*(
+            self._get_json(client, "taapi", f"{taapi_client.base_url}/bulk", json_body=payload) for payload in payloads
+        ), return_exceptions=True)
+        logger.info(f"Fetched {len(query)} TAAPI indicators for {len(symbols)} symbols in {len(payloads)} bulk requests")
+        return query.unpack([None if isinstance(r, Exception) else r for r in responses], self.build_price_history)
+
+    # Cycle
+
+    def _uses_taapi(self, symbol: str) -> bool:
+        return "/" in symbol or config.taapi.fetch_for_stocks
+
+    def _refresh_price_history(self, index: int, count: int) -> bool:
+        # Chart candles change slowly: refresh every symbol on the first
+        # cycle, then one symbol per cycle to save TAAPI requests
+        return self.cycle == 0 or self.cycle % count == index
+
+    async def _fetch_symbol(self, client: httpx.AsyncClient, symbol: str, index: int, count: int,
+                            bulk_taapi: bool) -> Dict[str, Any]:
+        """Run every request for one symbol concurrently and collect the results by kind"""
+        is_stock = "/" not in symbol
+        requests = {}
+
+        if is_stock and self.use_polygon:
+            requests["polygon_bars"] = self._polygon_bars(client, symbol)
+            requests["polygon_prev_close"] = self._polygon_prev_close(client, symbol)
+            if self.fetch_news:
+                requests["news"] = self._polygon_news(client, symbol)
+
+        if self._uses_taapi(symbol) and not bulk_taapi:
+            requests["rsi"] = self._taapi_rsi(client, symbol)
+            requests["price"] = self._taapi_price(client, symbol)
+            if self._refresh_price_history(index, count):
+                requests["price_history"] = self._taapi_price_history(client, symbol)
+
+        results = await asyncio.gather(*requests.values(), return_exceptions=True)
+        fetched = {"symbol": symbol}
+        for kind, result in zip(requests, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching {kind} for {symbol}: {result}")
+            elif result is None:
+                logger.warning(f"No {kind} data for {symbol}")
+            else:
+                fetched[kind] = result
+        return fetched
+
+    def _latest_price(self, fetched: Dict[str, Any]) -> Optional[Tuple[float, float, str]]:
+        """Most recently observed (price, epoch seconds, source) among the fetched results"""
+        observations = []
+        if "price" in fetched:
+            observations.append((fetched["price"].get("close"), to_epoch(fetched["price"].get("timestamp")), "taapi"))
+        if "price_history" in fetched and fetched["price_history"].candles:
+            candle = max(fetched["price_history"].candles, key=lambda c: c.timestamp)
+            observations.append((candle.close, to_epoch(candle.timestamp), "taapi_candles"))
+        if fetched.get("polygon_bars"):
+            bar = max(fetched["polygon_bars"], key=lambda b: b.get("t", 0))
+            # "t" is the start of the daily bar; its close is as of the bar's end, or now while it is still open
+            started = to_epoch(bar.get("t"))
+            observed = min(started + POLYGON_BAR_SECONDS, time.time()) if started else None
+            observations.append((bar.get("c"), observed, "polygon"))
+        observations = [o for o in observations if o[0] and o[1]]
+        return max(observations, key=lambda o: o[1]) if observations else None
+
+    def _queue_writes(self, pipe, fetched: Dict[str, Any], request_id: str, now: str):
+        """Queue the Redis writes for one symbol's results"""
+        symbol = fetched["symbol"]
+        if "rsi" in fetched:
+            pipe.set_json(f"rsi:{symbol}", fetched["rsi"].dict(), ttl=self.poll_interval * 5)
+        if "price" in fetched:
+            pipe.set_json(f"price:{symbol}", fetched["price"], ttl=self.poll_interval * 5)
+        if "price_history" in fetched:
+            # Long TTL so charts do not disappear between refreshes
+            pipe.set_json(f"price_history:{symbol}", fetched["price_history"].dict(), ttl=86400)
+        if "polygon_bars" in fetched:
+            pipe.set_json(f"polygon:bars:{symbol}", {
+                "symbol": symbol, "data": fetched["polygon_bars"], "timestamp": now, "request_id": request_id
+            })
+        if "polygon_prev_close" in fetched:
+            pipe.set_json(f"polygon:prev_close:{symbol}", {
+                "symbol": symbol, "data": fetched["polygon_prev_close"], "timestamp": now, "request_id": request_id
+            })
+        for news_item in fetched.get("news", []):
+            news_index.queue(pipe, news_item)
+        latest = self._latest_price(fetched)
+        if latest:
+            price_cache.queue(pipe, symbol, *latest)
+
+    async def run_cycle(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch data for all symbols concurrently and store it in one pipeline
+
+        Returns:
+            Fetched results per symbol
+        """
+        start = time.monotonic()
+        limits = httpx.Limits(max_connections=sum(l.max_concurrency for l in self.limiters.values()))
+        bulk_taapi = config.taapi.bulk_constructs > 0
+        taapi_symbols = [symbol for symbol in symbols if self._uses_taapi(symbol)] if bulk_taapi else []
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits, transport=self.transport) as client:
+            per_symbol = asyncio.gather(*(
+                self._fetch_symbol(client, symbol, i, len(symbols), bulk_taapi) for i, symbol in enumerate(symbols)
+            ))
+            if taapi_symbols:
+                fetched, bulk = await asyncio.gather(per_symbol, self._taapi_bulk(client, taapi_symbols))
+                for result in fetched:
+                    result.update(bulk.get(result["symbol"], {}))
+            else:
+                fetched = await per_symbol
+        fetch_seconds = time.monotonic() - start
+
+        request_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
+        with redis_client.pipeline() as pipe:
+            for result in fetched:
+                self._queue_writes(pipe, result, request_id, now)
+            pipe.set("last_data_poll", now)
+            # Wake the strategy manager as soon as fresh data is stored
+            pipe.publish("market_data_updated", now)
+
+        self.cycle += 1
+        logger.info(f"Fetched data for {len(symbols)} symbols in {fetch_seconds:.1f}s "
+                    f"({len(pipe.results)} Redis writes in one pipeline)")
+        return {result["symbol"]: result for result in fetched}
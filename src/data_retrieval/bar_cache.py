@@ -0,0 +1,185 @@
+"""
+Persistent on-disk cache of Polygon.io aggregate bars for backtests.
+"""
+
+import os
+import json
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+from src.utils import get_logger
+
+logger = get_logger("bar_cache")
+
+# Polygon.io aggregate fields stored by the cache; each is one .npy column file
+BAR_COLUMNS = ("t", "o", "h", "l", "c", "v", "vw", "n")
+
+DateRange = Tuple[date, date]
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+def _day_start_ms(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() * 1000)
+
+class BarCache:
+    """
+    Columnar bar store keyed by (symbol, timespan, multiplier)
+
+    Each series lives in {root}/{symbol}/{multiplier}_{timespan}/ as one
+    .npy file per bar field, sorted by timestamp, plus coverage.json listing
+    the inclusive date ranges that have been fetched. Columns are opened
+    with mmap, so a repeat backtest reads only the rows it needs and makes
+    no API calls. Dates are UTC calendar days of the bar timestamps.
+
+    Ranges reaching today are never marked as covered, because the current
+    day's bars are still forming; those days are refetched on each request.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _series_dir(self, symbol: str, timespan: str, multiplier: int) -> str:
+        safe_symbol = symbol.upper().replace("/", "_").replace(":", "_")
+        return os.path.join(self.root, safe_symbol, f"{multiplier}_{timespan}")
+
+    def _read_coverage(self, series_dir: str) -> List[DateRange]:
+        path = os.path.join(series_dir, "coverage.json")
+        if not os.path.exists(path):
+            return []
+        try:
+            with open(path) as f:
+                return [(_to_date(start), _to_date(end)) for start, end in json.load(f)]
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable bar cache coverage {path}: {e}")
+            return []
+
+    @staticmethod
+    def _merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+        """Union of inclusive date ranges, joining ranges that touch"""
+        merged: List[DateRange] = []
+        for start, end in sorted(ranges):
+            if merged and start <= merged[-1][1] + timedelta(days=1):
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def missing_ranges(self, symbol: str, timespan: str, multiplier: int,
+                       start_date, end_date) -> List[DateRange]:
+        """
+        Sub-ranges of [start_date, end_date] that are not in the cache yet
+
+        Returns:
+            List of inclusive (start, end) dates to fetch, oldest first
+        """
+        start, end = _to_date(start_date), _to_date(end_date)
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in self._read_coverage(self._series_dir(symbol, timespan, multiplier)):
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start - timedelta(days=1)))
+            cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def _load_columns(self, series_dir: str) -> Dict[str, np.ndarray]:
+        columns = {}
+        for name in BAR_COLUMNS:
+            path = os.path.join(series_dir, f"{name}.npy")
+            if os.path.exists(path):
+                columns[name] = np.load(path, mmap_mode="r")
+        return columns if "t" in columns else {}
+
+    def load(self, symbol: str, timespan: str, multiplier: int, start_date, end_date) -> List[Dict[str, Any]]:
+        """
+        Cached bars whose timestamps fall on [start_date, end_date]
+
+        Returns:
+            List of Polygon.io bar dictionaries, oldest first
+        """
+        columns = self._load_columns(self._series_dir(symbol, timespan, multiplier))
+        if not columns:
+            return []
+
+        timestamps = columns["t"]
+        lo = int(np.searchsorted(timestamps, _day_start_ms(_to_date(start_date)), side="left"))
+        hi = int(np.searchsorted(timestamps, _day_start_ms(_to_date(end_date) + timedelta(days=1)), side="left"))
+
+        selected = {name: np.asarray(values[lo:hi]) for name, values in columns.items()}
+        bars = []
+        for i in range(hi - lo):
+            bar = {"t": int(selected["t"][i])}
+            for name in BAR_COLUMNS[1:]:
+                if name in selected and not np.isnan(selected[name][i]):
+                    value = float(selected[name][i])
+                    bar[name] = int(value) if name == "n" else value
+            bars.append(bar)
+        return bars
+
+    def store(self, symbol: str, timespan: str, multiplier: int, start_date, end_date,
+              bars: List[Dict[str, Any]]):
+        """
+        Merge freshly fetched bars for [start_date, end_date] into the cache
+
+        Bars with the same timestamp replace cached ones. The range is then
+        recorded as covered (up to yesterday), so an empty result such as a
+        holiday-only range is not requested again.
+        """
+        series_dir = self._series_dir(symbol, timespan, multiplier)
+        os.makedirs(series_dir, exist_ok=True)
+
+        existing = {name: np.asarray(values) for name, values in self._load_columns(series_dir).items()}
+        fresh = [bar for bar in bars if bar.get("t") is not None]
+
+        new_t = np.array([bar["t"] for bar in fresh], dtype=np.int64)
+        old_t = existing.get("t", np.empty(0, dtype=np.int64))
+        all_t = np.concatenate([new_t, old_t])
+        # np.unique keeps the first occurrence, so fresh bars win over cached ones
+        merged_t, first = np.unique(all_t, return_index=True)
+
+        merged = {"t": merged_t}
+        for name in BAR_COLUMNS[1:]:
+            new_values = np.array([bar.get(name, np.nan) for bar in fresh], dtype=np.float64)
+            old_values = existing.get(name, np.full(len(old_t), np.nan))
+            merged[name] = np.concatenate([new_values, old_values])[first]
+
+        # Release the mmaps before replacing their files
+        existing = None
+        for name, values in merged.items():
+            self._write_atomic(series_dir, f"{name}.npy", lambda f, v=values: np.save(f, v))
+
+        today = datetime.now(timezone.utc).date()
+        covered_end = min(_to_date(end_date), today - timedelta(days=1))
+        coverage = self._read_coverage(series_dir)
+        if _to_date(start_date) <= covered_end:
+            coverage = self._merge_ranges(coverage + [(_to_date(start_date), covered_end)])
+        payload = json.dumps([[start.isoformat(), end.isoformat()] for start, end in coverage])
+        # Coverage is written last: an interrupted store only causes a refetch
+        self._write_atomic(series_dir, "coverage.json", lambda f: f.write(payload.encode()))
+
+        logger.debug(f"Cached {len(fresh)} bars for {symbol} ({multiplier} {timespan}), {len(merged_t)} total")
+
+    @staticmethod
+    def _write_atomic(directory: str, filename: str, writer):
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer(f)
+            os.replace(tmp_path, os.path.join(directory, filename))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -8,7 +8,8 @@ from datetime import datetime
 import uuid
 
 from src.config import config
-from src.utils import get_logger, TradeSignal, TradingDecision, redis_client
+from src.utils import get_logger, TradeSignal, TradingDecision, redis_client, news_index, signal_stream
+from src.utils.rate_limiter import get_rate_limiter
 
 logger = get_logger("crypto_news_client")
 
@@ -68,32 +69,8 @@ class CryptoNewsClient:
         try:
             logger.info(f"Fetching crypto news for {symbol}")
             
-            # Format the symbol to match what's stored in news data
-            formatted_symbol = symbol.split('/')[0] if '/' in symbol else symbol
-            
-            # Get all news items from Redis
-            news_keys = redis_client.client.keys("news:*")
-            if not news_keys:
-                logger.debug(f"No news found in Redis for {symbol}")
-                return []
-                
-            # Find news matching our symbol
-            news_items = []
-            
-            for key in news_keys:
-                news_data = redis_client.get_json(key)
-                if not news_data:
-                    continue
-                    
-                # Check if this news item is about our symbol
-                symbols = news_data.get('symbols', [])
-                if formatted_symbol in symbols:
-                    # Add this news item to the list
-                    news_items.append(news_data)
-                    
-            # Sort by timestamp (newest first) and limit results
-            news_items.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-            return news_items[:limit]
+            # Single ZREVRANGE on the per-symbol index plus one MGET for the items
+            return news_index.fetch(symbol, limit)
             
         except Exception as e:
             logger.error(f"Error fetching news for {symbol}: {e}")
@@ -149,6 +126,7 @@ class CryptoNewsClient:
                         
                     try:
                         logger.info(f"Fetching news from {api['name']}...")
+                        get_rate_limiter("crypto_news", api["name"]).acquire()
                         response = requests.get(api["url"], timeout=10)
                         
                         if response.status_code == 200:
@@ -266,14 +244,10 @@ class CryptoNewsClient:
             # Store the news item in Redis
             redis_key = f"news:{news_item['id']}"
             
-            # Check if this news item already exists
-            existing_news = redis_client.get_json(redis_key)
-            if existing_news:
-                logger.debug(f"News item already exists in Redis: {redis_key}")
+            # Save to Redis with a 24-hour TTL and index it by symbol,
+            # skipping items we have already stored
+            if not news_index.store(news_item, only_if_new=True):
                 return
-                
-            # Save to Redis with a 24-hour TTL
-            redis_client.set_json(redis_key, news_item, ttl=86400)  # 24 hour TTL
             
             # Publish a notification so the frontend updates immediately
             redis_client.client.publish('trade_notifications', json.dumps({
@@ -303,6 +277,7 @@ class CryptoNewsClient:
             logger.info(f"Analyzing headline for {symbol}: {headline}")
             
             # Ask OpenAI to analyze the headline
+            get_rate_limiter("openai", self.openai_api_key).acquire()
             completion = self.openai_client.chat.completions.create(
                 model=self.openai_model,
                 messages=[
@@ -367,9 +342,8 @@ class CryptoNewsClient:
                     }
                 )
                 
-                # Store the signal in Redis
-                signal_key = f"signal:{symbol}"
-                redis_client.set_json(signal_key, signal.to_dict())
+                # Store the signal and add it to the signal stream for execution
+                signal_stream.publish(signal, ttl=None)
                 logger.info(f"Created BUY signal for {symbol} based on news sentiment")
                 
             elif impact_score <= self.impact_threshold_sell:
@@ -387,9 +361,8 @@ class CryptoNewsClient:
                     }
                 )
                 
-                # Store the signal in Redis
-                signal_key = f"signal:{symbol}"
-                redis_client.set_json(signal_key, signal.to_dict())
+                # Store the signal and add it to the signal stream for execution
+                signal_stream.publish(signal, ttl=None)
                 logger.info(f"Created SELL signal for {symbol} based on news sentiment")
                 
             else:
@@ -7,7 +7,8 @@ import websocket
 from openai import OpenAI
 
 from src.config import config
-from src.utils import get_logger, TradeSignal, TradingDecision, redis_client
+from src.utils import get_logger, TradeSignal, TradingDecision, redis_client, news_index, signal_stream
+from src.utils.rate_limiter import get_rate_limiter
 
 logger = get_logger("news_client")
 
@@ -53,32 +54,8 @@ class AlpacaNewsClient:
         try:
             logger.info(f"Fetching news for {symbol}")
             
-            # Format the symbol to match what's stored in news data
-            formatted_symbol = symbol.split('/')[0] if '/' in symbol else symbol
-            
-            # Get all news items from Redis
-            news_keys = redis_client.client.keys("news:*")
-            if not news_keys:
-                logger.debug(f"No news found in Redis for {symbol}")
-                return []
-                
-            # Find news matching our symbol
-            news_items = []
-            
-            for key in news_keys:
-                news_data = redis_client.get_json(key)
-                if not news_data:
-                    continue
-                    
-                # Check if this news item is about our symbol
-                symbols = news_data.get('symbols', [])
-                if formatted_symbol in symbols:
-                    # Add this news item to the list
-                    news_items.append(news_data)
-                    
-            # Sort by timestamp (newest first) and limit results
-            news_items.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-            return news_items[:limit]
+            # Single ZREVRANGE on the per-symbol index plus one MGET for the items
+            return news_index.fetch(symbol, limit)
             
         except Exception as e:
             logger.error(f"Error fetching news for {symbol}: {e}")
@@ -252,9 +229,9 @@ class AlpacaNewsClient:
                 "summary": event.get("summary", "")
             }
             
-            # Save to Redis with a 24-hour TTL
+            # Save to Redis with a 24-hour TTL and index it by symbol
             redis_key = f"news:{news_id}"
-            redis_client.set_json(redis_key, news_data, ttl=86400)  # 24 hour TTL
+            news_index.store(news_data)
             
             # Publish a notification so the frontend updates immediately
             redis_client.client.publish('trade_notifications', f"New market news for {', '.join(symbols)}")
@@ -304,6 +281,7 @@ class AlpacaNewsClient:
             logger.info(f"Analyzing headline for {symbol}: {headline}")
             
             # Ask OpenAI to analyze the headline
+            get_rate_limiter("openai", self.openai_api_key).acquire()
             completion = self.openai_client.chat.completions.create(
                 model=self.openai_model,
                 messages=[
@@ -351,17 +329,9 @@ class AlpacaNewsClient:
             timestamp=None  # Will use default current time
         )
         
-        # Store the signal in Redis for the trade execution service to process
-        try:
-            signal_key = f"signal:{symbol}"
-            redis_client.set_json(signal_key, signal.dict(), ttl=3600)  # 1 hour TTL
-            logger.info(f"Stored trade signal in Redis with key {signal_key}: {signal.dict()}")
-            
-            # Publish a notification so the trade execution service can process it immediately
-            redis_client.client.publish('new_trade_signal', symbol)
-            logger.info(f"Published trade signal notification for {symbol}")
-        except Exception as e:
-            logger.error(f"Error storing trade signal for {symbol} in Redis: {e}")
+        # Store the signal and add it to the signal stream for the trade execution service
+        if signal_stream.publish(signal, ttl=3600):  # 1 hour TTL
+            logger.info(f"Published trade signal for {symbol}: {signal.dict()}")
     
     def _on_error(self, ws, error):
         """Handle WebSocket error"""
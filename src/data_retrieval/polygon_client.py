@@ -10,9 +10,21 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 
 from src.config import config
 from src.utils import get_logger, TradeSignal, TradingDecision
+from src import indicators
+from src.utils.rate_limiter import get_rate_limiter, LANE_LIVE, LANE_BACKFILL
+from src.data_retrieval.bar_cache import BarCache
 
 logger = get_logger("polygon_client")
 
+# Backtest timeframe strings -> (Polygon.io timespan, multiplier)
+TIMEFRAME_ALIASES = {
+    "1m": ("minute", 1),
+    "5m": ("minute", 5),
+    "15m": ("minute", 15),
+    "1h": ("hour", 1),
+    "1d": ("day", 1),
+}
+
 class PolygonClient:
     """
     Client for interacting with the Polygon.io API to retrieve stock market data.
@@ -28,6 +40,12 @@ class PolygonClient:
             raise ValueError("Polygon.io API key is not set")
             
         logger.debug(f"Using Polygon.io API key: {self.api_key[:5]}...{self.api_key[-5:]}")
+        
+        # Quota shared with every other process using this API key (POLYGON_RATE_LIMIT)
+        self.rate_limiter = get_rate_limiter("polygon", self.api_key)
+        
+        # On-disk cache for backtest history
+        self.bar_cache = BarCache(config.polygon.bar_cache_dir) if config.polygon.bar_cache_dir else None
     
     @retry(
         stop=stop_after_attempt(5),
@@ -52,6 +70,7 @@ class PolygonClient:
         
         try:
             logger.debug(f"Fetching ticker details for {symbol}")
+            self.rate_limiter.acquire(LANE_LIVE)
             response = requests.get(
                 f"{self.base_url}{endpoint}",
                 params=params,
@@ -96,6 +115,7 @@ class PolygonClient:
         
         try:
             logger.debug(f"Fetching news for {symbol}")
+            self.rate_limiter.acquire(LANE_LIVE)
             response = requests.get(
                 f"{self.base_url}{endpoint}",
                 params=params,
@@ -256,6 +276,7 @@ class PolygonClient:
         
         try:
             logger.debug(f"Fetching daily open/close for {symbol} on {date}")
+            self.rate_limiter.acquire(LANE_LIVE)
             response = requests.get(
                 f"{self.base_url}{endpoint}",
                 params=params,
@@ -281,7 +302,8 @@ class PolygonClient:
         reraise=True
     )
     def get_aggregate_bars(self, symbol: str, multiplier: int = 1, timespan: str = "day", 
-                         from_date: str = None, to_date: str = None, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+                         from_date: str = None, to_date: str = None, limit: int = 10,
+                         lane: str = LANE_LIVE) -> Optional[List[Dict[str, Any]]]:
         """
         Get aggregate bars for a ticker over a given date range in custom time window sizes.
         
@@ -292,6 +314,7 @@ class PolygonClient:
             from_date: The start date in format YYYY-MM-DD
             to_date: The end date in format YYYY-MM-DD
             limit: Maximum number of bars to retrieve
+            lane: Rate limiter lane (LANE_BACKFILL for backtest history)
             
         Returns:
             List of price bars or None if error
@@ -312,6 +335,7 @@ class PolygonClient:
         
         try:
             logger.debug(f"Fetching aggregate bars for {symbol} from {from_date} to {to_date}")
+            self.rate_limiter.acquire(lane)
             response = requests.get(
                 f"{self.base_url}{endpoint}",
                 params=params,
@@ -335,15 +359,20 @@ class PolygonClient:
         """
         Get comprehensive historical data for backtesting strategies.
         
+        Bars are served from the on-disk bar cache when enabled; only date
+        ranges not cached yet are requested from the API.
+        
         Args:
             symbol: The stock ticker symbol (e.g., AAPL, TSLA)
             start_date: Start date in YYYY-MM-DD format
             end_date: End date in YYYY-MM-DD format
-            timespan: Time window (minute, hour, day, week, month)
+            timespan: Time window (minute, hour, day, week, month) or a
+                backtest timeframe such as 1d, 1h or 15m
             multiplier: Multiplier for the timespan
             
         Returns:
-            List of OHLCV bars for the specified period or None if error
+            List of OHLCV bars for the specified period (oldest first when
+            served from the cache) or None if error
         """
         # Validate date formats
         try:
@@ -353,6 +382,32 @@ class PolygonClient:
             logger.error(f"Invalid date format: {str(e)}")
             return None
         
+        if timespan in TIMEFRAME_ALIASES:
+            timespan, multiplier = TIMEFRAME_ALIASES[timespan]
+        
+        if self.bar_cache is None:
+            return self._fetch_historical_range(symbol, start_date, end_date, timespan, multiplier)
+        
+        try:
+            gaps = self.bar_cache.missing_ranges(symbol, timespan, multiplier, start_date, end_date)
+            for gap_start, gap_end in gaps:
+                bars = self._fetch_historical_range(
+                    symbol, gap_start.strftime("%Y-%m-%d"), gap_end.strftime("%Y-%m-%d"), timespan, multiplier
+                )
+                if bars is None:
+                    return None
+                self.bar_cache.store(symbol, timespan, multiplier, gap_start, gap_end, bars)
+            
+            if not gaps:
+                logger.info(f"Serving {symbol} {multiplier} {timespan} bars from {start_date} to {end_date} from cache")
+            return self.bar_cache.load(symbol, timespan, multiplier, start_date, end_date)
+        except Exception as e:
+            logger.error(f"Error reading cached historical data for {symbol}: {str(e)}")
+            return None
+    
+    def _fetch_historical_range(self, symbol: str, start_date: str, end_date: str,
+                                timespan: str, multiplier: int) -> Optional[List[Dict[str, Any]]]:
+        """Request historical bars for a date range from the API, chunking intraday data"""
         # Calculate date periods for fetching data
         # Polygon has limits on how much data can be retrieved at once,
         # so we may need to make multiple requests
@@ -370,7 +425,8 @@ class PolygonClient:
                     timespan=timespan,
                     from_date=start_date,
                     to_date=end_date,
-                    limit=5000  # Request maximum allowed
+                    limit=5000,  # Request maximum allowed
+                    lane=LANE_BACKFILL
                 )
             
             # For minute/hour data, we need to break it into smaller chunks
@@ -388,7 +444,7 @@ class PolygonClient:
                 
                 # Fetch data in chunks
                 current_start = start_dt
-                while current_start < end_dt:
+                while current_start <= end_dt:
                     current_end = min(current_start + chunk_size, end_dt)
                     
                     # Format dates for API call
@@ -402,9 +458,15 @@ class PolygonClient:
                         timespan=timespan,
                         from_date=chunk_start,
                         to_date=chunk_end,
-                        limit=50000  # High limit for intraday data
+                        limit=50000,  # High limit for intraday data
+                        lane=LANE_BACKFILL
                     )
                     
+                    # A failed chunk would leave a hole in the history
+                    if chunk_data is None:
+                        logger.error(f"Failed to retrieve bars for {symbol} from {chunk_start} to {chunk_end}")
+                        return None
+                    
                     # Add results to the combined list
                     if chunk_data:
                         data_chunks.extend(chunk_data)
@@ -412,9 +474,6 @@ class PolygonClient:
                     
                     # Move to the next chunk
                     current_start = current_end + timedelta(days=1)
-                    
-                    # Add a small delay to avoid hitting rate limits
-                    time.sleep(0.5)
                 
                 logger.info(f"Retrieved a total of {len(data_chunks)} bars for {symbol} from {start_date} to {end_date}")
                 return data_chunks
@@ -587,6 +646,7 @@ class PolygonClient:
         
         try:
             logger.debug(f"Fetching previous close for {symbol}")
+            self.rate_limiter.acquire(LANE_LIVE)
             response = requests.get(
                 f"{self.base_url}{endpoint}",
                 params=params,
@@ -667,10 +727,10 @@ class PolygonClient:
     
     def _calculate_rsi(self, price_data: List[Dict[str, Any]], period: int = 14) -> Optional[Dict[str, Any]]:
         """
-        Calculate Relative Strength Index (RSI) from price data
+        Calculate Wilder's Relative Strength Index (RSI) from price data
         
         Args:
-            price_data: List of price bars
+            price_data: List of price bars, newest first
             period: RSI period (default: 14)
             
         Returns:
@@ -681,27 +741,8 @@ class PolygonClient:
             return None
             
         try:
-            # Extract closing prices in reverse order to get chronological order
-            closes = [bar['c'] for bar in reversed(price_data[:period + 1])]
-            
-            # Calculate price changes
-            changes = [closes[i] - closes[i-1] for i in range(1, len(closes))]
-            
-            # Separate gains and losses
-            gains = [max(0, change) for change in changes]
-            losses = [max(0, -change) for change in changes]
-            
-            # Calculate average gain and loss
-            avg_gain = sum(gains) / period
-            avg_loss = sum(losses) / period
-            
-            if avg_loss == 0:
-                # No losses, RSI = 100
-                rsi = 100
-            else:
-                # Calculate RS and RSI
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
+            closes = indicators.bars_to_array(price_data, newest_first=True)
+            rsi = float(indicators.rsi(closes, period)[-1])
             
             return {
                 "value": rsi,
@@ -720,7 +761,7 @@ class PolygonClient:
         Calculate Moving Average Convergence Divergence (MACD) from price data
         
         Args:
-            price_data: List of price bars
+            price_data: List of price bars, newest first
             fast_period: Fast EMA period (default: 12)
             slow_period: Slow EMA period (default: 26)
             signal_period: Signal line period (default: 9)
@@ -733,35 +774,13 @@ class PolygonClient:
             return None
             
         try:
-            # Extract closing prices in reverse order to get chronological order
-            closes = [bar['c'] for bar in reversed(price_data)]
-            
-            # Calculate fast and slow EMAs
-            fast_ema = self._calculate_ema(closes, fast_period)
-            slow_ema = self._calculate_ema(closes, slow_period)
-            
-            if not fast_ema or not slow_ema:
-                return None
-                
-            # Calculate MACD line
-            macd_line = fast_ema[-1] - slow_ema[-1]
-            
-            # Calculate all MACD values for signal line
-            macd_values = [fast_ema[i] - slow_ema[i] for i in range(max(len(fast_ema), len(slow_ema)))]
-            
-            # Calculate signal line (EMA of MACD)
-            signal_line = self._calculate_ema(macd_values, signal_period)
-            
-            if not signal_line:
-                return None
-                
-            # MACD histogram
-            histogram = macd_line - signal_line[-1]
+            closes = indicators.bars_to_array(price_data, newest_first=True)
+            macd_line, signal_line, histogram = indicators.macd(closes, fast_period, slow_period, signal_period)
             
             return {
-                "value": macd_line,
-                "signal": signal_line[-1],
-                "histogram": histogram,
+                "value": float(macd_line[-1]),
+                "signal": float(signal_line[-1]),
+                "histogram": float(histogram[-1]),
                 "fast_period": fast_period,
                 "slow_period": slow_period,
                 "signal_period": signal_period,
@@ -777,29 +796,16 @@ class PolygonClient:
         Calculate Exponential Moving Average (EMA)
         
         Args:
-            values: List of values to calculate EMA for
+            values: List of values to calculate EMA for, oldest first
             period: EMA period
             
         Returns:
-            List of EMA values or None if error
+            List of EMA values (starting at the SMA seed) or None if error
         """
         if len(values) < period:
             return None
             
-        # Calculate multiplier
-        multiplier = 2 / (period + 1)
-        
-        # Calculate first EMA using SMA
-        sma = sum(values[:period]) / period
-        
-        # Calculate EMAs
-        emas = [sma]
-        
-        for i in range(period, len(values)):
-            ema = (values[i] - emas[-1]) * multiplier + emas[-1]
-            emas.append(ema)
-            
-        return emas
+        return indicators.ema(values, period)[period - 1:].tolist()
     
     def _calculate_bollinger_bands(self, price_data: List[Dict[str, Any]], 
                                  period: int = 20, std_dev: float = 2.0) -> Optional[Dict[str, Any]]:
@@ -807,7 +813,7 @@ class PolygonClient:
         Calculate Bollinger Bands from price data
         
         Args:
-            price_data: List of price bars
+            price_data: List of price bars, newest first
             period: Bollinger Band period (default: 20)
             std_dev: Standard deviation multiplier (default: 2.0)
             
@@ -819,19 +825,10 @@ class PolygonClient:
             return None
             
         try:
-            # Extract closing prices in reverse order
-            closes = [bar['c'] for bar in reversed(price_data[:period])]
-            
-            # Calculate middle band (SMA)
-            middle_band = sum(closes) / period
-            
-            # Calculate standard deviation
-            variance = sum([(x - middle_band) ** 2 for x in closes]) / period
-            stdev = variance ** 0.5
-            
-            # Calculate upper and lower bands
-            upper_band = middle_band + (std_dev * stdev)
-            lower_band = middle_band - (std_dev * stdev)
+            # Only the latest window matters for the current bands
+            closes = indicators.bars_to_array(price_data[:period], newest_first=True)
+            upper, middle, lower = indicators.bollinger_bands(closes, period, std_dev)
+            upper_band, middle_band, lower_band = float(upper[-1]), float(middle[-1]), float(lower[-1])
             
             # Get current price
             current_price = price_data[0]['c']
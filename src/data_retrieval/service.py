@@ -1,15 +1,18 @@
 import time
 import uuid
+import asyncio
 import threading
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from src.config import config
 from src.utils import get_logger, redis_client, RSIData, PriceCandle, PriceHistory, MarketStatus
+from src.utils.price_cache import price_cache
 from src.data_retrieval.taapi_client import taapi_client
 from src.data_retrieval.news_client import news_client
 from src.data_retrieval.crypto_news_client import crypto_news_client
 from src.data_retrieval.polygon_client import PolygonClient
+from src.data_retrieval.async_engine import AsyncRetrievalEngine
 
 logger = get_logger("data_retrieval_service")
 
@@ -32,6 +35,16 @@ class DataRetrievalService:
         # Create an instance of PolygonClient
         self.polygon_client = PolygonClient() if self.use_polygon else None
         
+        # Fetches every symbol concurrently, bounded per provider
+        self.retrieval_engine = AsyncRetrievalEngine(
+            poll_interval=self.poll_interval,
+            price_history_interval=self.price_history_interval,
+            price_history_limit=self.price_history_limit,
+            use_polygon=self.use_polygon,
+            fetch_news=self.use_news_strategy,
+            build_price_history=self._build_price_history
+        )
+        
         logger.info(f"Data Retrieval Service initialized with symbols: {', '.join(self.symbols)}")
         logger.info(f"Poll interval: {self.poll_interval} seconds")
         logger.info(f"Use news strategy: {self.use_news_strategy}")
@@ -94,137 +107,13 @@ class DataRetrievalService:
                 time.sleep(10)  # Shorter sleep in case of error
     
     def fetch_all_data(self):
-        """Fetch all data types for all symbols"""
-        for symbol in self.symbols:
-            try:
-                # Check if the symbol is a crypto pair or a stock
-                is_crypto = "/" in symbol
-                is_stock = not is_crypto
-                
-                logger.info(f"Fetching data for {symbol} ({'crypto' if is_crypto else 'stock'})")
-                
-                # For stocks, use Polygon.io API if available
-                if is_stock and self.use_polygon:
-                    logger.info(f"Fetching Polygon.io data for stock symbol {symbol}")
-                    self.fetch_polygon_data(symbol)
-                
-                # For crypto, or if enabled for stocks with RSI
-                if is_crypto or (is_stock and config.taapi.fetch_for_stocks):
-                    logger.info(f"Fetching TAAPI data for {symbol}")
-                    # Fetch RSI data
-                    self.fetch_rsi_data(symbol)
-                    
-                    # Fetch price history for charting
-                    self.fetch_price_history(symbol)
-                
-                # Fetch news for the symbol if news strategy is enabled
-                if self.use_news_strategy:
-                    if is_crypto and self.use_crypto_news:
-                        # Use crypto-specific news client for crypto
-                        logger.info(f"Fetching crypto news for {symbol}")
-                        crypto_news_client.fetch_news(symbol)
-                    else:
-                        # Use regular news client for stocks
-                        logger.info(f"Fetching regular news for {symbol}")
-                        news_client.fetch_news(symbol)
-            except Exception as e:
-                logger.error(f"Error fetching data for {symbol}: {str(e)}")
-                
-        # Update the last poll timestamp in Redis
-        redis_client.set('last_data_poll', datetime.now().isoformat())
-        logger.info("Data fetch cycle completed")
-
-    def _run_service(self):
         """
-        Main service loop - fetches RSI data at regular intervals
+        Fetch all data types for all symbols concurrently and store them in
+        Redis in one pipeline (see AsyncRetrievalEngine)
         """
-        while self.should_run:
-            try:
-                # For TAAPI's free tier (1 request per 15 seconds), process all symbols
-                # at consistent intervals to respect rate limits
-                symbols_count = len(self.symbols)
-                if symbols_count > 0:
-                    # Fixed 16 second interval between API calls for TAAPI free tier
-                    # (slightly more than the 15-second minimum to be safe)
-                    time_between_symbols = 16
-                    logger.info(f"Processing {symbols_count} symbols with {time_between_symbols} seconds between each")
-                
-                    # Process all symbols in sequence
-                    for i, symbol in enumerate(self.symbols):
-                        start_time = time.time()
-                        logger.info(f"Fetching data for {symbol}")
-                        
-                        try:
-                            # Get RSI data for the symbol
-                            rsi_data = taapi_client.get_rsi(symbol)
-                            if rsi_data:
-                                # Store in Redis
-                                redis_key = f"rsi:{symbol}"
-                                # Set longer TTL to ensure data is still available for main loop processing
-                                redis_client.set_json(redis_key, rsi_data.dict(), ttl=self.poll_interval * 5)
-                                logger.info(f"Stored RSI data for {symbol}: {rsi_data.value}")
-                                
-                                # Get AI decision immediately after getting the data
-                                from src.ai_decision import ai_decision_service
-                                trade_signal = ai_decision_service.get_decision(rsi_data)
-                                if trade_signal:
-                                    logger.info(f"Generated trade signal for {symbol}: {trade_signal.decision.value}")
-                                    
-                                    # Directly execute the trade after generating the signal
-                                    if trade_signal.decision.value != "hold":
-                                        try:
-                                            # NOTE: To avoid potential validation errors,
-                                            # we'll use the main module signal-driven approach for trade execution
-                                            # rather than executing trades directly from the data retrieval service
-                                            
-                                            # Simply log that we found a trading opportunity
-                                            logger.info(f"Trading opportunity detected for {symbol}: {trade_signal.decision.value}")
-                                            logger.info(f"Signal stored in Redis, will be processed by main loop")
-                                        except Exception as trade_error:
-                                            logger.error(f"Error executing trade from data service: {trade_error}")
-                                            
-                            # Get price data for the symbol
-                            # Add a small delay to respect TAAPI rate limits
-                            time.sleep(2)
-                            price_data = taapi_client.get_price(symbol)
-                            if price_data:
-                                # Store in Redis
-                                redis_key = f"price:{symbol}"
-                                redis_client.set_json(redis_key, price_data, ttl=self.poll_interval * 5)
-                                logger.info(f"Stored price data for {symbol}: {price_data['close']}")
-                                
-                            # Get historical price data for all symbols but stagger them to respect rate limits
-                            # Indexes 0, 1, 2, 3, etc. update on cycles 0, 1, 2, 3, etc.
-                            current_cycle = int(time.time()) // self.poll_interval
-                            if current_cycle % len(self.symbols) == i:
-                                time.sleep(2)  # Add delay to respect rate limits
-                                logger.info(f"Fetching price history for {symbol} on cycle {current_cycle}")
-                                self.update_price_history(symbol)
-                            
-                            # Calculate remaining time to wait based on elapsed time
-                            elapsed = time.time() - start_time
-                            wait_time = max(0, time_between_symbols - elapsed)
-                            
-                            # If this isn't the last symbol, wait before the next one
-                            if i < symbols_count - 1 and wait_time > 0:
-                                logger.debug(f"Waiting {wait_time:.1f} seconds before next symbol...")
-                                time.sleep(wait_time)
-                                
-                        except Exception as symbol_error:
-                            logger.error(f"Error processing symbol {symbol}: {symbol_error}")
-                            # Even on error, respect the rate limit timing
-                            elapsed = time.time() - start_time
-                            wait_time = max(0, time_between_symbols - elapsed)
-                            if i < symbols_count - 1 and wait_time > 0:
-                                time.sleep(wait_time)
-                
-                # After processing all symbols, wait until the next poll interval
-                remaining_time = max(5, self.poll_interval - (time_between_symbols * symbols_count))
-                logger.info(f"Completed processing all symbols. Next poll cycle in {remaining_time:.1f} seconds")
-                time.sleep(remaining_time)
-            except Exception as e:
-                logger.error(f"Error in data retrieval service: {e}")
-                time.sleep(10)  # Sleep briefly before retrying
+        logger.info(f"Fetching data for {len(self.symbols)} symbols")
+        asyncio.run(self.retrieval_engine.run_cycle(self.symbols))
+        logger.info("Data fetch cycle completed")
 
     def get_latest_rsi(self, symbol: str) -> Optional[RSIData]:
         """
@@ -273,15 +162,48 @@ class DataRetrievalService:
         Returns:
             PriceHistory object if successful, None if failed
         """
-        interval = self.price_history_interval
-        limit = self.price_history_limit
-        
         # Fetch historical price data
-        price_history_data = taapi_client.get_price_history(symbol, interval, limit)
+        price_history_data = taapi_client.get_price_history(symbol, self.price_history_interval, self.price_history_limit)
         if not price_history_data:
             logger.warning(f"Failed to get historical price data for {symbol}")
             return None
             
+        price_history = self._build_price_history(symbol, price_history_data)
+        if not price_history:
+            return None
+        
+        # Store in Redis with a much longer TTL to prevent charts disappearing
+        redis_key = f"price_history:{symbol}"
+        serialized_data = price_history.dict()
+        # Use 24 hours instead of 10x poll interval to maintain persistent chart data
+        redis_client.set_json(redis_key, serialized_data, ttl=86400) 
+        last_candle = max(price_history.candles, key=lambda c: c.timestamp)
+        price_cache.set(symbol, last_candle.close, last_candle.timestamp.timestamp(), source="taapi_candles")
+        logger.info(f"Stored price history for {symbol}: {len(price_history.candles)} candles with 24-hour TTL")
+        
+        # Verify data was stored correctly
+        try:
+            verification = redis_client.get_json(redis_key)
+            if verification and 'candles' in verification:
+                logger.info(f"Verification: Redis has {len(verification['candles'])} candles for {symbol}")
+            else:
+                logger.error(f"Failed to verify price history data in Redis for {symbol}")
+        except Exception as e:
+            logger.error(f"Error verifying Redis data for {symbol}: {e}")
+        
+        return price_history
+    
+    def _build_price_history(self, symbol: str, price_history_data: List[Dict[str, Any]]) -> Optional[PriceHistory]:
+        """
+        Convert raw TAAPI candles into a PriceHistory with per-candle market status
+        
+        Args:
+            symbol: Trading symbol
+            price_history_data: Candles from TaapiClient.parse_candles
+            
+        Returns:
+            PriceHistory object, or None if no candle could be converted
+        """
         # Log the raw data format to help diagnose issues
         logger.debug(f"Raw price history data for {symbol}: {len(price_history_data)} candles")
         if price_history_data and len(price_history_data) > 0:
@@ -360,31 +282,12 @@ class DataRetrievalService:
             logger.info(f"Market status summary for {symbol}: {status_counts}")
             
         # Create PriceHistory object
-        price_history = PriceHistory(
+        return PriceHistory(
             symbol=symbol,
-            interval=interval,
+            interval=self.price_history_interval,
             candles=candles
         )
         
-        # Store in Redis with a much longer TTL to prevent charts disappearing
-        redis_key = f"price_history:{symbol}"
-        serialized_data = price_history.dict()
-        # Use 24 hours instead of 10x poll interval to maintain persistent chart data
-        redis_client.set_json(redis_key, serialized_data, ttl=86400) 
-        logger.info(f"Stored price history for {symbol}: {len(candles)} candles with 24-hour TTL")
-        
-        # Verify data was stored correctly
-        try:
-            verification = redis_client.get_json(redis_key)
-            if verification and 'candles' in verification:
-                logger.info(f"Verification: Redis has {len(verification['candles'])} candles for {symbol}")
-            else:
-                logger.error(f"Failed to verify price history data in Redis for {symbol}")
-        except Exception as e:
-            logger.error(f"Error verifying Redis data for {symbol}: {e}")
-        
-        return price_history
-        
     def get_latest_price_history(self, symbol: str) -> Optional[PriceHistory]:
         """
         Get the latest price history data for a symbol from Redis
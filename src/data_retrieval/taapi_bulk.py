@@ -0,0 +1,150 @@
+"""
+Query builder for the TAAPI /bulk endpoint.
+
+A bulk request carries several "constructs" (one symbol and interval each),
+and each construct carries up to MAX_INDICATORS_PER_CONSTRUCT indicators.
+Packing RSI, the latest candle and chart candles for many symbols into a
+few bulk requests lets the whole universe refresh within one rate limit
+window, since TAAPI counts a bulk request as a single request.
+"""
+
+from datetime import datetime
+from typing import Dict, Any, List, Tuple, Callable, Optional
+
+from src.utils import get_logger, RSIData
+from src.data_retrieval.taapi_client import taapi_client
+
+logger = get_logger("taapi_bulk")
+
+# TAAPI limit on indicators per construct
+MAX_INDICATORS_PER_CONSTRUCT = 20
+
+# Result kinds
+KIND_RSI = "rsi"
+KIND_PRICE = "price"
+KIND_PRICE_HISTORY = "price_history"
+
+class TaapiBulkQuery:
+    """
+    Collects RSI, price and price-history requests for many symbols and packs
+    them into as few /bulk request bodies as the plan allows
+    """
+
+    def __init__(self, max_constructs: int = 1, rsi_period: int = 14):
+        """
+        Args:
+            max_constructs: Constructs allowed per bulk request by the TAAPI plan
+            rsi_period: RSI period
+        """
+        self.max_constructs = max(1, max_constructs)
+        self.rsi_period = rsi_period
+        # (symbol, interval) -> indicator list, in insertion order
+        self._constructs: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+
+    def _add(self, symbol: str, interval: str, indicator: Dict[str, Any]):
+        self._constructs.setdefault((symbol, interval), []).append(indicator)
+
+    @staticmethod
+    def _indicator_id(symbol: str, kind: str) -> str:
+        return f"{symbol}|{kind}"
+
+    def add_rsi(self, symbol: str, interval: str = "1m") -> "TaapiBulkQuery":
+        self._add(symbol, interval, {"id": self._indicator_id(symbol, KIND_RSI),
+                                     "indicator": "rsi", "period": self.rsi_period})
+        return self
+
+    def add_price(self, symbol: str, interval: str = "1m") -> "TaapiBulkQuery":
+        self._add(symbol, interval, {"id": self._indicator_id(symbol, KIND_PRICE), "indicator": "candle"})
+        return self
+
+    def add_price_history(self, symbol: str, interval: str, limit: int) -> "TaapiBulkQuery":
+        self._add(symbol, interval, {"id": self._indicator_id(symbol, KIND_PRICE_HISTORY),
+                                     "indicator": "candle", "results": limit})
+        return self
+
+    def __len__(self):
+        return sum(len(indicators) for indicators in self._constructs.values())
+
+    def _construct(self, symbol: str, interval: str, indicators: List[Dict[str, Any]]) -> Dict[str, Any]:
+        construct = taapi_client.request_params(symbol, interval=interval)
+        construct.pop("secret")
+        construct["indicators"] = indicators
+        return construct
+
+    def payloads(self, secret: str) -> List[Dict[str, Any]]:
+        """
+        Build the JSON bodies to POST to /bulk
+
+        Returns:
+            List of request bodies, each with at most max_constructs constructs
+        """
+        constructs = []
+        for (symbol, interval), indicators in self._constructs.items():
+            for start in range(0, len(indicators), MAX_INDICATORS_PER_CONSTRUCT):
+                constructs.append(self._construct(symbol, interval, indicators[start:start + MAX_INDICATORS_PER_CONSTRUCT]))
+
+        return [{"secret": secret, "construct": constructs[start:start + self.max_constructs]}
+                for start in range(0, len(constructs), self.max_constructs)]
+
+    def unpack(self, responses: List[Optional[Dict[str, Any]]],
+               build_price_history: Callable[[str, List[Dict[str, Any]]], Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Map bulk responses back to symbols
+
+        Args:
+            responses: Parsed /bulk responses (None for failed requests)
+            build_price_history: Converts raw candles into a PriceHistory
+
+        Returns:
+            symbol -> {"rsi": RSIData, "price": dict, "price_history": PriceHistory},
+            with only the kinds that succeeded
+        """
+        intervals = {indicator["id"]: interval
+                     for (_, interval), indicators in self._constructs.items()
+                     for indicator in indicators}
+        results: Dict[str, Dict[str, Any]] = {}
+
+        for response in responses:
+            for entry in (response or {}).get("data", []):
+                symbol, _, kind = str(entry.get("id", "")).rpartition("|")
+                result = entry.get("result")
+                if entry.get("errors") or not result or kind not in (KIND_RSI, KIND_PRICE, KIND_PRICE_HISTORY):
+                    logger.warning(f"TAAPI bulk error for {entry.get('id')}: {entry.get('errors') or 'no result'}")
+                    continue
+
+                try:
+                    if kind == KIND_RSI:
+                        value = result.get("value")
+                        if value is None:
+                            continue
+                        results.setdefault(symbol, {})[kind] = RSIData(
+                            symbol=symbol, value=float(value),
+                            interval=intervals.get(entry["id"], "1m"), timestamp=datetime.now()
+                        )
+                    elif kind == KIND_PRICE:
+                        results.setdefault(symbol, {})[kind] = {
+                            "symbol": symbol,
+                            "timestamp": datetime.now().isoformat(),
+                            "open": result.get("open"),
+                            "high": result.get("high"),
+                            "low": result.get("low"),
+                            "close": result.get("close"),
+                            "volume": result.get("volume", 0)
+                        }
+                    else:
+                        price_history = build_price_history(symbol, taapi_client.parse_candles(_candle_rows(result)))
+                        if price_history:
+                            results.setdefault(symbol, {})[kind] = price_history
+                except (ValueError, TypeError, AttributeError) as e:
+                    logger.error(f"Error unpacking TAAPI bulk {kind} for {symbol}: {e}")
+
+        return results
+
+def _candle_rows(result: Any) -> List[Dict[str, Any]]:
+    """Candles as a list of dicts, whether TAAPI returned rows or one list per field"""
+    if isinstance(result, list):
+        return result
+    fields = {key: value for key, value in result.items() if isinstance(value, list)}
+    if not fields:
+        return [result]
+    return [{key: values[i] for key, values in fields.items()} for i in range(min(len(v) for v in fields.values()))]
@@ -10,6 +10,7 @@ import pytz
 import json
 
 from src.utils import get_logger, RSIData, PriceHistory, PriceCandle, MarketStatus
+from src.utils.rate_limiter import get_rate_limiter, LANE_LIVE
 from src.config import config
 
 logger = get_logger("taapi_client")
@@ -19,8 +20,9 @@ class TaapiClient:
         self.api_key = config.taapi.api_key
         self.rsi_period = config.taapi.rsi_period
         self.base_url = "https://api.taapi.io"
-        self.last_request_time = 0
-        self.min_request_interval = 16  # Minimum time between requests in seconds for free tier
+        # Quota shared with every other process using this API key (TAAPI_RATE_LIMIT)
+        self.rate_limiter = get_rate_limiter("taapi", self.api_key)
+        self.min_request_interval = self.rate_limiter.interval
         self.retry_count = 0
         self.max_retries = 3
         self.backoff_factor = 2  # Exponential backoff factor
@@ -65,22 +67,48 @@ class TaapiClient:
             # The API will use the type=stocks parameter instead
             return symbol, None
             
-    def _wait_for_rate_limit(self):
+    def request_params(self, symbol: str, **extra) -> Dict[str, Any]:
         """
-        Wait if needed to respect API rate limits
+        Build query parameters for a TAAPI request
+        
+        Args:
+            symbol: Trading symbol (e.g., BTC/USD or AAPL)
+            **extra: Endpoint parameters such as interval, period or limit
+            
+        Returns:
+            Parameters with secret, normalized symbol and exchange or type
         """
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < self.min_request_interval:
-            # Calculate wait time with jitter to avoid request alignment
-            wait_time = self.min_request_interval - time_since_last_request
-            jitter = random.uniform(0, 2)  # Add random jitter between 0-2 seconds
-            wait_time += jitter
-            logger.debug(f"Rate limiting: Waiting {wait_time:.2f} seconds before next request")
-            time.sleep(wait_time)
+        normalized_symbol, exchange = self._normalize_symbol(symbol)
+        params = {"secret": self.api_key, "symbol": normalized_symbol, **extra}
+        
+        # Exchange for crypto symbols, type for stock symbols
+        if exchange:
+            params["exchange"] = exchange
+        if not self.crypto_pattern.match(symbol):
+            params["type"] = "stocks"
+        return params
+    
+    @staticmethod
+    def parse_candles(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add an integer "timestamp" to each candle of a /bulk/candles response
+        """
+        candles = []
+        for candle in data:
+            timestamp = candle.get("timestampHuman")
+            if timestamp:
+                # Convert to timestamp integer
+                dt = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+                candle["timestamp"] = int(dt.timestamp())
             
-        self.last_request_time = time.time()
+            candles.append(candle)
+        return candles
+    
+    def _wait_for_rate_limit(self, lane: str = LANE_LIVE):
+        """
+        Wait for a request slot from the shared TAAPI quota
+        """
+        self.rate_limiter.acquire(lane)
     
     def _handle_rate_limit(self, response):
         """
@@ -97,7 +125,9 @@ class TaapiClient:
                 # Add jitter
                 backoff_time += random.uniform(1, 5)
                 logger.warning(f"Rate limited (429). Retry {self.retry_count}/{self.max_retries} after {backoff_time:.1f}s")
-                time.sleep(backoff_time)
+                # Hold every process sharing the key, then wait for our own slot
+                self.rate_limiter.backoff(backoff_time)
+                self._wait_for_rate_limit()
                 return True
             else:
                 logger.error(f"Max retries ({self.max_retries}) exceeded for rate limit")
@@ -358,20 +388,7 @@ class TaapiClient:
                 # Handle successful response
                 if response.status_code == 200:
                     try:
-                        data = response.json()
-                        
-                        # Process all candles
-                        candles = []
-                        for candle in data:
-                            # Add timestamp to each candle
-                            timestamp = candle.get("timestampHuman")
-                            if timestamp:
-                                # Convert to timestamp integer
-                                dt = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
-                                candle["timestamp"] = int(dt.timestamp())
-                            
-                            candles.append(candle)
-                            
+                        candles = self.parse_candles(response.json())
                         logger.info(f"Got {len(candles)} historical candles for {symbol}")
                         return candles
                     except (ValueError, KeyError) as e:
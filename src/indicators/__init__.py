@@ -0,0 +1,48 @@
+"""
+Technical indicator library for TraderMagic.
+NumPy implementations shared by the live strategies, the data clients and the backtester.
+"""
+
+from .technical import (
+    as_float_array,
+    bars_to_array,
+    sma,
+    rolling_std,
+    ema,
+    rsi,
+    macd,
+    bollinger_bands,
+    true_range,
+    atr,
+    pct_change,
+    rolling_volatility,
+    annualized_volatility,
+)
+from .streaming import (
+    RollingWindow,
+    StreamingEMA,
+    StreamingRSI,
+    StreamingMACD,
+    SymbolIndicatorState,
+)
+
+__all__ = [
+    "as_float_array",
+    "bars_to_array",
+    "sma",
+    "rolling_std",
+    "ema",
+    "rsi",
+    "macd",
+    "bollinger_bands",
+    "true_range",
+    "atr",
+    "pct_change",
+    "rolling_volatility",
+    "annualized_volatility",
+    "RollingWindow",
+    "StreamingEMA",
+    "StreamingRSI",
+    "StreamingMACD",
+    "SymbolIndicatorState",
+]
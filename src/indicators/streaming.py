@@ -0,0 +1,386 @@
+"""
+Incremental (streaming) indicators.
+
+Each indicator consumes one value at a time in O(1) and produces the same
+numbers as the batch functions in technical.py for the same input series.
+`preview(value)` returns what the indicator would read after `update(value)`
+without changing its state, which lets callers evaluate a still-forming bar
+and only commit it once it is final. All state round-trips through
+`to_dict()`/`from_dict()` so it can be persisted as JSON.
+"""
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer that tracks the mean and variance of its contents
+
+    Mean and sum of squared deviations are updated with Welford's method when
+    a value is added or replaced, and recomputed exactly from the buffer once
+    per full rotation so floating-point drift cannot accumulate.
+    """
+
+    def __init__(self, period: int):
+        if period <= 0:
+            raise ValueError("period must be positive")
+        self.period = period
+        self.values: List[float] = []
+        self.index = 0  # Slot holding the oldest value once the buffer is full
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    @property
+    def ready(self) -> bool:
+        return self.count == self.period
+
+    def _next_stats(self, value: float) -> Tuple[float, float, int]:
+        """Mean, M2 and count after adding value (oldest value evicted when full)"""
+        if not self.ready:
+            count = self.count + 1
+            delta = value - self.mean
+            mean = self.mean + delta / count
+            return mean, self.m2 + delta * (value - mean), count
+        oldest = self.values[self.index]
+        mean = self.mean + (value - oldest) / self.period
+        m2 = self.m2 + (value - oldest) * (value - mean + oldest - self.mean)
+        return mean, max(m2, 0.0), self.period
+
+    def update(self, value: float):
+        """Add a value, evicting the oldest one when the window is full"""
+        self.mean, self.m2, _ = self._next_stats(value)
+        if not self.ready:
+            self.values.append(value)
+            return
+        self.values[self.index] = value
+        self.index = (self.index + 1) % self.period
+        if self.index == 0:
+            self.mean = math.fsum(self.values) / self.period
+            self.m2 = math.fsum((v - self.mean) ** 2 for v in self.values)
+
+    @staticmethod
+    def _std(m2: float, count: int, ddof: int) -> Optional[float]:
+        if count - ddof <= 0:
+            return None
+        return math.sqrt(m2 / (count - ddof))
+
+    def std(self, ddof: int = 0) -> Optional[float]:
+        """Standard deviation of the window, or None until it is full"""
+        return self._std(self.m2, self.count, ddof) if self.ready else None
+
+    def value(self) -> Optional[float]:
+        """Mean of the window (SMA), or None until it is full"""
+        return self.mean if self.ready else None
+
+    def preview(self, value: float, ddof: int = 0) -> Tuple[Optional[float], Optional[float]]:
+        """(mean, std) the window would report after update(value)"""
+        mean, m2, count = self._next_stats(value)
+        if count < self.period:
+            return None, None
+        return mean, self._std(m2, count, ddof)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"period": self.period, "values": self.values, "index": self.index,
+                "mean": self.mean, "m2": self.m2}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RollingWindow":
+        window = cls(data["period"])
+        window.values = [float(v) for v in data["values"]]
+        window.index = data["index"]
+        window.mean = data["mean"]
+        window.m2 = data["m2"]
+        return window
+
+
+class StreamingEMA:
+    """
+    Exponential moving average seeded with the SMA of the first `period` values
+
+    Args:
+        period: Lookback period
+        alpha: Smoothing factor; defaults to 2 / (period + 1). Pass 1 / period
+            for Wilder smoothing.
+    """
+
+    def __init__(self, period: int, alpha: Optional[float] = None):
+        if period <= 0:
+            raise ValueError("period must be positive")
+        self.period = period
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.current: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.current is not None
+
+    def preview(self, value: float) -> Optional[float]:
+        """EMA after update(value), without changing state"""
+        if self.current is not None:
+            return self.current + self.alpha * (value - self.current)
+        if self.count + 1 == self.period:
+            return (self.seed_sum + value) / self.period
+        return None
+
+    def update(self, value: float) -> Optional[float]:
+        if self.current is None:
+            self.seed_sum += value
+        self.current = self.preview(value)
+        self.count += 1
+        return self.current
+
+    def value(self) -> Optional[float]:
+        return self.current
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"period": self.period, "alpha": self.alpha, "count": self.count,
+                "seed_sum": self.seed_sum, "current": self.current}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamingEMA":
+        ema = cls(data["period"], data["alpha"])
+        ema.count = data["count"]
+        ema.seed_sum = data["seed_sum"]
+        ema.current = data["current"]
+        return ema
+
+
+def _rsi_from_averages(avg_gain: Optional[float], avg_loss: Optional[float]) -> Optional[float]:
+    if avg_gain is None or avg_loss is None:
+        return None
+    if avg_loss == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+class StreamingRSI:
+    """Wilder's RSI fed one closing price at a time"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.avg_gain = StreamingEMA(period, alpha=1.0 / period)
+        self.avg_loss = StreamingEMA(period, alpha=1.0 / period)
+
+    @property
+    def ready(self) -> bool:
+        return self.avg_loss.ready
+
+    def preview(self, close: float) -> Optional[float]:
+        if self.prev_close is None:
+            return None
+        change = close - self.prev_close
+        return _rsi_from_averages(self.avg_gain.preview(max(change, 0.0)),
+                                  self.avg_loss.preview(max(-change, 0.0)))
+
+    def update(self, close: float) -> Optional[float]:
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            self.avg_gain.update(max(change, 0.0))
+            self.avg_loss.update(max(-change, 0.0))
+        self.prev_close = close
+        return self.value()
+
+    def value(self) -> Optional[float]:
+        return _rsi_from_averages(self.avg_gain.value(), self.avg_loss.value())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"period": self.period, "prev_close": self.prev_close,
+                "avg_gain": self.avg_gain.to_dict(), "avg_loss": self.avg_loss.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamingRSI":
+        rsi = cls(data["period"])
+        rsi.prev_close = data["prev_close"]
+        rsi.avg_gain = StreamingEMA.from_dict(data["avg_gain"])
+        rsi.avg_loss = StreamingEMA.from_dict(data["avg_loss"])
+        return rsi
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram fed one closing price at a time"""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.fast = StreamingEMA(fast_period)
+        self.slow = StreamingEMA(slow_period)
+        self.signal = StreamingEMA(signal_period)
+
+    @staticmethod
+    def _combine(fast: Optional[float], slow: Optional[float],
+                 signal: Optional[float]) -> Dict[str, Optional[float]]:
+        line = fast - slow if fast is not None and slow is not None else None
+        histogram = line - signal if line is not None and signal is not None else None
+        return {"macd": line, "signal": signal, "histogram": histogram}
+
+    def preview(self, close: float) -> Dict[str, Optional[float]]:
+        fast, slow = self.fast.preview(close), self.slow.preview(close)
+        signal = self.signal.preview(fast - slow) if fast is not None and slow is not None else None
+        return self._combine(fast, slow, signal)
+
+    def update(self, close: float) -> Dict[str, Optional[float]]:
+        fast, slow = self.fast.update(close), self.slow.update(close)
+        if fast is not None and slow is not None:
+            self.signal.update(fast - slow)
+        return self.value()
+
+    def value(self) -> Dict[str, Optional[float]]:
+        return self._combine(self.fast.value(), self.slow.value(), self.signal.value())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"fast": self.fast.to_dict(), "slow": self.slow.to_dict(), "signal": self.signal.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamingMACD":
+        macd = cls()
+        macd.fast = StreamingEMA.from_dict(data["fast"])
+        macd.slow = StreamingEMA.from_dict(data["slow"])
+        macd.signal = StreamingEMA.from_dict(data["signal"])
+        return macd
+
+
+class SymbolIndicatorState:
+    """
+    Streaming indicator bundle for one symbol's bar series
+
+    Bars are committed in order with `commit(bar)` (Polygon-style dicts with
+    't' in ms and 'c'). `snapshot(bar)` reports every indicator as of a bar
+    that may still be forming, using preview so the bar can be committed
+    later once it is final.
+
+    Args:
+        rsi_period: Wilder RSI period
+        ma_short_period: Short SMA period
+        ma_long_period: Long SMA period
+        volatility_period: Number of returns in the rolling volatility window
+        macd_periods: (fast, slow, signal) MACD periods
+        periods_per_year: Annualization factor for volatility
+    """
+
+    def __init__(self, rsi_period: int = 14, ma_short_period: int = 20, ma_long_period: int = 50,
+                 volatility_period: int = 20, macd_periods: Tuple[int, int, int] = (12, 26, 9),
+                 periods_per_year: int = 252):
+        self.params = {
+            "rsi_period": rsi_period,
+            "ma_short_period": ma_short_period,
+            "ma_long_period": ma_long_period,
+            "volatility_period": volatility_period,
+            "macd_periods": list(macd_periods),
+            "periods_per_year": periods_per_year,
+        }
+        self.last_timestamp: Optional[int] = None
+        self.last_close: Optional[float] = None
+        self.bars = 0
+        self.prev_ma_short: Optional[float] = None
+        self.prev_ma_long: Optional[float] = None
+        self.rsi = StreamingRSI(rsi_period)
+        self.ma_short = RollingWindow(ma_short_period)
+        self.ma_long = RollingWindow(ma_long_period)
+        self.returns = RollingWindow(volatility_period)
+        self.macd = StreamingMACD(*macd_periods)
+
+    def _annualize(self, std: Optional[float]) -> Optional[float]:
+        if std is None:
+            return None
+        return std * math.sqrt(self.params["periods_per_year"])
+
+    def commit(self, bar: Dict[str, Any]):
+        """Apply a finished bar to every indicator"""
+        close = float(bar["c"])
+        self.prev_ma_short = self.ma_short.value()
+        self.prev_ma_long = self.ma_long.value()
+        if self.last_close:
+            self.returns.update(close / self.last_close - 1.0)
+        self.rsi.update(close)
+        self.ma_short.update(close)
+        self.ma_long.update(close)
+        self.macd.update(close)
+        self.last_close = close
+        self.last_timestamp = bar.get("t")
+        self.bars += 1
+
+    def snapshot(self, bar: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Current indicator values
+
+        Args:
+            bar: Newest bar, not yet committed; None to report the committed state
+
+        Returns:
+            Dictionary of indicator values (None where not yet warmed up).
+            prev_ma_short/prev_ma_long are the averages one bar earlier.
+        """
+        if bar is None:
+            macd = self.macd.value()
+            return {
+                "timestamp": self.last_timestamp,
+                "close": self.last_close,
+                "bars": self.bars,
+                "rsi": self.rsi.value(),
+                "ma_short": self.ma_short.value(),
+                "ma_long": self.ma_long.value(),
+                "prev_ma_short": self.prev_ma_short,
+                "prev_ma_long": self.prev_ma_long,
+                "volatility": self._annualize(self.returns.std(ddof=1)),
+                "macd": macd["macd"],
+                "macd_signal": macd["signal"],
+                "macd_histogram": macd["histogram"],
+            }
+
+        close = float(bar["c"])
+        volatility = None
+        if self.last_close:
+            _, std = self.returns.preview(close / self.last_close - 1.0, ddof=1)
+            volatility = self._annualize(std)
+        macd = self.macd.preview(close)
+        return {
+            "timestamp": bar.get("t"),
+            "close": close,
+            "bars": self.bars + 1,
+            "rsi": self.rsi.preview(close),
+            "ma_short": self.ma_short.preview(close)[0],
+            "ma_long": self.ma_long.preview(close)[0],
+            "prev_ma_short": self.ma_short.value(),
+            "prev_ma_long": self.ma_long.value(),
+            "volatility": volatility,
+            "macd": macd["macd"],
+            "macd_signal": macd["signal"],
+            "macd_histogram": macd["histogram"],
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "params": self.params,
+            "last_timestamp": self.last_timestamp,
+            "last_close": self.last_close,
+            "bars": self.bars,
+            "prev_ma_short": self.prev_ma_short,
+            "prev_ma_long": self.prev_ma_long,
+            "rsi": self.rsi.to_dict(),
+            "ma_short": self.ma_short.to_dict(),
+            "ma_long": self.ma_long.to_dict(),
+            "returns": self.returns.to_dict(),
+            "macd": self.macd.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SymbolIndicatorState":
+        params = data["params"]
+        state = cls(params["rsi_period"], params["ma_short_period"], params["ma_long_period"],
+                    params["volatility_period"], tuple(params["macd_periods"]), params["periods_per_year"])
+        state.last_timestamp = data["last_timestamp"]
+        state.last_close = data["last_close"]
+        state.bars = data["bars"]
+        state.prev_ma_short = data["prev_ma_short"]
+        state.prev_ma_long = data["prev_ma_long"]
+        state.rsi = StreamingRSI.from_dict(data["rsi"])
+        state.ma_short = RollingWindow.from_dict(data["ma_short"])
+        state.ma_long = RollingWindow.from_dict(data["ma_long"])
+        state.returns = RollingWindow.from_dict(data["returns"])
+        state.macd = StreamingMACD.from_dict(data["macd"])
+        return state
@@ -0,0 +1,247 @@
+"""
+Vectorized technical indicators.
+
+Every function takes prices in chronological order (oldest first) as anything
+array-like and returns float64 arrays of the same length, with NaN for the
+warm-up bars where the indicator is not yet defined.
+"""
+import math
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Largest growth factor allowed inside one closed-form EWM block; keeps the
+# scaled cumulative sums far from float64 overflow
+_EWM_MAX_GROWTH = 1e100
+
+
+def as_float_array(values: Sequence[float]) -> np.ndarray:
+    """Return values as a contiguous 1-D float64 array (no copy if already one)"""
+    return np.ascontiguousarray(values, dtype=np.float64).reshape(-1)
+
+
+def bars_to_array(bars: List[Dict[str, Any]], field: str = "c", newest_first: bool = False) -> np.ndarray:
+    """
+    Extract one field from a list of bar dicts into a chronological float64 array
+
+    Args:
+        bars: Price bars, e.g. Polygon aggregates ({'c': ..., 'h': ..., ...})
+        field: Bar field to extract
+        newest_first: Set when bars are sorted newest first (Polygon "desc")
+
+    Returns:
+        Array of field values, oldest first
+    """
+    values = np.fromiter((bar[field] for bar in bars), dtype=np.float64, count=len(bars))
+    return values[::-1].copy() if newest_first else values
+
+
+def _ewm(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """
+    Evaluate y[t] = (1 - alpha) * y[t-1] + alpha * values[t] with y[-1] = seed.
+
+    The recurrence is solved in closed form block by block:
+    y[t] = d^(t+1) * (y0 + alpha * cumsum(values[k] * d^-(k+1))) with d = 1 - alpha.
+    Blocks are sized so d^-blocksize stays bounded, which keeps it stable.
+    """
+    n = values.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[:] = values
+        return out
+
+    block = max(1, min(n, int(math.log(_EWM_MAX_GROWTH) / -math.log(decay))))
+    powers = decay ** np.arange(1, block + 1, dtype=np.float64)
+    inverse_powers = 1.0 / powers
+
+    prev = seed
+    for start in range(0, n, block):
+        chunk = values[start:start + block]
+        size = chunk.shape[0]
+        acc = np.cumsum(chunk * inverse_powers[:size])
+        acc *= alpha
+        acc += prev
+        acc *= powers[:size]
+        out[start:start + size] = acc
+        prev = acc[-1]
+    return out
+
+
+def sma(values: Sequence[float], period: int) -> np.ndarray:
+    """Simple moving average over a trailing window of `period` values"""
+    x = as_float_array(values)
+    out = np.full(x.shape[0], np.nan)
+    if period <= 0 or x.shape[0] < period:
+        return out
+    csum = np.cumsum(np.concatenate(([0.0], x)))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def rolling_std(values: Sequence[float], period: int, ddof: int = 0) -> np.ndarray:
+    """
+    Trailing standard deviation over a window of `period` values
+
+    Args:
+        values: Input series
+        period: Window length
+        ddof: Delta degrees of freedom (0 = population, 1 = sample)
+    """
+    x = as_float_array(values)
+    out = np.full(x.shape[0], np.nan)
+    if period <= ddof or x.shape[0] < period:
+        return out
+    windows = np.lib.stride_tricks.sliding_window_view(x, period)
+    out[period - 1:] = windows.std(axis=1, ddof=ddof)
+    return out
+
+
+def ema(values: Sequence[float], period: int) -> np.ndarray:
+    """
+    Exponential moving average with alpha = 2 / (period + 1), seeded with the
+    SMA of the first `period` values (first defined value at index period - 1)
+    """
+    x = as_float_array(values)
+    out = np.full(x.shape[0], np.nan)
+    if period <= 0 or x.shape[0] < period:
+        return out
+    seed = x[:period].mean()
+    out[period - 1] = seed
+    out[period:] = _ewm(x[period:], 2.0 / (period + 1), seed)
+    return out
+
+
+def _wilder_smooth(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing (alpha = 1 / period) seeded with the mean of the first `period` values"""
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] < period:
+        return out
+    seed = values[:period].mean()
+    out[period - 1] = seed
+    out[period:] = _ewm(values[period:], 1.0 / period, seed)
+    return out
+
+
+def rsi(values: Sequence[float], period: int = 14) -> np.ndarray:
+    """
+    Wilder's Relative Strength Index
+
+    The first value (index `period`) uses simple averages of the first
+    `period` gains and losses; later values use Wilder smoothing. RSI is 100
+    whenever the average loss is zero.
+
+    Args:
+        values: Closing prices, oldest first
+        period: Lookback period
+
+    Returns:
+        RSI series with NaN for the first `period` entries
+    """
+    x = as_float_array(values)
+    out = np.full(x.shape[0], np.nan)
+    if period <= 0 or x.shape[0] < period + 1:
+        return out
+
+    changes = np.diff(x)
+    avg_gain = _wilder_smooth(np.maximum(changes, 0.0), period)[period - 1:]
+    avg_loss = _wilder_smooth(np.maximum(-changes, 0.0), period)[period - 1:]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values_rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    values_rsi[avg_loss == 0] = 100.0
+    out[period:] = values_rsi
+    return out
+
+
+def macd(values: Sequence[float], fast_period: int = 12, slow_period: int = 26,
+         signal_period: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Moving Average Convergence Divergence
+
+    Returns:
+        Tuple of (macd line, signal line, histogram). The MACD line starts at
+        index slow_period - 1 and the signal line (an EMA of the MACD line)
+        signal_period - 1 bars later.
+    """
+    x = as_float_array(values)
+    macd_line = ema(x, fast_period) - ema(x, slow_period)
+    signal_line = np.full(x.shape[0], np.nan)
+
+    start = slow_period - 1
+    if x.shape[0] > start:
+        signal_line[start:] = ema(macd_line[start:], signal_period)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger_bands(values: Sequence[float], period: int = 20,
+                    num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands using the population standard deviation
+
+    Returns:
+        Tuple of (upper, middle, lower) bands
+    """
+    middle = sma(values, period)
+    width = num_std * rolling_std(values, period, ddof=0)
+    return middle + width, middle, middle - width
+
+
+def true_range(high: Sequence[float], low: Sequence[float], close: Sequence[float]) -> np.ndarray:
+    """True range; the first bar has no previous close and uses high - low"""
+    h, l, c = as_float_array(high), as_float_array(low), as_float_array(close)
+    tr = h - l
+    if tr.shape[0] > 1:
+        prev_close = c[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(h[1:] - prev_close), np.abs(l[1:] - prev_close)))
+    return tr
+
+
+def atr(high: Sequence[float], low: Sequence[float], close: Sequence[float], period: int = 14) -> np.ndarray:
+    """
+    Wilder's Average True Range
+
+    Like RSI, the first value (index `period`) is the mean of the true ranges
+    of bars 1..period, followed by Wilder smoothing.
+    """
+    tr = true_range(high, low, close)
+    out = np.full(tr.shape[0], np.nan)
+    if period <= 0 or tr.shape[0] < period + 1:
+        return out
+    out[1:] = _wilder_smooth(tr[1:], period)
+    return out
+
+
+def pct_change(values: Sequence[float]) -> np.ndarray:
+    """Simple returns; the first entry is NaN"""
+    x = as_float_array(values)
+    out = np.full(x.shape[0], np.nan)
+    if x.shape[0] > 1:
+        out[1:] = x[1:] / x[:-1] - 1.0
+    return out
+
+
+def rolling_volatility(values: Sequence[float], period: int = 20) -> np.ndarray:
+    """Sample standard deviation of simple returns over a trailing window (not annualized)"""
+    returns = pct_change(values)
+    out = np.full(returns.shape[0], np.nan)
+    if returns.shape[0] > period:
+        out[1:] = rolling_std(returns[1:], period, ddof=1)
+    return out
+
+
+def annualized_volatility(values: Sequence[float], periods_per_year: int = 252) -> float:
+    """
+    Annualized volatility of simple returns over the whole series
+
+    Returns:
+        Sample standard deviation of returns times sqrt(periods_per_year),
+        as a fraction; NaN with fewer than two returns
+    """
+    returns = pct_change(values)[1:]
+    if returns.shape[0] < 2:
+        return float("nan")
+    return float(returns.std(ddof=1) * math.sqrt(periods_per_year))
@@ -1,13 +1,15 @@
 import os
 import time
 import signal
+import socket
 import threading
 import sys
 import uuid
+from typing import List
 from datetime import datetime
 
 from src.config import config
-from src.utils import get_logger
+from src.utils import get_logger, RSIData, TradeSignal
 from src.data_retrieval import data_retrieval_service
 from src.ai_decision import ai_decision_service
 
@@ -111,164 +113,153 @@ def setup_services():
         else:
             logger.info(f"No existing trade result for {symbol}")
 
+def _debug_result(trade_signal: TradeSignal):
+    """Successful mock trade result used in ALPACA_DEBUG_MODE"""
+    from src.utils import TradeResult
+    
+    symbol = trade_signal.symbol
+    mock_price = 45000.0 if "BTC" in symbol else 3000.0
+    mock_quantity = 0.001 if "BTC" in symbol else 0.01
+    
+    logger.info(f"DEBUG MODE: Created mock trade result for {symbol}")
+    return TradeResult(
+        symbol=symbol,
+        decision=trade_signal.decision,
+        order_id=f"debug-{uuid.uuid4()}",
+        quantity=mock_quantity,
+        price=mock_price,
+        status="executed",
+        error=None,
+        timestamp=datetime.now()
+    )
+
+def _store_result(symbol: str, result):
+    """Log a trade result and keep executed ones in Redis for a day"""
+    from src.utils import redis_client
+    from src.trade_execution.order_tracker import order_tracker
+    
+    if not result:
+        logger.error(f"No result returned from trade execution for {symbol}")
+        return
+    
+    logger.info(f"Trade result for {symbol}: {result.status}")
+    if result.status == "executed":
+        logger.info(f"Order executed for {symbol}: {result.quantity} @ ~${result.price:.2f}")
+        
+        # Keep fills that already arrived on the trade updates stream
+        result = order_tracker.merge(result)
+        
+        # Always save the result to Redis with a long TTL
+        redis_key = f"trade_result:{symbol}"
+        success = redis_client.set_json(redis_key, result.dict(), ttl=86400)  # 24 hour TTL
+        if success:
+            logger.info(f"Saved trade result to Redis key: {redis_key}")
+        else:
+            logger.error(f"Failed to save trade result to Redis key {redis_key}!")
+    else:
+        logger.warning(f"Trade not executed. Status: {result.status}, Error: {result.error}")
+
+def execute_signals(signals: List[TradeSignal]):
+    """
+    Execute the trade signals of one signal stream read together and store their results
+    
+    Args:
+        signals: Trade signals to execute
+    """
+    orders = []
+    for trade_signal in signals:
+        if trade_signal.decision.value == "hold":
+            logger.info(f"Decision is to hold for {trade_signal.symbol}, no trade executed")
+        else:
+            logger.info(f"Executing trade for {trade_signal.symbol} with decision: {trade_signal.decision.value}")
+            orders.append(trade_signal)
+    if not orders:
+        return
+    
+    # FORCE SUCCESS FOR TESTING 
+    if os.getenv("ALPACA_DEBUG_MODE") == "true":
+        results = [_debug_result(trade_signal) for trade_signal in orders]
+    else:
+        # Normal execution, submitted concurrently
+        results = trade_execution_service.execute_batch(orders)
+    
+    for trade_signal, result in zip(orders, results):
+        _store_result(trade_signal.symbol, result)
+
 def main_loop():
     """
     Main application loop that coordinates the three components
+    
+    Signals are executed by a signal stream consumer as soon as they are
+    published, each read's signals as one concurrent batch; the loop itself
+    only generates legacy AI decisions for symbols that have no signal yet.
     """
     global running
     
     logger.info(f"Starting main loop with poll interval: {config.trading.poll_interval} seconds")
     logger.info(f"Trading symbols: {config.trading.symbols}")
+    logger.info(f"ALPACA_DEBUG_MODE: {os.getenv('ALPACA_DEBUG_MODE') == 'true'}")
+    
+    # Import for direct redis access
+    from src.utils import redis_client, signal_stream
     
-    # Check if ALPACA_DEBUG_MODE is enabled
-    import os
-    debug_mode = os.getenv("ALPACA_DEBUG_MODE") == "true"
-    logger.info(f"ALPACA_DEBUG_MODE: {debug_mode}")
+    # Execute signals from the stream as they arrive
+    consumer_thread = threading.Thread(
+        target=signal_stream.consume,
+        args=(execute_signals,),
+        kwargs={
+            "consumer": f"main-{socket.gethostname()}",
+            "should_run": lambda: running,
+            "block_ms": 1000,
+            "batch": True
+        },
+        daemon=True
+    )
+    consumer_thread.start()
+    logger.info("Signal stream consumer started")
     
     # Wait initial time for the data retrieval service to get first data
     initial_wait = min(30, config.trading.poll_interval)
     logger.info(f"Waiting {initial_wait} seconds for initial data collection...")
     time.sleep(initial_wait)
     
-    # Import for direct redis access
-    from src.utils import redis_client
-    import json
-    
     # Initialize execution count for tracking
     execution_count = 0
     
-    # Try to import the strategy manager
-    try:
-        from src.strategies.strategy_manager import strategy_manager
-        has_strategy_manager = True
-        logger.info("Strategy manager available for trading decisions")
-    except ImportError:
-        has_strategy_manager = False
-        logger.warning("Strategy manager not available, using legacy decision process")
-    
     while running:
         try:
             # Log iteration start
             execution_count += 1
             logger.info(f"Main loop iteration #{execution_count} starting")
             
-            # Get all signals at once to avoid decision delays
-            all_signals = {}
-            
-            # First check for signals from the strategy manager
-            if has_strategy_manager:
-                for symbol in config.trading.symbols:
-                    # Check if there's a signal from the strategy manager
-                    signal_key = f"signal:{symbol}"
-                    signal_data = redis_client.get_json(signal_key)
-                    
-                    if signal_data:
-                        # Convert the signal data to a TradeSignal object
-                        from src.utils import TradeSignal, TradeDecision
-                        
-                        # Check if the signal is recent (within the last 5 minutes)
-                        signal_time = datetime.fromisoformat(signal_data.get('timestamp', '')) if 'timestamp' in signal_data else None
-                        if signal_time and (datetime.now() - signal_time).total_seconds() < 300:
-                            # Create a trade signal from the data
-                            signal = TradeSignal(
-                                symbol=signal_data.get('symbol'),
-                                decision=TradeDecision(signal_data.get('decision')),
-                                confidence=signal_data.get('confidence', 0.0),
-                                timestamp=signal_time
-                            )
-                            
-                            all_signals[symbol] = signal
-                            logger.info(f"Using strategy manager signal for {symbol}: {signal.decision.value}")
-            
-            # If we don't have signals from the strategy manager, use the legacy approach
-            for symbol in config.trading.symbols:
-                if symbol not in all_signals:
-                    # Get the latest trade signal (already calculated by data_retrieval service)
-                    signal = ai_decision_service.get_latest_signal(symbol)
-                    if signal:
-                        all_signals[symbol] = signal
-                        logger.info(f"Retrieved legacy signal for {symbol}: {signal.decision.value}")
-                    else:
-                        logger.warning(f"No signal found for {symbol}")
-                        # Check if RSI data is available
-                        rsi_data = data_retrieval_service.get_latest_rsi(symbol)
-                        if rsi_data:
-                            logger.info(f"RSI data available for {symbol}: {rsi_data.value}, generating signal")
-                            # Try to generate a signal
-                            signal = ai_decision_service.get_decision(rsi_data)
-                            if signal:
-                                all_signals[symbol] = signal
-                                logger.info(f"Generated new legacy signal for {symbol}: {signal.decision.value}")
+            # Fetch every symbol's signal and RSI data in a single round trip
+            symbols = config.trading.symbols
+            batch = redis_client.mget_json(
+                [f"signal:{symbol}" for symbol in symbols] + [f"rsi:{symbol}" for symbol in symbols]
+            )
+            signal_by_symbol = dict(zip(symbols, batch[:len(symbols)]))
+            rsi_by_symbol = dict(zip(symbols, batch[len(symbols):]))
             
-            # Log how many signals we found
-            logger.info(f"Found {len(all_signals)} signals for execution")
+            # Generate legacy signals for symbols without one; they are
+            # published to the signal stream and executed by the consumer
+            needs_decision = []
+            for symbol in symbols:
+                if signal_by_symbol.get(symbol):
+                    continue
+                
+                logger.warning(f"No signal found for {symbol}")
+                # Check if RSI data is available
+                rsi_payload = rsi_by_symbol.get(symbol)
+                if rsi_payload:
+                    rsi_data = RSIData(**rsi_payload)
+                    logger.info(f"RSI data available for {symbol}: {rsi_data.value}, generating signal")
+                    needs_decision.append(rsi_data)
             
-            # Execute trades for all signals that aren't "hold"
-            for symbol, signal in all_signals.items():
-                try:
-                    if signal.decision.value != "hold":
-                        logger.info(f"Executing trade for {symbol} with decision: {signal.decision.value}")
-                        
-                        # FORCE SUCCESS FOR TESTING 
-                        if debug_mode:
-                            # Force a successful trade result in debug mode
-                            from src.utils import TradeResult
-                            import uuid
-                            from datetime import datetime
-                            
-                            mock_price = 45000.0 if "BTC" in symbol else 3000.0
-                            mock_quantity = 0.001 if "BTC" in symbol else 0.01
-                            
-                            # Create a successful trade result
-                            result = TradeResult(
-                                symbol=symbol,
-                                decision=signal.decision,
-                                order_id=f"debug-{uuid.uuid4()}",
-                                quantity=mock_quantity,
-                                price=mock_price,
-                                status="executed",
-                                error=None,
-                                timestamp=datetime.now()
-                            )
-                            
-                            logger.info(f"DEBUG MODE: Created mock trade result for {symbol}")
-                        else:
-                            # Normal execution
-                            result = trade_execution_service.execute_trade(signal)
-                        
-                        # Handle the result
-                        if result:
-                            logger.info(f"Trade result for {symbol}: {result.status}")
-                            if result.status == "executed":
-                                logger.info(f"Order executed for {symbol}: {result.quantity} @ ~${result.price:.2f}")
-                                
-                                # Debug the result that's being saved in Redis
-                                logger.info(f"Trade result object: {result}")
-                                
-                                # Always save the result to Redis with a long TTL
-                                redis_key = f"trade_result:{symbol}"
-                                success = redis_client.set_json(redis_key, result.dict(), ttl=86400)  # 24 hour TTL
-                                logger.info(f"Saved trade result to Redis key: {redis_key} (success: {success})")
-                                
-                                # Check if it was saved properly
-                                saved_data = redis_client.get_json(redis_key)
-                                if saved_data:
-                                    logger.info(f"Verified Redis data for {redis_key}: {json.dumps(saved_data)}")
-                                else:
-                                    logger.error(f"Failed to verify Redis data for {redis_key}!")
-                            else:
-                                logger.warning(f"Trade not executed. Status: {result.status}, Error: {result.error}")
-                        else:
-                            logger.error(f"No result returned from trade execution for {symbol}")
-                    else:
-                        logger.info(f"Decision is to hold for {symbol}, no trade executed")
-                except Exception as trade_error:
-                    logger.error(f"Error executing trade for {symbol}: {trade_error}")
-                    import traceback
-                    logger.error(f"Traceback: {traceback.format_exc()}")
+            # One batched LLM request covers every symbol that needs a decision
+            if needs_decision:
+                for symbol, trade_signal in ai_decision_service.get_decisions(needs_decision).items():
+                    logger.info(f"Generated new legacy signal for {symbol}: {trade_signal.decision.value}")
             
-            # Sleep less than the poll interval to check for new signals sooner
-            # This ensures we catch new signals shortly after they're generated
             sleep_time = min(60, max(30, config.trading.poll_interval // 2))
             logger.info(f"Main loop iteration #{execution_count} completed. Sleeping for {sleep_time} seconds")
             time.sleep(sleep_time)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Benchmark for BacktestEngine daily data lookups on synthetic bars.
+
+Compares the per-date row index with the former per-day boolean filter
+(df[df['timestamp'].dt.date == day]) and times full engine runs as the
+number of years and symbols grows, event-driven and vectorized.
+"""
+
+import os
+import sys
+import argparse
+import time
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.backtest.backtest_engine import BacktestEngine
+from src.strategies.base_strategy import BaseStrategy
+from src.strategies.polygon_strategy import PolygonStrategy
+from src.strategies.rsi_strategy import RSIStrategy
+
+class HoldStrategy(BaseStrategy):
+    """Strategy that never trades, so the benchmark measures engine overhead only"""
+
+    name = "Hold"
+    description = "Never trades"
+
+    def process_data(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return None
+
+    def get_required_data(self) -> List[str]:
+        return []
+
+def make_synthetic_bars(years: int, symbols: int, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """Daily OHLCV bars on business days for `symbols` random-walk tickers"""
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2010-01-01", periods=252 * years)
+    timestamps = (days.values.astype("datetime64[ms]").astype(np.int64))
+    data = {}
+    for i in range(symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(days))))
+        data[f"SYM{i:03d}"] = pd.DataFrame({
+            "t": timestamps,
+            "o": close * (1 + rng.normal(0, 0.002, len(days))),
+            "h": close * 1.01,
+            "l": close * 0.99,
+            "c": close,
+            "v": rng.integers(1_000, 1_000_000, len(days)),
+        })
+    return data
+
+def bench_lookups(engine: BacktestEngine, frames: Dict[str, pd.DataFrame], legacy_days: int):
+    """Time daily lookups with the date index and with the legacy boolean filter"""
+    start = time.perf_counter()
+    engine.date_index = {symbol: engine._build_date_index(df) for symbol, df in frames.items()}
+    build_s = time.perf_counter() - start
+
+    common_dates = engine._find_common_dates(frames)
+    lookups = len(common_dates) * len(frames)
+
+    start = time.perf_counter()
+    for day in common_dates:
+        for symbol in frames:
+            engine._get_day_data(symbol, frames, day)
+    indexed_s = time.perf_counter() - start
+
+    # The legacy filter is far too slow to run over the full grid; time a
+    # sample of days and extrapolate to the same number of lookups
+    sample = common_dates[:legacy_days]
+    start = time.perf_counter()
+    for day in sample:
+        for symbol, df in frames.items():
+            df[df['timestamp'].dt.date == day.date()]
+    legacy_per_lookup = (time.perf_counter() - start) / max(1, len(sample) * len(frames))
+
+    print(f"  date index build:      {build_s * 1000:10.1f} ms")
+    print(f"  indexed lookups:       {indexed_s:10.2f} s  ({indexed_s / lookups * 1e6:.1f} us/lookup, {lookups} lookups)")
+    print(f"  boolean-filter lookups:{legacy_per_lookup * lookups:10.2f} s  "
+          f"({legacy_per_lookup * 1e6:.1f} us/lookup, extrapolated from {len(sample)} days)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BacktestEngine daily lookups")
+    parser.add_argument("--years", type=int, default=10, help="Years of daily bars")
+    parser.add_argument("--symbols", type=int, default=100, help="Number of symbols")
+    parser.add_argument("--legacy-days", type=int, default=20, help="Days sampled for the boolean filter timing")
+    parser.add_argument("--full", action="store_true", help="Also time complete engine runs at increasing sizes")
+    args = parser.parse_args()
+
+    engine = BacktestEngine()
+
+    print(f"Lookups: {args.years} years x {args.symbols} symbols")
+    raw = make_synthetic_bars(args.years, args.symbols)
+    frames = {symbol: engine._prepare_symbol_data(df) for symbol, df in raw.items()}
+    bench_lookups(engine, frames, args.legacy_days)
+
+    if not args.full:
+        return
+
+    print("\nFull engine runs (HoldStrategy)")
+    strategy = HoldStrategy()
+    for years, symbols in [(1, 10), (2, 20), (5, 50), (args.years, args.symbols)]:
+        data = make_synthetic_bars(years, symbols)
+        start = time.perf_counter()
+        engine.run_backtest(strategy, list(data), "2010-01-01", "2030-01-01", data=data)
+        elapsed = time.perf_counter() - start
+        bars = years * 252 * symbols
+        print(f"  {years:>2}y x {symbols:>3} symbols: {elapsed:8.2f} s  ({elapsed / bars * 1e6:.1f} us/bar)")
+
+    print("\nVectorized runs")
+    data = make_synthetic_bars(args.years, args.symbols)
+    bars = args.years * 252 * args.symbols
+    for strategy in (RSIStrategy(), PolygonStrategy()):
+        start = time.perf_counter()
+        engine.run_backtest(strategy, list(data), "2010-01-01", "2030-01-01", data=data, vectorized=True)
+        elapsed = time.perf_counter() - start
+        print(f"  {strategy.name:<16} {args.years:>2}y x {args.symbols:>3} symbols: {elapsed * 1000:8.1f} ms  "
+              f"({elapsed / bars * 1e6:.2f} us/bar)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark comparing the NumPy indicator library with the pure-Python
+loops it replaced
+"""
+
+import os
+import sys
+import argparse
+import timeit
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src import indicators
+
+def python_rsi_series(closes, period=14):
+    """Pure-Python Wilder RSI (the former run_rsi_test implementation)"""
+    changes = [closes[i] - closes[i-1] for i in range(1, len(closes))]
+    avg_gain = sum(max(0, c) for c in changes[:period]) / period
+    avg_loss = sum(max(0, -c) for c in changes[:period]) / period
+    series = [None] * period
+    series.append(100 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss))
+    for change in changes[period:]:
+        avg_gain = (avg_gain * (period - 1) + max(0, change)) / period
+        avg_loss = (avg_loss * (period - 1) + max(0, -change)) / period
+        series.append(100 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss))
+    return series
+
+def python_ema(values, period):
+    """Pure-Python SMA-seeded EMA (the former PolygonClient implementation)"""
+    multiplier = 2 / (period + 1)
+    emas = [sum(values[:period]) / period]
+    for value in values[period:]:
+        emas.append((value - emas[-1]) * multiplier + emas[-1])
+    return emas
+
+def python_sma_series(values, period):
+    """Pure-Python trailing SMA recomputed per bar"""
+    return [sum(values[i - period + 1:i + 1]) / period for i in range(period - 1, len(values))]
+
+def bench(label, func, repeat):
+    """Time func and return the best per-call time in milliseconds"""
+    best = min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+    print(f"  {label:<28} {best:10.3f} ms")
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark technical indicator implementations")
+    parser.add_argument("--bars", type=int, default=100_000, help="Number of bars in the series")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    closes = 100 + np.cumsum(rng.normal(0, 1, args.bars))
+    closes_list = closes.tolist()
+
+    print(f"Series length: {args.bars} bars\n")
+    cases = [
+        ("RSI(14)", lambda: python_rsi_series(closes_list, 14), lambda: indicators.rsi(closes, 14)),
+        ("EMA(26)", lambda: python_ema(closes_list, 26), lambda: indicators.ema(closes, 26)),
+        ("SMA(50)", lambda: python_sma_series(closes_list, 50), lambda: indicators.sma(closes, 50)),
+    ]
+
+    for name, python_impl, numpy_impl in cases:
+        print(name)
+        python_ms = bench("pure Python", python_impl, args.repeat)
+        numpy_ms = bench("src.indicators (NumPy)", numpy_impl, args.repeat)
+        print(f"  {'speedup':<28} {python_ms / numpy_ms:10.1f}x\n")
+
+    print("Other indicators (NumPy)")
+    bench("MACD(12, 26, 9)", lambda: indicators.macd(closes), args.repeat)
+    bench("Bollinger(20, 2)", lambda: indicators.bollinger_bands(closes), args.repeat)
+    bench("ATR(14)", lambda: indicators.atr(closes + 1, closes - 1, closes), args.repeat)
+    bench("Rolling volatility(20)", lambda: indicators.rolling_volatility(closes, 20), args.repeat)
+
+if __name__ == "__main__":
+    main()
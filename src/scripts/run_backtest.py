@@ -14,9 +14,13 @@ from typing import List, Dict, Any, Optional
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.backtest.backtest_engine import BacktestEngine
+from src.backtest.sweep import SWEEP_STRATEGIES, parse_param_range, run_sweep
 from src.strategies.base_strategy import BaseStrategy
 from src.strategies.polygon_strategy import PolygonStrategy
-from src.strategies.crypto_strategy import CryptoStrategy
+try:
+    from src.strategies.crypto_strategy import CryptoStrategy
+except ImportError:
+    CryptoStrategy = None
 from src.strategies.rsi_strategy import RSIStrategy
 from src.strategies.news_sentiment_strategy import NewsSentimentStrategy
 from src.config import config
@@ -71,6 +75,20 @@ def parse_args():
     parser.add_argument("--rsi_lower", type=float, default=30,
                         help="RSI lower threshold for signals")
     
+    parser.add_argument("--vectorized", action="store_true",
+                        help="Use the vectorized engine (strategies with generate_signals: rsi, polygon)")
+    
+    # Parameter sweep
+    parser.add_argument("--sweep", action="append", default=[], metavar="NAME=START:STOP:STEP",
+                        help="Sweep a strategy parameter over a range (stop inclusive) or a list "
+                             "(NAME=V1,V2,...); repeat for a grid, e.g. --sweep overbought_threshold=60:80:5")
+    
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for sweeps (default: all cores)")
+    
+    parser.add_argument("--top", type=int, default=20,
+                        help="Number of ranked sweep results to print")
+    
     # Output options
     parser.add_argument("--output_dir", type=str, default="./backtest_results",
                         help="Directory to save results")
@@ -97,6 +115,9 @@ def create_strategy(strategy_name: str, args: argparse.Namespace) -> Optional[Ba
         return strategy
     
     elif strategy_name == "crypto":
+        if CryptoStrategy is None:
+            logger.warning("Crypto strategy is not available, skipping")
+            return None
         strategy = CryptoStrategy()
         strategy.configure({
             "price_change_trigger": args.price_change_trigger,
@@ -106,11 +127,7 @@ def create_strategy(strategy_name: str, args: argparse.Namespace) -> Optional[Ba
     
     elif strategy_name == "rsi":
         strategy = RSIStrategy()
-        strategy.configure({
-            "upper_threshold": args.rsi_upper,
-            "lower_threshold": args.rsi_lower,
-            "enabled": True
-        })
+        strategy.configure(overbought_threshold=args.rsi_upper, oversold_threshold=args.rsi_lower)
         return strategy
     
     elif strategy_name == "news_sentiment":
@@ -170,7 +187,8 @@ def run_backtest(args):
             start_date=args.start_date,
             end_date=args.end_date,
             timeframe=args.timeframe,
-            verbose=args.verbose
+            verbose=args.verbose,
+            vectorized=args.vectorized
         )
         
         # Save results
@@ -231,6 +249,59 @@ def run_backtest(args):
         
         logger.info("="*50)
 
+def run_parameter_sweep(args):
+    """Backtest a grid of strategy parameters in parallel and rank the results"""
+    if args.strategy not in SWEEP_STRATEGIES:
+        logger.error(f"Sweeps support --strategy {' or '.join(SWEEP_STRATEGIES)}")
+        return
+    
+    param_ranges = dict(parse_param_range(spec) for spec in args.sweep)
+    symbols = [s.strip() for s in args.symbols.split(",")]
+    os.makedirs(args.output_dir, exist_ok=True)
+    
+    engine_kwargs = {
+        "initial_capital": args.initial_capital,
+        "commission": args.commission,
+        "risk_per_trade": args.risk_per_trade,
+    }
+    
+    # Fetch bars once; workers read them from shared memory
+    engine = BacktestEngine(**engine_kwargs)
+    data = {}
+    for symbol in symbols:
+        logger.info(f"Fetching historical data for {symbol}")
+        bars = engine.polygon.get_historical_data_for_backtest(symbol, args.start_date, args.end_date, args.timeframe)
+        if bars:
+            data[symbol] = bars
+        else:
+            logger.warning(f"No historical data found for {symbol}, skipping")
+    
+    if not args.vectorized:
+        logger.warning("Running the sweep with the event-driven engine; add --vectorized for large grids")
+    
+    table = run_sweep(
+        strategy_name=args.strategy,
+        param_ranges=param_ranges,
+        data=data,
+        start_date=args.start_date,
+        end_date=args.end_date,
+        engine_kwargs=engine_kwargs,
+        vectorized=args.vectorized,
+        max_workers=args.workers
+    )
+    if table.empty:
+        logger.error("Sweep produced no results")
+        return
+    
+    output_file = os.path.join(args.output_dir, f"sweep_{args.strategy}.csv")
+    table.to_csv(output_file)
+    
+    logger.info("\n" + "="*50)
+    logger.info(f"PARAMETER SWEEP ({len(table)} runs, top {min(args.top, len(table))})")
+    logger.info("="*50)
+    logger.info("\n" + table.head(args.top).to_string(float_format=lambda v: f"{v:.2f}"))
+    logger.info(f"Full results saved to {output_file}")
+
 if __name__ == "__main__":
     args = parse_args()
     
@@ -240,4 +311,7 @@ if __name__ == "__main__":
     else:
         logging.basicConfig(level=logging.WARNING)
     
-    run_backtest(args) 
\ No newline at end of file
+    if args.sweep:
+        run_parameter_sweep(args)
+    else:
+        run_backtest(args) 
\ No newline at end of file
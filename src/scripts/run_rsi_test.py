@@ -23,6 +23,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 from src.config import config
 from src.utils import get_logger
+from src import indicators
 from src.data_retrieval.polygon_client import PolygonClient
 from src.strategies.polygon_strategy import PolygonStrategy
 
@@ -56,17 +57,27 @@ def fetch_historical_data(symbol, days=120):
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
     
-    bars = client.get_aggregates(
+    # Served from the on-disk bar cache after the first run
+    polygon_bars = client.get_historical_data_for_backtest(
         symbol,
         start_date.strftime("%Y-%m-%d"),
         end_date.strftime("%Y-%m-%d"),
         "1d"
     )
     
-    if not bars:
+    if not polygon_bars:
         logger.error(f"No data available for {symbol}")
         return None
     
+    bars = [{
+        "timestamp": bar['t'],
+        "open": bar.get('o'),
+        "high": bar.get('h'),
+        "low": bar.get('l'),
+        "close": bar.get('c'),
+        "volume": bar.get('v'),
+    } for bar in sorted(polygon_bars, key=lambda bar: bar['t'])]
+    
     logger.info(f"Retrieved {len(bars)} bars for {symbol}")
     return bars
 
@@ -76,45 +87,11 @@ def calculate_rsi_series(bars, period=14):
         logger.error(f"Not enough data points to calculate RSI (need at least {period + 1})")
         return None
     
-    # Extract closing prices
-    closes = [bar.get('close') for bar in bars]
-    
-    # Calculate price changes
-    price_changes = [closes[i] - closes[i-1] for i in range(1, len(closes))]
-    
-    # Initialize RSI series with None values
-    rsi_series = [None] * period
-    
-    # Calculate initial average gains and losses
-    gains = [max(0, change) for change in price_changes[:period]]
-    losses = [max(0, -change) for change in price_changes[:period]]
-    
-    avg_gain = sum(gains) / period
-    avg_loss = sum(losses) / period
-    
-    # Calculate RSI for the first point after the period
-    if avg_loss == 0:
-        rsi = 100
-    else:
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-    
-    rsi_series.append(rsi)
-    
-    # Calculate RSI for the remaining points
-    for i in range(period, len(price_changes)):
-        avg_gain = ((avg_gain * (period - 1)) + max(0, price_changes[i])) / period
-        avg_loss = ((avg_loss * (period - 1)) + max(0, -price_changes[i])) / period
-        
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-        
-        rsi_series.append(rsi)
+    # Wilder RSI over the closing prices; warm-up entries become None
+    closes = indicators.as_float_array([bar.get('close') for bar in bars])
+    rsi_values = indicators.rsi(closes, period)
     
-    return rsi_series
+    return [None if np.isnan(value) else float(value) for value in rsi_values]
 
 def generate_signals(symbol, bars, period=14, overbought=70, oversold=30):
     """Generate trading signals based on RSI values."""
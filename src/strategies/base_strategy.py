@@ -8,6 +8,11 @@ from src.utils import TradeSignal, get_logger
 
 logger = get_logger("strategies")
 
+# Values in the signal arrays returned by BaseStrategy.generate_signals
+SIGNAL_BUY = 1
+SIGNAL_SELL = -1
+SIGNAL_HOLD = 0
+
 class BaseStrategy(ABC):
     """Base interface for all trading strategies"""
     
@@ -51,6 +56,22 @@ class BaseStrategy(ABC):
             List of required data keys (e.g., ["rsi", "price"])
         """
         pass
+    
+    def generate_signals(self, frame: Any) -> Optional[Any]:
+        """
+        Compute signals for a whole price history at once (vectorized backtests)
+        
+        Strategies that support the vectorized backtest mode override this.
+        
+        Args:
+            frame: pandas DataFrame of bars sorted oldest first, with
+                timestamp/open/high/low/close/volume columns
+            
+        Returns:
+            int8 NumPy array aligned with the frame rows holding SIGNAL_BUY,
+            SIGNAL_SELL or SIGNAL_HOLD, or None if not supported
+        """
+        return None
 
 
 class StrategyRegistry:
@@ -0,0 +1,157 @@
+"""
+Worker pools for evaluating strategies across symbols.
+"""
+
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from typing import Dict, Any, List, Optional, Callable
+
+from src.utils import get_logger
+from src.utils.metrics import LatencyHistogram
+from src.strategies.base_strategy import BaseStrategy, StrategyRegistry
+
+logger = get_logger("strategy_executor")
+
+# Strategy instances created inside process pool workers, one per class
+_worker_strategies: Dict[str, BaseStrategy] = {}
+
+_PLAIN_TYPES = (bool, int, float, str, type(None))
+
+
+def _is_plain(value: Any) -> bool:
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_plain(item) for key, item in value.items())
+    return isinstance(value, _PLAIN_TYPES)
+
+
+def strategy_state(strategy: BaseStrategy) -> Dict[str, Any]:
+    """Public plain-data attributes of a strategy (thresholds, enabled, ...), as set by configure()"""
+    return {name: value for name, value in vars(strategy).items() if not name.startswith("_") and _is_plain(value)}
+
+
+def _process_in_worker(strategy_name: str, state: Dict[str, Any], data: Dict[str, Any]) -> Any:
+    """Run a strategy in a process pool worker, reusing one instance per worker with the parent's settings"""
+    strategy = _worker_strategies.get(strategy_name)
+    if strategy is None:
+        strategy = _worker_strategies[strategy_name] = StrategyRegistry.get_strategy(strategy_name)
+    strategy.__dict__.update(state)
+    return strategy.process_data(data)
+
+
+class StrategyExecutor:
+    """
+    Evaluates symbols in parallel on a thread pool, with a time budget per symbol
+
+    Strategies are I/O bound (Redis reads, Polygon fetches) and run on the
+    symbol's thread; strategy classes listed in process_strategies run in a
+    process pool instead so CPU-heavy analysis does not hold the GIL.
+    Workers keep their own strategy instances: each call ships the parent
+    instance's plain-data attributes (see strategy_state), so configure()
+    and enable/disable carry over, but other state such as clients or
+    incremental indicator state stays per worker. Strategies that depend on
+    such state should run on the thread pool.
+
+    Each strategy call is timed into a histogram at strategy:{name}:latency.
+    """
+
+    def __init__(self, max_workers: int = 4, symbol_timeout: float = 30.0,
+                 process_strategies: Optional[List[str]] = None, process_workers: int = 2):
+        """
+        Args:
+            max_workers: Symbols evaluated at the same time
+            symbol_timeout: Seconds from submission before a symbol's evaluation is abandoned
+            process_strategies: Strategy class names to run in the process pool
+            process_workers: Size of the process pool
+        """
+        self.max_workers = max(1, max_workers)
+        self.symbol_timeout = symbol_timeout
+        self.process_strategies = set(process_strategies or [])
+        self.process_workers = max(1, process_workers)
+        self.thread_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="strategy")
+        self.process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {}
+
+    def latency(self, strategy_name: str) -> LatencyHistogram:
+        """Latency histogram for a strategy"""
+        histogram = self._histograms.get(strategy_name)
+        if histogram is None:
+            histogram = self._histograms[strategy_name] = LatencyHistogram(f"strategy:{strategy_name}:latency")
+        return histogram
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._process_pool_lock:
+            if self.process_pool is None:
+                self.process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+                logger.info(f"Started strategy process pool with {self.process_workers} workers "
+                            f"for {', '.join(sorted(self.process_strategies))}")
+            return self.process_pool
+
+    def run_strategy(self, name: str, strategy: BaseStrategy, data: Dict[str, Any],
+                     deadline: Optional[float] = None) -> Any:
+        """
+        Run one strategy on a symbol's data and record its latency
+
+        Args:
+            name: Strategy class name
+            strategy: Strategy instance (used when running in this process)
+            data: Symbol data for the strategy
+            deadline: time.monotonic() value after which a process pool call is abandoned
+
+        Returns:
+            Whatever the strategy's process_data returns
+
+        Raises:
+            TimeoutError: If a process pool call did not finish before the deadline
+        """
+        started = time.perf_counter()
+        try:
+            if name not in self.process_strategies:
+                return strategy.process_data(data)
+
+            future = self._get_process_pool().submit(_process_in_worker, name, strategy_state(strategy), data)
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                return future.result(timeout=timeout)
+            except TimeoutError:
+                future.cancel()
+                self.latency(name).increment("timeouts")
+                raise
+        finally:
+            self.latency(name).observe(time.perf_counter() - started)
+
+    def evaluate(self, symbols: List[str], process_symbol: Callable[[str, float], Any]):
+        """
+        Evaluate symbols in parallel and wait up to symbol_timeout for them
+
+        process_symbol(symbol, deadline) is called on a pool thread and should
+        stop, dropping its signals, once time.monotonic() passes the deadline.
+        Evaluations that have not started by then are cancelled. A symbol whose
+        previous evaluation is still running is skipped instead of queued again,
+        so a slow symbol only delays itself.
+
+        Args:
+            symbols: Symbols to evaluate
+            process_symbol: Callable taking the symbol and its deadline
+        """
+        deadline = time.monotonic() + self.symbol_timeout
+        futures: Dict[str, Future] = {}
+        for symbol in symbols:
+            previous = self._inflight.get(symbol)
+            if previous is not None and not previous.done():
+                logger.warning(f"Skipping {symbol}: its previous evaluation is still running")
+                continue
+            futures[symbol] = self._inflight[symbol] = self.thread_pool.submit(process_symbol, symbol, deadline)
+
+        if not futures:
+            return
+
+        _, not_done = wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+        for symbol, future in futures.items():
+            if future in not_done:
+                state = "cancelled before starting" if future.cancel() else "still running, signals will be dropped"
+                logger.warning(f"Evaluation of {symbol} exceeded {self.symbol_timeout}s ({state})")
@@ -0,0 +1,110 @@
+"""
+Per-symbol streaming indicator state shared by the strategy manager.
+"""
+
+from typing import Dict, Any, List, Optional, Callable
+from src.indicators import SymbolIndicatorState
+from src.utils import get_logger, redis_client
+
+logger = get_logger("indicator_state")
+
+class IndicatorStateStore:
+    """
+    Keeps a SymbolIndicatorState per symbol in process and mirrors it to Redis
+    (indicators:state:{symbol}) so restarts resume without replaying history.
+
+    Each poll only bars newer than the last committed one are applied. The
+    newest bar is treated as still forming: it is previewed for the snapshot
+    and committed once a later bar arrives.
+    """
+
+    def __init__(self, ttl: int = 7 * 86400):
+        self.ttl = ttl
+        self.states: Dict[str, SymbolIndicatorState] = {}
+
+    def _key(self, symbol: str) -> str:
+        return f"indicators:state:{symbol}"
+
+    def _load(self, symbol: str) -> Optional[SymbolIndicatorState]:
+        state = self.states.get(symbol)
+        if state is not None:
+            return state
+        data = redis_client.get_json(self._key(symbol))
+        if not data:
+            return None
+        try:
+            state = SymbolIndicatorState.from_dict(data)
+            self.states[symbol] = state
+            return state
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Discarding unreadable indicator state for {symbol}: {e}")
+            return None
+
+    def update(self, symbol: str, bars: List[Dict[str, Any]], params: Dict[str, Any],
+               history_loader: Optional[Callable[[], Optional[List[Dict[str, Any]]]]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Advance a symbol's indicators with any new bars and return a snapshot
+
+        Args:
+            symbol: Trading symbol
+            bars: Recent bars ('t' in ms, 'c' close) in any order
+            params: SymbolIndicatorState keyword arguments (periods)
+            history_loader: Optional callable returning a longer bar history,
+                used only when the state has to be (re)built from scratch
+
+        Returns:
+            Snapshot dictionary from SymbolIndicatorState.snapshot or None
+        """
+        bars = sorted((bar for bar in bars if bar.get('t') is not None and bar.get('c') is not None),
+                      key=lambda bar: bar['t'])
+        if not bars:
+            return None
+
+        try:
+            state = self._load(symbol)
+            expected = SymbolIndicatorState(**params).params
+
+            # Rebuild when there is no state, the periods changed, or bars were
+            # missed between the last committed bar and the oldest one we have
+            if state is None or state.params != expected or (
+                    state.last_timestamp is not None and bars[0]['t'] > state.last_timestamp):
+                state, bars = self._rebuild(symbol, bars, params, history_loader)
+
+            latest = bars[-1]
+            changed = False
+            for bar in bars[:-1]:
+                if state.last_timestamp is None or bar['t'] > state.last_timestamp:
+                    state.commit(bar)
+                    changed = True
+
+            if changed:
+                redis_client.set_json(self._key(symbol), state.to_dict(), ttl=self.ttl)
+
+            if state.last_timestamp is not None and latest['t'] <= state.last_timestamp:
+                return state.snapshot()
+            return state.snapshot(latest)
+        except Exception as e:
+            logger.error(f"Error updating indicator state for {symbol}: {e}")
+            return None
+
+    def _rebuild(self, symbol: str, bars: List[Dict[str, Any]], params: Dict[str, Any],
+                 history_loader: Optional[Callable[[], Optional[List[Dict[str, Any]]]]]):
+        """Start a fresh state, merging in a longer history when available"""
+        logger.info(f"Building indicator state for {symbol}")
+        if history_loader:
+            try:
+                history = history_loader() or []
+                merged = {bar['t']: bar for bar in history if bar.get('t') is not None and bar.get('c') is not None}
+                merged.update({bar['t']: bar for bar in bars})
+                bars = [merged[t] for t in sorted(merged)]
+            except Exception as e:
+                logger.warning(f"Could not load bar history for {symbol}: {e}")
+
+        state = SymbolIndicatorState(**params)
+        self.states[symbol] = state
+        return state, bars
+
+    def reset(self, symbol: str):
+        """Drop a symbol's state so it is rebuilt on the next update"""
+        self.states.pop(symbol, None)
+        redis_client.client.delete(self._key(symbol))
@@ -3,12 +3,14 @@ Polygon.io-based trading strategy implementation.
 """
 
 import math
-import statistics
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import datetime, timedelta
+
+import numpy as np
 
 from src.utils import TradeSignal, TradingDecision, get_logger
-from src.strategies.base_strategy import BaseStrategy
+from src import indicators
+from src.strategies.base_strategy import BaseStrategy, SIGNAL_BUY, SIGNAL_SELL, SIGNAL_HOLD
 from src.data_retrieval.polygon_client import PolygonClient
 
 logger = get_logger("polygon_strategy")
@@ -25,6 +27,8 @@ class PolygonStrategy(BaseStrategy):
     def __init__(self):
         """Initialize the Polygon.io strategy with default settings"""
         super().__init__()
+        self.enabled = True
+        
         # Initialize our own instance of PolygonClient
         self.polygon_client = PolygonClient()
         
@@ -54,6 +58,7 @@ class PolygonStrategy(BaseStrategy):
         # Risk management
         self.max_risk_per_trade = 1.0        # Maximum risk percentage per trade
         self.volatility_adjustment = True    # Adjust position size based on volatility
+        self.volatility_period = 20          # Daily returns in the streaming volatility window
         
     def configure(self, config: Dict[str, Any]):
         """
@@ -75,6 +80,7 @@ class PolygonStrategy(BaseStrategy):
         self.ma_long_period = config.get("ma_long_period", self.ma_long_period)
         self.max_risk_per_trade = config.get("max_risk_per_trade", self.max_risk_per_trade)
         self.volatility_adjustment = config.get("volatility_adjustment", self.volatility_adjustment)
+        self.volatility_period = config.get("volatility_period", self.volatility_period)
         
         # RSI settings
         self.rsi_period = config.get("rsi_period", self.rsi_period)
@@ -137,9 +143,42 @@ class PolygonStrategy(BaseStrategy):
                 return None
         
         # Run comprehensive analysis for signal generation
-        return self._generate_comprehensive_signal(symbol, price_bars, data.get("price"))
+        return self._generate_comprehensive_signal(symbol, price_bars, data.get("price"), data.get("indicators"))
+    
+    def load_indicator_history(self, symbol: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch enough bars to warm up every streaming indicator for a symbol
+        
+        Args:
+            symbol: Stock ticker symbol
+            
+        Returns:
+            List of price bars (newest first) or None
+        """
+        limit = max(self.ma_long_period, self.rsi_period, self.volatility_period) + 1
+        from_date = None
+        if self.timespan == "day":
+            # Leave room for weekends and market holidays
+            from_date = (datetime.now() - timedelta(days=int(limit * self.multiplier * 1.6) + 10)).strftime("%Y-%m-%d")
+        return self.polygon_client.get_aggregate_bars(
+            symbol,
+            multiplier=self.multiplier,
+            timespan=self.timespan,
+            from_date=from_date,
+            limit=limit
+        )
+    
+    def indicator_params(self) -> Dict[str, Any]:
+        """Periods for the streaming indicator state maintained by the strategy manager"""
+        return {
+            "rsi_period": self.rsi_period,
+            "ma_short_period": self.ma_short_period,
+            "ma_long_period": self.ma_long_period,
+            "volatility_period": self.volatility_period,
+        }
     
-    def _generate_comprehensive_signal(self, symbol: str, price_bars: List[Dict[str, Any]], current_price: float = None) -> Optional[Dict[str, Any]]:
+    def _generate_comprehensive_signal(self, symbol: str, price_bars: List[Dict[str, Any]], current_price: float = None,
+                                       indicators: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Generate a comprehensive trading signal using multiple analysis methods
         
@@ -147,6 +186,8 @@ class PolygonStrategy(BaseStrategy):
             symbol: The trading symbol
             price_bars: List of price bars from polygon
             current_price: Current price (optional, will use latest bar close if not provided)
+            indicators: Streaming indicator snapshot (see IndicatorStateStore); values
+                that are present replace recomputation over price_bars
             
         Returns:
             Signal dictionary or None if no signal
@@ -163,14 +204,29 @@ class PolygonStrategy(BaseStrategy):
         if current_price is None:
             current_price = latest_bar.get('c')
         
-        # Calculate various indicators
+        # Calculate various indicators, preferring the incrementally maintained
+        # values so we don't rescan the full bar history every poll
+        indicators = indicators or {}
         price_change = self._calculate_price_change(latest_bar, previous_bar)
         volume_analysis = self._analyze_volume(price_bars)
-        moving_averages = self._calculate_moving_averages(price_bars)
-        volatility = self._calculate_volatility(price_bars)
+        
+        ma_values = [indicators.get(k) for k in ("ma_short", "ma_long", "prev_ma_short", "prev_ma_long")]
+        if all(value is not None for value in ma_values):
+            moving_averages = self._analyze_moving_averages(*ma_values)
+        else:
+            moving_averages = self._calculate_moving_averages(price_bars)
+            
+        volatility = indicators.get("volatility")
+        if volatility is not None:
+            volatility *= 100  # Snapshot volatility is a fraction
+        else:
+            volatility = self._calculate_volatility(price_bars)
         
         # Calculate RSI
-        rsi_data = self._analyze_rsi(price_bars)
+        if indicators.get("rsi") is not None:
+            rsi_data = self._analyze_rsi_value(indicators["rsi"])
+        else:
+            rsi_data = self._analyze_rsi(price_bars)
         
         # Initialize signal components
         decision = TradingDecision.HOLD
@@ -345,27 +401,34 @@ class PolygonStrategy(BaseStrategy):
         if len(price_data) < self.ma_long_period:
             return {"signal": TradingDecision.HOLD, "confidence": 0.5}
             
-        # Extract closing prices in chronological order (oldest to newest)
+        # Closing prices in chronological order (oldest to newest), including
+        # the previous bar so we can detect crossovers
         # Note: Polygon data is typically in reverse chronological order
-        closes = [bar['c'] for bar in reversed(price_data[:self.ma_long_period])]
-        
-        if len(closes) < self.ma_long_period:
-            return {"signal": TradingDecision.HOLD, "confidence": 0.5}
+        closes = indicators.bars_to_array(price_data[:self.ma_long_period + 1], newest_first=True)
+        short_ma = indicators.sma(closes, self.ma_short_period)
+        long_ma = indicators.sma(closes, self.ma_long_period)
         
-        # Calculate simple moving averages
-        ma_short = sum(closes[-self.ma_short_period:]) / self.ma_short_period
-        ma_long = sum(closes) / self.ma_long_period
+        ma_short = float(short_ma[-1])
+        ma_long = float(long_ma[-1])
         
-        # Calculate previous day's MAs to detect crossovers
-        prev_closes = [bar['c'] for bar in reversed(price_data[1:self.ma_long_period+1])]
-        if len(prev_closes) >= self.ma_long_period:
-            prev_ma_short = sum(prev_closes[-self.ma_short_period:]) / self.ma_short_period
-            prev_ma_long = sum(prev_closes) / self.ma_long_period
+        # Previous bar's MAs (not available with exactly ma_long_period bars)
+        if len(closes) > self.ma_long_period:
+            prev_ma_short = float(short_ma[-2])
+            prev_ma_long = float(long_ma[-2])
         else:
-            # Not enough data for previous day MA
             prev_ma_short = ma_short
             prev_ma_long = ma_long
         
+        return self._analyze_moving_averages(ma_short, ma_long, prev_ma_short, prev_ma_long)
+    
+    def _analyze_moving_averages(self, ma_short: float, ma_long: float,
+                                 prev_ma_short: float, prev_ma_long: float) -> Dict[str, Any]:
+        """
+        Generate signals from current and previous short/long moving averages
+        
+        Returns:
+            Dictionary with moving average analysis results
+        """
         result = {
             "ma_short": ma_short,
             "ma_long": ma_long,
@@ -423,23 +486,28 @@ class PolygonStrategy(BaseStrategy):
             logger.debug(f"Not enough data for RSI calculation (need {self.rsi_period + 1}, got {len(price_data)})")
             return None
             
-        # We can either calculate RSI directly or use the Polygon client's method
         try:
-            # Use Polygon client's RSI calculation
-            rsi_data = self.polygon_client._calculate_rsi(price_data, self.rsi_period)
-            if not rsi_data or 'value' not in rsi_data:
-                # Fall back to direct calculation
-                rsi_data = self._calculate_rsi_directly(price_data)
-        except Exception as e:
-            logger.warning(f"Error calculating RSI via client, falling back to direct calculation: {str(e)}")
             rsi_data = self._calculate_rsi_directly(price_data)
+        except Exception as e:
+            logger.warning(f"Error calculating RSI: {str(e)}")
+            rsi_data = None
             
         if not rsi_data or 'value' not in rsi_data:
             logger.warning("Failed to calculate RSI")
             return None
             
-        rsi_value = rsi_data['value']
+        return self._analyze_rsi_value(rsi_data['value'])
+    
+    def _analyze_rsi_value(self, rsi_value: float) -> Dict[str, Any]:
+        """
+        Generate signals from an RSI value using the configured thresholds
         
+        Args:
+            rsi_value: Current RSI value
+            
+        Returns:
+            Dictionary with RSI analysis results
+        """
         # Initialize result
         result = {
             "value": rsi_value,
@@ -468,7 +536,7 @@ class PolygonStrategy(BaseStrategy):
     
     def _calculate_rsi_directly(self, price_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Calculate RSI directly from price data (fallback if client method fails)
+        Calculate Wilder RSI directly from price data
         
         Args:
             price_data: List of price bars
@@ -479,32 +547,9 @@ class PolygonStrategy(BaseStrategy):
         if len(price_data) < self.rsi_period + 1:
             return {"value": 50, "signal": TradingDecision.HOLD, "confidence": 0.5}
             
-        # Get closes in chronological order
-        closes = [bar['c'] for bar in reversed(price_data)]
-        
-        gains = []
-        losses = []
-        
-        # Calculate price changes
-        for i in range(1, len(closes)):
-            change = closes[i] - closes[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        # Calculate initial averages
-        avg_gain = sum(gains[:self.rsi_period]) / self.rsi_period
-        avg_loss = sum(losses[:self.rsi_period]) / self.rsi_period
-        
-        # Calculate final RSI
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
+        # Wilder RSI over all bars (chronological order)
+        closes = indicators.bars_to_array(price_data, newest_first=True)
+        rsi = float(indicators.rsi(closes, self.rsi_period)[-1])
             
         return {
             "value": rsi,
@@ -521,26 +566,12 @@ class PolygonStrategy(BaseStrategy):
         if len(price_data) < 5:
             return 0.0
             
-        # Extract closing prices
-        closes = [bar['c'] for bar in price_data]
-        
-        # Calculate daily returns
-        returns = []
-        for i in range(len(closes) - 1):
-            daily_return = (closes[i] / closes[i+1]) - 1
-            returns.append(daily_return)
-        
-        if not returns:
-            return 0.0
-            
-        # Calculate standard deviation of returns
-        try:
-            std_dev = statistics.stdev(returns)
-            # Annualize volatility (assuming daily data, multiply by sqrt(252))
-            annualized_vol = std_dev * math.sqrt(252)
-            return annualized_vol * 100  # Convert to percentage
-        except statistics.StatisticsError:
+        # Annualized volatility of daily returns (assuming daily data)
+        closes = indicators.bars_to_array(price_data, newest_first=True)
+        annualized_vol = indicators.annualized_volatility(closes, periods_per_year=252)
+        if math.isnan(annualized_vol):
             return 0.0
+        return annualized_vol * 100  # Convert to percentage
     
     def _calculate_position_size(self, symbol: str, price_data: List[Dict[str, Any]], volatility: float = None) -> float:
         """
@@ -596,6 +627,78 @@ class PolygonStrategy(BaseStrategy):
         
         return adjusted_amount
     
+    def generate_signals(self, frame) -> np.ndarray:
+        """
+        Vectorized version of _generate_comprehensive_signal's decision over a
+        whole bar history
+        
+        Each bar takes the first non-HOLD vote from price change, volume spike,
+        moving averages and (if enabled) RSI, in that order, exactly as the
+        per-bar analysis does. Confidence weighting is not reproduced.
+        
+        Args:
+            frame: DataFrame of bars (oldest first) with close and volume columns
+            
+        Returns:
+            int8 array of SIGNAL_BUY / SIGNAL_SELL / SIGNAL_HOLD
+        """
+        closes = indicators.as_float_array(frame['close'].values)
+        volumes = indicators.as_float_array(frame['volume'].values) if 'volume' in frame else np.zeros_like(closes)
+        n = len(closes)
+        
+        # 1. Price change versus the previous bar
+        price_change = indicators.pct_change(closes) * 100
+        with np.errstate(invalid='ignore'):
+            price_vote = np.where(price_change > self.price_increase_threshold, SIGNAL_BUY,
+                                  np.where(price_change < self.price_decrease_threshold, SIGNAL_SELL, SIGNAL_HOLD))
+        
+        # 2. Volume spike against the average of the previous four non-zero volumes
+        volume_vote = np.zeros(n, dtype=np.int8)
+        if n >= 5:
+            nonzero = (volumes > 0).astype(np.float64)
+            window_sum = indicators.sma(volumes, 4) * 4
+            window_count = indicators.sma(nonzero, 4) * 4
+            prev_sum = np.concatenate(([np.nan], window_sum[:-1]))
+            prev_count = np.concatenate(([np.nan], window_count[:-1]))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                factor = volumes / (prev_sum / prev_count)
+            spike = (factor >= self.volume_spike_threshold) & (volumes > 0) & (prev_count > 0)
+            spike[:4] = False
+            volume_vote = np.where(spike, np.sign(np.nan_to_num(price_change)), 0).astype(np.int8)
+        
+        # 3. Moving average crossovers and strong trends
+        ma_short = indicators.sma(closes, self.ma_short_period)
+        ma_long = indicators.sma(closes, self.ma_long_period)
+        prev_short = np.concatenate(([np.nan], ma_short[:-1]))
+        prev_long = np.concatenate(([np.nan], ma_long[:-1]))
+        # With exactly ma_long_period bars there is no previous average; reuse the current one
+        prev_short = np.where(np.isnan(prev_long), ma_short, prev_short)
+        prev_long = np.where(np.isnan(prev_long), ma_long, prev_long)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            golden = (ma_short > ma_long) & (prev_short <= prev_long)
+            death = (ma_short < ma_long) & (prev_short >= prev_long)
+            trend = (ma_short - ma_long) / ma_long * 100
+            ma_vote = np.select(
+                [golden, death, ~golden & ~death & (trend > 5), ~golden & ~death & (trend < -5)],
+                [SIGNAL_BUY, SIGNAL_SELL, SIGNAL_BUY, SIGNAL_SELL],
+                SIGNAL_HOLD
+            )
+        
+        # 4. RSI thresholds
+        rsi_vote = np.zeros(n, dtype=np.int8)
+        if self.use_rsi_signals:
+            rsi = indicators.rsi(closes, self.rsi_period)
+            with np.errstate(invalid='ignore'):
+                rsi_vote = np.where(rsi <= self.rsi_oversold, SIGNAL_BUY,
+                                    np.where(rsi >= self.rsi_overbought, SIGNAL_SELL, SIGNAL_HOLD))
+        
+        # Earlier analyses win; later ones only fill in HOLDs
+        signals = price_vote.astype(np.int8)
+        for vote in (volume_vote, ma_vote, rsi_vote):
+            signals = np.where(signals == SIGNAL_HOLD, vote, signals).astype(np.int8)
+        signals[0] = SIGNAL_HOLD  # No previous bar to compare against
+        return signals
+    
     def get_required_data(self) -> List[str]:
         """Get required data keys for this strategy"""
         return ["polygon_data"] 
\ No newline at end of file
@@ -5,8 +5,11 @@ RSI-based trading strategy implementation.
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+import numpy as np
+
 from src.utils import TradeSignal, TradingDecision, get_logger
-from src.strategies.base_strategy import BaseStrategy
+from src import indicators
+from src.strategies.base_strategy import BaseStrategy, SIGNAL_BUY, SIGNAL_SELL, SIGNAL_HOLD
 
 logger = get_logger("rsi_strategy")
 
@@ -25,6 +28,7 @@ class RSIStrategy(BaseStrategy):
         # Default thresholds - more sensitive than standard 30/70
         self.overbought_threshold = 60.0  # Changed from 70.0
         self.oversold_threshold = 40.0    # Changed from 30.0
+        self.rsi_period = 14              # Period used when computing RSI from bars (backtests)
     
     def configure(self, overbought_threshold: float = 60.0, oversold_threshold: float = 40.0):
         """
@@ -100,6 +104,22 @@ class RSIStrategy(BaseStrategy):
             timestamp=datetime.now()
         )
     
+    def generate_signals(self, frame) -> np.ndarray:
+        """
+        Vectorized RSI signals over a whole bar history
+        
+        Args:
+            frame: DataFrame of bars (oldest first) with a close column
+            
+        Returns:
+            int8 array: SIGNAL_BUY where RSI <= oversold, SIGNAL_SELL where RSI >= overbought
+        """
+        rsi = indicators.rsi(frame['close'].values, self.rsi_period)
+        signals = np.full(len(rsi), SIGNAL_HOLD, dtype=np.int8)
+        signals[rsi <= self.oversold_threshold] = SIGNAL_BUY
+        signals[rsi >= self.overbought_threshold] = SIGNAL_SELL
+        return signals
+    
     def get_required_data(self) -> List[str]:
         """Get required data keys for this strategy"""
         return ["rsi"] 
\ No newline at end of file
@@ -8,8 +8,10 @@ import time
 import json
 from datetime import datetime
 
-from src.utils import get_logger, TradeSignal, redis_client
+from src.utils import get_logger, RSIData, TradeSignal, TradingDecision, redis_client, news_index, signal_stream
 from src.strategies.base_strategy import BaseStrategy, StrategyRegistry
+from src.strategies.indicator_state import IndicatorStateStore
+from src.strategies.executor import StrategyExecutor
 
 logger = get_logger("strategy_manager")
 
@@ -26,6 +28,17 @@ class StrategyManager:
         self.polling_interval = 60   # seconds
         self.running = False
         self.poll_thread = None
+        self.news_sentiment_lookback = 20  # newest indexed news items checked for a score
+        self.indicator_store = IndicatorStateStore()
+        
+        # Evaluate symbols in parallel with a time budget per symbol
+        from src.config import config
+        self.executor = StrategyExecutor(
+            max_workers=config.strategies.max_workers,
+            symbol_timeout=config.strategies.symbol_timeout,
+            process_strategies=config.strategies.process_strategies,
+            process_workers=config.strategies.process_workers
+        )
         
         # Initialize with all available strategies
         self._initialize_strategies()
@@ -109,6 +122,10 @@ class StrategyManager:
             })
         return result
     
+    def get_strategy_latency(self) -> Dict[str, Dict[str, Any]]:
+        """Latency histogram snapshots per strategy (see StrategyExecutor)"""
+        return {name: self.executor.latency(name).snapshot() for name in self.active_strategies}
+    
     def process_data(self, symbol: str, data: Dict[str, Any]) -> List[TradeSignal]:
         """
         Process data through all enabled strategies
@@ -180,8 +197,43 @@ class StrategyManager:
         # Store the running state in Redis
         redis_client.client.set('strategy_manager:running', 'false')
     
+    def _wait_for_market_data(self, pubsub, timeout: float):
+        """
+        Wait until the data retrieval service publishes a completed fetch cycle,
+        or until timeout seconds have passed
+        
+        Args:
+            pubsub: PubSub subscribed to market_data_updated, or None to just sleep
+            timeout: Longest time to wait in seconds
+        """
+        deadline = time.monotonic() + timeout
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            # Short waits so stop_polling() is noticed promptly
+            step = min(remaining, 1.0)
+            if pubsub is None:
+                time.sleep(step)
+                continue
+            try:
+                if pubsub.get_message(ignore_subscribe_messages=True, timeout=step):
+                    return
+            except Exception as e:
+                logger.error(f"Error waiting for market data updates: {e}")
+                pubsub = None
+    
     def _polling_loop(self):
         """Background polling loop to fetch data and generate signals"""
+        # Run as soon as new data arrives instead of on a fixed schedule;
+        # the polling interval is the fallback when no update is published
+        try:
+            pubsub = redis_client.client.pubsub()
+            pubsub.subscribe('market_data_updated')
+        except Exception as e:
+            logger.error(f"Could not subscribe to market data updates, polling every {self.polling_interval}s: {e}")
+            pubsub = None
+        
         while self.running:
             logger.debug("Strategy manager polling for data...")
             
@@ -195,19 +247,23 @@ class StrategyManager:
             from src.config import config
             symbols = config.trading.symbols
             
-            # Process each symbol
-            for symbol in symbols:
-                self._process_symbol(symbol)
+            # Process the symbols in parallel; a slow symbol does not hold up the others
+            self.executor.evaluate(symbols, self._process_symbol)
                 
-            # Wait for next poll
-            time.sleep(self.polling_interval)
+            # Wait for the next data update
+            self._wait_for_market_data(pubsub, self.polling_interval)
+        
+        if pubsub is not None:
+            pubsub.close()
             
-    def _process_symbol(self, symbol: str):
+    def _process_symbol(self, symbol: str, deadline: Optional[float] = None):
         """
         Process a single symbol with all enabled strategies
         
         Args:
             symbol: Trading symbol to process
+            deadline: time.monotonic() value after which evaluation stops and
+                signals are dropped (None for no limit)
         """
         try:
             logger.info(f"Processing symbol: {symbol}")
@@ -234,6 +290,13 @@ class StrategyManager:
             # Add symbol to the data dictionary
             all_data['symbol'] = symbol
             
+            # Advance the streaming indicators with only the newly arrived bars
+            if 'polygon_bars' in all_data:
+                all_data['polygon_data'] = {'bars': all_data['polygon_bars']}
+                indicators = self._update_indicators(symbol, all_data['polygon_bars'])
+                if indicators:
+                    all_data['indicators'] = indicators
+            
             # Select appropriate strategies based on symbol type and available data
             suitable_strategies = {}
             
@@ -267,15 +330,26 @@ class StrategyManager:
                     logger.debug(f"Strategy {name} missing required data: {', '.join(missing_data)}")
                     continue
                     
+                if deadline is not None and time.monotonic() > deadline:
+                    logger.warning(f"Stopping evaluation of {symbol}: time budget used up before {name}")
+                    return
+                    
                 # Process data with this strategy
                 try:
-                    signal = strategy.process_data(all_data)
+                    signal = self.executor.run_strategy(name, strategy, all_data, deadline)
+                    if isinstance(signal, dict):
+                        signal = self._signal_from_dict(name, signal, all_data)
                     if signal:
                         logger.info(f"Strategy {name} generated {signal.decision.value} signal for {symbol}")
                         signals.append(signal)
                 except Exception as e:
                     logger.error(f"Error processing {symbol} with strategy {name}: {str(e)}")
             
+            # Signals that arrive after the deadline are stale; drop them
+            if signals and deadline is not None and time.monotonic() > deadline:
+                logger.warning(f"Dropping {len(signals)} late signals for {symbol}")
+                return
+                
             # If we got signals, handle them
             if signals:
                 logger.info(f"Generated {len(signals)} signals for {symbol}")
@@ -286,6 +360,61 @@ class StrategyManager:
         except Exception as e:
             logger.error(f"Error processing symbol {symbol}: {e}")
     
+    def _update_indicators(self, symbol: str, bars: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Update the symbol's streaming indicator state with new bars
+        
+        Args:
+            symbol: Trading symbol
+            bars: Latest Polygon.io bars from Redis
+            
+        Returns:
+            Indicator snapshot or None
+        """
+        strategy = self.active_strategies.get("PolygonStrategy")
+        if strategy is None:
+            return self.indicator_store.update(symbol, bars, {})
+            
+        return self.indicator_store.update(
+            symbol,
+            bars,
+            strategy.indicator_params(),
+            history_loader=lambda: strategy.load_indicator_history(symbol)
+        )
+    
+    def _signal_from_dict(self, strategy_name: str, signal: Dict[str, Any], all_data: Dict[str, Any]) -> Optional[TradeSignal]:
+        """
+        Convert a dictionary signal (as returned by PolygonStrategy) into a TradeSignal
+        
+        Args:
+            strategy_name: Name of the strategy that produced the signal
+            signal: Signal dictionary with 'action', 'confidence' and 'metadata'
+            all_data: Data the strategy was evaluated on
+            
+        Returns:
+            TradeSignal or None if the action is not recognised
+        """
+        try:
+            decision = TradingDecision(str(signal.get('action', '')).lower())
+        except ValueError:
+            logger.warning(f"Unrecognised action from {strategy_name}: {signal.get('action')}")
+            return None
+            
+        metadata = dict(signal.get('metadata') or {})
+        metadata['strategy'] = strategy_name
+        
+        rsi_value = metadata.get('rsi')
+        if rsi_value is None and 'rsi' in all_data:
+            rsi_value = all_data['rsi'].value
+            
+        return TradeSignal(
+            symbol=signal.get('symbol', all_data.get('symbol')),
+            decision=decision,
+            confidence=signal.get('confidence'),
+            rsi_value=rsi_value if rsi_value is not None else 50.0,
+            metadata=metadata
+        )
+    
     def _fetch_symbol_data(self, symbol: str) -> Dict[str, Any]:
         """
         Fetch all data needed for strategies for a given symbol
@@ -298,95 +427,77 @@ class StrategyManager:
         """
         all_data = {}
         
+        # Check if this is a stock symbol (without a slash)
+        is_stock = not "/" in symbol
+        
+        # Fetch every key this symbol needs in a single round trip
+        logger.info(f"Fetching RSI, price and market data for {symbol}")
+        rsi_payload, price_data, polygon_data, prev_close, sentiment_data = redis_client.mget_json([
+            f"rsi:{symbol}",
+            f"price:{symbol}",
+            f"polygon:bars:{symbol}",
+            f"polygon:prev_close:{symbol}",
+            f"news:{symbol}:sentiment",
+        ])
+        
         # Get RSI data
-        from src.data_retrieval import data_retrieval_service
-        logger.info(f"Fetching RSI data for {symbol}")
-        rsi_data = data_retrieval_service.get_latest_rsi(symbol)
-        if rsi_data:
+        if rsi_payload:
+            rsi_data = RSIData(**rsi_payload)
             all_data['rsi'] = rsi_data
             logger.info(f"Found RSI data for {symbol}: {rsi_data.value}")
         else:
             logger.warning(f"No RSI data found for {symbol}")
             
         # Get price data
-        price_key = f"price:{symbol}"
-        logger.info(f"Fetching price data for {symbol}")
-        price_data = redis_client.get_json(price_key)
         if price_data:
             all_data['price'] = price_data
         
-        # Check if this is a stock symbol (without a slash)
-        is_stock = not "/" in symbol
-        
         # Get Polygon.io data for stock symbols
         if is_stock:
-            polygon_data_key = f"polygon:bars:{symbol}"
-            logger.info(f"Fetching Polygon.io data for stock symbol {symbol}")
-            polygon_data = redis_client.get_json(polygon_data_key)
             if polygon_data and 'data' in polygon_data:
                 all_data['polygon_bars'] = polygon_data['data']
                 logger.info(f"Found Polygon.io bars data for {symbol}: {len(polygon_data['data'])} bars")
                 
                 # Also get previous close if available
-                prev_close_key = f"polygon:prev_close:{symbol}"
-                prev_close = redis_client.get_json(prev_close_key)
                 if prev_close and 'data' in prev_close:
                     all_data['polygon_prev_close'] = prev_close['data']
             else:
                 logger.warning(f"No Polygon.io data found for {symbol}")
         
         # Get recent news for this symbol
-        all_data['news_sentiment'] = self._get_latest_news_sentiment(symbol)
+        all_data['news_sentiment'] = self._get_latest_news_sentiment(symbol, sentiment_data)
             
         return all_data
     
-    def _get_latest_news_sentiment(self, symbol: str) -> Optional[Dict[str, Any]]:
+    def _get_latest_news_sentiment(self, symbol: str, sentiment_data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Get the latest news sentiment for a symbol
         
         Args:
             symbol: Trading symbol
+            sentiment_data: Pre-fetched value of news:{symbol}:sentiment, if already loaded
             
         Returns:
             Dictionary with news sentiment data or None
         """
         # First try to get sentiment directly
-        sentiment_key = f"news:{symbol}:sentiment"
-        sentiment_data = redis_client.get_json(sentiment_key)
+        if sentiment_data is None:
+            sentiment_data = redis_client.get_json(f"news:{symbol}:sentiment")
         if sentiment_data and 'score' in sentiment_data:
             logger.info(f"Found direct sentiment data for {symbol}: {sentiment_data['score']}")
             return sentiment_data
             
-        # If no direct sentiment, get from news items
-        # Get all news items
-        news_keys = redis_client.client.keys("news:*")
-        if not news_keys:
-            return None
-            
-        # Check each news item to see if it's relevant to this symbol
-        formatted_symbol = symbol.split('/')[0] if '/' in symbol else symbol
-        
-        for key in news_keys:
-            # Skip sentiment keys
-            if ":sentiment" in key:
-                continue
-                
-            news_data = redis_client.get_json(key)
-            if not news_data:
-                continue
-                
-            # Check if this news item is about our symbol
-            symbols = news_data.get('symbols', [])
-            if formatted_symbol in symbols:
-                # Get the sentiment score (from OpenAI processing)
-                impact_score = news_data.get('impact_score')
-                if impact_score is not None:
-                    logger.info(f"Found news sentiment for {symbol}: {impact_score}")
-                    return {
-                        'score': impact_score,
-                        'headline': news_data.get('headline', ''),
-                        'timestamp': news_data.get('timestamp')
-                    }
+        # If no direct sentiment, walk the symbol's news index (newest first)
+        for news_data in news_index.fetch(symbol, limit=self.news_sentiment_lookback):
+            # Get the sentiment score (from OpenAI processing)
+            impact_score = news_data.get('impact_score')
+            if impact_score is not None:
+                logger.info(f"Found news sentiment for {symbol}: {impact_score}")
+                return {
+                    'score': impact_score,
+                    'headline': news_data.get('headline', ''),
+                    'timestamp': news_data.get('timestamp')
+                }
         
         return None
     
@@ -401,18 +512,15 @@ class StrategyManager:
             symbol = signal.symbol
             decision = signal.decision.value.upper()
             
-            # Store the signal in Redis
-            redis_key = f"signal:{symbol}"
             # Convert the Pydantic model to a dictionary for Redis storage
             signal_dict = signal.dict() if hasattr(signal, 'dict') else vars(signal)
             signal_dict['timestamp'] = datetime.now().isoformat()
-            redis_client.set_json(redis_key, signal_dict, ttl=3600)  # 1 hour TTL
+            # Store, add to the signal stream and notify services in a single round trip
+            with redis_client.pipeline() as pipe:
+                signal_stream.queue(pipe, signal_dict, ttl=3600)  # 1 hour TTL
+                pipe.publish('trade_notifications', f"New trade signal for {symbol}: {decision}")
             
             logger.info(f"Stored {decision} signal for {symbol}")
-            
-            # Notify services through Redis
-            redis_client.client.publish('trade_notifications', f"New trade signal for {symbol}: {decision}")
-            redis_client.client.publish('new_trade_signal', symbol)
         except Exception as e:
             logger.error(f"Error handling signal: {e}")
 
@@ -0,0 +1,123 @@
+import json
+import time
+import threading
+from typing import Dict, Any, Callable, Optional
+
+from src.config import config
+from src.utils import get_logger, redis_client
+from src.utils.redis_client import DateTimeEncoder
+
+logger = get_logger("account_snapshot")
+
+# Channel the frontend publishes account info requests on
+REQUEST_CHANNEL = "trade_execution_requests"
+
+# Latest account summary, read by the frontend before it sends a request
+SUMMARY_KEY = "account_summary"
+
+# Reply lists nobody popped (e.g. the requester timed out) are removed after this many seconds
+REPLY_TTL = 60
+
+
+def reply_key(request_id: str) -> str:
+    """List the requester BLPOPs for the reply to request_id"""
+    return f"account_info_response:{request_id}"
+
+
+class AccountSnapshot:
+    """
+    Short-lived cache of the Alpaca account summary
+
+    get() returns the cached summary while it is younger than ttl. Otherwise
+    one caller fetches it and concurrent callers wait for that fetch, so any
+    number of requests within ttl cost one Alpaca call. Successful fetches are
+    also written to the summary key in Redis, expiring after ttl, where the
+    frontend reads them without asking. While the summary has been requested
+    within the last idle_timeout seconds, run() keeps refreshing it in the
+    background so requests find a fresh copy.
+    """
+
+    def __init__(self, fetch: Optional[Callable[[], Dict[str, Any]]] = None,
+                 ttl: float = 10.0, idle_timeout: float = 60.0, summary_key: str = SUMMARY_KEY):
+        """
+        Args:
+            fetch: Returns a fresh account summary (defaults to alpaca_client.get_account_summary)
+            ttl: Seconds a summary is served from the cache
+            idle_timeout: Background refreshes stop this long after the last request
+            summary_key: Redis key the latest summary is written to
+        """
+        self.fetch = fetch
+        self.ttl = ttl
+        self.idle_timeout = idle_timeout
+        self.summary_key = summary_key
+        self.fetched_at = 0.0
+        self.last_requested = 0.0
+        self.fetches = 0
+        self._summary: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def _fresh(self) -> bool:
+        return self._summary is not None and time.time() - self.fetched_at < self.ttl
+
+    def _refresh_locked(self) -> Dict[str, Any]:
+        if self.fetch is None:
+            # Imported here to avoid circular imports
+            from src.trade_execution.alpaca_client import alpaca_client
+            summary = alpaca_client.get_account_summary()
+        else:
+            summary = self.fetch()
+        self._summary = summary
+        self.fetched_at = time.time()
+        self.fetches += 1
+        # Error summaries are cached here (so a failing API is not hammered) but not shared
+        if "error" not in summary:
+            redis_client.set_json(self.summary_key, summary, ttl=max(1, int(self.ttl)))
+        return summary
+
+    def get(self) -> Dict[str, Any]:
+        """Account summary, fetched only if the cached one is older than ttl"""
+        self.last_requested = time.time()
+        if self._fresh():
+            return self._summary
+        with self._lock:
+            # Another caller may have fetched it while we waited for the lock
+            if self._fresh():
+                return self._summary
+            return self._refresh_locked()
+
+    def refresh(self) -> Dict[str, Any]:
+        """Fetch the summary now"""
+        with self._lock:
+            return self._refresh_locked()
+
+    def invalidate(self):
+        """Make the next get() fetch a new summary"""
+        self.fetched_at = 0.0
+
+    def reply(self, request_id: str):
+        """Push the summary onto the reply list a requester is blocking on"""
+        try:
+            summary = self.get()
+        except Exception as e:
+            logger.error(f"Error getting account info: {e}")
+            summary = {"error": str(e), "status": "error"}
+        key = reply_key(request_id)
+        with redis_client.pipeline() as pipe:
+            pipe.rpush(key, json.dumps(summary, cls=DateTimeEncoder))
+            pipe.expire(key, REPLY_TTL)
+
+    def run(self, should_run: Callable[[], bool] = lambda: True, interval: Optional[float] = None):
+        """Refresh in the background while the summary is being requested"""
+        interval = interval or self.ttl
+        while should_run():
+            time.sleep(interval)
+            if time.time() - self.last_requested >= self.idle_timeout:
+                continue
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing account snapshot: {e}")
+
+
+# Singleton instance
+account_snapshot = AccountSnapshot(ttl=config.alpaca.account_cache_ttl)
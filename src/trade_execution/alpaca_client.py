@@ -1,4 +1,5 @@
 import os
+import threading
 from typing import Dict, Any, Optional, Tuple, List
 from datetime import datetime, timedelta
 from alpaca.trading.client import TradingClient
@@ -7,7 +8,11 @@ from alpaca.trading.enums import OrderSide, TimeInForce, AssetClass
 from alpaca.common.exceptions import APIError
 
 from src.config import config
-from src.utils import get_logger, TradeSignal, TradingDecision, TradeResult
+from src.utils import get_logger, TradeSignal, TradingDecision, TradeResult, price_cache
+from src.utils.rate_limiter import get_rate_limiter
+from src.trade_execution.broker_cache import BrokerCache
+from src.trade_execution.order_tracker import order_tracker, SUBMITTED
+from src.trade_execution.order_ledger import order_ledger, client_order_id
 
 logger = get_logger("alpaca_client")
 
@@ -48,9 +53,16 @@ class AlpacaClient:
         
         logger.info("Connected to Alpaca API")
         
+        # Quota shared with every other process using this API key (ALPACA_RATE_LIMIT)
+        self.rate_limiter = get_rate_limiter("alpaca", self.api_key)
+        
+        # Account and positions shared by all orders, refreshed in the background and after our fills
+        self.account = None
+        self.cache = BrokerCache(self._fetch_account, self._fetch_positions, ttl=config.alpaca.snapshot_ttl)
+        
         try:
             # Get account info
-            self.account = self.client.get_account()
+            self.cache.account()
             logger.info(f"Account status: {self.account.status}")
             logger.info(f"Account cash: ${float(self.account.cash):.2f}")
             logger.info(f"Account portfolio value: ${float(self.account.portfolio_value):.2f}")
@@ -61,6 +73,41 @@ class AlpacaClient:
         
         # Load recent day trades on startup
         self._load_day_trade_history()
+        
+        threading.Thread(
+            target=self.cache.run,
+            kwargs={"interval": config.alpaca.snapshot_refresh_interval},
+            daemon=True
+        ).start()
+        
+        # Order states, fills and positions follow Alpaca's trade updates stream
+        order_tracker.on_fill = self._on_fill
+        if os.getenv("ALPACA_DEBUG_MODE", "false").lower() != "true":
+            threading.Thread(
+                target=order_tracker.run,
+                kwargs={"paper": self.paper_trading},
+                daemon=True
+            ).start()
+    
+    def _on_fill(self, symbol: str):
+        """Drop cached balances and positions once one of our orders fills"""
+        # Imported here to avoid circular imports
+        from src.trade_execution.account_snapshot import account_snapshot
+        
+        self.cache.invalidate()
+        account_snapshot.invalidate()
+        logger.info(f"Order for {symbol} filled, account and positions will be refetched")
+    
+    def _fetch_account(self):
+        """Fetch the account from Alpaca (use self.cache.account() to read it)"""
+        self.rate_limiter.acquire()
+        self.account = self.client.get_account()
+        return self.account
+    
+    def _fetch_positions(self) -> Dict[str, Any]:
+        """Fetch all open positions from Alpaca, indexed by Alpaca symbol"""
+        self.rate_limiter.acquire()
+        return {position.symbol: position for position in self.client.get_all_positions()}
     
     def _convert_to_alpaca_symbol(self, symbol: str) -> str:
         """
@@ -104,6 +151,7 @@ class AlpacaClient:
             # Convert symbol to Alpaca's format
             alpaca_symbol = self._convert_to_alpaca_symbol(symbol)
             logger.info(f"Getting asset info for {symbol} using Alpaca symbol: {alpaca_symbol}")
+            self.rate_limiter.acquire()
             asset_info = self.client.get_asset(alpaca_symbol)
             return asset_info
         except APIError as e:
@@ -125,14 +173,11 @@ class AlpacaClient:
             alpaca_symbol = self._convert_to_alpaca_symbol(symbol)
             logger.info(f"Getting position for {symbol} using Alpaca symbol: {alpaca_symbol}")
             
-            # The current alpaca-py API uses get_all_positions() and then filters
-            positions = self.client.get_all_positions()
-            
-            # Find the position for our symbol
-            for position in positions:
-                if position.symbol == alpaca_symbol:
-                    logger.info(f"Found position for {alpaca_symbol}: {position.qty} shares")
-                    return position
+            # Positions come from the shared snapshot (one get_all_positions() per refresh)
+            position = self.cache.position(alpaca_symbol)
+            if position is not None:
+                logger.info(f"Found position for {alpaca_symbol}: {position.qty} shares")
+                return position
                     
             logger.info(f"No position found for {alpaca_symbol}")
             return None
@@ -256,7 +301,7 @@ class AlpacaClient:
         
         return None
     
-    def _calculate_order_quantity(self, symbol: str, side: OrderSide) -> Tuple[float, float, Optional[str]]:
+    def _calculate_order_quantity(self, symbol: str, side: OrderSide) -> Tuple[float, float, Optional[str], Optional[int]]:
         """
         Calculate the order quantity based on the fixed amount or percentage
         
@@ -265,23 +310,25 @@ class AlpacaClient:
             side: Buy or sell
             
         Returns:
-            Tuple of (quantity, price, error_message)
-            If error_message is not None, the trade should be skipped
+            Tuple of (quantity, price, error_message, reservation)
+            If error_message is not None, the trade should be skipped. Otherwise the
+            order's funds are held in self.cache under reservation until it is
+            confirmed or released
         """
         # Get current price (we need this regardless of fixed or percentage)
         price = self._get_current_price(symbol)
         if price <= 0:
-            return 0, price, f"Invalid price for {symbol}: {price}"
+            return 0, price, f"No recent price for {symbol}", None
             
         logger.info(f"Current price for {symbol}: ${price:.2f}")
         
         # Get account info
         try:
-            account = self.client.get_account()
+            account = self.cache.account()
             logger.info(f"Account info - Cash: ${float(account.cash):.2f}, Portfolio: ${float(account.portfolio_value):.2f}")
         except Exception as e:
             logger.error(f"Error getting account info: {e}")
-            return 0, price, f"Error getting account info: {e}"
+            return 0, price, f"Error getting account info: {e}", None
         
         # Calculate trade amount based on fixed amount or percentage
         from src.config import config
@@ -312,37 +359,52 @@ class AlpacaClient:
             
         logger.info(f"Planning to {side.value} {quantity} units of {symbol} at ${price:.2f}")
         
-        # Validate funds
-        available_cash = float(account.cash)
+        # Apply minimum order size check
+        if quantity * price < 10.0:  # Example: $10 minimum order
+            logger.warning(f"Order value too small: ${quantity * price:.2f} for {symbol}")
+            return 0, price, f"Order value too small: ${quantity * price:.2f} (minimum $10)", None
+        
+        # Validate funds, holding them so concurrent orders cannot spend them too
         if side == OrderSide.BUY:
-            if trade_amount > available_cash:
+            reservation, available_cash = self.cache.reserve(trade_amount, "cash")
+            if reservation is None:
                 logger.warning(f"Insufficient funds for {symbol} buy order. Need ${trade_amount:.2f}, have ${available_cash:.2f}")
-                return 0, price, f"Insufficient funds. Required: ${trade_amount:.2f}, available: ${available_cash:.2f}"
+                return 0, price, f"Insufficient funds. Required: ${trade_amount:.2f}, available: ${available_cash:.2f}", None
         else:  # SELL (SHORT)
             # For shorting, we just need to make sure we have enough buying power
             # We're not selling existing positions, we're shorting
-            buying_power = float(account.buying_power)
-            if trade_amount > buying_power:
+            reservation, buying_power = self.cache.reserve(trade_amount, "buying_power")
+            if reservation is None:
                 logger.warning(f"Insufficient buying power for {symbol} short order. Need ${trade_amount:.2f}, have ${buying_power:.2f}")
-                return 0, price, f"Insufficient buying power. Required: ${trade_amount:.2f}, available: ${buying_power:.2f}"
-            
-        # Apply minimum order size check
-        if quantity * price < 10.0:  # Example: $10 minimum order
-            logger.warning(f"Order value too small: ${quantity * price:.2f} for {symbol}")
-            return 0, price, f"Order value too small: ${quantity * price:.2f} (minimum $10)"
+                return 0, price, f"Insufficient buying power. Required: ${trade_amount:.2f}, available: ${buying_power:.2f}", None
         
-        return quantity, price, None
+        return quantity, price, None, reservation
     
     def _get_current_price(self, symbol: str) -> float:
         """
-        Get current price for an asset from RSI data or a market data API.
-        For now, we'll use RSI data from Redis since it's already available.
+        Get the current price for an asset from the last-price cache, which the
+        data retrieval service fills; a price older than PRICE_MAX_AGE is
+        refreshed once synchronously.
         
         Args:
             symbol: Trading symbol (e.g., "BTC/USDT", "AAPL", "SPY")
             
         Returns:
-            Current price estimate
+            Current price, or 0.0 if no recent price is available
+        """
+        price = price_cache.get(symbol)
+        return price if price is not None else 0.0
+    
+    def _estimate_price(self, symbol: str) -> float:
+        """
+        Rough price from RSI data or typical price levels, only used to size
+        simulated trades when no market price is known
+        
+        Args:
+            symbol: Trading symbol (e.g., "BTC/USDT", "AAPL", "SPY")
+            
+        Returns:
+            Price estimate
         """
         try:
             # Import here to avoid circular import
@@ -440,7 +502,7 @@ class AlpacaClient:
             logger.info(f"DEBUG MODE ACTIVATED BY EXPLICIT FLAG: Simulating successful trade for {signal.symbol} - {signal.decision.value}")
             import uuid
             fake_order_id = f"sim-{uuid.uuid4()}"
-            price = self._get_current_price(signal.symbol)
+            price = self._get_current_price(signal.symbol) or self._estimate_price(signal.symbol)
             
             # Calculate quantity based on settings (fixed amount or percentage)
             if config.trading.use_fixed_amount:
@@ -456,7 +518,6 @@ class AlpacaClient:
                 logger.info(f"DEBUG MODE: Using percentage {config.trading.trade_percentage}% for trade (amount: ${trade_amount:.2f}, quantity: {quantity:.8f})")
             
             # Make the result
-            from datetime import datetime
             debug_result = TradeResult(
                 symbol=signal.symbol,
                 decision=signal.decision,
@@ -491,6 +552,8 @@ class AlpacaClient:
                 error=None
             )
         
+        # Funds held for this order; released unless the order is submitted
+        reservation = None
         try:
             # Map the decision to an order side
             side = OrderSide.BUY if signal.decision == TradingDecision.BUY else OrderSide.SELL
@@ -512,7 +575,7 @@ class AlpacaClient:
                 )
             
             # Calculate the order quantity and validate funds
-            quantity, price, error_message = self._calculate_order_quantity(signal.symbol, side)
+            quantity, price, error_message, reservation = self._calculate_order_quantity(signal.symbol, side)
             
             # If we have an error message, skip the trade
             if error_message:
@@ -550,12 +613,16 @@ class AlpacaClient:
             clean_symbol = self._convert_to_alpaca_symbol(signal.symbol)
             logger.info(f"Using Alpaca symbol {clean_symbol} for {signal.symbol}")
             
+            # Same id for the same signal in every process, so it is only ever submitted once
+            order_key = client_order_id(signal)
+            
             # Create a market order
             order_request = MarketOrderRequest(
                 symbol=clean_symbol,
                 qty=quantity,
                 side=side,
-                time_in_force=TimeInForce.GTC
+                time_in_force=TimeInForce.GTC,
+                client_order_id=order_key
             )
             
             try:
@@ -585,13 +652,38 @@ class AlpacaClient:
                         status="executed"
                     )
                 
+                # Another executor may already have submitted this signal
+                if not order_ledger.claim(order_key, signal.symbol):
+                    logger.warning(f"Order {order_key} for {signal.symbol} was already submitted, skipping")
+                    return TradeResult(
+                        symbol=signal.symbol,
+                        decision=signal.decision,
+                        order_id=f"duplicate-{order_key}",
+                        status="skipped",
+                        error=f"Duplicate of order {order_key}"
+                    )
+                
                 # Normal order submission
                 try:
+                    self.rate_limiter.acquire()
                     order = self.client.submit_order(order_request)
                     order_id = order.id
+                    order_ledger.complete(order_key, str(order_id))
                     logger.info(f"Order successfully submitted with ID: {order_id}")
                 except Exception as submit_error:
                     logger.error(f"Error submitting order: {submit_error}")
+                    if "client_order_id" in str(submit_error).lower():
+                        # The broker already has an order with this id: an earlier attempt went through
+                        order_ledger.complete(order_key, "unknown")
+                        return TradeResult(
+                            symbol=signal.symbol,
+                            decision=signal.decision,
+                            order_id=f"duplicate-{order_key}",
+                            status="skipped",
+                            error=f"Duplicate of order {order_key}"
+                        )
+                    # The signal may be retried; a retry reuses order_key, so the broker rejects it if this one went through
+                    order_ledger.release(order_key)
                     # Generate a fallback ID for tracking purposes
                     import uuid
                     order_id = f"paper-failed-{uuid.uuid4()}"
@@ -645,6 +737,8 @@ class AlpacaClient:
                     )
                 
                 logger.info(f"Executed {side.value} order for {signal.symbol}: {quantity} @ ${price:.2f}")
+                self.cache.confirm(reservation)
+                reservation = None
                 
                 # If this is a successful order and might contribute to day trading,
                 # update our day trade counter (we'll reload it next time)
@@ -653,14 +747,16 @@ class AlpacaClient:
                     self._load_day_trade_history()
                     logger.info(f"Updated day trade history after potential day trade")
                 
-                return TradeResult(
+                # Fills arrive on the trade updates stream and are applied to the result from there
+                return order_tracker.track(TradeResult(
                     symbol=signal.symbol,
                     decision=signal.decision,
                     order_id=str(order_id),  # Convert UUID to string
                     quantity=quantity,
                     price=price,
-                    status="executed"
-                )
+                    status="executed",
+                    order_state=SUBMITTED
+                ))
             except APIError as api_error:
                 error_msg = f"Alpaca API error: {api_error}"
                 logger.error(error_msg)
@@ -706,6 +802,9 @@ class AlpacaClient:
                 status="failed",
                 error=str(e)
             )
+        finally:
+            if reservation is not None:
+                self.cache.release(reservation)
 
     def get_account_summary(self) -> Dict[str, Any]:
         """
@@ -715,11 +814,9 @@ class AlpacaClient:
             Dictionary with account information
         """
         try:
-            # Refresh account info
-            self.account = self.client.get_account()
-            
-            # Get all positions
-            positions = self.client.get_all_positions()
+            # Account and positions from the shared snapshot
+            self.cache.account()
+            positions = list(self.cache.positions().values())
             
             # Calculate total position value
             position_value = sum(float(position.market_value) for position in positions)
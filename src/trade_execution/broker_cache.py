@@ -0,0 +1,166 @@
+import time
+import threading
+from typing import Dict, Any, Callable, Optional, Tuple
+
+from src.utils import get_logger
+
+logger = get_logger("broker_cache")
+
+ACCOUNT = "account"
+POSITIONS = "positions"
+
+
+class BrokerCache:
+    """
+    Short-lived copy of the Alpaca account and open positions
+
+    account() and positions() serve the last fetch for up to ttl seconds,
+    with positions indexed by Alpaca symbol; concurrent callers share one
+    fetch. reserve() checks an order's notional against the cached cash or
+    buying power and holds it in the same locked step, so concurrent orders
+    cannot spend the same funds; the reservation is release()d if the order
+    is not sent, or confirm()ed once it is, which wakes run() to refetch
+    both after the burst has settled. A burst of orders is therefore sized
+    from one fetch and reconciled afterwards.
+    """
+
+    def __init__(self, fetch_account: Callable[[], Any], fetch_positions: Callable[[], Dict[str, Any]],
+                 ttl: float = 5.0, settle: float = 1.0):
+        """
+        Args:
+            fetch_account: Returns the Alpaca account
+            fetch_positions: Returns the open positions by Alpaca symbol
+            ttl: Seconds a fetch is reused
+            settle: Seconds run() waits after a fill before refetching
+        """
+        self.ttl = ttl
+        self.settle = settle
+        self.fetches = {ACCOUNT: 0, POSITIONS: 0}
+        self._fetchers = {ACCOUNT: fetch_account, POSITIONS: fetch_positions}
+        self._values: Dict[str, Any] = {}
+        self._fetched_at = {ACCOUNT: 0.0, POSITIONS: 0.0}
+        self._locks = {ACCOUNT: threading.Lock(), POSITIONS: threading.Lock()}
+        # Notional of our orders not yet reflected in the account, by reservation number
+        self._reservations: Dict[int, float] = {}
+        # Sequence number at which each reserved order was submitted
+        self._submitted: Dict[int, int] = {}
+        self._next_reservation = 0
+        self._reserve_lock = threading.Lock()
+        self._filled = threading.Event()
+
+    def _fresh(self, kind: str) -> bool:
+        return kind in self._values and time.time() - self._fetched_at[kind] < self.ttl
+
+    def _fetch(self, kind: str) -> Any:
+        with self._reserve_lock:
+            first_unseen = self._next_reservation
+        value = self._fetchers[kind]()
+        self._values[kind] = value
+        self._fetched_at[kind] = time.time()
+        self.fetches[kind] += 1
+        if kind == ACCOUNT:
+            # The new balances include orders submitted before the fetch began, but maybe not later ones
+            with self._reserve_lock:
+                for number, submitted in list(self._submitted.items()):
+                    if submitted < first_unseen:
+                        del self._submitted[number]
+                        self._reservations.pop(number, None)
+        return value
+
+    def _reserved(self) -> float:
+        with self._reserve_lock:
+            return sum(self._reservations.values())
+
+    def _get(self, kind: str) -> Any:
+        if self._fresh(kind):
+            return self._values[kind]
+        with self._locks[kind]:
+            # Another caller may have fetched it while we waited for the lock
+            if self._fresh(kind):
+                return self._values[kind]
+            return self._fetch(kind)
+
+    def account(self) -> Any:
+        """Alpaca account, at most ttl seconds old"""
+        return self._get(ACCOUNT)
+
+    def cash(self) -> float:
+        """Cash minus the notional of orders submitted since the account was fetched"""
+        return float(self.account().cash) - self._reserved()
+
+    def buying_power(self) -> float:
+        """Buying power minus the notional of orders submitted since the account was fetched"""
+        return float(self.account().buying_power) - self._reserved()
+
+    def positions(self) -> Dict[str, Any]:
+        """Open positions by Alpaca symbol, at most ttl seconds old"""
+        return self._get(POSITIONS)
+
+    def position(self, alpaca_symbol: str) -> Optional[Any]:
+        """Open position for one Alpaca symbol, or None"""
+        return self.positions().get(alpaca_symbol)
+
+    def reserve(self, notional: float, available: str = "cash") -> Tuple[Optional[int], float]:
+        """
+        Hold an order's notional if the account can cover it
+
+        Args:
+            notional: Order value
+            available: Account balance to check against ("cash" or "buying_power")
+
+        Returns:
+            Tuple of (reservation, balance before it); reservation is None if the balance is too low
+        """
+        account = self.account()
+        with self._reserve_lock:
+            balance = float(getattr(account, available)) - sum(self._reservations.values())
+            if abs(notional) > balance:
+                return None, balance
+            reservation = self._next_reservation
+            self._reservations[reservation] = abs(notional)
+            self._next_reservation += 1
+            return reservation, balance
+
+    def release(self, reservation: Optional[int]):
+        """Drop the reservation of an order that was not submitted"""
+        with self._reserve_lock:
+            self._reservations.pop(reservation, None)
+            self._submitted.pop(reservation, None)
+
+    def confirm(self, reservation: Optional[int]):
+        """Keep a submitted order's reservation until the next fetch and schedule a refresh"""
+        with self._reserve_lock:
+            if reservation in self._reservations:
+                self._submitted[reservation] = self._next_reservation
+                self._next_reservation += 1
+        self._filled.set()
+
+    def record_fill(self, notional: float):
+        """Reserve the notional of an order submitted without reserve() until the next fetch"""
+        with self._reserve_lock:
+            reservation = self._next_reservation
+            self._reservations[reservation] = abs(notional)
+            self._next_reservation += 1
+        self.confirm(reservation)
+
+    def invalidate(self):
+        """Make the next reads fetch again"""
+        self._fetched_at = {ACCOUNT: 0.0, POSITIONS: 0.0}
+
+    def refresh(self):
+        """Fetch the account and positions now"""
+        for kind in (ACCOUNT, POSITIONS):
+            with self._locks[kind]:
+                self._fetch(kind)
+
+    def run(self, should_run: Callable[[], bool] = lambda: True, interval: float = 30.0):
+        """Refresh every interval seconds, and shortly after our own fills"""
+        while should_run():
+            if self._filled.wait(interval):
+                # Let the rest of a burst go out before reconciling
+                time.sleep(self.settle)
+                self._filled.clear()
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Error refreshing account and positions: {e}")
@@ -0,0 +1,90 @@
+import json
+import uuid
+import socket
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from src.utils import get_logger, redis_client, TradeSignal
+
+logger = get_logger("order_ledger")
+
+LEDGER_PREFIX = "orders:ledger:"  # orders:ledger:{client_order_id} -> submission record
+LEDGER_TTL = 7 * 86400
+
+# Fixed namespace so every replica derives the same id for a signal
+ORDER_NAMESPACE = uuid.UUID("6f1d2c3a-8b4e-5f60-9a7b-2c8d4e6f1a3b")
+
+
+def client_order_id(signal: TradeSignal) -> str:
+    """
+    Deterministic Alpaca client_order_id for a signal
+
+    Built from the symbol, the signal timestamp and the strategy that
+    produced it, so every process executing the same signal sends the
+    same id (Alpaca allows at most 48 characters).
+    """
+    strategy = (signal.metadata or {}).get("strategy", "default")
+    key = f"{signal.symbol}|{signal.timestamp.isoformat()}|{strategy}"
+    return f"tm-{uuid.uuid5(ORDER_NAMESPACE, key)}"
+
+
+class OrderLedger:
+    """
+    Cross-process record of submitted orders, keyed by client_order_id
+
+    claim() takes the id with SET NX before an order is sent, so when
+    several executors pick up the same signal only one of them submits it.
+    The winner records the broker's order id with complete(), or calls
+    release() if the submission failed, so the signal may be retried.
+    Alpaca rejects a reused client_order_id as well, which covers a
+    submission that reached the broker even though the response was lost.
+    """
+
+    def __init__(self, prefix: str = LEDGER_PREFIX, ttl: int = LEDGER_TTL):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.owner = socket.gethostname()
+
+    def _key(self, client_order_id: str) -> str:
+        return f"{self.prefix}{client_order_id}"
+
+    def claim(self, client_order_id: str, symbol: str) -> bool:
+        """
+        Reserve a client_order_id for submission
+
+        Returns:
+            True if this process may submit the order, False if it was already claimed
+        """
+        record = {"symbol": symbol, "state": "submitting", "owner": self.owner,
+                  "claimed_at": datetime.now().isoformat()}
+        try:
+            return bool(redis_client.client.set(self._key(client_order_id), json.dumps(record), nx=True, ex=self.ttl))
+        except Exception as e:
+            # Without the ledger, the client_order_id still stops the broker from taking the order twice
+            logger.error(f"Error claiming order {client_order_id}, relying on the broker to reject duplicates: {e}")
+            return True
+
+    def complete(self, client_order_id: str, order_id: str):
+        """Record the broker order id of a submitted order"""
+        try:
+            record = self.get(client_order_id) or {}
+            record.update({"state": "submitted", "order_id": order_id, "owner": self.owner})
+            redis_client.client.set(self._key(client_order_id), json.dumps(record), ex=self.ttl)
+        except Exception as e:
+            logger.error(f"Error recording order {client_order_id}: {e}")
+
+    def release(self, client_order_id: str):
+        """Give up a claim after a failed submission"""
+        try:
+            redis_client.client.delete(self._key(client_order_id))
+        except Exception as e:
+            logger.error(f"Error releasing order {client_order_id}: {e}")
+
+    def get(self, client_order_id: str) -> Optional[Dict[str, Any]]:
+        """Ledger record for a client_order_id, or None"""
+        raw = redis_client.client.get(self._key(client_order_id))
+        return json.loads(raw) if raw else None
+
+
+# Singleton instance
+order_ledger = OrderLedger()
@@ -0,0 +1,265 @@
+import json
+import time
+import asyncio
+import threading
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional
+
+import websockets
+
+from src.config import config
+from src.utils import get_logger, redis_client, TradeResult
+from src.utils.redis_client import DateTimeEncoder
+
+logger = get_logger("order_tracker")
+
+ORDER_KEY_PREFIX = "order:"  # order:{order_id} -> tracked order state
+ORDER_TTL = 7 * 86400
+PAPER_STREAM_URL = "wss://paper-api.alpaca.markets/stream"
+LIVE_STREAM_URL = "wss://api.alpaca.markets/stream"
+
+# Order states and the states each one may move to
+SUBMITTED = "submitted"
+ACCEPTED = "accepted"
+PARTIALLY_FILLED = "partially_filled"
+FILLED = "filled"
+CANCELED = "canceled"
+EXPIRED = "expired"
+REJECTED = "rejected"
+
+TRANSITIONS = {
+    SUBMITTED: {ACCEPTED, PARTIALLY_FILLED, FILLED, CANCELED, EXPIRED, REJECTED},
+    ACCEPTED: {PARTIALLY_FILLED, FILLED, CANCELED, EXPIRED, REJECTED},
+    PARTIALLY_FILLED: {PARTIALLY_FILLED, FILLED, CANCELED, EXPIRED},
+    FILLED: set(),
+    CANCELED: set(),
+    EXPIRED: set(),
+    REJECTED: set(),
+}
+
+# Alpaca trade_updates events -> order state; other events (pending_cancel, replaced, ...) are ignored
+EVENT_STATES = {
+    "pending_new": SUBMITTED,
+    "new": ACCEPTED,
+    "accepted": ACCEPTED,
+    "partial_fill": PARTIALLY_FILLED,
+    "fill": FILLED,
+    "canceled": CANCELED,
+    "expired": EXPIRED,
+    "done_for_day": EXPIRED,
+    "rejected": REJECTED,
+}
+
+
+# Store an order and, if it is still the symbol's latest order, its trade result, in one step.
+# KEYS[1]: order:{order_id}, KEYS[2]: trade_result:{symbol}
+# ARGV[1]: order JSON, ARGV[2]: order TTL, ARGV[3]: order id, ARGV[4]: trade result JSON (or ""), ARGV[5]: result TTL
+# Returns 1 if the trade result was written, otherwise 0.
+_UPDATE_SCRIPT = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+if ARGV[4] == '' then
+    return 0
+end
+local current = redis.call('GET', KEYS[2])
+if current then
+    local ok, stored = pcall(cjson.decode, current)
+    if ok and type(stored) == 'table' and tostring(stored['order_id']) ~= ARGV[3] then
+        return 0
+    end
+end
+redis.call('SET', KEYS[2], ARGV[4], 'EX', ARGV[5])
+return 1
+"""
+
+
+def order_key(order_id: str) -> str:
+    return f"{ORDER_KEY_PREFIX}{order_id}"
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+class OrderTracker:
+    """
+    Order state machine fed by Alpaca's trade_updates websocket stream
+
+    Orders are registered with track() when they are submitted. Each update
+    from the stream moves the order along TRANSITIONS (updates that would
+    move it backwards, e.g. a late partial fill after the fill, are
+    ignored), is stored in order:{order_id}, and is written straight into
+    trade_result:{symbol} with the filled quantity and average price as long
+    as that result is still for this order (a later order's result is never
+    overwritten by a late fill of an earlier one).
+    Orders that are canceled, expired or rejected without a fill turn their
+    trade result into a failure. on_fill is called with the symbol after
+    every fill so cached positions can be refreshed.
+    """
+
+    def __init__(self, on_fill: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            on_fill: Called with our symbol after a fill or partial fill
+        """
+        self.on_fill = on_fill
+        self._lock = threading.Lock()
+        self._running = False
+        self._failures = 0
+        self._loop = None
+        self._ws = None
+        self._update = redis_client.client.register_script(_UPDATE_SCRIPT)
+
+    def _load(self, order_id: str) -> Optional[Dict[str, Any]]:
+        return redis_client.get_json(order_key(order_id))
+
+    def track(self, result: TradeResult) -> TradeResult:
+        """
+        Register a submitted order
+
+        Args:
+            result: Trade result returned for the submission
+
+        Returns:
+            The result, updated with any stream updates that arrived before it was registered
+        """
+        with self._lock:
+            order = self._load(result.order_id)
+            if order is None:
+                order = {"order_id": result.order_id, "symbol": result.symbol, "state": SUBMITTED,
+                         "filled_qty": 0.0, "filled_avg_price": None}
+            else:
+                # The stream was faster than the submission; keep its state and use our symbol
+                order["symbol"] = result.symbol
+            order["result"] = result.dict()
+            redis_client.set_json(order_key(result.order_id), order, ttl=ORDER_TTL)
+        return self.merge(result)
+
+    def merge(self, result: TradeResult) -> TradeResult:
+        """Apply the tracked state of an order to a trade result about to be stored"""
+        order = self._load(result.order_id) if result and result.order_id else None
+        if not order:
+            return result
+        return TradeResult(**self._result(order, result.dict()))
+
+    @staticmethod
+    def _result(order: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        result = dict(result)
+        result["order_state"] = order["state"]
+        if order["filled_qty"]:
+            result["filled_quantity"] = order["filled_qty"]
+            result["price"] = order["filled_avg_price"] or result.get("price")
+        if order["state"] in (CANCELED, EXPIRED, REJECTED) and not order["filled_qty"]:
+            result["status"] = "failed"
+            result["error"] = f"Order {order['state']}"
+        return result
+
+    def handle(self, update: Dict[str, Any]) -> Optional[str]:
+        """
+        Apply one trade_updates message
+
+        Args:
+            update: The message's data ({"event", "order", "price", "qty", "position_qty", "timestamp"})
+
+        Returns:
+            The order's new state, or None if the update was ignored
+        """
+        event = update.get("event")
+        alpaca_order = update.get("order") or {}
+        order_id = str(alpaca_order.get("id") or "")
+        state = EVENT_STATES.get(event)
+        if not order_id or state is None:
+            logger.debug(f"Ignoring {event} update for order {order_id}")
+            return None
+
+        with self._lock:
+            order = self._load(order_id) or {"order_id": order_id, "symbol": alpaca_order.get("symbol"),
+                                             "state": SUBMITTED, "filled_qty": 0.0, "filled_avg_price": None}
+            if state not in TRANSITIONS[order["state"]]:
+                logger.info(f"Ignoring {event} for order {order_id} in state {order['state']}")
+                return None
+
+            order["state"] = state
+            order["filled_qty"] = _float(alpaca_order.get("filled_qty")) or order["filled_qty"]
+            order["filled_avg_price"] = _float(alpaca_order.get("filled_avg_price")) or order["filled_avg_price"]
+            order["position_qty"] = _float(update.get("position_qty"))
+            order["updated_at"] = update.get("timestamp") or datetime.now().isoformat()
+
+            # Untracked orders (placed outside this service) have no trade result to update
+            result = self._result(order, order["result"]) if order.get("result") else None
+            self._update(keys=[order_key(order_id), f"trade_result:{order['symbol']}"],
+                         args=[json.dumps(order, cls=DateTimeEncoder), ORDER_TTL, order_id,
+                               json.dumps(result, cls=DateTimeEncoder) if result else "", 86400])
+
+        logger.info(f"Order {order_id} for {order['symbol']} is {state} "
+                    f"({order['filled_qty']} filled @ {order['filled_avg_price']})")
+        if state in (PARTIALLY_FILLED, FILLED) and self.on_fill:
+            try:
+                self.on_fill(order["symbol"])
+            except Exception as e:
+                logger.error(f"Error handling fill for {order['symbol']}: {e}")
+        return state
+
+    async def _follow(self, url: str, api_key: str, api_secret: str):
+        """Authenticate, listen to trade_updates and apply messages until the connection closes"""
+        async with websockets.connect(url, ping_interval=10, ping_timeout=180) as ws:
+            self._ws = ws
+            await ws.send(json.dumps({"action": "authenticate", "data": {"key_id": api_key, "secret_key": api_secret}}))
+            reply = json.loads(await ws.recv())
+            if reply.get("data", {}).get("status") != "authorized":
+                raise ValueError(f"Trade updates stream authentication failed: {reply}")
+            await ws.send(json.dumps({"action": "listen", "data": {"streams": ["trade_updates"]}}))
+            logger.info(f"Following trade updates from {url}")
+            self._failures = 0
+
+            async for raw in ws:
+                message = json.loads(raw)
+                if message.get("stream") != "trade_updates":
+                    continue
+                try:
+                    self.handle(message.get("data") or {})
+                except Exception as e:
+                    logger.error(f"Error handling trade update: {e}")
+
+    def run(self, url: Optional[str] = None, api_key: Optional[str] = None, api_secret: Optional[str] = None,
+            paper: bool = True):
+        """
+        Follow the trade_updates stream until stop() is called, reconnecting with backoff
+
+        Args:
+            url: Stream URL (defaults to ALPACA_STREAM_URL, or Alpaca's paper/live endpoint)
+            api_key: Alpaca API key (defaults to the configured key)
+            api_secret: Alpaca API secret (defaults to the configured secret)
+            paper: Use the paper trading endpoint when no URL is given
+        """
+        url = url or config.alpaca.stream_url or (PAPER_STREAM_URL if paper else LIVE_STREAM_URL)
+        self._running = True
+        self._failures = 0
+        while self._running:
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._follow(url, api_key or config.alpaca.api_key,
+                                                           api_secret or config.alpaca.api_secret))
+            except Exception as e:
+                if self._running:
+                    logger.error(f"Trade updates stream error: {e}")
+            finally:
+                self._loop.close()
+                self._ws = None
+            if self._running:
+                # Back off on repeated failures (bad credentials, broker down)
+                self._failures += 1
+                time.sleep(min(60, 2 ** min(self._failures, 6)))
+
+    def stop(self):
+        """Close the trade_updates stream"""
+        self._running = False
+        ws, loop = self._ws, self._loop
+        if ws is not None and loop is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(ws.close(), loop)
+
+
+# Singleton instance
+order_tracker = OrderTracker()
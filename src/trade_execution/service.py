@@ -1,63 +1,138 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+import os
 import time
 import uuid
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from src.config import config
 from src.utils import get_logger, TradeSignal, TradeResult, redis_client
+from src.utils.metrics import LatencyHistogram
+from src.trade_execution.order_tracker import order_tracker
 
 logger = get_logger("trade_execution_service")
 
 # Import alpaca_client inside the class methods to avoid circular imports
 
 class TradeExecutionService:
-    def __init__(self):
+    def __init__(self, max_concurrent_orders: Optional[int] = None):
         self.last_execution_time: Dict[str, float] = {}
         self.min_execution_interval = 300  # Minimum seconds between trades for the same symbol
         
+        # Orders of a batch are submitted on this pool; its size bounds concurrent Alpaca calls
+        self.max_concurrent_orders = max_concurrent_orders or config.trading.max_concurrent_orders
+        self.order_pool = ThreadPoolExecutor(max_workers=self.max_concurrent_orders, thread_name_prefix="order")
+        self.latency = LatencyHistogram("trade_execution:latency")
+        
         # Enable trading at startup
         redis_client.client.set("trading_enabled", "true")
         logger.info("Trading initialized to ENABLED in trade execution service")
 
-    def execute_trade(self, signal: TradeSignal) -> Optional[TradeResult]:
-        """
-        Execute a trade based on a signal if enough time has passed since last execution
-        
-        Args:
-            signal: Trade signal
-            
-        Returns:
-            TradeResult or None if trade was skipped due to time constraints
-        """
+    def _can_execute(self, symbol: str, now: float) -> bool:
+        """Whether min_execution_interval has passed since the last executed trade for symbol"""
+        time_since_last_trade = now - self.last_execution_time.get(symbol, 0)
+        if time_since_last_trade < self.min_execution_interval:
+            logger.info(f"Skipping trade for {symbol} - too soon after last trade ({time_since_last_trade:.1f}s < {self.min_execution_interval}s)")
+            return False
+        return True
+
+    def _submit(self, signal: TradeSignal, now: float) -> Optional[TradeResult]:
+        """Place one order, record its latency and store the result"""
         # Import alpaca_client here to avoid circular imports
         from src.trade_execution.alpaca_client import alpaca_client
         
-        # Check if we recently executed a trade for this symbol
-        current_time = time.time()
-        last_time = self.last_execution_time.get(signal.symbol, 0)
-        time_since_last_trade = current_time - last_time
-        
-        if time_since_last_trade < self.min_execution_interval:
-            logger.info(f"Skipping trade for {signal.symbol} - too soon after last trade ({time_since_last_trade:.1f}s < {self.min_execution_interval}s)")
-            return None
-        
-        # Execute the trade
         logger.info(f"Calling alpaca_client.execute_trade for {signal.symbol}")
-        result = alpaca_client.execute_trade(signal)
-        logger.info(f"Trade execution result: {result}")
+        started = time.perf_counter()
+        try:
+            result = alpaca_client.execute_trade(signal)
+        except Exception as e:
+            logger.error(f"Error executing trade for {signal.symbol}: {e}")
+            result = TradeResult(
+                symbol=signal.symbol,
+                decision=signal.decision,
+                order_id=f"exception-{uuid.uuid4()}",
+                status="failed",
+                error=str(e)
+            )
+        elapsed = time.perf_counter() - started
+        self.latency.observe(elapsed)
+        logger.info(f"Trade execution result in {elapsed:.2f}s: {result}")
         
         # Update last execution time
         if result and result.status == "executed":
-            self.last_execution_time[signal.symbol] = current_time
+            self.last_execution_time[signal.symbol] = now
             logger.info(f"Updated last execution time for {signal.symbol}")
         
         # Store the result in Redis with explicit TTL
         if result:
+            result = order_tracker.merge(result)
             redis_key = f"trade_result:{signal.symbol}"
             success = redis_client.set_json(redis_key, result.dict(), ttl=3600)
             logger.info(f"Saved trade result to Redis key {redis_key}: {success}")
         
         return result
+
+    def execute_trade(self, signal: TradeSignal) -> Optional[TradeResult]:
+        """
+        Execute a trade based on a signal if enough time has passed since last execution
+        
+        Args:
+            signal: Trade signal
+            
+        Returns:
+            TradeResult or None if trade was skipped due to time constraints
+        """
+        now = time.time()
+        if not self._can_execute(signal.symbol, now):
+            return None
+        return self._submit(signal, now)
+    
+    def execute_batch(self, signals: List[TradeSignal]) -> List[Optional[TradeResult]]:
+        """
+        Execute several signals concurrently
+        
+        The account and positions snapshot is fetched once up front, so every
+        order's pre-trade checks read the same copy; the orders are then
+        submitted on the order pool. Only the last signal per symbol is
+        executed, and min_execution_interval still applies.
+        
+        Args:
+            signals: Trade signals
+            
+        Returns:
+            One entry per signal, in order: its TradeResult, or None if it was skipped
+        """
+        from src.trade_execution.alpaca_client import alpaca_client
+        
+        now = time.time()
+        results: List[Optional[TradeResult]] = [None] * len(signals)
+        runnable: Dict[int, TradeSignal] = {}
+        seen = set()
+        for index in reversed(range(len(signals))):
+            symbol = signals[index].symbol
+            if symbol in seen:
+                logger.info(f"Skipping older signal for {symbol} in the same batch")
+                continue
+            seen.add(symbol)
+            if self._can_execute(symbol, now):
+                runnable[index] = signals[index]
+        if not runnable:
+            return results
+        
+        try:
+            alpaca_client.cache.account()
+            alpaca_client.cache.positions()
+        except Exception as e:
+            logger.warning(f"Could not prefetch account and positions: {e}")
+        
+        started = time.perf_counter()
+        futures = {index: self.order_pool.submit(self._submit, signal, now) for index, signal in runnable.items()}
+        for index, future in futures.items():
+            results[index] = future.result()
+        logger.info(f"Executed {len(futures)} orders in {time.perf_counter() - started:.2f}s "
+                    f"(up to {self.max_concurrent_orders} at a time)")
+        return results
     
     def get_latest_result(self, symbol: str) -> Optional[TradeResult]:
         """
@@ -79,7 +154,6 @@ class TradeExecutionService:
 def start_listeners():
     """Start background threads to listen for various Redis requests"""
     import json
-    import threading
     from dotenv import load_dotenv
     
     def settings_listener_thread():
@@ -106,43 +180,32 @@ def start_listeners():
     
     def account_info_listener_thread():
         from src.utils import redis_client
-        from src.trade_execution.alpaca_client import alpaca_client
-        import json
+        from src.trade_execution.account_snapshot import account_snapshot, REQUEST_CHANNEL
         
         logger.info("Starting account info listener thread")
         pubsub = redis_client.get_pubsub()
-        pubsub.subscribe('trade_execution_requests')
+        pubsub.subscribe(REQUEST_CHANNEL)
         
         for message in pubsub.listen():
             try:
                 if message['type'] == 'message':
                     data = json.loads(message['data'])
-                    logger.info(f"Received trade execution request: {data}")
                     
-                    # Handle account info requests
+                    # Handle account info requests; replies come from the shared snapshot,
+                    # so a burst of requests costs at most one Alpaca call
                     if data.get('type') == 'account_info_request':
                         request_id = data.get('request_id')
                         if request_id:
-                            try:
-                                # Get account summary from Alpaca
-                                account_summary = alpaca_client.get_account_summary()
-                                
-                                # Store the response in Redis with the request ID
-                                response_key = f'account_info_response:{request_id}'
-                                redis_client.set_json(response_key, account_summary, ttl=60)  # 1 minute TTL
-                                logger.info(f"Sent account info response for request {request_id}")
-                            except Exception as e:
-                                logger.error(f"Error getting account info: {e}")
-                                # Store error response
-                                response_key = f'account_info_response:{request_id}'
-                                error_response = {
-                                    'error': str(e),
-                                    'status': 'error'
-                                }
-                                redis_client.set_json(response_key, error_response, ttl=60)
+                            account_snapshot.reply(request_id)
+                            logger.debug(f"Sent account info response for request {request_id}")
             except Exception as e:
                 logger.error(f"Error processing trade execution request: {e}")
     
+    def account_refresh_thread():
+        from src.trade_execution.account_snapshot import account_snapshot
+        logger.info("Starting account snapshot refresh thread")
+        account_snapshot.run()
+    
     # Start settings listener in a daemon thread
     settings_thread = threading.Thread(target=settings_listener_thread, daemon=True)
     settings_thread.start()
@@ -153,13 +216,16 @@ def start_listeners():
     account_thread.start()
     logger.info("Account info listener thread started")
     
+    # Keep the account snapshot fresh while the dashboard is asking for it
+    threading.Thread(target=account_refresh_thread, daemon=True).start()
+    
     return settings_thread, account_thread
 
 # Entry point for running as a standalone module
 def run_standalone():
-    import time
-    import json
-    import uuid
+    import socket
+    from src.utils import signal_stream
+    from src.config import config
     logger.info("Starting Trade Execution Service as standalone")
     
     # Create the service for standalone use
@@ -168,98 +234,43 @@ def run_standalone():
     # Start all listeners
     settings_thread, account_thread = start_listeners()
     
-    # Keep the main thread alive and actively check for signals
-    try:
-        logger.info("Starting active poll for trade signals")
-        poll_interval = 5  # seconds
-        running = True
-        iteration = 0
+    # Set debug mode to false to allow real API calls with paper trading
+    os.environ["ALPACA_DEBUG_MODE"] = "false"
+    # Import alpaca_client here to avoid circular imports
+    from src.trade_execution.alpaca_client import alpaca_client
+    
+    def execute_signal(trade_signal):
+        symbol = trade_signal.symbol
+        # Only execute if this is a BUY or SELL (not HOLD) for a symbol we trade
+        if trade_signal.decision.value == "hold" or symbol not in config.trading.symbols:
+            return
         
-        while running:
-            try:
-                iteration += 1
-                if iteration % 4 == 0:  # Log less frequently 
-                    logger.info(f"Polling for trade signals (iteration {iteration})")
-                
-                # Get all signal keys from Redis
-                from src.utils import redis_client
-                from src.utils import TradeSignal, TradingDecision
-                from src.config import config
-                
-                # Process each trading symbol
-                for symbol in config.trading.symbols:
-                    signal_key = f"signal:{symbol}"
-                    try:
-                        # Get the signal data
-                        signal_data = redis_client.get_json(signal_key)
-                        if signal_data:
-                            if iteration % 4 == 0:  # Log less frequently
-                                logger.info(f"Found signal for {symbol}: {json.dumps(signal_data)}")
-                            
-                            # Create a trade signal object
-                            try:
-                                trade_signal = TradeSignal(**signal_data)
-                                
-                                # Only execute if this is a BUY or SELL (not HOLD)
-                                if trade_signal.decision.value != "hold":
-                                    # Always enable trading
-                                    trading_enabled = True
-                                    
-                                    # Find most recent result
-                                    result_key = f"trade_result:{symbol}"
-                                    recent_result = redis_client.get_json(result_key)
-                                    
-                                    # Only execute if we don't have a recent result or the signal is newer
-                                    should_execute = True
-                                    if recent_result and 'timestamp' in recent_result and 'timestamp' in signal_data:
-                                        signal_time = signal_data['timestamp']
-                                        result_time = recent_result['timestamp']
-                                        # If signal is older than result, don't execute again
-                                        if signal_time <= result_time:
-                                            should_execute = False
-                                            if iteration % 20 == 0:  # Log very infrequently
-                                                logger.info(f"Signal for {symbol} is not newer than last result, skipping")
-                                    
-                                    if should_execute:
-                                        # Set debug mode to false to allow real API calls with paper trading
-                                        import os
-                                        os.environ["ALPACA_DEBUG_MODE"] = "false"
-                                        
-                                        logger.info(f"Executing trade for {symbol}: {trade_signal.decision.value}")
-                                        # Import alpaca_client here to avoid circular imports
-                                        from src.trade_execution.alpaca_client import alpaca_client
-                                        result = alpaca_client.execute_trade(trade_signal)
-                                        
-                                        if result:
-                                            logger.info(f"Trade result for {symbol}: {result.status}")
-                                            
-                                            # Ensure order_id is always a string and all required fields are present
-                                            if not result:
-                                                logger.warning(f"No result returned from trade execution for {symbol}")
-                                                continue
-                                                
-                                            if result.order_id is None:
-                                                result.order_id = f"unknown-{uuid.uuid4()}"
-                                                
-                                            # Ensure all fields are valid
-                                            if not isinstance(result.order_id, str):
-                                                result.order_id = str(result.order_id)
-                                            
-                                            # Save to Redis
-                                            redis_key = f"trade_result:{symbol}"
-                                            success = redis_client.set_json(redis_key, result.dict(), ttl=86400)
-                                            logger.info(f"Saved trade result to Redis key: {redis_key}: {success}")
-                            except Exception as signal_error:
-                                logger.error(f"Error processing signal for {symbol}: {signal_error}")
-                    except Exception as e:
-                        logger.error(f"Error checking signal for {symbol}: {e}")
-                            
-                # Sleep between polling cycles
-                time.sleep(poll_interval)
-                
-            except Exception as e:
-                logger.error(f"Error in polling loop: {e}")
-                time.sleep(poll_interval)
+        logger.info(f"Executing trade for {symbol}: {trade_signal.decision.value}")
+        result = alpaca_client.execute_trade(trade_signal)
+        if not result:
+            logger.warning(f"No result returned from trade execution for {symbol}")
+            return
+        
+        logger.info(f"Trade result for {symbol}: {result.status}")
+        # Ensure order_id is always a string
+        if result.order_id is None:
+            result.order_id = f"unknown-{uuid.uuid4()}"
+        if not isinstance(result.order_id, str):
+            result.order_id = str(result.order_id)
+        
+        # Keep fills that already arrived on the trade updates stream
+        result = order_tracker.merge(result)
+        
+        # Save to Redis
+        redis_key = f"trade_result:{symbol}"
+        success = redis_client.set_json(redis_key, result.dict(), ttl=86400)
+        logger.info(f"Saved trade result to Redis key: {redis_key}: {success}")
+    
+    # Block on the signal stream; each signal is executed once, as soon as it is published.
+    # The consumer name is stable across container restarts so unacknowledged signals resume.
+    try:
+        logger.info("Waiting for trade signals on the signal stream")
+        signal_stream.consume(execute_signal, consumer=f"executor-{socket.gethostname()}")
     except KeyboardInterrupt:
         logger.info("Shutting down Trade Execution Service")
 
@@ -2,6 +2,9 @@ from .logger import get_logger
 from .redis_client import redis_client
 from .models import RSIData, TradeSignal, TradeResult, TradingDecision, PriceCandle, PriceHistory, MarketStatus
 from .force_disabled import force_trading_disabled
+from .news_index import news_index
+from .signal_stream import signal_stream
+from .price_cache import price_cache
 
 __all__ = [
     "get_logger", 
@@ -13,5 +16,8 @@ __all__ = [
     "PriceCandle",
     "PriceHistory",
     "MarketStatus",
-    "force_trading_disabled"
+    "force_trading_disabled",
+    "news_index",
+    "signal_stream",
+    "price_cache"
 ]
\ No newline at end of file
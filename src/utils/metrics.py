@@ -0,0 +1,181 @@
+import json
+import math
+import time
+import bisect
+from typing import Dict, Any, List, Optional, Sequence
+
+from src.utils.logger import get_logger
+from src.utils.redis_client import redis_client
+
+logger = get_logger("metrics")
+
+# Upper bounds in seconds; observations above the last bound go to "+Inf"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def bucket_labels(buckets: Sequence[float]) -> List[str]:
+    """Field names for bucket upper bounds, plus "+Inf" for the overflow bucket"""
+    return [f"{bound:g}" for bound in buckets] + ["+Inf"]
+
+
+class LatencyHistogram:
+    """
+    Latency histogram stored in a Redis hash so every process adds to the
+    same counts and the dashboard can read them
+
+    Hash fields: one per bucket upper bound ("0.05", ..., "+Inf") holding the
+    number of observations that fell into that bucket (not cumulative), plus
+    "count" and "sum" (seconds) and any named event counters.
+    """
+
+    def __init__(self, key: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Args:
+            key: Redis hash key (e.g. "strategy:RSIStrategy:latency")
+            buckets: Increasing bucket upper bounds in seconds
+        """
+        self.key = key
+        self.buckets = tuple(buckets)
+        self.labels = bucket_labels(self.buckets)
+
+    def queue(self, pipe, seconds: float):
+        """Queue one observation on an open redis_client.pipeline()"""
+        pipe.hincrby(self.key, self.labels[bisect.bisect_left(self.buckets, seconds)], 1)
+        pipe.hincrby(self.key, "count", 1)
+        pipe.hincrbyfloat(self.key, "sum", seconds)
+
+    def observe(self, seconds: float):
+        """Record one observation"""
+        try:
+            with redis_client.pipeline() as pipe:
+                self.queue(pipe, seconds)
+        except Exception as e:
+            logger.error(f"Error recording latency in {self.key}: {e}")
+
+    def increment(self, counter: str, amount: int = 1):
+        """Count an event alongside the latencies (e.g. "timeouts")"""
+        try:
+            redis_client.client.hincrby(self.key, counter, amount)
+        except Exception as e:
+            logger.error(f"Error incrementing {counter} in {self.key}: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Read the histogram
+
+        Returns:
+            Dictionary with "buckets" (label -> count), "count", "sum", "mean",
+            "p50"/"p95"/"p99" (bucket upper bounds) and any event counters
+        """
+        raw = redis_client.client.hgetall(self.key) or {}
+        buckets = {label: int(raw.get(label, 0)) for label in self.labels}
+        count = int(raw.get("count", 0))
+        total = float(raw.get("sum", 0.0))
+        snapshot = {
+            "buckets": buckets,
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else None,
+        }
+        for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            snapshot[name] = self._quantile(buckets, count, q)
+        for field, value in raw.items():
+            if field not in buckets and field not in ("count", "sum"):
+                snapshot[field] = int(value)
+        return snapshot
+
+    def _quantile(self, buckets: Dict[str, int], count: int, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (inf if beyond the last bound)"""
+        if not count:
+            return None
+        seen = 0
+        for bound, label in zip(list(self.buckets) + [float("inf")], self.labels):
+            seen += buckets[label]
+            if seen >= q * count:
+                return bound
+        return float("inf")
+
+
+class RollingMetrics:
+    """
+    Rolling window of recent samples in Redis, summarised in a hash
+
+    Samples are kept newest first in {key}:samples (at most `size`), each a
+    JSON object of numeric fields plus a timestamp. After every observation
+    the hash at {key} is rewritten with the sample count and, for each field,
+    its mean, p50, p95 and p99 over the samples from the last `window`
+    seconds; `histogram_field` additionally gets bucket counts
+    ("{field}_le_{bound}").
+    """
+
+    def __init__(self, key: str, size: int = 500, window: float = 900.0,
+                 histogram_field: Optional[str] = None, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Args:
+            key: Redis key of the summary hash (samples go to {key}:samples)
+            size: Samples kept
+            window: Only samples newer than this many seconds are summarised
+            histogram_field: Field to keep bucket counts for
+            buckets: Bucket upper bounds for histogram_field
+        """
+        self.key = key
+        self.samples_key = f"{key}:samples"
+        self.size = size
+        self.window = window
+        self.histogram_field = histogram_field
+        self.buckets = tuple(buckets)
+        self.labels = bucket_labels(self.buckets)
+
+    def samples(self) -> List[Dict[str, float]]:
+        """Samples from the last `window` seconds, newest first"""
+        cutoff = time.time() - self.window
+        samples = []
+        for raw in redis_client.client.lrange(self.samples_key, 0, self.size - 1):
+            try:
+                sample = json.loads(raw)
+            except ValueError:
+                continue
+            if sample.get("ts", 0) >= cutoff:
+                samples.append(sample)
+        return samples
+
+    def percentile(self, field: str, q: float, samples: Optional[List[Dict[str, float]]] = None) -> Optional[float]:
+        """Nearest-rank q-quantile of a field over the window (None without samples)"""
+        values = sorted(s[field] for s in (self.samples() if samples is None else samples) if field in s)
+        if not values:
+            return None
+        return values[min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))]
+
+    def observe(self, **values: float):
+        """Record one sample and refresh the summary"""
+        try:
+            with redis_client.pipeline() as pipe:
+                pipe.lpush(self.samples_key, json.dumps({**values, "ts": time.time()}))
+                pipe.ltrim(self.samples_key, 0, self.size - 1)
+
+            samples = self.samples()
+            summary: Dict[str, Any] = {"count": len(samples), "updated": time.time()}
+            for field in values:
+                field_values = [s[field] for s in samples if field in s]
+                if not field_values:
+                    continue
+                summary[f"{field}_mean"] = sum(field_values) / len(field_values)
+                for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+                    summary[f"{field}_{name}"] = self.percentile(field, q, samples)
+            if self.histogram_field:
+                counts = dict.fromkeys(self.labels, 0)
+                for s in samples:
+                    if self.histogram_field in s:
+                        counts[self.labels[bisect.bisect_left(self.buckets, s[self.histogram_field])]] += 1
+                for label, count in counts.items():
+                    summary[f"{self.histogram_field}_le_{label}"] = count
+
+            with redis_client.pipeline() as pipe:
+                pipe.delete(self.key)
+                pipe.hset(self.key, mapping=summary)
+        except Exception as e:
+            logger.error(f"Error recording metrics in {self.key}: {e}")
+
+    def summary(self) -> Dict[str, float]:
+        """Read the summary hash"""
+        return {field: float(value) for field, value in (redis_client.client.hgetall(self.key) or {}).items()}
@@ -52,6 +52,9 @@ class TradeResult(BaseModel):
     status: str = "unknown"  # Default value to prevent validation errors
     error: Optional[str] = None
     timestamp: datetime = Field(default_factory=datetime.now)
+    # Broker-side progress of the order, from the trade updates stream
+    order_state: Optional[str] = None
+    filled_quantity: Optional[float] = None
     
     class Config:
         # Add extra validation to ensure order_id is always a string
@@ -0,0 +1,136 @@
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.utils.logger import get_logger
+from src.utils.redis_client import redis_client
+
+logger = get_logger("news_index")
+
+NEWS_TTL = 86400  # News items are kept for 24 hours
+MAX_ITEMS_PER_SYMBOL = 200  # Hard cap on index size per symbol
+RECENT_NEWS_KEY = "news:recent"  # Global index used by the dashboard feed
+
+
+def news_index_key(symbol: str) -> str:
+    """Return the sorted-set key holding news ids for a symbol (BTC/USD -> BTC)"""
+    base_symbol = symbol.split('/')[0] if '/' in symbol else symbol
+    return f"news:by_symbol:{base_symbol.upper()}"
+
+
+def _publish_score(news_item: Dict[str, Any]) -> float:
+    """Convert a news item's ISO timestamp to an epoch score, defaulting to now"""
+    timestamp = news_item.get("timestamp")
+    if timestamp:
+        try:
+            return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            logger.debug(f"Unparseable news timestamp {timestamp!r}, using current time")
+    return time.time()
+
+
+class NewsIndex:
+    """
+    Stores news items under news:{id} and indexes them per symbol in
+    news:by_symbol:{SYM} sorted sets scored by publish time, so readers can
+    page the newest items without scanning the keyspace.
+    """
+
+    def __init__(self, ttl: int = NEWS_TTL, max_items: int = MAX_ITEMS_PER_SYMBOL):
+        self.ttl = ttl
+        self.max_items = max_items
+
+    def store(self, news_item: Dict[str, Any], only_if_new: bool = False) -> bool:
+        """
+        Save a news item and add it to the per-symbol and recent indexes
+
+        Args:
+            news_item: News item dict with at least "id" and "symbols"
+            only_if_new: Skip the write if news:{id} already exists
+
+        Returns:
+            True if the item was stored, False if skipped or on error
+        """
+        try:
+            news_key = f"news:{news_item['id']}"
+            if only_if_new and redis_client.client.exists(news_key):
+                logger.debug(f"News item already exists in Redis: {news_key}")
+                return False
+
+            with redis_client.pipeline() as pipe:
+                self.queue(pipe, news_item)
+            return True
+        except Exception as e:
+            logger.error(f"Error indexing news item: {e}")
+            return False
+
+    def queue(self, pipe, news_item: Dict[str, Any]):
+        """
+        Queue the writes for a news item on an open redis_client.pipeline(),
+        so callers can batch it with other writes in one round trip
+        """
+        score = _publish_score(news_item)
+        cutoff = time.time() - self.ttl
+        index_keys = {news_index_key(s) for s in news_item.get("symbols", []) if s}
+        index_keys.add(RECENT_NEWS_KEY)
+
+        pipe.set_json(f"news:{news_item['id']}", news_item, ttl=self.ttl)
+        for index_key in index_keys:
+            pipe.zadd(index_key, {news_item["id"]: score})
+            # Retention: drop ids older than the item TTL, then cap the size
+            pipe.zremrangebyscore(index_key, "-inf", cutoff)
+            pipe.zremrangebyrank(index_key, 0, -(self.max_items + 1))
+            pipe.expire(index_key, self.ttl)
+
+    def fetch(self, symbol: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Return the newest news items for a symbol (or across all symbols)
+
+        Args:
+            symbol: Trading symbol (e.g. BTC/USD or AAPL); None for all news
+            limit: Maximum number of items to return
+
+        Returns:
+            News items, newest first
+        """
+        if limit <= 0:
+            return []
+        try:
+            index_key = news_index_key(symbol) if symbol else RECENT_NEWS_KEY
+            news_ids = redis_client.client.zrevrange(index_key, 0, limit - 1)
+            if not news_ids:
+                return []
+
+            items = redis_client.mget_json([f"news:{news_id}" for news_id in news_ids])
+
+            # Items can expire ahead of their index entry; prune those lazily
+            expired = [news_id for news_id, item in zip(news_ids, items) if item is None]
+            if expired:
+                redis_client.client.zrem(index_key, *expired)
+
+            return [item for item in items if item is not None]
+        except Exception as e:
+            logger.error(f"Error fetching news from index: {e}")
+            return []
+
+    def clear(self) -> int:
+        """
+        Delete every indexed news item and the indexes themselves
+
+        Returns:
+            Number of news items deleted
+        """
+        client = redis_client.client
+        index_keys = [RECENT_NEWS_KEY] + list(client.scan_iter(match=news_index_key("*")))
+        news_ids = set()
+        for index_key in index_keys:
+            news_ids.update(client.zrange(index_key, 0, -1))
+        with redis_client.pipeline() as pipe:
+            for news_id in news_ids:
+                pipe.delete(f"news:{news_id}")
+            pipe.delete(*index_keys)
+        return len(news_ids)
+
+
+# Singleton instance
+news_index = NewsIndex()
@@ -0,0 +1,144 @@
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable, Union
+
+from src.config import config
+from src.utils.logger import get_logger
+from src.utils.redis_client import redis_client
+
+logger = get_logger("price_cache")
+
+# Hash of symbol -> {"price", "timestamp" (epoch seconds observed), "source"}
+LAST_PRICE_KEY = "prices:last"
+
+
+def to_epoch(timestamp: Union[str, int, float, datetime, None]) -> Optional[float]:
+    """Epoch seconds for an ISO string, datetime, epoch seconds or epoch milliseconds"""
+    if timestamp is None:
+        return None
+    try:
+        if isinstance(timestamp, datetime):
+            return timestamp.timestamp()
+        if isinstance(timestamp, (int, float)):
+            # Polygon timestamps are in milliseconds
+            return timestamp / 1000.0 if timestamp > 1e11 else float(timestamp)
+        return datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).timestamp()
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+class PriceCache:
+    """
+    Last observed price per symbol, with the time it was observed
+
+    The data retrieval pipeline writes prices (TAAPI candles, Polygon bars)
+    to one Redis hash. Readers keep an in-memory copy of the whole hash that
+    is reloaded at most every local_ttl seconds, so lookups are dictionary
+    reads. get() only returns prices younger than max_age; an older price is
+    refreshed once synchronously through the refresh callable, and None is
+    returned if that fails too.
+    """
+
+    def __init__(self, key: str = LAST_PRICE_KEY, max_age: float = 300.0, local_ttl: float = 1.0,
+                 refresh: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None):
+        """
+        Args:
+            key: Redis hash key
+            max_age: Seconds after which a price is too old to trade on
+            local_ttl: Seconds the in-memory copy is used before Redis is read again
+            refresh: Returns {"close", "timestamp"} for a symbol (defaults to a TAAPI candle)
+        """
+        self.key = key
+        self.max_age = max_age
+        self.local_ttl = local_ttl
+        self.refresh = refresh
+        self._prices: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry(price: float, observed_at: float, source: str) -> str:
+        return json.dumps({"price": float(price), "timestamp": observed_at, "source": source})
+
+    def queue(self, pipe, symbol: str, price: Optional[float], observed_at: Optional[float], source: str):
+        """Queue a price on an open redis_client.pipeline(); missing or invalid prices are ignored"""
+        if not price or price <= 0:
+            return
+        pipe.hset(self.key, symbol, self._entry(price, observed_at or time.time(), source))
+
+    def set(self, symbol: str, price: float, observed_at: Optional[float] = None, source: str = "manual"):
+        """Store a price and update the in-memory copy"""
+        observed_at = observed_at or time.time()
+        try:
+            redis_client.client.hset(self.key, symbol, self._entry(price, observed_at, source))
+        except Exception as e:
+            logger.error(f"Error storing last price for {symbol}: {e}")
+        self._prices[symbol] = {"price": float(price), "timestamp": observed_at, "source": source}
+
+    def _load(self):
+        prices = {}
+        for symbol, raw in (redis_client.client.hgetall(self.key) or {}).items():
+            try:
+                prices[symbol] = json.loads(raw)
+            except ValueError:
+                continue
+        self._prices = prices
+        self._loaded_at = time.monotonic()
+
+    def entry(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Last observation for a symbol ({"price", "timestamp", "source"}), whatever its age"""
+        if time.monotonic() - self._loaded_at > self.local_ttl:
+            with self._lock:
+                if time.monotonic() - self._loaded_at > self.local_ttl:
+                    try:
+                        self._load()
+                    except Exception as e:
+                        logger.error(f"Error loading last prices: {e}")
+        return self._prices.get(symbol)
+
+    def age(self, symbol: str) -> Optional[float]:
+        """Seconds since the price of a symbol was observed, or None if unknown"""
+        entry = self.entry(symbol)
+        return time.time() - entry["timestamp"] if entry else None
+
+    def _fetch(self, symbol: str) -> Optional[Dict[str, Any]]:
+        if self.refresh is None:
+            # Imported here to avoid circular imports
+            from src.data_retrieval.taapi_client import taapi_client
+            return taapi_client.get_price(symbol)
+        return self.refresh(symbol)
+
+    def get(self, symbol: str) -> Optional[float]:
+        """
+        Price of a symbol observed within max_age seconds
+
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            The price, or None if no recent price is known and the refresh failed
+        """
+        entry = self.entry(symbol)
+        if entry and time.time() - entry["timestamp"] <= self.max_age:
+            return entry["price"]
+
+        age = f"{time.time() - entry['timestamp']:.0f}s old" if entry else "missing"
+        logger.info(f"Last price for {symbol} is {age}, refreshing")
+        try:
+            data = self._fetch(symbol)
+            price = float(data["close"]) if data and data.get("close") else None
+        except Exception as e:
+            logger.error(f"Error refreshing price for {symbol}: {e}")
+            price = None
+        if not price or price <= 0:
+            logger.warning(f"No recent price for {symbol}")
+            return None
+
+        self.set(symbol, price, to_epoch(data.get("timestamp")), source="refresh")
+        return price
+
+
+# Singleton instance
+price_cache = PriceCache(max_age=config.trading.price_max_age)
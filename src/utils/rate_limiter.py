@@ -0,0 +1,234 @@
+import math
+import time
+import asyncio
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+
+import redis
+
+from src.config import config
+from src.utils.logger import get_logger
+from src.utils.redis_client import redis_client
+
+logger = get_logger("rate_limiter")
+
+# Priority lanes: live trading calls are served before backfill (backtests, history)
+LANE_LIVE = "live"
+LANE_BACKFILL = "backfill"
+
+# GCRA on the Redis clock, so every process sharing an API key sees one schedule.
+# KEYS[1]: theoretical arrival time (ms), KEYS[2]: number of waiting live callers
+# ARGV[1]: emission interval (ms), ARGV[2]: burst tolerance (ms), ARGV[3]: "1" for backfill
+# Returns 0 when a request slot was taken, otherwise the milliseconds to wait.
+_ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+if ARGV[3] == '1' and tonumber(redis.call('GET', KEYS[2]) or '0') > 0 then
+    return math.ceil(interval)
+end
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+local wait = tat - tolerance - now
+if wait > 0 then
+    return math.ceil(wait)
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now) + 1000)
+return 0
+"""
+
+# Push the schedule back after a 429 so no process sharing the key retries early;
+# the burst is used up too, so requests resume at the sustained rate.
+# KEYS[1]: theoretical arrival time (ms), ARGV[1]: penalty (ms), ARGV[2]: live burst tolerance (ms)
+_BACKOFF_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local until_ms = now + tonumber(ARGV[1]) + tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < until_ms then
+    redis.call('SET', KEYS[1], tostring(until_ms), 'PX', math.ceil(until_ms - now) + 1000)
+end
+return 0
+"""
+
+# Safety expiry for the live-waiter counter in case a process dies while waiting
+LIVE_WAITING_TTL = 60
+
+
+def parse_rate(spec: str) -> Tuple[int, float]:
+    """
+    Parse a quota such as "5/60" (5 requests per 60 seconds)
+
+    Returns:
+        Tuple of (requests, period in seconds)
+    """
+    try:
+        count, period = spec.split("/", 1)
+        count, period = int(count), float(period)
+    except ValueError:
+        raise ValueError(f"Invalid rate limit '{spec}', expected requests/seconds such as 5/60")
+    if count < 1 or period <= 0:
+        raise ValueError(f"Invalid rate limit '{spec}', requests and seconds must be positive")
+    return count, period
+
+
+class RateLimiter:
+    """
+    Token bucket (GCRA) shared through Redis by every client using the same
+    provider and API key
+
+    A quota of N requests per period allows bursts of up to N requests and
+    then one request every period/N seconds. Backfill callers may only use
+    the part of the burst outside backfill_reserve, and are held back while
+    any live caller is waiting, so live requests always go first.
+
+    If Redis is unavailable the limiter falls back to the same schedule kept
+    in process memory.
+    """
+
+    def __init__(self, provider: str, api_key: str = "", requests: int = 1, period: float = 1.0,
+                 backfill_reserve: float = 0.0):
+        """
+        Args:
+            provider: Provider name used in the Redis key (e.g. "taapi")
+            api_key: API key the quota belongs to; only a hash is stored
+            requests: Requests allowed per period (also the burst size)
+            period: Quota period in seconds
+            backfill_reserve: Fraction of the burst kept free for live calls
+        """
+        key_id = hashlib.sha1(api_key.encode()).hexdigest()[:12] if api_key else "shared"
+        self.provider = provider
+        self.key = f"ratelimit:{provider}:{key_id}"
+        self.live_waiting_key = f"{self.key}:live_waiting"
+        self.interval_ms = period * 1000.0 / requests
+        backfill_burst = max(1, math.floor(requests * (1 - backfill_reserve)))
+        self.tolerance_ms = {
+            LANE_LIVE: self.interval_ms * (requests - 1),
+            LANE_BACKFILL: self.interval_ms * (backfill_burst - 1),
+        }
+
+        self._acquire = redis_client.client.register_script(_ACQUIRE_SCRIPT)
+        self._backoff = redis_client.client.register_script(_BACKOFF_SCRIPT)
+        self._local_tat = 0.0
+        self._local_lock = threading.Lock()
+
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the sustained rate"""
+        return self.interval_ms / 1000.0
+
+    def _try_local(self, lane: str) -> float:
+        with self._local_lock:
+            now = time.monotonic() * 1000
+            tat = max(self._local_tat, now)
+            wait = tat - self.tolerance_ms[lane] - now
+            if wait > 0:
+                return wait / 1000.0
+            self._local_tat = tat + self.interval_ms
+            return 0.0
+
+    def try_acquire(self, lane: str = LANE_LIVE) -> float:
+        """
+        Take a request slot if one is free
+
+        Returns:
+            0.0 if the request may proceed, otherwise seconds to wait before retrying
+        """
+        try:
+            wait_ms = self._acquire(
+                keys=[self.key, self.live_waiting_key],
+                args=[self.interval_ms, self.tolerance_ms[lane], "1" if lane == LANE_BACKFILL else "0"]
+            )
+            return int(wait_ms) / 1000.0
+        except redis.RedisError as e:
+            logger.warning(f"Rate limiter for {self.provider} using local state, Redis unavailable: {e}")
+            return self._try_local(lane)
+
+    def _set_live_waiting(self, delta: int):
+        try:
+            with redis_client.pipeline() as pipe:
+                pipe.incrby(self.live_waiting_key, delta)
+                pipe.expire(self.live_waiting_key, LIVE_WAITING_TTL)
+        except redis.RedisError as e:
+            logger.debug(f"Could not update live waiters for {self.provider}: {e}")
+
+    def acquire(self, lane: str = LANE_LIVE, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a request slot is taken
+
+        Args:
+            lane: LANE_LIVE or LANE_BACKFILL
+            timeout: Give up after this many seconds (None waits indefinitely)
+
+        Returns:
+            True if a slot was taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waiting = False
+        try:
+            while True:
+                wait = self.try_acquire(lane)
+                if wait <= 0:
+                    return True
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    return False
+                if lane == LANE_LIVE and not waiting:
+                    self._set_live_waiting(1)
+                    waiting = True
+                logger.debug(f"{self.provider} rate limit: waiting {wait:.2f}s ({lane})")
+                time.sleep(wait)
+        finally:
+            if waiting:
+                self._set_live_waiting(-1)
+
+    async def acquire_async(self, lane: str = LANE_LIVE, timeout: Optional[float] = None) -> bool:
+        """Same as acquire(), but waits with asyncio.sleep"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waiting = False
+        try:
+            while True:
+                wait = self.try_acquire(lane)
+                if wait <= 0:
+                    return True
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    return False
+                if lane == LANE_LIVE and not waiting:
+                    self._set_live_waiting(1)
+                    waiting = True
+                await asyncio.sleep(wait)
+        finally:
+            if waiting:
+                self._set_live_waiting(-1)
+
+    def backoff(self, seconds: float):
+        """Hold every caller of this quota for `seconds`, e.g. after an HTTP 429"""
+        try:
+            self._backoff(keys=[self.key], args=[int(seconds * 1000), self.tolerance_ms[LANE_LIVE]])
+        except redis.RedisError as e:
+            logger.warning(f"Rate limiter for {self.provider} using local state, Redis unavailable: {e}")
+            with self._local_lock:
+                until_ms = time.monotonic() * 1000 + seconds * 1000 + self.tolerance_ms[LANE_LIVE]
+                self._local_tat = max(self._local_tat, until_ms)
+
+
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, api_key: str = "") -> RateLimiter:
+    """
+    Return the process-wide limiter for a provider and API key, configured
+    from config.rate_limits (e.g. TAAPI_RATE_LIMIT=1/16)
+    """
+    with _limiters_lock:
+        limiter = _limiters.get((provider, api_key))
+        if limiter is None:
+            requests, period = parse_rate(getattr(config.rate_limits, provider))
+            limiter = RateLimiter(provider, api_key, requests, period, config.rate_limits.backfill_reserve)
+            _limiters[(provider, api_key)] = limiter
+        return limiter
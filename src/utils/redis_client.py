@@ -1,6 +1,7 @@
 import json
 import redis
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 from datetime import datetime
 from src.config import config
 from src.utils.logger import get_logger
@@ -14,6 +15,23 @@ class DateTimeEncoder(json.JSONEncoder):
             return obj.isoformat()
         return super().default(obj)
 
+class JsonPipeline:
+    """
+    Thin wrapper around a redis-py pipeline that adds the JSON helpers of RedisClient.
+    Any other Redis command is forwarded to the underlying pipeline and queued.
+    """
+    def __init__(self, pipe):
+        self._pipe = pipe
+        self.results: List[Any] = []
+
+    def set_json(self, key: str, data: Dict[str, Any], ttl: Optional[int] = None):
+        """Queue a JSON SET, with the TTL applied atomically via SET ... EX"""
+        self._pipe.set(key, json.dumps(data, cls=DateTimeEncoder), ex=ttl or None)
+        return self
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
 class RedisClient:
     def __init__(self):
         self.client = redis.Redis(
@@ -61,10 +79,7 @@ class RedisClient:
         Set a string value in Redis
         """
         try:
-            result = self.client.set(key, value)
-            if ttl:
-                self.client.expire(key, ttl)
-            return result
+            return self.client.set(key, value, ex=ttl or None)
         except Exception as e:
             logger.error(f"Error setting key {key} in Redis: {e}")
             return False
@@ -76,14 +91,74 @@ class RedisClient:
         try:
             # Use the custom encoder to handle datetime objects
             serialized = json.dumps(data, cls=DateTimeEncoder)
-            result = self.client.set(key, serialized)
-            if ttl:
-                self.client.expire(key, ttl)
-            return result
+            return self.client.set(key, serialized, ex=ttl or None)
         except Exception as e:
             logger.error(f"Error storing data in Redis: {e}")
             return False
 
+    def mget_json(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Retrieve several JSON values in a single MGET round trip.
+        Results are returned in the same order as the keys; missing or
+        undecodable values come back as None.
+        """
+        if not keys:
+            return []
+        try:
+            raw_values = self.client.mget(keys)
+        except Exception as e:
+            logger.error(f"Error retrieving {len(keys)} keys from Redis: {e}")
+            return [None] * len(keys)
+
+        results = []
+        for key, raw in zip(keys, raw_values):
+            if not raw:
+                results.append(None)
+                continue
+            try:
+                results.append(json.loads(raw))
+            except (TypeError, ValueError) as e:
+                logger.error(f"Error decoding JSON for key {key}: {e}")
+                results.append(None)
+        return results
+
+    def mset_json(self, mapping: Dict[str, Dict[str, Any]], ttl: Optional[int] = None) -> bool:
+        """
+        Store several JSON values in one round trip.
+        Each key is written with SET ... EX so the TTL is applied atomically.
+        """
+        if not mapping:
+            return True
+        try:
+            with self.pipeline() as pipe:
+                for key, data in mapping.items():
+                    pipe.set_json(key, data, ttl=ttl)
+            return all(pipe.results)
+        except Exception as e:
+            logger.error(f"Error storing {len(mapping)} keys in Redis: {e}")
+            return False
+
+    @contextmanager
+    def pipeline(self, transaction: bool = False) -> Iterator[JsonPipeline]:
+        """
+        Queue commands and send them to Redis in a single round trip.
+        With transaction=True the commands run inside MULTI/EXEC.
+
+        The queued commands are executed when the block exits cleanly and
+        their replies are available afterwards as ``pipe.results``:
+
+            with redis_client.pipeline() as pipe:
+                pipe.set_json("a", {...}, ttl=60)
+                pipe.get("b")
+            a_ok, b_value = pipe.results
+        """
+        pipe = JsonPipeline(self.client.pipeline(transaction=transaction))
+        try:
+            yield pipe
+            pipe.results = pipe.execute()
+        finally:
+            pipe.reset()
+
     def get_json(self, key: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve JSON data from Redis
@@ -8,6 +8,7 @@ from typing import Dict, Any, Optional
 
 from src.config import config
 from src.utils import get_logger
+from src.utils.rate_limiter import get_rate_limiter
 
 logger = get_logger("sentiment_analyzer")
 
@@ -68,6 +69,7 @@ def _analyze_with_openai(text: str) -> Optional[Dict[str, Any]]:
         """
         
         # Make API call with appropriate model
+        get_rate_limiter("openai", config.openai.api_key).acquire()
         response = openai.chat.completions.create(
             model=config.openai.model,
             messages=[{"role": "user", "content": prompt}],
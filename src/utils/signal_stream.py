@@ -0,0 +1,188 @@
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import redis
+
+from src.utils.logger import get_logger
+from src.utils.models import TradeSignal
+from src.utils.redis_client import redis_client, DateTimeEncoder
+
+logger = get_logger("signal_stream")
+
+SIGNAL_STREAM = "signals"  # Stream every trade signal is appended to
+EXECUTION_GROUP = "trade_execution"  # Consumer group of the services that place orders
+STREAM_MAXLEN = 10000  # Approximate cap on retained stream entries
+SIGNAL_MAX_AGE = 300  # Signals older than this (seconds) are acknowledged without trading
+EXECUTED_TTL = 7 * 86400  # How long per-entry execution markers are kept
+CLAIM_IDLE_MS = 60000  # Pending entries idle this long are taken over from dead consumers
+
+
+class SignalStream:
+    """
+    Publishes trade signals to the "signals" Redis Stream and runs consumer
+    group workers that execute them.
+
+    Producers still write the latest signal to signal:{symbol} for the
+    dashboard. Consumers read with XREADGROUP BLOCK, so a signal reaches the
+    execution service as soon as it is added. Entries stay pending until
+    acknowledged, so a signal delivered to a worker that dies is redelivered
+    after a restart, or claimed by another worker in the group.
+
+    Each entry is marked in signals:executed:{group}:{id} (SET NX) before its
+    handler runs. A redelivered entry whose marker exists is acknowledged
+    without running the handler again, so an order is never placed twice;
+    an entry interrupted mid-execution is logged and left for review.
+    """
+
+    def __init__(self, stream: str = SIGNAL_STREAM, max_age: int = SIGNAL_MAX_AGE):
+        self.stream = stream
+        self.max_age = max_age
+
+    def queue(self, pipe, signal: Union[TradeSignal, Dict[str, Any]], ttl: Optional[int] = 3600):
+        """
+        Queue the writes that publish a signal on an open redis_client.pipeline()
+
+        Args:
+            pipe: Pipeline from redis_client.pipeline()
+            signal: TradeSignal or its dict form
+            ttl: TTL for the signal:{symbol} snapshot (None for no expiry)
+        """
+        signal_dict = signal.dict() if isinstance(signal, TradeSignal) else dict(signal)
+        symbol = signal_dict["symbol"]
+        pipe.set_json(f"signal:{symbol}", signal_dict, ttl=ttl)
+        pipe.xadd(self.stream, {"symbol": symbol, "signal": json.dumps(signal_dict, cls=DateTimeEncoder)},
+                  maxlen=STREAM_MAXLEN, approximate=True)
+        pipe.publish("new_trade_signal", symbol)
+
+    def publish(self, signal: Union[TradeSignal, Dict[str, Any]], ttl: Optional[int] = 3600) -> Optional[str]:
+        """
+        Publish a signal in one round trip
+
+        Returns:
+            The stream entry id, or None on error
+        """
+        try:
+            with redis_client.pipeline() as pipe:
+                self.queue(pipe, signal, ttl=ttl)
+            return pipe.results[1]
+        except Exception as e:
+            logger.error(f"Error publishing trade signal: {e}")
+            return None
+
+    def ensure_group(self, group: str = EXECUTION_GROUP):
+        """Create the consumer group (and stream) if needed; new groups start at new entries"""
+        try:
+            redis_client.client.xgroup_create(self.stream, group, id="$", mkstream=True)
+            logger.info(f"Created consumer group {group} on {self.stream}")
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _is_stale(self, signal: TradeSignal) -> bool:
+        return (datetime.now() - signal.timestamp.replace(tzinfo=None)).total_seconds() > self.max_age
+
+    def _marker(self, group: str, entry_id: str) -> str:
+        return f"{self.stream}:executed:{group}:{entry_id}"
+
+    def _claim(self, group: str, entry_id: str, fields: Dict[str, str]) -> Optional[TradeSignal]:
+        """Mark an entry as executing; returns its signal, or None if it was acknowledged without running"""
+        client = redis_client.client
+        try:
+            signal = TradeSignal(**json.loads(fields["signal"]))
+        except (KeyError, ValueError, TypeError) as e:
+            logger.error(f"Dropping malformed signal entry {entry_id}: {e}")
+            client.xack(self.stream, group, entry_id)
+            return None
+
+        if self._is_stale(signal):
+            logger.warning(f"Skipping stale {signal.decision.value} signal for {signal.symbol} from {signal.timestamp}")
+            client.xack(self.stream, group, entry_id)
+            return None
+
+        marker = self._marker(group, entry_id)
+        if not client.set(marker, "executing", nx=True, ex=EXECUTED_TTL):
+            logger.warning(f"Signal {entry_id} for {signal.symbol} was already {client.get(marker)}, not executing again")
+            client.xack(self.stream, group, entry_id)
+            return None
+        return signal
+
+    def _finish(self, group: str, entry_ids: List[str], state: str):
+        """Record the outcome of claimed entries and acknowledge them"""
+        with redis_client.pipeline() as pipe:
+            for entry_id in entry_ids:
+                pipe.set(self._marker(group, entry_id), state, ex=EXECUTED_TTL)
+                pipe.xack(self.stream, group, entry_id)
+
+    def _process(self, group: str, response, handler: Callable, batch: bool = False) -> int:
+        count = 0
+        claimed: List[Tuple[str, TradeSignal]] = []
+        for _, entries in response or []:
+            for entry_id, fields in entries:
+                count += 1
+                # Entries deleted by MAXLEN trimming come back with no fields
+                if not fields:
+                    redis_client.client.xack(self.stream, group, entry_id)
+                    continue
+                signal = self._claim(group, entry_id, fields)
+                if signal:
+                    claimed.append((entry_id, signal))
+
+        # Run the handler once per entry, or once with every entry of the read
+        calls = [claimed] if batch and claimed else [[item] for item in claimed]
+        for items in calls:
+            entry_ids = [entry_id for entry_id, _ in items]
+            signals = [signal for _, signal in items]
+            try:
+                handler(signals if batch else signals[0])
+                state = "done"
+            except Exception as e:
+                logger.error(f"Error executing signals {', '.join(entry_ids)}: {e}")
+                state = "failed"
+            self._finish(group, entry_ids, state)
+        return count
+
+    def consume(self, handler: Callable, consumer: str, group: str = EXECUTION_GROUP,
+                should_run: Callable[[], bool] = lambda: True, block_ms: int = 5000, count: int = 10,
+                batch: bool = False):
+        """
+        Execute signals from the stream until should_run() returns False
+
+        Args:
+            handler: Called with each TradeSignal, or with the list of signals of each read if batch
+            consumer: Consumer name; keep it stable across restarts to resume its pending entries
+            group: Consumer group name
+            should_run: Checked between reads
+            block_ms: Longest time a read blocks waiting for new entries
+            count: Maximum entries per read
+            batch: Pass the signals of one read to the handler together
+        """
+        client = redis_client.client
+        self.ensure_group(group)
+        logger.info(f"Consuming {self.stream} as {consumer} in group {group}")
+
+        # Entries delivered to this consumer before a restart but never acknowledged
+        while self._process(group, client.xreadgroup(group, consumer, {self.stream: "0"}, count=count), handler, batch):
+            pass
+
+        while should_run():
+            try:
+                response = client.xreadgroup(group, consumer, {self.stream: ">"}, count=count, block=block_ms)
+                if not self._process(group, response, handler, batch):
+                    # Idle: take over entries left pending by consumers that went away
+                    _, claimed, *_ = client.xautoclaim(self.stream, group, consumer, CLAIM_IDLE_MS, count=count)
+                    self._process(group, [(self.stream, claimed)], handler, batch)
+            except redis.ResponseError as e:
+                if "NOGROUP" in str(e):
+                    self.ensure_group(group)
+                else:
+                    logger.error(f"Error reading {self.stream}: {e}")
+                    time.sleep(1)
+            except Exception as e:
+                logger.error(f"Error consuming {self.stream}: {e}")
+                time.sleep(1)
+
+
+# Singleton instance
+signal_stream = SignalStream()
@@ -0,0 +1,114 @@
+import json
+import uuid
+import asyncio
+import threading
+from datetime import datetime, timezone
+
+import websockets
+
+
+class FakeBroker:
+    """
+    Local stand-in for Alpaca's trade updates websocket
+
+    Speaks the same protocol (authenticate, listen to trade_updates, then
+    {"stream": "trade_updates", "data": {...}} messages) and keeps just
+    enough order and position state to send realistic updates.
+    """
+
+    def __init__(self, api_key: str = "test-key", api_secret: str = "test-secret"):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.orders = {}
+        self.positions = {}
+        self.listening = threading.Event()
+        self._listeners = set()
+        self._loop = asyncio.new_event_loop()
+        self._server = None
+        self._thread = None
+        self.url = None
+
+    def start(self) -> str:
+        """Start serving on a free local port and return the stream URL"""
+        started = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(websockets.serve(self._session, "127.0.0.1", 0))
+            self.url = f"ws://127.0.0.1:{self._server.sockets[0].getsockname()[1]}/stream"
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, daemon=True)
+        self._thread.start()
+        started.wait(5)
+        return self.url
+
+    def stop(self):
+        async def close():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(close(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+    async def _session(self, ws, path=None):
+        message = json.loads(await ws.recv())
+        data = message.get("data", {})
+        authorized = (message.get("action") == "authenticate" and data.get("key_id") == self.api_key
+                      and data.get("secret_key") == self.api_secret)
+        await ws.send(json.dumps({"stream": "authorization",
+                                  "data": {"action": "authenticate",
+                                           "status": "authorized" if authorized else "unauthorized"}}))
+        if not authorized:
+            return
+
+        async for raw in ws:
+            message = json.loads(raw)
+            if message.get("action") == "listen":
+                streams = message.get("data", {}).get("streams", [])
+                await ws.send(json.dumps({"stream": "listening", "data": {"streams": streams}}))
+                if "trade_updates" in streams:
+                    self._listeners.add(ws)
+                    self.listening.set()
+        self._listeners.discard(ws)
+
+    def _send(self, event: str, order: dict, **fields):
+        message = json.dumps({"stream": "trade_updates", "data": {
+            "event": event, "order": dict(order), "timestamp": datetime.now(timezone.utc).isoformat(), **fields}})
+
+        async def broadcast():
+            for ws in list(self._listeners):
+                await ws.send(message)
+
+        asyncio.run_coroutine_threadsafe(broadcast(), self._loop).result(5)
+
+    def submit(self, symbol: str, side: str, qty: float) -> dict:
+        """Accept a market order and announce it"""
+        order = {"id": str(uuid.uuid4()), "symbol": symbol, "side": side, "qty": str(qty),
+                 "filled_qty": "0", "filled_avg_price": None, "status": "new"}
+        self.orders[order["id"]] = order
+        self._send("new", order)
+        return order
+
+    def fill(self, order_id: str, qty: float, price: float):
+        """Fill part or all of an order at price"""
+        order = self.orders[order_id]
+        filled = float(order["filled_qty"])
+        notional = filled * float(order["filled_avg_price"] or 0) + qty * price
+        filled += qty
+        order["filled_qty"] = str(filled)
+        order["filled_avg_price"] = str(notional / filled)
+        order["status"] = "filled" if filled >= float(order["qty"]) else "partially_filled"
+
+        signed = qty if order["side"] == "buy" else -qty
+        position = self.positions.get(order["symbol"], 0.0) + signed
+        self.positions[order["symbol"]] = position
+        self._send("fill" if order["status"] == "filled" else "partial_fill", order,
+                   price=str(price), qty=str(qty), position_qty=str(position))
+
+    def cancel(self, order_id: str):
+        order = self.orders[order_id]
+        order["status"] = "canceled"
+        self._send("canceled", order)
@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+import json
+import time
+import threading
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.redis_client import redis_client
+from src.trade_execution.account_snapshot import AccountSnapshot, reply_key
+
+SUMMARY_KEY = "test:account_summary"
+REQUEST_ID = "test-request"
+
+
+class TestAccountSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = 0
+        self.snapshot = AccountSnapshot(fetch=self._fetch, ttl=5, summary_key=SUMMARY_KEY)
+        self._cleanup()
+
+    def tearDown(self):
+        self._cleanup()
+
+    def _cleanup(self):
+        redis_client.client.delete(SUMMARY_KEY, reply_key(REQUEST_ID))
+
+    def _fetch(self):
+        self.calls += 1
+        time.sleep(0.05)
+        return {"cash": 100.0, "equity": 150.0, "positions": []}
+
+    def test_concurrent_requests_share_one_fetch(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.snapshot.get())) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(results), 10)
+        self.assertEqual(redis_client.get_json(SUMMARY_KEY)["cash"], 100.0)
+
+        self.snapshot.invalidate()
+        self.snapshot.get()
+        self.assertEqual(self.calls, 2)
+
+    def test_reply_is_delivered_to_blocking_requester(self):
+        self.snapshot.reply(REQUEST_ID)
+        _, raw = redis_client.client.blpop(reply_key(REQUEST_ID), timeout=1)
+
+        self.assertEqual(json.loads(raw)["equity"], 150.0)
+
+    def test_errors_are_not_shared(self):
+        self.snapshot.fetch = lambda: {"error": "unauthorized", "status": "error"}
+        self.assertEqual(self.snapshot.get()["status"], "error")
+        self.assertIsNone(redis_client.client.get(SUMMARY_KEY))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,11 @@ class TestAIDecisionService(unittest.TestCase):
         # Create a test instance of the service
         self.service = AIDecisionService()
         
+        # Exercise the LLM path rather than the RSI fallback used while the model loads
+        model_ready = patch('src.ai_decision.ollama_client.ollama_client.model_ready', True)
+        model_ready.start()
+        self.addCleanup(model_ready.stop)
+        
         # Create a test RSI data object
         self.rsi_data = RSIData(
             symbol="BTC/USD",
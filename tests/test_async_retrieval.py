@@ -0,0 +1,157 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import time
+import json
+import asyncio
+
+import httpx
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import config
+from src.utils.redis_client import redis_client
+from src.utils.rate_limiter import RateLimiter
+from src.utils.price_cache import LAST_PRICE_KEY
+from src.data_retrieval.async_engine import AsyncRetrievalEngine, ProviderLimiter
+from src.data_retrieval.service import data_retrieval_service
+
+SYMBOLS = ["TSTA", "TSTB", "TSTC", "TST/USD"]
+LATENCY = 0.05
+
+
+def bulk_result(indicator):
+    if indicator["indicator"] == "rsi":
+        return {"value": 42.0}
+    if indicator.get("results"):
+        return {"timestampHuman": ["2024-01-02 15:00:00", "2024-01-02 15:05:00"], "open": [1, 1], "high": [2, 2],
+                "low": [0.5, 0.5], "close": [1.5, 1.6], "volume": [10, 12]}
+    return {"open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10}
+
+
+class FakeProviders:
+    """MockTransport handler answering Polygon.io and TAAPI requests after a fixed delay"""
+
+    def __init__(self):
+        self.in_flight = {"api.polygon.io": 0, "api.taapi.io": 0}
+        self.peak = dict(self.in_flight)
+        self.calls = 0
+
+    async def __call__(self, request):
+        host = request.url.host
+        self.calls += 1
+        self.in_flight[host] += 1
+        self.peak[host] = max(self.peak[host], self.in_flight[host])
+        await asyncio.sleep(LATENCY)
+        self.in_flight[host] -= 1
+
+        path = request.url.path
+        if path.endswith("/bulk"):
+            return httpx.Response(200, json={"data": [
+                {"id": indicator["id"], "result": bulk_result(indicator), "errors": []}
+                for construct in json.loads(request.content)["construct"]
+                for indicator in construct["indicators"]
+            ]})
+        if path.endswith("/rsi"):
+            return httpx.Response(200, json={"value": 42.0})
+        if path.endswith("/candle"):
+            return httpx.Response(200, json={"open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10})
+        if path.endswith("/bulk/candles"):
+            return httpx.Response(200, json=[{"timestampHuman": "2024-01-02 15:00:00", "open": 1, "high": 2,
+                                              "low": 0.5, "close": 1.5, "volume": 10}])
+        if path.endswith("/prev"):
+            return httpx.Response(200, json={"results": [{"c": 9.0}]})
+        if "/range/" in path:
+            return httpx.Response(200, json={"results": [{"t": 1, "c": 10.0}]})
+        return httpx.Response(404)
+
+
+class TestAsyncRetrievalEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.providers = FakeProviders()
+        self.engine = AsyncRetrievalEngine(
+            poll_interval=60,
+            price_history_interval="5m",
+            price_history_limit=20,
+            use_polygon=True,
+            fetch_news=False,
+            build_price_history=data_retrieval_service._build_price_history,
+            transport=httpx.MockTransport(self.providers)
+        )
+        self.engine.limiters = {
+            "polygon": ProviderLimiter("polygon", 3),
+            "taapi": ProviderLimiter("taapi", 2),
+        }
+        self.keys = [f"{prefix}:{s}" for s in SYMBOLS
+                     for prefix in ("rsi", "price", "price_history", "polygon:bars", "polygon:prev_close")]
+        redis_client.client.delete(*self.keys)
+        redis_client.client.hdel(LAST_PRICE_KEY, *SYMBOLS)
+
+    def tearDown(self):
+        redis_client.client.delete(*self.keys)
+        redis_client.client.hdel(LAST_PRICE_KEY, *SYMBOLS)
+
+    def test_cycle_is_concurrent_and_bounded_per_provider(self):
+        start = time.monotonic()
+        with patch.object(redis_client, "pipeline", wraps=redis_client.pipeline) as pipeline, \
+                patch.object(config.taapi, "bulk_constructs", 0):
+            results = asyncio.run(self.engine.run_cycle(SYMBOLS))
+        elapsed = time.monotonic() - start
+
+        # 3 stocks x 2 Polygon calls + 4 symbols x 3 TAAPI calls
+        self.assertEqual(self.providers.calls, 18)
+        self.assertEqual(self.providers.peak["api.polygon.io"], 3)
+        self.assertEqual(self.providers.peak["api.taapi.io"], 2)
+        # 12 TAAPI calls, 2 at a time, is the slowest provider
+        self.assertLess(elapsed, 18 * LATENCY)
+        self.assertEqual(pipeline.call_count, 1)
+
+        self.assertEqual(redis_client.get_json("rsi:TSTA")["value"], 42.0)
+        self.assertEqual(redis_client.get_json("polygon:prev_close:TSTB")["data"], {"c": 9.0})
+        self.assertEqual(len(redis_client.get_json("price_history:TST/USD")["candles"]), 1)
+        self.assertIsNone(redis_client.get_json("polygon:bars:TST/USD"))
+        self.assertEqual(results["TSTC"]["price"]["close"], 1.5)
+        # The TAAPI candle is newer than the daily Polygon bar
+        last_price = json.loads(redis_client.client.hget(LAST_PRICE_KEY, "TSTC"))
+        self.assertEqual((last_price["price"], last_price["source"]), (1.5, "taapi"))
+
+    def test_daily_bar_price_is_timed_at_the_bar_end(self):
+        now = time.time()
+        today = {"polygon_bars": [{"t": int((now - 3 * 3600) * 1000), "c": 11.0}]}
+        price, observed, source = self.engine._latest_price(today)
+        self.assertEqual((price, source), (11.0, "polygon"))
+        self.assertAlmostEqual(observed, now, delta=5)
+
+        older = {"polygon_bars": [{"t": int((now - 2 * 86400) * 1000), "c": 10.0}]}
+        self.assertAlmostEqual(self.engine._latest_price(older)[1], now - 86400, delta=5)
+
+    def test_bulk_cycle_packs_taapi_requests(self):
+        with patch.object(config.taapi, "bulk_constructs", 3):
+            results = asyncio.run(self.engine.run_cycle(SYMBOLS))
+
+        # 4 symbols x (1m construct + chart construct) = 8 constructs in 3 bulk requests
+        self.assertEqual(self.providers.calls, 6 + 3)
+        self.assertEqual(redis_client.get_json("rsi:TST/USD")["value"], 42.0)
+        self.assertEqual(len(redis_client.get_json("price_history:TSTA")["candles"]), 2)
+        self.assertEqual(results["TSTB"]["price"]["close"], 1.5)
+
+    def test_shared_rate_limit_spaces_requests_across_cycles(self):
+        limiter = RateLimiter("test-taapi", "async-test", requests=1, period=0.05)
+        redis_client.client.delete(limiter.key)
+        self.engine.limiters["taapi"] = ProviderLimiter("taapi", 5, limiter)
+
+        with patch.object(config.taapi, "bulk_constructs", 0):
+            asyncio.run(self.engine.run_cycle(["TST/USD"]))
+            start = time.monotonic()
+            asyncio.run(self.engine.run_cycle(["TST/USD"]))
+
+        # Second cycle: rsi + price (no price history), one request per 50ms
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        redis_client.client.delete(limiter.key)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.backtest.backtest_engine import BacktestEngine
+from src.strategies.base_strategy import BaseStrategy, SIGNAL_BUY, SIGNAL_SELL, SIGNAL_HOLD
+from src.strategies.rsi_strategy import RSIStrategy
+
+
+def hourly_bars(day_count, bars_per_day=3, start="2024-01-01"):
+    """Polygon-style bars: several intraday bars on each of day_count days"""
+    rows = []
+    for day in range(day_count):
+        for hour in range(bars_per_day):
+            ts = pd.Timestamp(start) + pd.Timedelta(days=day, hours=10 + hour)
+            close = 100.0 + day + hour / 10
+            rows.append({'t': int(ts.value // 10**6), 'o': close, 'h': close, 'l': close, 'c': close, 'v': 100})
+    return rows
+
+
+class TestBacktestDateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = BacktestEngine()
+
+    def test_day_lookup_returns_that_days_rows(self):
+        bars = list(reversed(hourly_bars(5)))  # unsorted input, like Polygon "desc"
+        df = self.engine._prepare_symbol_data(bars)
+        self.engine.date_index = {"AAA": self.engine._build_date_index(df)}
+
+        day_data = self.engine._get_day_data("AAA", {"AAA": df}, datetime(2024, 1, 3))
+
+        self.assertEqual(len(day_data), 3)
+        self.assertTrue((day_data['timestamp'].dt.date == datetime(2024, 1, 3).date()).all())
+        self.assertIsNone(self.engine._get_day_data("AAA", {"AAA": df}, datetime(2024, 2, 1)))
+
+    def test_common_dates_use_the_index(self):
+        data = {"AAA": hourly_bars(5), "BBB": hourly_bars(3, start="2024-01-03")}
+        frames = {symbol: self.engine._prepare_symbol_data(bars) for symbol, bars in data.items()}
+        self.engine.date_index = {symbol: self.engine._build_date_index(df) for symbol, df in frames.items()}
+
+        common = self.engine._find_common_dates(frames)
+
+        self.assertEqual(common, [datetime(2024, 1, 3), datetime(2024, 1, 4), datetime(2024, 1, 5)])
+
+    def test_open_positions_marked_to_last_bar_of_day(self):
+        df = self.engine._prepare_symbol_data(hourly_bars(2))
+        self.engine.date_index = {"AAA": self.engine._build_date_index(df)}
+        self.engine.positions = {"AAA": {'size': 1, 'current_price': 0.0}}
+
+        self.engine._process_open_positions(datetime(2024, 1, 2), {"AAA": df})
+
+        self.assertAlmostEqual(self.engine.positions["AAA"]['current_price'], 101.2)
+
+
+def daily_bars(closes, start="2024-01-01"):
+    days = pd.date_range(start, periods=len(closes), freq="D")
+    return pd.DataFrame({'t': days.values.astype('datetime64[ms]').astype(np.int64),
+                         'o': closes, 'h': closes, 'l': closes, 'c': closes, 'v': 100})
+
+
+class FixedSignalStrategy(BaseStrategy):
+    """Returns a preset signal array for every symbol"""
+
+    name = "FixedSignal"
+    description = "Preset signals"
+
+    def __init__(self, signals):
+        super().__init__()
+        self.signals = np.asarray(signals, dtype=np.int8)
+
+    def generate_signals(self, frame):
+        return self.signals[:len(frame)]
+
+    def process_data(self, data):
+        return None
+
+    def get_required_data(self):
+        return []
+
+
+class TestVectorizedBacktest(unittest.TestCase):
+
+    def test_round_trip_with_costs(self):
+        engine = BacktestEngine(initial_capital=10000.0, commission=0.001, slippage=0.001)
+        closes = [10.0, 10.0, 11.0, 12.0, 12.0]
+        strategy = FixedSignalStrategy([SIGNAL_HOLD, SIGNAL_BUY, SIGNAL_HOLD, SIGNAL_SELL, SIGNAL_HOLD])
+
+        results = engine.run_backtest(strategy, ["AAA"], "2024-01-01", "2024-01-05",
+                                      data={"AAA": daily_bars(closes)}, vectorized=True)
+
+        invested = 10000.0 / (1.001 * 1.001)
+        shares = invested / 10.0
+        self.assertAlmostEqual(results['final_capital'], shares * 12.0 * 0.999 * 0.999, places=6)
+        self.assertEqual(results['total_trades'], 2)
+        self.assertEqual(results['winning_trades'], 1)
+        self.assertAlmostEqual(results['avg_win'], shares * (12.0 * 0.999 - 10.0 * 1.001), places=6)
+        self.assertEqual(results['avg_holding_period_days'], 2)
+        self.assertEqual(len(engine.equity_frame), 5)
+
+    def test_open_position_is_marked_but_not_closed(self):
+        engine = BacktestEngine(initial_capital=1000.0, commission=0.0, slippage=0.0)
+        strategy = FixedSignalStrategy([SIGNAL_BUY, SIGNAL_HOLD, SIGNAL_SELL, SIGNAL_BUY, SIGNAL_HOLD])
+        data = {"AAA": daily_bars([10.0, 12.0, 9.0, 10.0, 15.0]), "BBB": daily_bars([5.0] * 5)}
+
+        results = engine.run_backtest(strategy, ["AAA", "BBB"], "2024-01-01", "2024-01-05",
+                                      data=data, vectorized=True)
+
+        # AAA sleeve: 500 -> 450 on the closed trade, then 450 * 1.5 while still open
+        self.assertAlmostEqual(results['final_capital'], 450.0 * 1.5 + 500.0)
+        self.assertEqual(results['total_closed_trades'], 2)
+        self.assertEqual(results['total_trades'], 6)
+        self.assertAlmostEqual(results['max_drawdown'], 1 - 950.0 / 1100.0)
+
+    def test_strategy_without_signal_arrays(self):
+        engine = BacktestEngine()
+        strategy = FixedSignalStrategy([])
+        strategy.generate_signals = lambda frame: None
+
+        results = engine.run_backtest(strategy, ["AAA"], "2024-01-01", "2024-01-05",
+                                      data={"AAA": daily_bars([1.0, 2.0])}, vectorized=True)
+
+        self.assertIn("error", results)
+
+    def test_rsi_strategy_signals_follow_thresholds(self):
+        closes = 100 + np.cumsum(np.random.default_rng(3).normal(0, 2, 200))
+        strategy = RSIStrategy()
+        frame = BacktestEngine()._prepare_symbol_data(daily_bars(closes))
+
+        signals = strategy.generate_signals(frame)
+
+        # No look-ahead: each bar's signal only depends on bars up to it
+        prefix_signals = np.array([strategy.generate_signals(frame.iloc[:i + 1])[-1] for i in range(0, 200, 17)])
+        self.assertTrue((signals[::17] == prefix_signals).all())
+        self.assertTrue((signals[:14] == SIGNAL_HOLD).all())
+        self.assertTrue((signals == SIGNAL_BUY).any() and (signals == SIGNAL_SELL).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
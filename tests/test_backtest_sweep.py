@@ -0,0 +1,73 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.backtest.backtest_engine import BacktestEngine
+from src.backtest.sweep import SharedBars, parse_param_range, expand_grid, build_strategy, rank_results, run_sweep
+
+
+def daily_bars(closes, start="2024-01-01"):
+    days = pd.date_range(start, periods=len(closes), freq="D")
+    return pd.DataFrame({'t': days.values.astype('datetime64[ms]').astype(np.int64),
+                         'o': closes, 'h': closes, 'l': closes, 'c': closes, 'v': 100})
+
+
+class TestBacktestSweep(unittest.TestCase):
+
+    def test_parse_param_range(self):
+        self.assertEqual(parse_param_range("overbought_threshold=60:80:10"), ("overbought_threshold", [60, 70, 80]))
+        self.assertEqual(parse_param_range("volume_spike_threshold=1.5,2.5"), ("volume_spike_threshold", [1.5, 2.5]))
+        with self.assertRaises(ValueError):
+            parse_param_range("rsi_period")
+        self.assertEqual(len(expand_grid({"a": [1, 2], "b": [3, 4, 5]})), 6)
+
+    def test_unknown_parameter_is_rejected(self):
+        with self.assertRaises(ValueError):
+            build_strategy("rsi", {"no_such_parameter": 1})
+
+    def test_shared_bars_round_trip(self):
+        engine = BacktestEngine()
+        frames = {"AAA": engine._prepare_symbol_data(daily_bars([1.0, 2.0, 3.0])),
+                  "BBB": engine._prepare_symbol_data(daily_bars([4.0, 5.0]))}
+        shared = SharedBars.create(frames)
+        try:
+            attached = SharedBars.attach(*shared.handle)
+            restored = attached.frames()
+            for symbol, df in frames.items():
+                pd.testing.assert_frame_equal(restored[symbol][list(SharedBars.COLUMNS)],
+                                              df[list(SharedBars.COLUMNS)], check_dtype=False)
+            del restored
+            attached.close()
+        finally:
+            shared.close()
+
+    def test_results_ranked_by_sharpe_then_drawdown(self):
+        table = rank_results([
+            {"p": 1, "sharpe_ratio": 0.5, "max_drawdown_pct": 10, "win_rate_pct": 50},
+            {"p": 2, "sharpe_ratio": 1.0, "max_drawdown_pct": 20, "win_rate_pct": 40},
+            {"p": 3, "sharpe_ratio": 1.0, "max_drawdown_pct": 5, "win_rate_pct": 40},
+            {"p": 4, "sharpe_ratio": np.nan, "max_drawdown_pct": np.nan, "win_rate_pct": np.nan},
+        ])
+        self.assertEqual(table["p"].tolist(), [3, 2, 1, 4])
+        self.assertEqual(table.index[0], 1)
+
+    def test_sweep_matches_single_runs(self):
+        closes = 100 + np.cumsum(np.random.default_rng(5).normal(0, 2, 300))
+        data = {"AAA": daily_bars(closes)}
+        table = run_sweep("rsi", {"overbought_threshold": [60, 70]}, data, "2024-01-01", "2025-12-31", max_workers=2)
+
+        for threshold in (60, 70):
+            single = BacktestEngine().run_backtest(build_strategy("rsi", {"overbought_threshold": threshold}),
+                                                   ["AAA"], "2024-01-01", "2025-12-31", data=data, vectorized=True)
+            row = table[table["overbought_threshold"] == threshold].iloc[0]
+            self.assertAlmostEqual(row["sharpe_ratio"], single["sharpe_ratio"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_retrieval.polygon_client import PolygonClient
+from src.data_retrieval.bar_cache import BarCache
+from src.utils.rate_limiter import RateLimiter
+
+
+def fake_aggregates(url, params=None, timeout=None):
+    """Stand-in for requests.get: one daily bar per weekday in the requested range, newest first"""
+    from_date, to_date = url.rstrip("/").split("/")[-2:]
+    day = datetime.strptime(from_date, "%Y-%m-%d").date()
+    end = datetime.strptime(to_date, "%Y-%m-%d").date()
+    results = []
+    while day <= end:
+        if day.weekday() < 5:
+            t = int(datetime(day.year, day.month, day.day, 5, tzinfo=timezone.utc).timestamp() * 1000)
+            results.append({"t": t, "o": 1.0, "h": 2.0, "l": 0.5, "c": float(day.day), "v": 1000.0, "n": 7})
+        day += timedelta(days=1)
+    response = MagicMock()
+    response.status_code = 200
+    response.json.return_value = {"results": list(reversed(results))}
+    return response
+
+
+class TestBarCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.client = PolygonClient()
+        self.client.bar_cache = BarCache(self.cache_dir)
+        # Keep the fake API calls off the real Polygon.io quota
+        self.client.rate_limiter = RateLimiter("test-polygon", "bar-cache-test", requests=1000, period=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    @patch('src.data_retrieval.polygon_client.requests.get', side_effect=fake_aggregates)
+    def test_repeat_request_is_served_from_disk(self, mock_get):
+        first = self.client.get_historical_data_for_backtest("AAPL", "2024-01-01", "2024-01-31", "1d")
+        second = self.client.get_historical_data_for_backtest("AAPL", "2024-01-01", "2024-01-31", "1d")
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(len(first), 23)
+        self.assertEqual(first, second)
+        self.assertEqual(first, sorted(first, key=lambda bar: bar['t']))
+        self.assertEqual(second[0], {"t": second[0]['t'], "o": 1.0, "h": 2.0, "l": 0.5, "c": 1.0, "v": 1000.0, "n": 7})
+
+    @patch('src.data_retrieval.polygon_client.requests.get', side_effect=fake_aggregates)
+    def test_only_missing_ranges_are_fetched(self, mock_get):
+        self.client.get_historical_data_for_backtest("AAPL", "2024-01-10", "2024-01-20", "day")
+        bars = self.client.get_historical_data_for_backtest("AAPL", "2024-01-01", "2024-01-31", "day")
+
+        requested = [call.args[0].split("/")[-2:] for call in mock_get.call_args_list]
+        self.assertEqual(requested, [["2024-01-10", "2024-01-20"],
+                                     ["2024-01-01", "2024-01-09"],
+                                     ["2024-01-21", "2024-01-31"]])
+        self.assertEqual(len(bars), 23)
+        self.assertEqual(len({bar['t'] for bar in bars}), 23)
+
+        # A narrower range inside the cached one needs no request at all
+        inner = self.client.get_historical_data_for_backtest("AAPL", "2024-01-15", "2024-01-19", "day")
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual([bar['c'] for bar in inner], [15.0, 16.0, 17.0, 18.0, 19.0])
+
+    @patch('src.data_retrieval.polygon_client.requests.get')
+    def test_failed_fetch_is_not_cached(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=500, text="error")
+
+        self.assertIsNone(self.client.get_historical_data_for_backtest("AAPL", "2024-01-01", "2024-01-31", "day"))
+        self.assertEqual(self.client.bar_cache.missing_ranges("AAPL", "day", 1, "2024-01-01", "2024-01-31"),
+                         [(date(2024, 1, 1), date(2024, 1, 31))])
+
+    def test_today_is_never_marked_covered(self):
+        today = datetime.now(timezone.utc).date()
+        cache = BarCache(self.cache_dir)
+        cache.store("AAPL", "day", 1, today - timedelta(days=5), today, [])
+
+        self.assertEqual(cache.missing_ranges("AAPL", "day", 1, today - timedelta(days=5), today), [(today, today)])
+
+
+if __name__ == '__main__':
+    unittest.main()
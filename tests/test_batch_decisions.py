@@ -0,0 +1,100 @@
+import unittest
+import os
+import sys
+import json
+import asyncio
+from datetime import datetime
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.redis_client import redis_client
+from src.utils.signal_stream import SignalStream
+from src.utils.models import RSIData, TradingDecision
+from src.ai_decision.decision_cache import DecisionCache
+from src.ai_decision.service import AIDecisionService, parse_batch_decisions
+
+PREFIX = "test:batch:cache"
+STREAM = "test:batch:signals"
+SYMBOLS = ["TSTA", "TSTB", "TST/USD"]
+
+
+class FakeOllama:
+    """Answers batched prompts with JSON and single prompts with one word"""
+
+    model = "test-model"
+
+    def __init__(self, batch_reply):
+        self.batch_reply = batch_reply
+        self.calls = []
+
+    def available(self):
+        return True
+
+    async def generate(self, prompt, system_prompt=None, json_format=False, num_predict=500, stop_pattern=None):
+        self.calls.append("batch" if json_format else "single")
+        return self.batch_reply if json_format else "hold"
+
+
+class TestBatchDecisions(unittest.TestCase):
+
+    def setUp(self):
+        self.service = AIDecisionService()
+        self.rsi = [RSIData(symbol=symbol, value=value, timestamp=datetime.now())
+                    for symbol, value in zip(SYMBOLS, (25.0, 75.0, 50.0))]
+        self.previous_trading = redis_client.client.get("trading_enabled")
+        redis_client.client.set("trading_enabled", "true")
+        self._cleanup()
+
+    def tearDown(self):
+        self._cleanup()
+        if self.previous_trading is None:
+            redis_client.client.delete("trading_enabled")
+        else:
+            redis_client.client.set("trading_enabled", self.previous_trading)
+
+    def _cleanup(self):
+        keys = redis_client.client.keys(f"{PREFIX}*") + redis_client.client.keys(f"{STREAM}*")
+        redis_client.client.delete(*(keys + [f"signal:{symbol}" for symbol in SYMBOLS]))
+
+    def _run(self, ollama):
+        with patch("src.ai_decision.service.ollama_client", ollama), \
+                patch("src.ai_decision.service.decision_cache", DecisionCache(ttl=60, prefix=PREFIX)), \
+                patch("src.ai_decision.service.signal_stream", SignalStream(stream=STREAM)):
+            return asyncio.run(self.service.analyze_batch(self.rsi))
+
+    def test_parse_batch_decisions(self):
+        reply = json.dumps({"decisions": {"tsta": "BUY", "TSTB": "maybe", "OTHER": "sell"}})
+        self.assertEqual(parse_batch_decisions(reply, SYMBOLS), {"TSTA": "buy"})
+        reply = json.dumps([{"symbol": "TST/USD", "decision": "sell"}])
+        self.assertEqual(parse_batch_decisions(reply, SYMBOLS), {"TST/USD": "sell"})
+        self.assertEqual(parse_batch_decisions("not json", SYMBOLS), {})
+
+    def test_one_request_for_all_symbols_with_fallback(self):
+        # TST/USD is missing from the reply and falls back to a single-symbol request
+        ollama = FakeOllama(json.dumps({"decisions": {"TSTA": "buy", "TSTB": "sell"}}))
+        signals = self._run(ollama)
+
+        self.assertEqual(ollama.calls, ["batch", "single"])
+        self.assertEqual(signals["TSTA"].decision, TradingDecision.BUY)
+        self.assertEqual(signals["TSTB"].decision, TradingDecision.SELL)
+        self.assertEqual(signals["TST/USD"].decision, TradingDecision.HOLD)
+        self.assertEqual(redis_client.client.xlen(STREAM), 3)
+        self.assertEqual(redis_client.get_json("signal:TSTB")["decision"], "sell")
+
+    def test_batched_decisions_are_cached_per_symbol(self):
+        ollama = FakeOllama(json.dumps({"decisions": {"TSTA": "buy", "TSTB": "sell", "TST/USD": "hold"}}))
+        cache = DecisionCache(ttl=60, prefix=PREFIX)
+        with patch("src.ai_decision.service.ollama_client", ollama), \
+                patch("src.ai_decision.service.decision_cache", cache), \
+                patch("src.ai_decision.service.signal_stream", SignalStream(stream=STREAM)):
+            asyncio.run(self.service.analyze_batch(self.rsi))
+            signal = asyncio.run(self.service.analyze_rsi(self.rsi[1]))
+
+        self.assertEqual(ollama.calls, ["batch"])
+        self.assertEqual(signal.decision, TradingDecision.SELL)
+
+
+if __name__ == '__main__':
+    unittest.main()
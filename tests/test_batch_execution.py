@@ -0,0 +1,79 @@
+import unittest
+import os
+import sys
+import time
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import TradeSignal, TradeResult, TradingDecision
+from src.utils.redis_client import redis_client
+from src.trade_execution.service import TradeExecutionService
+
+SYMBOLS = ["TSTA", "TSTB", "TSTC"]
+
+
+class FakeAlpacaClient:
+    """Records how many orders are in flight at once"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.orders = []
+        self.cache = SimpleNamespace(account=lambda: None, positions=lambda: {})
+
+    def execute_trade(self, signal):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+            self.orders.append(signal)
+        return TradeResult(symbol=signal.symbol, decision=signal.decision, order_id=f"order-{signal.symbol}",
+                           quantity=1.0, price=10.0, status="executed")
+
+
+def make_signal(symbol, decision=TradingDecision.BUY):
+    return TradeSignal(symbol=symbol, decision=decision, confidence=0.8, rsi_value=25.0, timestamp=datetime.now())
+
+
+class TestBatchExecution(unittest.TestCase):
+
+    def setUp(self):
+        self.alpaca = FakeAlpacaClient()
+        self.patcher = patch.dict(sys.modules, {"src.trade_execution.alpaca_client": SimpleNamespace(alpaca_client=self.alpaca)})
+        self.patcher.start()
+        self.service = TradeExecutionService(max_concurrent_orders=2)
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.service.order_pool.shutdown()
+        redis_client.client.delete(*[f"trade_result:{symbol}" for symbol in SYMBOLS])
+
+    def test_orders_run_concurrently_within_the_limit(self):
+        signals = [make_signal("TSTA"), make_signal("TSTB", TradingDecision.SELL),
+                   make_signal("TSTA", TradingDecision.SELL), make_signal("TSTC")]
+        results = self.service.execute_batch(signals)
+
+        # Only the latest signal for TSTA is executed; results line up with the signals
+        self.assertIsNone(results[0])
+        self.assertEqual([r.symbol for r in results[1:]], ["TSTB", "TSTA", "TSTC"])
+        self.assertEqual(results[2].decision, TradingDecision.SELL)
+        self.assertEqual(len(self.alpaca.orders), 3)
+        self.assertEqual(self.alpaca.max_in_flight, 2)
+        self.assertEqual(redis_client.get_json("trade_result:TSTC")["order_id"], "order-TSTC")
+
+    def test_min_execution_interval_applies_across_batches(self):
+        self.service.execute_batch([make_signal("TSTA")])
+        self.assertEqual(self.service.execute_batch([make_signal("TSTA"), make_signal("TSTB")])[0], None)
+        self.assertEqual([s.symbol for s in self.alpaca.orders], ["TSTA", "TSTB"])
+
+
+if __name__ == '__main__':
+    unittest.main()
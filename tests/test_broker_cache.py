@@ -0,0 +1,111 @@
+import unittest
+import os
+import sys
+import time
+import threading
+from types import SimpleNamespace
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.trade_execution.broker_cache import BrokerCache, ACCOUNT, POSITIONS
+
+
+class TestBrokerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = BrokerCache(self._account, self._positions, ttl=60, settle=0)
+
+    def _account(self):
+        return SimpleNamespace(cash="1000", buying_power="2000")
+
+    def _positions(self):
+        time.sleep(0.05)
+        return {"AAPL": SimpleNamespace(symbol="AAPL", qty="3"), "BTCUSD": SimpleNamespace(symbol="BTCUSD", qty="0.1")}
+
+    def test_burst_of_orders_shares_one_positions_fetch(self):
+        found = []
+        threads = [threading.Thread(target=lambda: found.append(self.cache.position("AAPL"))) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.cache.fetches[POSITIONS], 1)
+        self.assertEqual([p.qty for p in found], ["3"] * 20)
+        self.assertIsNone(self.cache.position("MSFT"))
+
+    def test_fills_are_reserved_until_the_refresh(self):
+        self.assertEqual(self.cache.cash(), 1000.0)
+        self.cache.record_fill(250.0)
+        self.cache.record_fill(-100.0)
+
+        self.assertEqual(self.cache.cash(), 650.0)
+        self.assertEqual(self.cache.buying_power(), 1650.0)
+        self.assertEqual(self.cache.fetches[ACCOUNT], 1)
+
+        # One background pass after the fills reconciles with the broker
+        passes = iter([True, False])
+        self.cache.run(should_run=lambda: next(passes), interval=5)
+        self.assertEqual(self.cache.fetches, {ACCOUNT: 2, POSITIONS: 1})
+        self.assertEqual(self.cache.cash(), 1000.0)
+
+    def test_reservation_during_a_fetch_is_kept(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_account():
+            started.set()
+            release.wait(5)
+            return SimpleNamespace(cash="1000", buying_power="2000")
+
+        self.cache.record_fill(100.0)
+        self.cache._fetchers[ACCOUNT] = slow_account
+        fetch = threading.Thread(target=self.cache.refresh)
+        fetch.start()
+        started.wait(5)
+        # Submitted while the broker was answering: the new balances may not include it
+        fills = [threading.Thread(target=self.cache.record_fill, args=(10.0,)) for _ in range(20)]
+        for thread in fills:
+            thread.start()
+        for thread in fills:
+            thread.join()
+        release.set()
+        fetch.join()
+
+        self.assertEqual(self.cache.cash(), 800.0)
+
+    def test_concurrent_buys_only_reserve_what_cash_covers(self):
+        start = threading.Barrier(10)
+        reservations = []
+
+        def buy():
+            start.wait()
+            reservations.append(self.cache.reserve(250.0, "cash")[0])
+
+        threads = [threading.Thread(target=buy) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        passed = [reservation for reservation in reservations if reservation is not None]
+        self.assertEqual(len(passed), 4)
+        self.assertEqual(self.cache.cash(), 0.0)
+        self.assertEqual(self.cache.reserve(10.0, "cash"), (None, 0.0))
+
+        # A failed submission gives its funds back
+        self.cache.release(passed[0])
+        self.assertEqual(self.cache.cash(), 250.0)
+
+    def test_unsubmitted_reservations_survive_a_refresh(self):
+        submitted, _ = self.cache.reserve(300.0, "cash")
+        pending, _ = self.cache.reserve(200.0, "cash")
+        self.cache.confirm(submitted)
+
+        self.cache.refresh()
+        self.assertEqual(self.cache.cash(), 800.0)
+        self.assertEqual(self.cache.buying_power(), 1800.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
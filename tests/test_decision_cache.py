@@ -0,0 +1,93 @@
+import unittest
+import os
+import sys
+import asyncio
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.redis_client import redis_client
+from src.ai_decision.decision_cache import DecisionCache, bucket_rsi
+
+PREFIX = "test:ai_decision:cache"
+
+
+class TestDecisionCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = DecisionCache(ttl=60, max_entries=2, prefix=PREFIX)
+        self.calls = 0
+        self._cleanup()
+
+    def tearDown(self):
+        self._cleanup()
+
+    def _cleanup(self):
+        keys = redis_client.client.keys(f"{PREFIX}*")
+        if keys:
+            redis_client.client.delete(*keys)
+
+    async def _generate(self):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return "buy"
+
+    def test_bucket_rsi(self):
+        self.assertEqual(bucket_rsi(25.74, 0.5), 25.5)
+        self.assertEqual(bucket_rsi(25.76, 0.5), 26.0)
+        self.assertEqual(bucket_rsi(25.76, 0), 25.76)
+
+    def test_repeat_prompt_is_served_from_cache(self):
+        key = self.cache.key("llama3", "RSI 25.50", "system")
+        self.assertEqual(asyncio.run(self.cache.get_or_generate(key, self._generate)), "buy")
+        self.assertEqual(asyncio.run(self.cache.get_or_generate(key, self._generate)), "buy")
+
+        self.assertEqual(self.calls, 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertGreater(stats["saved_seconds"], 0.04)
+
+    def test_concurrent_identical_prompts_share_one_call(self):
+        key = self.cache.key("llama3", "RSI 70.00")
+
+        async def burst():
+            return await asyncio.gather(*[self.cache.get_or_generate(key, self._generate) for _ in range(5)])
+
+        self.assertEqual(asyncio.run(burst()), ["buy"] * 5)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.cache.stats()["coalesced"], 4)
+
+    def test_failed_generation_is_not_cached(self):
+        async def no_decision():
+            self.calls += 1
+            return None
+
+        key = self.cache.key("llama3", "RSI 50.00")
+        asyncio.run(self.cache.get_or_generate(key, no_decision))
+        asyncio.run(self.cache.get_or_generate(key, no_decision))
+        self.assertEqual(self.calls, 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        keys = [self.cache.key("llama3", f"RSI {value}") for value in (10, 20, 30)]
+        asyncio.run(self.cache.get_or_generate(keys[0], self._generate))
+        asyncio.run(self.cache.get_or_generate(keys[1], self._generate))
+        # Touch the first entry so the second is the least recently used
+        self.cache.get(keys[0])
+        asyncio.run(self.cache.get_or_generate(keys[2], self._generate))
+
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = DecisionCache(ttl=0, prefix=PREFIX)
+        key = cache.key("llama3", "RSI 30.00")
+        cache.put(key, "hold", 0.1)
+
+        self.assertIsNone(redis_client.client.get(key))
+        self.assertEqual(redis_client.client.zcard(cache.lru_key), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import os
+import sys
+import math
+import statistics
+
+import numpy as np
+import pandas as pd
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import indicators
+
+
+# Reference implementations: the pure-Python loops the indicator library replaced
+
+def reference_rsi_series(closes, period=14):
+    """Wilder RSI as previously implemented in scripts/run_rsi_test.py"""
+    price_changes = [closes[i] - closes[i-1] for i in range(1, len(closes))]
+    rsi_series = [None] * period
+    gains = [max(0, change) for change in price_changes[:period]]
+    losses = [max(0, -change) for change in price_changes[:period]]
+    avg_gain = sum(gains) / period
+    avg_loss = sum(losses) / period
+    rsi_series.append(100 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss)))
+    for i in range(period, len(price_changes)):
+        avg_gain = ((avg_gain * (period - 1)) + max(0, price_changes[i])) / period
+        avg_loss = ((avg_loss * (period - 1)) + max(0, -price_changes[i])) / period
+        rsi_series.append(100 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss)))
+    return rsi_series
+
+
+def reference_ema(values, period):
+    """SMA-seeded EMA as previously implemented in PolygonClient._calculate_ema"""
+    multiplier = 2 / (period + 1)
+    emas = [sum(values[:period]) / period]
+    for i in range(period, len(values)):
+        emas.append((values[i] - emas[-1]) * multiplier + emas[-1])
+    return emas
+
+
+def reference_bollinger(closes, period=20, std_dev=2.0):
+    """Latest Bollinger Bands as previously implemented in PolygonClient"""
+    window = closes[-period:]
+    middle = sum(window) / period
+    stdev = (sum((x - middle) ** 2 for x in window) / period) ** 0.5
+    return middle + std_dev * stdev, middle, middle - std_dev * stdev
+
+
+def reference_atr(highs, lows, closes, period=14):
+    """Wilder ATR computed bar by bar"""
+    trs = [max(highs[i] - lows[i], abs(highs[i] - closes[i-1]), abs(lows[i] - closes[i-1]))
+           for i in range(1, len(closes))]
+    atr = sum(trs[:period]) / period
+    series = [None] * period + [atr]
+    for tr in trs[period:]:
+        atr = (atr * (period - 1) + tr) / period
+        series.append(atr)
+    return series
+
+
+class TestIndicators(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.closes = 100 + np.cumsum(rng.normal(0, 1, 600))
+        self.highs = self.closes + rng.uniform(0, 2, 600)
+        self.lows = self.closes - rng.uniform(0, 2, 600)
+
+    def assertSeriesClose(self, actual, expected, tol=1e-9):
+        expected = np.array([np.nan if v is None else v for v in expected], dtype=np.float64)
+        self.assertEqual(actual.shape, expected.shape)
+        np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+        np.testing.assert_allclose(actual[~np.isnan(actual)], expected[~np.isnan(expected)], rtol=tol, atol=tol)
+
+    def test_rsi_matches_wilder_reference(self):
+        for period in (2, 14, 30):
+            expected = reference_rsi_series(self.closes.tolist(), period)
+            self.assertSeriesClose(indicators.rsi(self.closes, period), expected)
+
+    def test_rsi_without_losses_is_100(self):
+        result = indicators.rsi(np.arange(1.0, 30.0), 14)
+        self.assertTrue(np.all(result[14:] == 100.0))
+
+    def test_rsi_short_series_is_all_nan(self):
+        self.assertTrue(np.all(np.isnan(indicators.rsi(self.closes[:14], 14))))
+
+    def test_ema_matches_reference(self):
+        for period in (5, 12, 26, 200):
+            expected = [None] * (period - 1) + reference_ema(self.closes.tolist(), period)
+            self.assertSeriesClose(indicators.ema(self.closes, period), expected)
+
+    def test_sma_and_rolling_volatility_match_pandas(self):
+        series = pd.Series(self.closes)
+        self.assertSeriesClose(indicators.sma(self.closes, 20), series.rolling(20).mean().tolist())
+        self.assertSeriesClose(indicators.rolling_volatility(self.closes, 20),
+                               series.pct_change().rolling(20).std().tolist())
+
+    def test_macd_matches_reference(self):
+        closes = self.closes.tolist()
+        fast = reference_ema(closes, 12)[26 - 12:]
+        slow = reference_ema(closes, 26)
+        macd_values = [f - s for f, s in zip(fast, slow)]
+        signal = reference_ema(macd_values, 9)
+
+        macd_line, signal_line, histogram = indicators.macd(self.closes, 12, 26, 9)
+
+        self.assertSeriesClose(macd_line, [None] * 25 + macd_values)
+        self.assertSeriesClose(signal_line, [None] * 33 + signal)
+        self.assertAlmostEqual(histogram[-1], macd_values[-1] - signal[-1], places=9)
+
+    def test_bollinger_matches_reference(self):
+        upper, middle, lower = indicators.bollinger_bands(self.closes, 20, 2.0)
+        expected = reference_bollinger(self.closes.tolist(), 20, 2.0)
+        np.testing.assert_allclose((upper[-1], middle[-1], lower[-1]), expected, rtol=1e-9)
+
+    def test_atr_matches_reference(self):
+        expected = reference_atr(self.highs.tolist(), self.lows.tolist(), self.closes.tolist(), 14)
+        self.assertSeriesClose(indicators.atr(self.highs, self.lows, self.closes, 14), expected)
+
+    def test_annualized_volatility_matches_statistics(self):
+        closes = self.closes.tolist()
+        returns = [closes[i] / closes[i-1] - 1 for i in range(1, len(closes))]
+        expected = statistics.stdev(returns) * math.sqrt(252)
+        self.assertAlmostEqual(indicators.annualized_volatility(self.closes), expected, places=12)
+
+    def test_bars_to_array_reverses_newest_first(self):
+        bars = [{'c': 3.0}, {'c': 2.0}, {'c': 1.0}]
+        result = indicators.bars_to_array(bars, newest_first=True)
+        self.assertEqual(result.tolist(), [1.0, 2.0, 3.0])
+        self.assertTrue(result.flags['C_CONTIGUOUS'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.redis_client import redis_client
+from src.utils.news_index import NewsIndex, news_index_key, RECENT_NEWS_KEY
+
+
+class TestNewsIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = NewsIndex(ttl=3600, max_items=3)
+        self.ids = [f"test-news-{i}" for i in range(5)]
+        self._cleanup()
+
+    def tearDown(self):
+        self._cleanup()
+
+    def _cleanup(self):
+        redis_client.client.delete(news_index_key("TSTX"), *[f"news:{i}" for i in self.ids])
+        redis_client.client.zrem(RECENT_NEWS_KEY, *self.ids)
+
+    def _item(self, i, minutes_ago):
+        return {
+            "id": self.ids[i],
+            "headline": f"headline {i}",
+            "symbols": ["TSTX"],
+            "timestamp": (datetime.now() - timedelta(minutes=minutes_ago)).isoformat()
+        }
+
+    def test_fetch_returns_newest_first(self):
+        self.index.store(self._item(0, 30))
+        self.index.store(self._item(1, 10))
+        self.index.store(self._item(2, 20))
+
+        items = self.index.fetch("TSTX/USD", limit=2)
+
+        self.assertEqual([item["id"] for item in items], [self.ids[1], self.ids[2]])
+
+    def test_index_is_trimmed_to_max_items(self):
+        for i in range(5):
+            self.index.store(self._item(i, 50 - i))
+
+        self.assertEqual(redis_client.client.zcard(news_index_key("TSTX")), 3)
+
+    def test_only_if_new_skips_existing(self):
+        self.assertTrue(self.index.store(self._item(0, 5), only_if_new=True))
+        self.assertFalse(self.index.store(self._item(0, 5), only_if_new=True))
+
+    def test_expired_items_are_pruned(self):
+        self.index.store(self._item(0, 5))
+        self.index.store(self._item(1, 1))
+        redis_client.client.delete(f"news:{self.ids[1]}")
+
+        items = self.index.fetch("TSTX", limit=5)
+
+        self.assertEqual([item["id"] for item in items], [self.ids[0]])
+        self.assertEqual(redis_client.client.zcard(news_index_key("TSTX")), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import os
+import sys
+import json
+import asyncio
+
+import httpx
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime
+from unittest.mock import patch
+
+from src.utils.redis_client import redis_client
+from src.utils.metrics import RollingMetrics
+from src.utils.models import RSIData, TradingDecision
+from src.utils.signal_stream import SignalStream
+from src.ai_decision.ollama_client import OllamaClient
+from src.ai_decision.service import AIDecisionService, DECISION_PATTERN
+
+METRICS_KEY = "test:ollama:metrics"
+
+WORDS = ["Based", " on", " the", " RSI", ",", " I", " would", " buy", ".", " However", ",", " markets", " vary", "."]
+
+
+class StreamingOllama:
+    """MockTransport handler streaming one JSON line per word and counting what was sent"""
+
+    def __init__(self):
+        self.sent = 0
+        self.payloads = []
+
+    async def __call__(self, request):
+        self.payloads.append(json.loads(request.content))
+
+        async def lines():
+            for i, word in enumerate(WORDS):
+                self.sent += 1
+                done = i == len(WORDS) - 1
+                yield (json.dumps({"response": word, "done": done}) + "\n").encode()
+                await asyncio.sleep(0)
+
+        return httpx.Response(200, content=lines())
+
+
+class TestOllamaClient(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StreamingOllama()
+        self.client = OllamaClient(async_transport=httpx.MockTransport(self.server), monitor=False)
+        self.client.model_ready = True
+        self.client.metrics = RollingMetrics(METRICS_KEY, histogram_field="latency")
+        self._cleanup()
+
+    def tearDown(self):
+        self._cleanup()
+
+    def _cleanup(self):
+        redis_client.client.delete(METRICS_KEY, f"{METRICS_KEY}:samples", "test:ollama:signals", "signal:TSTA")
+
+    def test_generation_stops_at_decision_word(self):
+        text = asyncio.run(self.client.generate("prompt", stop_pattern=DECISION_PATTERN))
+
+        self.assertEqual(text, "Based on the RSI, I would buy.")
+        self.assertLess(self.server.sent, len(WORDS))
+        payload = self.server.payloads[0]
+        self.assertTrue(payload["stream"])
+        self.assertEqual(payload["keep_alive"], self.client.keep_alive)
+
+    def test_full_response_without_stop_pattern(self):
+        text = asyncio.run(self.client.generate("prompt", json_format=True))
+
+        self.assertEqual(text, "".join(WORDS))
+        self.assertEqual(self.server.payloads[0]["format"], "json")
+
+    def test_client_is_reused_within_a_loop(self):
+        async def twice():
+            await self.client.generate("one")
+            first = self.client._get_async_client()
+            await self.client.generate("two")
+            return first is self.client._get_async_client()
+
+        self.assertTrue(asyncio.run(twice()))
+
+    def test_calls_are_recorded_in_rolling_metrics(self):
+        asyncio.run(self.client.generate("prompt"))
+
+        summary = self.client.metrics.summary()
+        self.assertEqual(summary["count"], 1)
+        self.assertEqual(summary["tokens_mean"], len(WORDS))
+        self.assertIn("queue_wait_p95", summary)
+        self.assertEqual(sum(v for k, v in summary.items() if k.startswith("latency_le_")), 1)
+
+    def test_slow_model_falls_back_to_rsi_thresholds(self):
+        self.client.latency_budget = 1.0
+        self.client.slo_min_samples = 3
+        self.assertTrue(self.client.available())
+        for _ in range(3):
+            self.client.metrics.observe(latency=5.0, tokens=10, queue_wait=0.0)
+        self.assertFalse(self.client.available())
+
+        service = AIDecisionService()
+        rsi = RSIData(symbol="TSTA", value=20.0, timestamp=datetime.now())
+        previous = redis_client.client.get("trading_enabled")
+        redis_client.client.set("trading_enabled", "true")
+        try:
+            with patch("src.ai_decision.service.ollama_client", self.client), \
+                    patch("src.ai_decision.service.signal_stream", SignalStream(stream="test:ollama:signals")):
+                signal = asyncio.run(service.analyze_rsi(rsi))
+        finally:
+            if previous is None:
+                redis_client.client.delete("trading_enabled")
+            else:
+                redis_client.client.set("trading_enabled", previous)
+
+        self.assertEqual(signal.decision, TradingDecision.BUY)
+        self.assertEqual(signal.metadata, {"source": "rsi_fallback"})
+        self.assertEqual(self.server.payloads, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+import threading
+from datetime import datetime
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import TradeSignal, TradingDecision
+from src.utils.redis_client import redis_client
+from src.trade_execution.order_ledger import OrderLedger, client_order_id
+
+PREFIX = "test:orders:ledger:"
+
+
+def make_signal(strategy="rsi", timestamp=datetime(2024, 1, 2, 15, 30)):
+    return TradeSignal(symbol="TSTA", decision=TradingDecision.BUY, rsi_value=25.0, timestamp=timestamp,
+                       metadata={"strategy": strategy})
+
+
+class TestOrderLedger(unittest.TestCase):
+
+    def setUp(self):
+        self._cleanup()
+
+    def tearDown(self):
+        self._cleanup()
+
+    def _cleanup(self):
+        keys = redis_client.client.keys(f"{PREFIX}*")
+        if keys:
+            redis_client.client.delete(*keys)
+
+    def test_client_order_id_is_deterministic(self):
+        order_key = client_order_id(make_signal())
+        self.assertEqual(order_key, client_order_id(make_signal()))
+        self.assertNotEqual(order_key, client_order_id(make_signal(strategy="news")))
+        self.assertNotEqual(order_key, client_order_id(make_signal(timestamp=datetime(2024, 1, 2, 15, 31))))
+        self.assertLessEqual(len(order_key), 48)
+
+    def test_only_one_replica_claims_a_signal(self):
+        order_key = client_order_id(make_signal())
+        replicas = [OrderLedger(prefix=PREFIX) for _ in range(8)]
+        claims = []
+        threads = [threading.Thread(target=lambda ledger=ledger: claims.append(ledger.claim(order_key, "TSTA")))
+                   for ledger in replicas]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(claims), [False] * 7 + [True])
+
+        replicas[0].complete(order_key, "order-1")
+        self.assertEqual(replicas[1].get(order_key)["order_id"], "order-1")
+
+    def test_released_claim_can_be_retried(self):
+        ledger = OrderLedger(prefix=PREFIX)
+        order_key = client_order_id(make_signal())
+        self.assertTrue(ledger.claim(order_key, "TSTA"))
+        ledger.release(order_key)
+        self.assertTrue(ledger.claim(order_key, "TSTA"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import os
+import sys
+import time
+import threading
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import TradeResult, TradingDecision
+from src.utils.redis_client import redis_client
+from src.trade_execution.order_tracker import OrderTracker, order_key, FILLED, CANCELED
+from tests.fake_broker import FakeBroker
+
+SYMBOL = "TSTA"
+
+
+class TestOrderTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.fills = []
+        self.tracker = OrderTracker(on_fill=self.fills.append)
+        self.broker = FakeBroker()
+        self.broker.start()
+        self.order_ids = []
+
+    def tearDown(self):
+        self.tracker.stop()
+        self.broker.stop()
+        redis_client.client.delete(f"trade_result:{SYMBOL}", *[order_key(order_id) for order_id in self.order_ids])
+
+    def _submit(self, qty=2.0):
+        order = self.broker.submit(SYMBOL, "buy", qty)
+        self.order_ids.append(order["id"])
+        result = TradeResult(symbol=SYMBOL, decision=TradingDecision.BUY, order_id=order["id"],
+                             quantity=qty, price=100.0, status="executed")
+        redis_client.set_json(f"trade_result:{SYMBOL}", self.tracker.track(result).dict())
+        return order
+
+    def _follow(self):
+        threading.Thread(target=self.tracker.run,
+                         kwargs={"url": self.broker.url, "api_key": "test-key", "api_secret": "test-secret"},
+                         daemon=True).start()
+        self.assertTrue(self.broker.listening.wait(5))
+
+    def _wait_for(self, state):
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            result = redis_client.get_json(f"trade_result:{SYMBOL}")
+            if result and result.get("order_state") == state:
+                return result
+            time.sleep(0.02)
+        self.fail(f"trade result never reached {state}")
+
+    def test_fills_from_the_stream_update_the_trade_result(self):
+        self._follow()
+        order = self._submit()
+
+        self.broker.fill(order["id"], 0.5, 99.0)
+        self._wait_for("partially_filled")
+        self.broker.fill(order["id"], 1.5, 101.0)
+        result = self._wait_for(FILLED)
+
+        self.assertEqual(result["status"], "executed")
+        self.assertEqual(result["filled_quantity"], 2.0)
+        self.assertAlmostEqual(result["price"], 100.5)
+        self.assertEqual(redis_client.get_json(order_key(order["id"]))["position_qty"], 2.0)
+        # on_fill runs right after the write
+        deadline = time.time() + 1
+        while len(self.fills) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.fills, [SYMBOL, SYMBOL])
+
+    def test_unfilled_cancel_fails_the_trade_and_late_updates_are_ignored(self):
+        self._follow()
+        order = self._submit()
+
+        self.broker.cancel(order["id"])
+        result = self._wait_for(CANCELED)
+        self.assertEqual(result["status"], "failed")
+
+        # A terminal order does not move again
+        late_fill = {"event": "fill", "order": dict(order, filled_qty="2", filled_avg_price="100")}
+        self.assertIsNone(self.tracker.handle(late_fill))
+        self.assertEqual(redis_client.get_json(f"trade_result:{SYMBOL}")["order_state"], CANCELED)
+
+    def test_late_fill_of_an_earlier_order_keeps_the_latest_result(self):
+        self._follow()
+        first = self._submit()
+        second = self._submit()
+        self._wait_for("accepted")
+
+        self.broker.fill(first["id"], 2.0, 99.0)
+        deadline = time.time() + 5
+        while redis_client.get_json(order_key(first["id"]))["state"] != FILLED and time.time() < deadline:
+            time.sleep(0.02)
+
+        self.assertEqual(redis_client.get_json(order_key(first["id"]))["filled_qty"], 2.0)
+        result = redis_client.get_json(f"trade_result:{SYMBOL}")
+        self.assertEqual(result["order_id"], second["id"])
+        self.assertEqual(result["order_state"], "accepted")
+
+    def test_wrong_credentials_are_rejected(self):
+        threading.Thread(target=self.tracker.run,
+                         kwargs={"url": self.broker.url, "api_key": "test-key", "api_secret": "wrong"},
+                         daemon=True).start()
+        self.assertFalse(self.broker.listening.wait(0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+import time
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.redis_client import redis_client
+from src.utils.price_cache import PriceCache, to_epoch
+
+KEY = "test:prices:last"
+
+
+class TestPriceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.refreshed = []
+        self.cache = PriceCache(key=KEY, max_age=60, local_ttl=0, refresh=self._refresh)
+        redis_client.client.delete(KEY)
+
+    def tearDown(self):
+        redis_client.client.delete(KEY)
+
+    def _refresh(self, symbol):
+        self.refreshed.append(symbol)
+        return {"close": 101.5, "timestamp": time.time()}
+
+    def test_recent_price_is_served_without_refresh(self):
+        with redis_client.pipeline() as pipe:
+            self.cache.queue(pipe, "TSTA", 100.0, time.time() - 5, "taapi")
+            self.cache.queue(pipe, "TSTB", None, time.time(), "taapi")
+
+        self.assertEqual(self.cache.get("TSTA"), 100.0)
+        self.assertEqual(self.cache.entry("TSTA")["source"], "taapi")
+        self.assertIsNone(self.cache.entry("TSTB"))
+        self.assertEqual(self.refreshed, [])
+
+    def test_stale_price_is_refreshed_once(self):
+        self.cache.set("TSTA", 90.0, time.time() - 3600, source="polygon")
+
+        self.assertEqual(self.cache.get("TSTA"), 101.5)
+        self.assertEqual(self.cache.get("TSTA"), 101.5)
+        self.assertEqual(self.refreshed, ["TSTA"])
+        self.assertLess(self.cache.age("TSTA"), 5)
+
+    def test_no_guess_when_refresh_fails(self):
+        self.cache.refresh = lambda symbol: None
+        self.assertIsNone(self.cache.get("TSTA"))
+
+    def test_to_epoch(self):
+        self.assertEqual(to_epoch(1700000000000), 1700000000.0)
+        self.assertEqual(to_epoch(1700000000.5), 1700000000.5)
+        self.assertEqual(to_epoch("2023-11-14T22:13:20+00:00"), 1700000000.0)
+        self.assertIsNone(to_epoch("not a date"))
+
+
+if __name__ == '__main__':
+    unittest.main()
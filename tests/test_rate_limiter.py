@@ -0,0 +1,84 @@
+import unittest
+import os
+import sys
+import time
+import threading
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.redis_client import redis_client
+from src.utils.rate_limiter import RateLimiter, parse_rate, LANE_LIVE, LANE_BACKFILL
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.limiters = []
+
+    def tearDown(self):
+        for limiter in self.limiters:
+            redis_client.client.delete(limiter.key, limiter.live_waiting_key)
+
+    def _limiter(self, requests, period, reserve=0.0):
+        limiter = RateLimiter("test", f"key-{len(self.limiters)}", requests, period, reserve)
+        redis_client.client.delete(limiter.key, limiter.live_waiting_key)
+        self.limiters.append(limiter)
+        return limiter
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("5/60"), (5, 60.0))
+        with self.assertRaises(ValueError):
+            parse_rate("5 per minute")
+
+    def test_burst_then_sustained_rate(self):
+        limiter = self._limiter(3, 3.0)
+
+        self.assertEqual([limiter.try_acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        wait = limiter.try_acquire()
+        self.assertGreater(wait, 0.9)
+        self.assertLessEqual(wait, 1.0)
+
+    def test_quota_is_shared_by_key(self):
+        limiter = self._limiter(1, 10.0)
+        other_process = RateLimiter("test", "key-0", 1, 10.0)
+
+        self.assertEqual(limiter.try_acquire(), 0.0)
+        self.assertGreater(other_process.try_acquire(), 0)
+
+    def test_backfill_leaves_reserve_for_live(self):
+        limiter = self._limiter(5, 5.0, reserve=0.4)
+
+        granted = 0
+        while limiter.try_acquire(LANE_BACKFILL) == 0.0:
+            granted += 1
+        self.assertEqual(granted, 3)
+        self.assertEqual(limiter.try_acquire(LANE_LIVE), 0.0)
+        self.assertEqual(limiter.try_acquire(LANE_LIVE), 0.0)
+
+    def test_waiting_live_caller_goes_before_backfill(self):
+        limiter = self._limiter(1, 0.2)
+        limiter.try_acquire()
+        order = []
+
+        live = threading.Thread(target=lambda: order.append(("live", limiter.acquire(LANE_LIVE))))
+        live.start()
+        time.sleep(0.05)
+        # The live caller is waiting, so backfill is held back even when a slot frees up
+        self.assertTrue(limiter.acquire(LANE_BACKFILL, timeout=1.0))
+        order.append(("backfill", True))
+        live.join()
+
+        self.assertEqual(order, [("live", True), ("backfill", True)])
+
+    def test_backoff_holds_all_callers(self):
+        limiter = self._limiter(100, 1.0)
+
+        limiter.backoff(0.5)
+
+        self.assertGreater(limiter.try_acquire(), 0.4)
+        self.assertFalse(limiter.acquire(timeout=0.1))
+
+
+if __name__ == '__main__':
+    unittest.main()
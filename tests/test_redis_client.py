@@ -0,0 +1,42 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.redis_client import redis_client
+
+
+class TestRedisClientBatching(unittest.TestCase):
+    
+    def setUp(self):
+        self.keys = ["test:batch:a", "test:batch:b", "test:batch:missing"]
+        redis_client.client.delete(*self.keys)
+    
+    def tearDown(self):
+        redis_client.client.delete(*self.keys)
+    
+    def test_mset_json_applies_ttl(self):
+        ok = redis_client.mset_json({"test:batch:a": {"value": 1}, "test:batch:b": {"value": 2}}, ttl=60)
+        
+        self.assertTrue(ok)
+        self.assertGreater(redis_client.client.ttl("test:batch:a"), 0)
+        self.assertGreater(redis_client.client.ttl("test:batch:b"), 0)
+    
+    def test_mget_json_preserves_order(self):
+        redis_client.mset_json({"test:batch:a": {"value": 1}, "test:batch:b": {"value": 2}})
+        
+        result = redis_client.mget_json(["test:batch:b", "test:batch:missing", "test:batch:a"])
+        
+        self.assertEqual(result, [{"value": 2}, None, {"value": 1}])
+    
+    def test_pipeline_collects_results(self):
+        with redis_client.pipeline(transaction=True) as pipe:
+            pipe.set_json("test:batch:a", {"value": 1}, ttl=30)
+            pipe.get("test:batch:a")
+        
+        self.assertEqual(pipe.results, [True, '{"value": 1}'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.data_retrieval.taapi_client import TaapiClient
 from src.utils.models import RSIData
+from src.utils.rate_limiter import RateLimiter
 
 class TestTaapiClient(unittest.TestCase):
     
@@ -23,6 +24,7 @@ class TestTaapiClient(unittest.TestCase):
         # Create client with test API key
         client = TaapiClient()
         client.api_key = "test_api_key"
+        client.rate_limiter = RateLimiter("test-taapi", "rsi-client-test", requests=1000, period=1)
         
         # Call the method
         result = client.get_rsi("BTC/USD")
@@ -47,6 +49,7 @@ class TestTaapiClient(unittest.TestCase):
         # Create client with test API key
         client = TaapiClient()
         client.api_key = "test_api_key"
+        client.rate_limiter = RateLimiter("test-taapi", "rsi-client-test", requests=1000, period=1)
         
         # Call the method and expect an exception
         with self.assertRaises(Exception):
@@ -0,0 +1,104 @@
+import unittest
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils import TradeSignal, TradingDecision
+from src.utils.redis_client import redis_client
+from src.utils.signal_stream import SignalStream
+
+STREAM = "test:signals"
+GROUP = "test_execution"
+
+
+def make_signal(symbol="TSTA", decision=TradingDecision.BUY, age=0):
+    return TradeSignal(symbol=symbol, decision=decision, confidence=0.8, rsi_value=25.0,
+                       timestamp=datetime.now() - timedelta(seconds=age))
+
+
+class TestSignalStream(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = SignalStream(stream=STREAM)
+        self._cleanup()
+        self.executed = []
+
+    def tearDown(self):
+        self._cleanup()
+
+    def _cleanup(self):
+        client = redis_client.client
+        keys = client.keys(f"{STREAM}:executed:*") + [STREAM, "signal:TSTA", "signal:TSTB"]
+        client.delete(*keys)
+
+    def _consume_once(self, consumer="worker-1"):
+        """Run one consumer pass: pending entries, then one read of new entries"""
+        reads = iter([True, False])
+        self.stream.consume(self.executed.append, consumer=consumer, group=GROUP,
+                            should_run=lambda: next(reads), block_ms=10)
+
+    def test_publish_stores_snapshot_and_executes_once(self):
+        self.stream.ensure_group(GROUP)
+        entry_id = self.stream.publish(make_signal())
+        self.assertIsNotNone(entry_id)
+        self.assertEqual(redis_client.get_json("signal:TSTA")["decision"], "buy")
+
+        self._consume_once()
+        self._consume_once()
+
+        self.assertEqual([s.symbol for s in self.executed], ["TSTA"])
+        self.assertEqual(redis_client.client.xpending(STREAM, GROUP)["pending"], 0)
+
+    def test_unacknowledged_signal_is_redelivered_after_restart(self):
+        self.stream.ensure_group(GROUP)
+        self.stream.publish(make_signal("TSTB", TradingDecision.SELL))
+
+        # A worker reads the entry and dies before handling it
+        redis_client.client.xreadgroup(GROUP, "worker-1", {STREAM: ">"}, count=10)
+        self.assertEqual(redis_client.client.xpending(STREAM, GROUP)["pending"], 1)
+
+        self._consume_once("worker-1")
+
+        self.assertEqual([s.decision for s in self.executed], [TradingDecision.SELL])
+        self.assertEqual(redis_client.client.xpending(STREAM, GROUP)["pending"], 0)
+
+    def test_redelivery_after_execution_does_not_trade_again(self):
+        self.stream.ensure_group(GROUP)
+        entry_id = self.stream.publish(make_signal())
+
+        # The order was placed but the worker died before acknowledging
+        redis_client.client.xreadgroup(GROUP, "worker-1", {STREAM: ">"}, count=10)
+        redis_client.client.set(f"{STREAM}:executed:{GROUP}:{entry_id}", "done")
+
+        self._consume_once("worker-1")
+
+        self.assertEqual(self.executed, [])
+        self.assertEqual(redis_client.client.xpending(STREAM, GROUP)["pending"], 0)
+
+    def test_stale_signal_is_acknowledged_without_executing(self):
+        self.stream.ensure_group(GROUP)
+        self.stream.publish(make_signal(age=self.stream.max_age + 60))
+
+        self._consume_once()
+
+        self.assertEqual(self.executed, [])
+        self.assertEqual(redis_client.client.xpending(STREAM, GROUP)["pending"], 0)
+
+    def test_batch_handler_receives_each_read_together(self):
+        self.stream.ensure_group(GROUP)
+        self.stream.publish(make_signal("TSTA"))
+        self.stream.publish(make_signal("TSTB", TradingDecision.SELL))
+
+        reads = iter([True, False])
+        self.stream.consume(self.executed.append, consumer="worker-1", group=GROUP,
+                            should_run=lambda: next(reads), block_ms=10, batch=True)
+
+        self.assertEqual([[s.symbol for s in batch] for batch in self.executed], [["TSTA", "TSTB"]])
+        self.assertEqual(redis_client.client.xpending(STREAM, GROUP)["pending"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
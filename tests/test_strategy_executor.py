@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+import time
+import threading
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.redis_client import redis_client
+from src.utils import RSIData
+from src.strategies.executor import StrategyExecutor
+from src.strategies.rsi_strategy import RSIStrategy
+
+
+class SleepyStrategy:
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def process_data(self, data):
+        time.sleep(self.seconds)
+        return data["symbol"]
+
+
+class TestStrategyExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = StrategyExecutor(max_workers=4, symbol_timeout=0.3)
+        redis_client.client.delete("strategy:TestSleepy:latency")
+
+    def tearDown(self):
+        redis_client.client.delete("strategy:TestSleepy:latency")
+
+    def test_slow_symbol_does_not_delay_others(self):
+        finished = {}
+        release = threading.Event()
+
+        def process_symbol(symbol, deadline):
+            if symbol == "SLOW":
+                release.wait(5)
+                finished[symbol] = time.monotonic() <= deadline
+                return
+            time.sleep(0.05)
+            finished[symbol] = time.monotonic() <= deadline
+
+        start = time.monotonic()
+        self.executor.evaluate(["SLOW", "A", "B", "C"], process_symbol)
+        elapsed = time.monotonic() - start
+
+        # Fast symbols ran in parallel, and the cycle ended at the timeout
+        self.assertEqual(dict(finished), {"A": True, "B": True, "C": True})
+        self.assertLess(elapsed, 0.6)
+
+        # The next cycle skips the still-running symbol instead of queueing it again
+        calls = []
+        self.executor.evaluate(["SLOW", "A"], lambda symbol, deadline: calls.append(symbol))
+        self.assertEqual(calls, ["A"])
+
+        release.set()
+        self.executor._inflight["SLOW"].result(timeout=5)
+        self.assertFalse(finished["SLOW"])
+
+    def test_strategy_latency_is_recorded(self):
+        for seconds in (0.0, 0.0, 0.06):
+            self.executor.run_strategy("TestSleepy", SleepyStrategy(seconds), {"symbol": "A"})
+
+        snapshot = self.executor.latency("TestSleepy").snapshot()
+        self.assertEqual(snapshot["count"], 3)
+        self.assertEqual(snapshot["buckets"]["0.005"], 2)
+        self.assertEqual(snapshot["buckets"]["0.1"], 1)
+        self.assertEqual(snapshot["p50"], 0.005)
+        self.assertEqual(snapshot["p99"], 0.1)
+
+    def test_process_pool_uses_the_configured_thresholds(self):
+        strategy = RSIStrategy()
+        strategy.configure(overbought_threshold=80.0, oversold_threshold=20.0)
+        executor = StrategyExecutor(process_strategies=["RSIStrategy"], process_workers=1)
+        data = {"symbol": "A", "rsi": RSIData(symbol="A", value=30.0)}
+        try:
+            in_process = executor.run_strategy("RSIStrategy", strategy, data)
+            executor.process_strategies = set()
+            in_thread = executor.run_strategy("RSIStrategy", strategy, data)
+        finally:
+            if executor.process_pool:
+                executor.process_pool.shutdown()
+            redis_client.client.delete("strategy:RSIStrategy:latency")
+
+        # RSI 30 is a buy at the default 40 but no signal at the configured 20
+        self.assertIsNone(in_process)
+        self.assertIsNone(in_thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import os
+import sys
+import json
+
+import numpy as np
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import indicators
+from src.indicators import SymbolIndicatorState
+from src.strategies.indicator_state import IndicatorStateStore
+
+
+def make_bars(closes, start=0):
+    return [{'t': (start + i) * 86400000, 'c': float(c)} for i, c in enumerate(closes)]
+
+
+class TestStreamingIndicators(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.closes = 100 + np.cumsum(rng.normal(0, 1, 400))
+
+    def test_state_matches_batch_indicators(self):
+        state = SymbolIndicatorState(rsi_period=14, ma_short_period=20, ma_long_period=50, volatility_period=20)
+        for bar in make_bars(self.closes):
+            state.commit(bar)
+        snapshot = state.snapshot()
+
+        macd_line, signal_line, _ = indicators.macd(self.closes)
+        self.assertAlmostEqual(snapshot['rsi'], indicators.rsi(self.closes, 14)[-1], places=9)
+        self.assertAlmostEqual(snapshot['ma_short'], indicators.sma(self.closes, 20)[-1], places=9)
+        self.assertAlmostEqual(snapshot['ma_long'], indicators.sma(self.closes, 50)[-1], places=9)
+        self.assertAlmostEqual(snapshot['prev_ma_long'], indicators.sma(self.closes, 50)[-2], places=9)
+        self.assertAlmostEqual(snapshot['volatility'],
+                               indicators.rolling_volatility(self.closes, 20)[-1] * np.sqrt(252), places=9)
+        self.assertAlmostEqual(snapshot['macd'], macd_line[-1], places=9)
+        self.assertAlmostEqual(snapshot['macd_signal'], signal_line[-1], places=9)
+
+    def test_preview_matches_commit_without_mutating(self):
+        bars = make_bars(self.closes[:100])
+        state = SymbolIndicatorState()
+        for bar in bars[:-1]:
+            state.commit(bar)
+        before = json.dumps(state.to_dict())
+
+        preview = state.snapshot(bars[-1])
+        self.assertEqual(json.dumps(state.to_dict()), before)
+
+        state.commit(bars[-1])
+        committed = state.snapshot()
+        for key in ('rsi', 'ma_short', 'ma_long', 'volatility', 'macd', 'macd_signal'):
+            self.assertAlmostEqual(preview[key], committed[key], places=9)
+
+    def test_state_round_trips_through_json(self):
+        state = SymbolIndicatorState()
+        for bar in make_bars(self.closes[:80]):
+            state.commit(bar)
+        restored = SymbolIndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+        for bar in make_bars(self.closes[80:120], start=80):
+            state.commit(bar)
+            restored.commit(bar)
+        self.assertEqual(state.snapshot(), restored.snapshot())
+
+    def test_store_only_applies_new_bars(self):
+        store = IndicatorStateStore()
+        store.reset("TEST:STREAM")
+        params = {"ma_short_period": 5, "ma_long_period": 10}
+        try:
+            all_bars = make_bars(self.closes[:60])
+            store.update("TEST:STREAM", all_bars[:50], params)
+            self.assertEqual(store.states["TEST:STREAM"].bars, 49)  # newest bar is still forming
+
+            # A sliding window of the latest 10 bars advances the state by one bar
+            snapshot = store.update("TEST:STREAM", list(reversed(all_bars[41:51])), params)
+            self.assertEqual(store.states["TEST:STREAM"].bars, 50)
+            self.assertAlmostEqual(snapshot['ma_long'], indicators.sma(self.closes[:51], 10)[-1], places=9)
+        finally:
+            store.reset("TEST:STREAM")
+
+
+if __name__ == '__main__':
+    unittest.main()
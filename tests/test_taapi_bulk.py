@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to the path so we can import our modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.models import RSIData
+from src.data_retrieval.taapi_bulk import TaapiBulkQuery, MAX_INDICATORS_PER_CONSTRUCT
+
+
+class TestTaapiBulkQuery(unittest.TestCase):
+
+    def test_payloads_respect_plan_limits(self):
+        query = TaapiBulkQuery(max_constructs=2)
+        for symbol in ["BTC/USD", "ETH/USD", "AAPL"]:
+            query.add_rsi(symbol).add_price(symbol)
+        query.add_price_history("AAPL", "5m", 20)
+
+        payloads = query.payloads("secret")
+
+        # 4 constructs (3 symbols at 1m, AAPL at 5m), 2 per request
+        self.assertEqual([len(p["construct"]) for p in payloads], [2, 2])
+        first = payloads[0]["construct"][0]
+        self.assertEqual((first["symbol"], first["exchange"], first["interval"]), ("BTC/USDT", "binance", "1m"))
+        self.assertEqual([i["indicator"] for i in first["indicators"]], ["rsi", "candle"])
+        stock = payloads[1]["construct"][0]
+        self.assertEqual((stock["symbol"], stock["type"]), ("AAPL", "stocks"))
+        self.assertNotIn("secret", stock)
+
+    def test_large_constructs_are_split(self):
+        query = TaapiBulkQuery(max_constructs=10)
+        for _ in range(MAX_INDICATORS_PER_CONSTRUCT + 1):
+            query.add_rsi("BTC/USD")
+
+        constructs = query.payloads("secret")[0]["construct"]
+
+        self.assertEqual([len(c["indicators"]) for c in constructs], [MAX_INDICATORS_PER_CONSTRUCT, 1])
+
+    def test_unpack_maps_results_to_symbols(self):
+        query = TaapiBulkQuery()
+        query.add_rsi("BTC/USD").add_price("BTC/USD").add_price_history("BTC/USD", "5m", 2)
+        query.add_rsi("AAPL")
+        response = {"data": [
+            {"id": "BTC/USD|rsi", "result": {"value": 28.5}, "errors": []},
+            {"id": "BTC/USD|price", "result": {"open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 3}, "errors": []},
+            {"id": "BTC/USD|price_history", "result": {"timestampHuman": ["2024-01-02 15:00:00", "2024-01-02 15:05:00"],
+                                                       "close": [1.0, 2.0]}, "errors": []},
+            {"id": "AAPL|rsi", "result": {}, "errors": ["Symbol not found"]},
+        ]}
+
+        results = query.unpack([response, None], lambda symbol, candles: candles)
+
+        self.assertIsInstance(results["BTC/USD"]["rsi"], RSIData)
+        self.assertEqual(results["BTC/USD"]["rsi"].value, 28.5)
+        self.assertEqual(results["BTC/USD"]["price"]["close"], 1.5)
+        self.assertEqual([c["close"] for c in results["BTC/USD"]["price_history"]], [1.0, 2.0])
+        self.assertIn("timestamp", results["BTC/USD"]["price_history"][0])
+        self.assertNotIn("AAPL", results)
+
+
+if __name__ == '__main__':
+    unittest.main()